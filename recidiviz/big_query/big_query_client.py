@@ -18,7 +18,10 @@
 tables and views.
 """
 import abc
+import datetime
 import logging
+import time
+from concurrent import futures
 from typing import List, Optional, Iterator, Dict
 
 import attr
@@ -239,6 +242,20 @@ class BigQueryClient:
             export_configs: List of queries along with how to export their results.
         """
 
+    @abc.abstractmethod
+    def export_query_results_to_cloud_storage_pipelined(self, export_configs: List[ExportQueryConfig]) -> None:
+        """Exports the queries to cloud storage according to the given configs, like
+        export_query_results_to_cloud_storage, but runs the three steps for each config independently of the other
+        configs: each extract job starts as soon as its own query job completes, and each temporary table is deleted as
+        soon as its own extract job completes. The temporary tables are also created with an expiration time before
+        their queries start, so that they are cleaned up even if this process dies before deleting them.
+
+        This runs synchronously and waits for all jobs to complete.
+
+        Args:
+            export_configs: List of queries along with how to export their results.
+        """
+
     @abc.abstractmethod
     def run_query_async(self, query_str: str) -> bigquery.QueryJob:
         """Runs a query in BigQuery asynchronously.
@@ -422,6 +439,12 @@ class BigQueryClientImpl(BigQueryClient):
     # Location of the GCP project that must be the same for bigquery.Client calls
     LOCATION = 'US'
 
+    # The maximum number of export configs to run at once in export_query_results_to_cloud_storage_pipelined
+    MAX_CONCURRENT_EXPORTS = 20
+
+    # How long the temporary tables created for exports live if they are not deleted explicitly
+    EXPORT_TEMP_TABLE_EXPIRATION = datetime.timedelta(hours=6)
+
     def __init__(self, project_id: Optional[str] = None):
         if not project_id:
             project_id = metadata.project_id()
@@ -599,6 +622,69 @@ class BigQueryClientImpl(BigQueryClient):
                               table_id=export_config.intermediate_table_name)
         logging.info('Done deleting temporary intermediate tables.')
 
+    def export_query_results_to_cloud_storage_pipelined(self, export_configs: List[ExportQueryConfig]) -> None:
+        if not export_configs:
+            return
+
+        max_workers = min(len(export_configs), self.MAX_CONCURRENT_EXPORTS)
+        logging.info('Exporting [%d] queries with [%d] workers', len(export_configs), max_workers)
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            export_futures = [executor.submit(self._export_query_results_to_cloud_storage_for_config, export_config)
+                              for export_config in export_configs]
+            for future in futures.as_completed(export_futures):
+                future.result()
+        logging.info('Completed [%d] query exports.', len(export_configs))
+
+    def _export_query_results_to_cloud_storage_for_config(self, export_config: ExportQueryConfig) -> None:
+        """Runs the query, extract and temporary table deletion for a single export config, logging the latency of
+        each step."""
+        start = time.perf_counter()
+        dataset_ref = self.dataset_ref_for_id(export_config.intermediate_dataset_id)
+        self.create_dataset_if_necessary(dataset_ref)
+        self._create_table_with_expiration(dataset_ref, export_config.intermediate_table_name,
+                                           datetime.datetime.now(tz=datetime.timezone.utc) +
+                                           self.EXPORT_TEMP_TABLE_EXPIRATION)
+
+        query_job = self.create_table_from_query_async(
+            dataset_id=export_config.intermediate_dataset_id,
+            table_id=export_config.intermediate_table_name,
+            query=export_config.query,
+            query_parameters=export_config.query_parameters,
+            overwrite=True
+        )
+        query_job.result()
+        query_end = time.perf_counter()
+
+        extract_job = self.export_table_to_cloud_storage_async(
+            dataset_ref,
+            export_config.intermediate_table_name,
+            export_config.output_uri,
+            export_config.output_format
+        )
+        if extract_job is not None:
+            extract_job.result()
+        extract_end = time.perf_counter()
+
+        self.delete_table(dataset_id=export_config.intermediate_dataset_id,
+                          table_id=export_config.intermediate_table_name)
+
+        logging.info('Exported [%s] in [%.2f] seconds (query: [%.2f] seconds, extract: [%.2f] seconds).',
+                     export_config.output_uri, time.perf_counter() - start, query_end - start, extract_end - query_end)
+
+    def _create_table_with_expiration(self,
+                                      dataset_ref: bigquery.DatasetReference,
+                                      table_id: str,
+                                      expiration: datetime.datetime) -> None:
+        """Creates an empty table that expires at the given time, or sets the expiration of the table if it already
+        exists. Overwriting the table with query results keeps its expiration."""
+        requested_table = bigquery.Table(dataset_ref.table(table_id))
+        requested_table.expires = expiration
+        table = self.client.create_table(requested_table, exists_ok=True)
+        if table.expires != requested_table.expires:
+            # The table already existed, e.g. left over from an export that died before deleting it
+            table.expires = expiration
+            self.client.update_table(table, ['expires'])
+
     def delete_table(self, dataset_id: str, table_id: str):
         dataset_ref = self.dataset_ref_for_id(dataset_id)
         table_ref = dataset_ref.table(table_id)
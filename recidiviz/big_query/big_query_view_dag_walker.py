@@ -0,0 +1,143 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Builds a dependency graph of BigQueryViews from the tables referenced in their queries and processes the views in
+dependency order, concurrently where possible."""
+import re
+from concurrent import futures
+from typing import Callable, Dict, List, Set, Tuple, TypeVar
+
+from recidiviz.big_query.big_query_view import BigQueryView
+
+# The (dataset_id, table_id) address of a view or table within a project
+DagKey = Tuple[str, str]
+
+ViewResultType = TypeVar('ViewResultType')
+
+# The default maximum number of views processed at once
+DEFAULT_MAX_WORKERS = 10
+
+
+class BigQueryViewDagNode:
+    """A single view in the BigQueryViewDagWalker graph, with the keys of the views it depends on and the views that
+    depend on it."""
+
+    def __init__(self, view: BigQueryView):
+        self.view = view
+        self.parent_keys: Set[DagKey] = set()
+        self.child_keys: Set[DagKey] = set()
+
+    @property
+    def dag_key(self) -> DagKey:
+        return self.view.dataset_id, self.view.view_id
+
+
+class BigQueryViewDagWalker:
+    """Builds a directed acyclic graph of the provided views, where there is an edge from view A to view B if B's query
+    references A or A's materialized table, and walks the graph so that each view is processed only after all the
+    views it depends on have been processed.
+
+    References are found by looking for fully qualified `{project_id}.{dataset_id}.{table_id}` addresses in the view
+    queries. References to tables that are not one of the provided views (or their materialized tables) are ignored.
+    """
+
+    def __init__(self, views: List[BigQueryView]):
+        self.nodes_by_key: Dict[DagKey, BigQueryViewDagNode] = {}
+        for view in views:
+            node = BigQueryViewDagNode(view)
+            if node.dag_key in self.nodes_by_key:
+                raise ValueError(f'Found multiple views with address [{view.dataset_id}.{view.view_id}]')
+            self.nodes_by_key[node.dag_key] = node
+
+        # Maps the addresses of views and their materialized tables to the key of the view that produces them
+        producing_view_keys: Dict[DagKey, DagKey] = {}
+        for key, node in self.nodes_by_key.items():
+            producing_view_keys[key] = key
+            if node.view.materialized_view_table_id:
+                producing_view_keys[(node.view.dataset_id, node.view.materialized_view_table_id)] = key
+
+        for key, node in self.nodes_by_key.items():
+            for referenced_address in _referenced_table_addresses(node.view):
+                parent_key = producing_view_keys.get(referenced_address)
+                if parent_key is None or parent_key == key:
+                    continue
+                node.parent_keys.add(parent_key)
+                self.nodes_by_key[parent_key].child_keys.add(key)
+
+        self._check_for_cycles()
+
+    def _check_for_cycles(self) -> None:
+        remaining_parent_counts = {key: len(node.parent_keys) for key, node in self.nodes_by_key.items()}
+        keys_to_visit = [key for key, count in remaining_parent_counts.items() if not count]
+        num_visited = 0
+        while keys_to_visit:
+            key = keys_to_visit.pop()
+            num_visited += 1
+            for child_key in self.nodes_by_key[key].child_keys:
+                remaining_parent_counts[child_key] -= 1
+                if not remaining_parent_counts[child_key]:
+                    keys_to_visit.append(child_key)
+
+        if num_visited != len(self.nodes_by_key):
+            views_in_cycles = sorted(f'{dataset_id}.{view_id}'
+                                     for (dataset_id, view_id), count in remaining_parent_counts.items() if count)
+            raise ValueError(f'Found a dependency cycle between views: {views_in_cycles}')
+
+    def process_dag(self,
+                    view_process_fn: Callable[[BigQueryView], ViewResultType],
+                    max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[BigQueryView, ViewResultType]:
+        """Calls |view_process_fn| on every view in the graph, using up to |max_workers| threads. A view is only
+        processed once |view_process_fn| has returned for all of the views it depends on. Returns the result of
+        |view_process_fn| for each view.
+
+        If |view_process_fn| raises for any view, the views that have not started yet are cancelled and the error is
+        raised once the views that are already running have finished.
+        """
+        results: Dict[BigQueryView, ViewResultType] = {}
+        remaining_parent_keys = {key: set(node.parent_keys) for key, node in self.nodes_by_key.items()}
+
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_progress = {
+                executor.submit(view_process_fn, node.view): key
+                for key, node in self.nodes_by_key.items() if not node.parent_keys
+            }
+
+            while in_progress:
+                done, _ = futures.wait(in_progress, return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    key = in_progress.pop(future)
+                    node = self.nodes_by_key[key]
+                    try:
+                        results[node.view] = future.result()
+                    except Exception:
+                        for pending_future in in_progress:
+                            pending_future.cancel()
+                        raise
+
+                    for child_key in node.child_keys:
+                        remaining_parent_keys[child_key].discard(key)
+                        if not remaining_parent_keys[child_key]:
+                            child_view = self.nodes_by_key[child_key].view
+                            in_progress[executor.submit(view_process_fn, child_view)] = child_key
+
+        return results
+
+
+def _referenced_table_addresses(view: BigQueryView) -> Set[DagKey]:
+    """Returns the (dataset_id, table_id) addresses of all tables in the view's project referenced in its query."""
+    reference_regex = re.compile(rf'{re.escape(view.project)}\.(?P<dataset_id>\w+)\.(?P<table_id>\w+)')
+    return {(match.group('dataset_id'), match.group('table_id'))
+            for match in reference_regex.finditer(view.view_query)}
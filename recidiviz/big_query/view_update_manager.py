@@ -25,10 +25,14 @@ This can be run on-demand whenever a set of views needs to be updated. Run local
 import argparse
 import logging
 import sys
+import time
 from typing import Dict, List
 
+from google.cloud import bigquery
+
 from recidiviz.big_query.big_query_client import BigQueryClientImpl
 from recidiviz.big_query.big_query_view import BigQueryView, BigQueryViewBuilder
+from recidiviz.big_query.big_query_view_dag_walker import BigQueryViewDagWalker, DagKey
 from recidiviz.calculator.query.county.view_config import VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE as COUNTY_VIEW_BUILDERS
 from recidiviz.calculator.query.state.view_config import VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE as STATE_VIEW_BUILDERS
 from recidiviz.utils.params import str_to_bool
@@ -52,13 +56,12 @@ def create_dataset_and_update_views_for_view_builders(
     field."""
     # Convert the map of dataset_ids to BigQueryViewBuilders into a map of dataset_ids to BigQueryViews by building
     # each of the views
-    views_to_update: Dict[str, List[BigQueryView]] = {
-        dataset: [
-            view_builder.build() for view_builder in view_builders
-            if not materialized_views_only or view_builder.build().materialized_view_table_id is not None
+    views_to_update: Dict[str, List[BigQueryView]] = {}
+    for dataset, view_builders in view_builders_to_update.items():
+        views = [view_builder.build() for view_builder in view_builders]
+        views_to_update[dataset] = [
+            view for view in views if not materialized_views_only or view.materialized_view_table_id is not None
         ]
-        for dataset, view_builders in view_builders_to_update.items()
-    }
 
     _create_dataset_and_update_views(views_to_update)
 
@@ -71,19 +74,37 @@ def _create_dataset_and_update_views(views_to_update: Dict[str, List[BigQueryVie
 
     If a view has a set materialized_view_table_id field, materializes the view into a table.
 
+    Views are updated concurrently, except that a view is only updated (and materialized) once all the views it
+    references, across all datasets, have been updated and materialized.
+
     Args:
         views_to_update: Dict of BigQuery dataset name to list of view objects to be created or updated.
     """
     bq_client = BigQueryClientImpl()
+    dataset_refs_by_view_key: Dict[DagKey, bigquery.DatasetReference] = {}
     for dataset_name, view_list in views_to_update.items():
         views_dataset_ref = bq_client.dataset_ref_for_id(dataset_name)
         bq_client.create_dataset_if_necessary(views_dataset_ref)
 
         for view in view_list:
-            bq_client.create_or_update_view(views_dataset_ref, view)
+            dataset_refs_by_view_key[(view.dataset_id, view.view_id)] = views_dataset_ref
+
+    def _update_view(view: BigQueryView) -> float:
+        start = time.perf_counter()
+        bq_client.create_or_update_view(dataset_refs_by_view_key[(view.dataset_id, view.view_id)], view)
+
+        if view.materialized_view_table_id:
+            bq_client.materialize_view_to_table(view)
+        return time.perf_counter() - start
+
+    dag_walker = BigQueryViewDagWalker([view for view_list in views_to_update.values() for view in view_list])
 
-            if view.materialized_view_table_id:
-                bq_client.materialize_view_to_table(view)
+    start = time.perf_counter()
+    update_seconds_by_view = dag_walker.process_dag(_update_view)
+    logging.info('Updated %d views in %.1fs. Per-view update times:',
+                 len(update_seconds_by_view), time.perf_counter() - start)
+    for view, seconds in sorted(update_seconds_by_view.items(), key=lambda item: item[1], reverse=True):
+        logging.info('  %s.%s: %.1fs', view.dataset_id, view.view_id, seconds)
 
 
 def parse_arguments(argv):
@@ -58,3 +58,22 @@ DATAFLOW_METRICS_TO_TABLES: Dict[Type[RecidivizMetric], str] = {
     SuccessfulSupervisionSentenceDaysServedMetric: 'successful_supervision_sentence_days_served_metrics',
     SupervisionTerminationMetric: 'supervision_termination_metrics'
 }
+
+# A map from the metric class to the name of the table where the event-based metrics of that class that are not tied to
+# a person are stored, summed across people, when the pipeline calculating them is run with
+# --aggregate_event_based_metrics. Only metrics whose values are all counts can be aggregated.
+AGGREGATED_DATAFLOW_METRICS_TO_TABLES: Dict[Type[RecidivizMetric], str] = {
+    # IncarcerationMetrics
+    IncarcerationAdmissionMetric: 'incarceration_admission_metrics_aggregated',
+    IncarcerationPopulationMetric: 'incarceration_population_metrics_aggregated',
+    IncarcerationReleaseMetric: 'incarceration_release_metrics_aggregated',
+    # SupervisionMetrics
+    SupervisionCaseComplianceMetric: 'supervision_case_compliance_metrics_aggregated',
+    SupervisionPopulationMetric: 'supervision_population_metrics_aggregated',
+    SupervisionRevocationMetric: 'supervision_revocation_metrics_aggregated',
+    SupervisionRevocationAnalysisMetric: 'supervision_revocation_analysis_metrics_aggregated',
+    SupervisionRevocationViolationTypeAnalysisMetric:
+        'supervision_revocation_violation_type_analysis_metrics_aggregated',
+    SupervisionSuccessMetric: 'supervision_success_metrics_aggregated',
+    SupervisionTerminationMetric: 'supervision_termination_metrics_aggregated'
+}
@@ -24,6 +24,7 @@ Run locally with the following command:
 
 """
 import argparse
+import itertools
 import logging
 import sys
 from http import HTTPStatus
@@ -32,7 +33,7 @@ import flask
 
 from recidiviz.big_query.big_query_client import BigQueryClientImpl
 from recidiviz.calculator.calculation_data_storage_config import DATAFLOW_METRICS_COLD_STORAGE_DATASET, \
-    MAX_DAYS_IN_DATAFLOW_METRICS_TABLE, DATAFLOW_METRICS_TO_TABLES
+    MAX_DAYS_IN_DATAFLOW_METRICS_TABLE, DATAFLOW_METRICS_TO_TABLES, AGGREGATED_DATAFLOW_METRICS_TO_TABLES
 from recidiviz.calculator.query.state.dataset_config import DATAFLOW_METRICS_DATASET
 from recidiviz.utils.auth import authenticate_request
 from recidiviz.utils.environment import GCP_PROJECT_STAGING, GCP_PROJECT_PRODUCTION
@@ -107,15 +108,16 @@ def move_old_dataflow_metrics_to_cold_storage():
 
 
 def update_dataflow_metric_tables_schemas() -> None:
-    """For each table that stores Dataflow metric output, ensures that all attributes on the corresponding metric are
-    present in the table in BigQuery."""
+    """For each table that stores Dataflow metric output, including the tables of aggregated event-based metrics,
+    ensures that all attributes on the corresponding metric are present in the table in BigQuery."""
     bq_client = BigQueryClientImpl()
     dataflow_metrics_dataset_id = DATAFLOW_METRICS_DATASET
     dataflow_metrics_dataset_ref = bq_client.dataset_ref_for_id(dataflow_metrics_dataset_id)
 
     bq_client.create_dataset_if_necessary(dataflow_metrics_dataset_ref)
 
-    for metric_class, table_id in DATAFLOW_METRICS_TO_TABLES.items():
+    for metric_class, table_id in itertools.chain(DATAFLOW_METRICS_TO_TABLES.items(),
+                                                  AGGREGATED_DATAFLOW_METRICS_TO_TABLES.items()):
         schema_for_metric_class = metric_class.bq_schema_for_metric_table()
 
         if bq_client.table_exists(dataflow_metrics_dataset_ref, table_id):
@@ -0,0 +1,223 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Runs the fused calculation pipeline, which loads the root entities of every person once and calculates the metrics
+of any subset of the incarceration, program, recidivism and supervision pipelines on them in a single job. Each metric
+family is written to the same tables as when its pipeline runs on its own. See
+recidiviz/tools/run_calculation_pipelines.py for details on how to run.
+"""
+# pylint: disable=abstract-method, arguments-differ
+import argparse
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Set, Type
+
+import apache_beam as beam
+from apache_beam.options.pipeline_options import SetupOptions, PipelineOptions
+from apache_beam.pvalue import PDone
+
+from recidiviz.calculator.pipeline.incarceration import pipeline as incarceration_pipeline
+from recidiviz.calculator.pipeline.incarceration.metrics import IncarcerationMetricType
+from recidiviz.calculator.pipeline.program import pipeline as program_pipeline
+from recidiviz.calculator.pipeline.program.metrics import ProgramMetricType
+from recidiviz.calculator.pipeline.recidivism import pipeline as recidivism_pipeline
+from recidiviz.calculator.pipeline.recidivism.metrics import ReincarcerationRecidivismMetricType
+from recidiviz.calculator.pipeline.supervision import pipeline as supervision_pipeline
+from recidiviz.calculator.pipeline.supervision.metrics import SupervisionMetricType
+from recidiviz.calculator.pipeline.utils.person_snapshot_utils import load_root_entities, \
+    PERSON_SNAPSHOT_ROOT_ENTITIES
+from recidiviz.calculator.pipeline.utils.pipeline_args_utils import add_shared_pipeline_arguments
+from recidiviz.persistence.database.schema.state import schema
+
+# The pipelines that can be fused into a single job, by name, along with the metric types each one calculates.
+FUSED_PIPELINES = {
+    'incarceration': (incarceration_pipeline, IncarcerationMetricType),
+    'program': (program_pipeline, ProgramMetricType),
+    'recidivism': (recidivism_pipeline, ReincarcerationRecidivismMetricType),
+    'supervision': (supervision_pipeline, SupervisionMetricType),
+}
+
+
+def get_arg_parser() -> argparse.ArgumentParser:
+    """Returns the parser for the command-line arguments for this pipeline."""
+    parser = argparse.ArgumentParser()
+
+    # Parse arguments
+    add_shared_pipeline_arguments(parser, include_calculation_limit_args=True)
+
+    parser.add_argument('--pipelines',
+                        dest='pipelines',
+                        type=str,
+                        nargs='+',
+                        choices=FUSED_PIPELINES.keys(),
+                        help='The calculation pipelines to run in this job. Defaults to all of them.',
+                        default=list(FUSED_PIPELINES.keys()))
+
+    metric_type_options: List[str] = [
+        metric_type.value
+        for _, metric_type_enum in FUSED_PIPELINES.values()
+        for metric_type in metric_type_enum
+    ]
+
+    metric_type_options.append('ALL')
+
+    parser.add_argument('--metric_types',
+                        dest='metric_types',
+                        type=str,
+                        nargs='+',
+                        choices=metric_type_options,
+                        help='A list of the types of metric to calculate, across all of the selected pipelines.',
+                        default={'ALL'})
+
+    parser.add_argument('--compress_population_buckets',
+                        dest='compress_population_buckets',
+                        action='store_true',
+                        help='When set, the supervision pipeline classifies consecutive days on supervision with '
+                             'identical attributes as a single run of days. See the supervision pipeline for details.',
+                        default=False)
+
+    parser.add_argument('--aggregate_event_based_metrics',
+                        dest='aggregate_event_based_metrics',
+                        action='store_true',
+                        help='When set, the incarceration and supervision pipelines sum event-based metrics across '
+                             'people and write them to the aggregated metrics tables. See those pipelines for details.',
+                        default=False)
+
+    return parser
+
+
+def metric_types_by_pipeline(pipelines: List[str], metric_types: Set[str]) -> Dict[str, Set[str]]:
+    """Returns the metric types to calculate for each of the given |pipelines|, leaving out the pipelines that calculate
+    none of the requested |metric_types|."""
+    pipeline_metric_types: Dict[str, Set[str]] = {}
+
+    for pipeline_name in pipelines:
+        _, metric_type_enum = FUSED_PIPELINES[pipeline_name]
+
+        if 'ALL' in metric_types:
+            pipeline_metric_types[pipeline_name] = {'ALL'}
+            continue
+
+        metric_types_for_pipeline = _metric_type_values(metric_type_enum) & set(metric_types)
+        if metric_types_for_pipeline:
+            pipeline_metric_types[pipeline_name] = metric_types_for_pipeline
+
+    if not pipeline_metric_types:
+        raise ValueError(f"None of the metric types {sorted(metric_types)} are calculated by the pipelines "
+                         f"{sorted(pipelines)}.")
+
+    return pipeline_metric_types
+
+
+def _metric_type_values(metric_type_enum: Type[Enum]) -> Set[str]:
+    return {metric_type.value for metric_type in metric_type_enum}
+
+
+class CalculatePipelineMetrics(beam.PTransform):
+    """Adds the calculations of one pipeline to the job, given a dictionary of its root entity PCollections.
+
+    Wrapping each pipeline's calculations in its own composite transform keeps the step labels of the fused pipelines
+    distinct, since the separate pipelines reuse labels such as 'Convert to dict to be written to BQ'.
+    """
+
+    def __init__(self, build_calculations: Callable[..., None], **kwargs):
+        super(CalculatePipelineMetrics, self).__init__()
+        self._build_calculations = build_calculations
+        self._kwargs = kwargs
+
+    def expand(self, input_or_inputs):
+        pipeline = next(iter(input_or_inputs.values())).pipeline
+
+        self._build_calculations(pipeline, input_or_inputs, **self._kwargs)
+
+        return PDone(pipeline)
+
+
+def run(apache_beam_pipeline_options: PipelineOptions,
+        data_input: str,
+        reference_input: str,
+        output: str,
+        calculation_month_count: int,
+        metric_types: List[str],
+        state_code: Optional[str],
+        calculation_end_month: Optional[str],
+        person_filter_ids: Optional[List[int]],
+        pipelines: List[str],
+        person_snapshot_input: Optional[str] = None,
+        compress_population_buckets: bool = False,
+        aggregate_event_based_metrics: bool = False):
+    """Runs the fused calculation pipeline."""
+
+    # Workaround to load SQLAlchemy objects at start of pipeline. This is necessary because the BuildRootEntity
+    # function tries to access attributes of relationship properties on the SQLAlchemy room_schema_class before they
+    # have been loaded. However, if *any* SQLAlchemy objects have been instantiated, then the relationship properties
+    # are loaded and their attributes can be successfully accessed.
+    _ = schema.StatePerson()
+
+    apache_beam_pipeline_options.view_as(SetupOptions).save_main_session = True
+
+    pipeline_metric_types = metric_types_by_pipeline(pipelines, set(metric_types))
+
+    # Get pipeline job details
+    all_pipeline_options = apache_beam_pipeline_options.get_all_options()
+
+    input_dataset = all_pipeline_options['project'] + '.' + data_input
+    reference_dataset = all_pipeline_options['project'] + '.' + reference_input
+
+    person_id_filter_set = set(person_filter_ids) if person_filter_ids else None
+
+    # Load each root entity collection needed by any of the pipelines once. A collection that the pipelines hydrate
+    # differently is loaded the way it is stored in person snapshots, so that all of them can share it.
+    root_entity_names = {
+        name
+        for pipeline_name in pipeline_metric_types
+        for name in FUSED_PIPELINES[pipeline_name][0].ROOT_ENTITIES
+    }
+
+    with beam.Pipeline(options=apache_beam_pipeline_options) as p:
+        root_entities = load_root_entities(
+            p,
+            dataset=input_dataset,
+            root_entities={name: spec for name, spec in PERSON_SNAPSHOT_ROOT_ENTITIES.items()
+                           if name in root_entity_names},
+            unifying_id_field_filter_set=person_id_filter_set,
+            state_code=state_code,
+            person_snapshot_input=person_snapshot_input)
+
+        for pipeline_name, metric_types_for_pipeline in pipeline_metric_types.items():
+            pipeline_module, _ = FUSED_PIPELINES[pipeline_name]
+
+            calculation_args = {
+                'apache_beam_pipeline_options': apache_beam_pipeline_options,
+                'reference_dataset': reference_dataset,
+                'output': output,
+                'metric_types': list(metric_types_for_pipeline),
+                'state_code': state_code,
+                'person_id_filter_set': person_id_filter_set,
+            }
+
+            if pipeline_name != 'recidivism':
+                calculation_args['calculation_month_count'] = calculation_month_count
+                calculation_args['calculation_end_month'] = calculation_end_month
+
+            if pipeline_name == 'supervision':
+                calculation_args['compress_population_buckets'] = compress_population_buckets
+
+            if pipeline_name in ('incarceration', 'supervision'):
+                calculation_args['aggregate_event_based_metrics'] = aggregate_event_based_metrics
+
+            _ = ({name: root_entities[name] for name in pipeline_module.ROOT_ENTITIES}
+                 | f'Calculate {pipeline_name} metrics' >>
+                 CalculatePipelineMetrics(pipeline_module.build_calculations, **calculation_args))
@@ -23,16 +23,17 @@ from __future__ import absolute_import
 import argparse
 import logging
 
-from typing import Any, Dict, List, Tuple, Set, Optional
+from typing import Any, Dict, List, Tuple, Set, Optional, Type
 import datetime
 
-from apache_beam.pvalue import AsDict
+from apache_beam.pvalue import AsDict, PCollection
 
 import apache_beam as beam
 from apache_beam.options.pipeline_options import SetupOptions, PipelineOptions
 from apache_beam.typehints import with_input_types, with_output_types
 
-from recidiviz.calculator.calculation_data_storage_config import DATAFLOW_METRICS_TO_TABLES
+from recidiviz.calculator.calculation_data_storage_config import DATAFLOW_METRICS_TO_TABLES, \
+    AGGREGATED_DATAFLOW_METRICS_TO_TABLES
 from recidiviz.calculator.pipeline.incarceration import identifier, calculator
 from recidiviz.calculator.pipeline.incarceration.incarceration_event import \
     IncarcerationEvent
@@ -44,7 +45,7 @@ from recidiviz.calculator.pipeline.utils.entity_hydration_utils import SetSenten
     ConvertSentencesToStateSpecificType
 from recidiviz.calculator.pipeline.utils.execution_utils import get_job_id, person_and_kwargs_for_identifier, \
     select_all_by_person_query
-from recidiviz.calculator.pipeline.utils.extractor_utils import BuildRootEntity
+from recidiviz.calculator.pipeline.utils.person_snapshot_utils import load_root_entities
 from recidiviz.calculator.pipeline.utils.pipeline_args_utils import add_shared_pipeline_arguments
 from recidiviz.calculator.query.state.views.reference.incarceration_period_judicial_district_association import \
     INCARCERATION_PERIOD_JUDICIAL_DISTRICT_ASSOCIATION_VIEW_NAME
@@ -54,7 +55,8 @@ from recidiviz.calculator.query.state.views.reference.us_mo_sentence_statuses im
 from recidiviz.persistence.database.schema.state import schema
 from recidiviz.persistence.entity.state import entities
 from recidiviz.utils import environment
-from recidiviz.calculator.pipeline.utils.metric_utils import RecidivizMetricWritableDict
+from recidiviz.calculator.pipeline.utils.metric_utils import RecidivizMetricWritableDict, AggregateEventBasedMetrics, \
+    aggregated_metric_output_tag
 
 # Cached job_id value
 _job_id = None
@@ -81,11 +83,13 @@ class GetIncarcerationMetrics(beam.PTransform):
     def __init__(self, pipeline_options: Dict[str, str],
                  metric_types: Set[str],
                  calculation_month_count: int,
-                 calculation_end_month: Optional[str] = None):
+                 calculation_end_month: Optional[str] = None,
+                 aggregate_event_based_metrics: bool = False):
         super(GetIncarcerationMetrics, self).__init__()
         self._pipeline_options = pipeline_options
         self._calculation_end_month = calculation_end_month
         self._calculation_month_count = calculation_month_count
+        self._aggregate_event_based_metrics = aggregate_event_based_metrics
 
         month_count_string = str(calculation_month_count) if calculation_month_count != -1 else 'all'
         end_month_string = calculation_end_month if calculation_end_month else 'the current month'
@@ -113,6 +117,12 @@ class GetIncarcerationMetrics(beam.PTransform):
                                  'Produce IncarcerationMetrics' >>
                                  beam.ParDo(ProduceIncarcerationMetric(), **self._pipeline_options))
 
+        if self._aggregate_event_based_metrics:
+            # Sum the event-based counts across people, leaving the person-based IncarcerationMetrics as they are
+            incarceration_metrics = (incarceration_metrics |
+                                     'Aggregate event-based IncarcerationMetrics' >>
+                                     AggregateEventBasedMetrics(AGGREGATED_METRIC_CLASSES.values()))
+
         # Return IncarcerationMetric objects
         return incarceration_metrics
 
@@ -267,6 +277,24 @@ class ProduceIncarcerationMetric(beam.DoFn):
         pass  # Passing unused abstract method.
 
 
+# The root entity collections this pipeline calculates metrics from, by the name of the collection, along with
+# whether the related entities of each root entity are hydrated.
+ROOT_ENTITIES: Dict[str, Tuple[Type[entities.Entity], bool]] = {
+    'persons': (entities.StatePerson, True),
+    'sentence_groups': (entities.StateSentenceGroup, True),
+    'incarceration_sentences': (entities.StateIncarcerationSentence, True),
+    'supervision_sentences': (entities.StateSupervisionSentence, True),
+}
+
+# The IncarcerationMetrics, by metric type, whose event-based metrics are summed across people and written to the
+# companion tables in AGGREGATED_DATAFLOW_METRICS_TO_TABLES when the pipeline is run with --aggregate_event_based_metrics.
+AGGREGATED_METRIC_CLASSES: Dict[IncarcerationMetricType, Type[IncarcerationMetric]] = {
+    IncarcerationMetricType.INCARCERATION_ADMISSION: IncarcerationAdmissionMetric,
+    IncarcerationMetricType.INCARCERATION_POPULATION: IncarcerationPopulationMetric,
+    IncarcerationMetricType.INCARCERATION_RELEASE: IncarcerationReleaseMetric,
+}
+
+
 def get_arg_parser() -> argparse.ArgumentParser:
     """Returns the parser for the command-line arguments for this pipeline."""
     parser = argparse.ArgumentParser()
@@ -288,9 +316,218 @@ def get_arg_parser() -> argparse.ArgumentParser:
                         help='A list of the types of metric to calculate.',
                         default={'ALL'})
 
+    parser.add_argument('--aggregate_event_based_metrics',
+                        dest='aggregate_event_based_metrics',
+                        action='store_true',
+                        help='When set, event-based metrics that are not tied to a person are summed across people '
+                             'and written to the aggregated metrics tables. Person-level and person-based metrics are '
+                             'written as usual.',
+                        default=False)
+
     return parser
 
 
+def build_calculations(p: beam.Pipeline,
+                       root_entities: Dict[str, PCollection],
+                       apache_beam_pipeline_options: PipelineOptions,
+                       reference_dataset: str,
+                       output: str,
+                       calculation_month_count: int,
+                       metric_types: List[str],
+                       state_code: Optional[str],
+                       calculation_end_month: Optional[str],
+                       person_id_filter_set: Optional[Set[int]],
+                       aggregate_event_based_metrics: bool = False):
+    """Adds the incarceration calculations on the given |root_entities| to the pipeline |p|, writing the metrics to
+    the |output| dataset. The |root_entities| must include each collection in ROOT_ENTITIES."""
+    persons = root_entities['persons']
+    sentence_groups = root_entities['sentence_groups']
+    incarceration_sentences = root_entities['incarceration_sentences']
+    supervision_sentences = root_entities['supervision_sentences']
+
+    if state_code is None or state_code == 'US_MO':
+        # Bring in the reference table that includes sentence status ranking information
+        us_mo_sentence_status_query = select_all_by_person_query(
+            reference_dataset, US_MO_SENTENCE_STATUSES_VIEW_NAME, state_code, person_id_filter_set)
+
+        us_mo_sentence_statuses = (p | "Read MO sentence status table from BigQuery" >>
+                                   beam.io.Read(beam.io.BigQuerySource(query=us_mo_sentence_status_query,
+                                                                       use_standard_sql=True)))
+    else:
+        us_mo_sentence_statuses = (p | f"Generate empty MO statuses list for non-MO state run: {state_code} " >>
+                                   beam.Create([]))
+
+    us_mo_sentence_status_rankings_as_kv = (
+        us_mo_sentence_statuses |
+        'Convert MO sentence status ranking table to KV tuples' >>
+        beam.ParDo(ConvertDictToKVTuple(), 'person_id')
+    )
+
+    supervision_sentences_and_statuses = (
+        {'incarceration_sentences': incarceration_sentences,
+         'supervision_sentences': supervision_sentences,
+         'sentence_statuses': us_mo_sentence_status_rankings_as_kv}
+        | 'Group sentences to the sentence statuses for that person' >>
+        beam.CoGroupByKey()
+    )
+
+    sentences_converted = (
+        supervision_sentences_and_statuses
+        | 'Convert to state-specific sentences' >>
+        beam.ParDo(ConvertSentencesToStateSpecificType()).with_outputs('incarceration_sentences',
+                                                                       'supervision_sentences')
+    )
+
+    sentences_and_sentence_groups = (
+        {'sentence_groups': sentence_groups,
+         'incarceration_sentences': sentences_converted.incarceration_sentences,
+         'supervision_sentences': sentences_converted.supervision_sentences}
+        | 'Group sentences to sentence groups' >>
+        beam.CoGroupByKey()
+    )
+
+    # Set hydrated sentences on the corresponding sentence groups
+    sentence_groups_with_hydrated_sentences = (
+        sentences_and_sentence_groups | 'Set hydrated sentences on sentence groups' >>
+        beam.ParDo(SetSentencesOnSentenceGroup())
+    )
+
+    # Bring in the table that associates people and their county of residence
+    person_id_to_county_query = select_all_by_person_query(
+        reference_dataset,
+        PERSONS_TO_RECENT_COUNTY_OF_RESIDENCE_VIEW_NAME,
+        # TODO(3602): Once we put state_code on StatePerson objects, we can update the
+        # persons_to_recent_county_of_residence query to have a state_code field, allowing us to also filter the
+        # output by state_code.
+        state_code_filter=None,
+        person_id_filter_set=person_id_filter_set)
+
+    person_id_to_county_kv = (
+        p | "Read person_id to county associations from BigQuery" >>
+        beam.io.Read(beam.io.BigQuerySource(
+            query=person_id_to_county_query,
+            use_standard_sql=True))
+        | "Convert person_id to county association table to KV" >>
+        beam.ParDo(ConvertDictToKVTuple(), 'person_id')
+    )
+
+    # Bring in the judicial districts associated with incarceration_periods
+    ip_to_judicial_district_query = select_all_by_person_query(
+        reference_dataset,
+        INCARCERATION_PERIOD_JUDICIAL_DISTRICT_ASSOCIATION_VIEW_NAME,
+        state_code,
+        person_id_filter_set)
+
+    ip_to_judicial_district_kv = (
+        p | "Read incarceration_period to judicial_district associations from BigQuery" >>
+        beam.io.Read(beam.io.BigQuerySource(
+            query=ip_to_judicial_district_query,
+            use_standard_sql=True))
+        | "Convert incarceration_period to judicial_district association table to KV" >>
+        beam.ParDo(ConvertDictToKVTuple(), 'person_id')
+    )
+
+    # Group each StatePerson with their related entities
+    person_entities = (
+        {'person': persons,
+         'sentence_groups': sentence_groups_with_hydrated_sentences,
+         'incarceration_period_judicial_district_association': ip_to_judicial_district_kv
+         }
+        | 'Group StatePerson to SentenceGroups' >>
+        beam.CoGroupByKey()
+    )
+
+    # Identify IncarcerationEvents events from the StatePerson's StateIncarcerationPeriods
+    person_events = (person_entities | 'Classify Incarceration Events' >>
+                     beam.ParDo(ClassifyIncarcerationEvents(),
+                                AsDict(person_id_to_county_kv)))
+
+    # Get pipeline job details for accessing job_id
+    all_pipeline_options = apache_beam_pipeline_options.get_all_options()
+
+    # Add timestamp for local jobs
+    job_timestamp = datetime.datetime.now().strftime('%Y-%m-%d_%H_%M_%S.%f')
+    all_pipeline_options['job_timestamp'] = job_timestamp
+
+    # Get the type of metric to calculate
+    metric_types_set = set(metric_types)
+
+    # Get IncarcerationMetrics
+    incarceration_metrics = (person_events | 'Get Incarceration Metrics' >>
+                             GetIncarcerationMetrics(
+                                 pipeline_options=all_pipeline_options,
+                                 metric_types=metric_types_set,
+                                 calculation_end_month=calculation_end_month,
+                                 calculation_month_count=calculation_month_count,
+                                 aggregate_event_based_metrics=aggregate_event_based_metrics))
+
+    if person_id_filter_set:
+        logging.warning("Non-empty person filter set - returning before writing metrics.")
+        return
+
+    aggregated_metric_types = list(AGGREGATED_METRIC_CLASSES) if aggregate_event_based_metrics else []
+
+    # Convert the metrics into a format that's writable to BQ
+    writable_metrics = (incarceration_metrics | 'Convert to dict to be written to BQ' >>
+                        beam.ParDo(RecidivizMetricWritableDict(),
+                                   aggregated_metric_classes={AGGREGATED_METRIC_CLASSES[metric_type]
+                                                              for metric_type in aggregated_metric_types}).with_outputs(
+                            IncarcerationMetricType.INCARCERATION_ADMISSION.value,
+                            IncarcerationMetricType.INCARCERATION_POPULATION.value,
+                            IncarcerationMetricType.INCARCERATION_RELEASE.value,
+                            *[aggregated_metric_output_tag(metric_type) for metric_type in aggregated_metric_types]
+                        ))
+
+    # Write the metrics to the output tables in BigQuery
+    admissions_table_id = DATAFLOW_METRICS_TO_TABLES.get(IncarcerationAdmissionMetric)
+    population_table_id = DATAFLOW_METRICS_TO_TABLES.get(IncarcerationPopulationMetric)
+    releases_table_id = DATAFLOW_METRICS_TO_TABLES.get(IncarcerationReleaseMetric)
+
+    _ = (writable_metrics.INCARCERATION_ADMISSION
+         | f"Write admission metrics to BQ table: {admissions_table_id}" >>
+         beam.io.WriteToBigQuery(
+             table=admissions_table_id,
+             dataset=output,
+             create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+             write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+             method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+         ))
+
+    _ = (writable_metrics.INCARCERATION_POPULATION
+         | f"Write population metrics to BQ table: {population_table_id}" >>
+         beam.io.WriteToBigQuery(
+             table=population_table_id,
+             dataset=output,
+             create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+             write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+             method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+         ))
+
+    _ = (writable_metrics.INCARCERATION_RELEASE
+         | f"Write release metrics to BQ table: {releases_table_id}" >>
+         beam.io.WriteToBigQuery(
+             table=releases_table_id,
+             dataset=output,
+             create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+             write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+             method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+         ))
+
+    # Write the event-based metrics that were summed across people to their own tables in BigQuery
+    for metric_type in aggregated_metric_types:
+        aggregated_table_id = AGGREGATED_DATAFLOW_METRICS_TO_TABLES.get(AGGREGATED_METRIC_CLASSES[metric_type])
+
+        _ = (writable_metrics[aggregated_metric_output_tag(metric_type)]
+             | f"Write aggregated {metric_type.value} metrics to BQ table: {aggregated_table_id}" >>
+             beam.io.WriteToBigQuery(
+                 table=aggregated_table_id,
+                 dataset=output,
+                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+             ))
+
+
 def run(apache_beam_pipeline_options: PipelineOptions,
         data_input: str,
         reference_input: str,
@@ -299,7 +536,9 @@ def run(apache_beam_pipeline_options: PipelineOptions,
         metric_types: List[str],
         state_code: Optional[str],
         calculation_end_month: Optional[str],
-        person_filter_ids: Optional[List[int]]):
+        person_filter_ids: Optional[List[int]],
+        person_snapshot_input: Optional[str] = None,
+        aggregate_event_based_metrics: bool = False):
     """Runs the incarceration calculation pipeline."""
 
     # Workaround to load SQLAlchemy objects at start of pipeline. This is necessary because the BuildRootEntity
@@ -319,203 +558,15 @@ def run(apache_beam_pipeline_options: PipelineOptions,
     person_id_filter_set = set(person_filter_ids) if person_filter_ids else None
 
     with beam.Pipeline(options=apache_beam_pipeline_options) as p:
-        # Get StatePersons
-        persons = (p | 'Load StatePersons' >>
-                   BuildRootEntity(dataset=query_dataset, root_entity_class=entities.StatePerson,
-                                   unifying_id_field=entities.StatePerson.get_class_id_name(),
-                                   build_related_entities=True, unifying_id_field_filter_set=person_id_filter_set))
-
-        # Get StateSentenceGroups
-        sentence_groups = (p | 'Load StateSentenceGroups' >>
-                           BuildRootEntity(
-                               dataset=query_dataset,
-                               root_entity_class=entities.StateSentenceGroup,
-                               unifying_id_field=entities.StatePerson.get_class_id_name(),
-                               build_related_entities=True,
-                               unifying_id_field_filter_set=person_id_filter_set,
-                               state_code=state_code
-                           ))
-
-        # Get StateIncarcerationSentences
-        incarceration_sentences = (p | 'Load StateIncarcerationSentences' >>
-                                   BuildRootEntity(
-                                       dataset=query_dataset,
-                                       root_entity_class=entities.StateIncarcerationSentence,
-                                       unifying_id_field=entities.StatePerson.get_class_id_name(),
-                                       build_related_entities=True,
-                                       unifying_id_field_filter_set=person_id_filter_set,
-                                       state_code=state_code
-                                   ))
-
-        # Get StateSupervisionSentences
-        supervision_sentences = (p | 'Load StateSupervisionSentences' >>
-                                 BuildRootEntity(
-                                     dataset=query_dataset,
-                                     root_entity_class=entities.StateSupervisionSentence,
-                                     unifying_id_field=entities.StatePerson.get_class_id_name(),
-                                     build_related_entities=True,
-                                     unifying_id_field_filter_set=person_id_filter_set,
-                                     state_code=state_code
-                                 ))
-
-        if state_code is None or state_code == 'US_MO':
-            # Bring in the reference table that includes sentence status ranking information
-            us_mo_sentence_status_query = select_all_by_person_query(
-                reference_dataset, US_MO_SENTENCE_STATUSES_VIEW_NAME, state_code, person_id_filter_set)
-
-            us_mo_sentence_statuses = (p | "Read MO sentence status table from BigQuery" >>
-                                       beam.io.Read(beam.io.BigQuerySource(query=us_mo_sentence_status_query,
-                                                                           use_standard_sql=True)))
-        else:
-            us_mo_sentence_statuses = (p | f"Generate empty MO statuses list for non-MO state run: {state_code} " >>
-                                       beam.Create([]))
-
-        us_mo_sentence_status_rankings_as_kv = (
-            us_mo_sentence_statuses |
-            'Convert MO sentence status ranking table to KV tuples' >>
-            beam.ParDo(ConvertDictToKVTuple(), 'person_id')
-        )
-
-        supervision_sentences_and_statuses = (
-            {'incarceration_sentences': incarceration_sentences,
-             'supervision_sentences': supervision_sentences,
-             'sentence_statuses': us_mo_sentence_status_rankings_as_kv}
-            | 'Group sentences to the sentence statuses for that person' >>
-            beam.CoGroupByKey()
-        )
-
-        sentences_converted = (
-            supervision_sentences_and_statuses
-            | 'Convert to state-specific sentences' >>
-            beam.ParDo(ConvertSentencesToStateSpecificType()).with_outputs('incarceration_sentences',
-                                                                           'supervision_sentences')
-        )
-
-        sentences_and_sentence_groups = (
-            {'sentence_groups': sentence_groups,
-             'incarceration_sentences': sentences_converted.incarceration_sentences,
-             'supervision_sentences': sentences_converted.supervision_sentences}
-            | 'Group sentences to sentence groups' >>
-            beam.CoGroupByKey()
-        )
-
-        # Set hydrated sentences on the corresponding sentence groups
-        sentence_groups_with_hydrated_sentences = (
-            sentences_and_sentence_groups | 'Set hydrated sentences on sentence groups' >>
-            beam.ParDo(SetSentencesOnSentenceGroup())
-        )
-
-        # Bring in the table that associates people and their county of residence
-        person_id_to_county_query = select_all_by_person_query(
-            reference_dataset,
-            PERSONS_TO_RECENT_COUNTY_OF_RESIDENCE_VIEW_NAME,
-            # TODO(3602): Once we put state_code on StatePerson objects, we can update the
-            # persons_to_recent_county_of_residence query to have a state_code field, allowing us to also filter the
-            # output by state_code.
-            state_code_filter=None,
-            person_id_filter_set=person_id_filter_set)
-
-        person_id_to_county_kv = (
-            p | "Read person_id to county associations from BigQuery" >>
-            beam.io.Read(beam.io.BigQuerySource(
-                query=person_id_to_county_query,
-                use_standard_sql=True))
-            | "Convert person_id to county association table to KV" >>
-            beam.ParDo(ConvertDictToKVTuple(), 'person_id')
-        )
-
-        # Bring in the judicial districts associated with incarceration_periods
-        ip_to_judicial_district_query = select_all_by_person_query(
-            reference_dataset,
-            INCARCERATION_PERIOD_JUDICIAL_DISTRICT_ASSOCIATION_VIEW_NAME,
-            state_code,
-            person_id_filter_set)
-
-        ip_to_judicial_district_kv = (
-            p | "Read incarceration_period to judicial_district associations from BigQuery" >>
-            beam.io.Read(beam.io.BigQuerySource(
-                query=ip_to_judicial_district_query,
-                use_standard_sql=True))
-            | "Convert incarceration_period to judicial_district association table to KV" >>
-            beam.ParDo(ConvertDictToKVTuple(), 'person_id')
-        )
-
-        # Group each StatePerson with their related entities
-        person_entities = (
-            {'person': persons,
-             'sentence_groups': sentence_groups_with_hydrated_sentences,
-             'incarceration_period_judicial_district_association': ip_to_judicial_district_kv
-             }
-            | 'Group StatePerson to SentenceGroups' >>
-            beam.CoGroupByKey()
-        )
-
-        # Identify IncarcerationEvents events from the StatePerson's StateIncarcerationPeriods
-        person_events = (person_entities | 'Classify Incarceration Events' >>
-                         beam.ParDo(ClassifyIncarcerationEvents(),
-                                    AsDict(person_id_to_county_kv)))
-
-        # Get pipeline job details for accessing job_id
-        all_pipeline_options = apache_beam_pipeline_options.get_all_options()
-
-        # Add timestamp for local jobs
-        job_timestamp = datetime.datetime.now().strftime('%Y-%m-%d_%H_%M_%S.%f')
-        all_apache_beam_pipeline_options['job_timestamp'] = job_timestamp
-
-        # Get the type of metric to calculate
-        metric_types_set = set(metric_types)
-
-        # Get IncarcerationMetrics
-        incarceration_metrics = (person_events | 'Get Incarceration Metrics' >>
-                                 GetIncarcerationMetrics(
-                                     pipeline_options=all_pipeline_options,
-                                     metric_types=metric_types_set,
-                                     calculation_end_month=calculation_end_month,
-                                     calculation_month_count=calculation_month_count))
-
-        if person_id_filter_set:
-            logging.warning("Non-empty person filter set - returning before writing metrics.")
-            return
-
-        # Convert the metrics into a format that's writable to BQ
-        writable_metrics = (incarceration_metrics | 'Convert to dict to be written to BQ' >>
-                            beam.ParDo(RecidivizMetricWritableDict()).with_outputs(
-                                IncarcerationMetricType.INCARCERATION_ADMISSION.value,
-                                IncarcerationMetricType.INCARCERATION_POPULATION.value,
-                                IncarcerationMetricType.INCARCERATION_RELEASE.value
-                            ))
-
-        # Write the metrics to the output tables in BigQuery
-        admissions_table_id = DATAFLOW_METRICS_TO_TABLES.get(IncarcerationAdmissionMetric)
-        population_table_id = DATAFLOW_METRICS_TO_TABLES.get(IncarcerationPopulationMetric)
-        releases_table_id = DATAFLOW_METRICS_TO_TABLES.get(IncarcerationReleaseMetric)
-
-        _ = (writable_metrics.INCARCERATION_ADMISSION
-             | f"Write admission metrics to BQ table: {admissions_table_id}" >>
-             beam.io.WriteToBigQuery(
-                 table=admissions_table_id,
-                 dataset=output,
-                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
-                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
-                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
-             ))
-
-        _ = (writable_metrics.INCARCERATION_POPULATION
-             | f"Write population metrics to BQ table: {population_table_id}" >>
-             beam.io.WriteToBigQuery(
-                 table=population_table_id,
-                 dataset=output,
-                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
-                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
-                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
-             ))
-
-        _ = (writable_metrics.INCARCERATION_RELEASE
-             | f"Write release metrics to BQ table: {releases_table_id}" >>
-             beam.io.WriteToBigQuery(
-                 table=releases_table_id,
-                 dataset=output,
-                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
-                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
-                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
-             ))
+        root_entities = load_root_entities(
+            p,
+            dataset=query_dataset,
+            root_entities=ROOT_ENTITIES,
+            unifying_id_field_filter_set=person_id_filter_set,
+            state_code=state_code,
+            person_snapshot_input=person_snapshot_input,
+            filter_persons_by_state_code=False)
+
+        build_calculations(p, root_entities, apache_beam_pipeline_options, reference_dataset, output,
+                           calculation_month_count, metric_types, state_code, calculation_end_month,
+                           person_id_filter_set, aggregate_event_based_metrics)
@@ -0,0 +1,87 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Runs the person snapshot pipeline, which extracts the hydrated root entities of every person once and writes them to
+a snapshot that the calculation pipelines can read with --person_snapshot_input. See
+recidiviz/tools/run_calculation_pipelines.py for details on how to run.
+"""
+import argparse
+from typing import List, Optional
+
+import apache_beam as beam
+from apache_beam.options.pipeline_options import SetupOptions, PipelineOptions
+
+from recidiviz.calculator.pipeline.utils.person_snapshot_utils import BuildHydratedPersons, WriteHydratedPersons
+from recidiviz.calculator.query.state.dataset_config import STATE_BASE_DATASET
+from recidiviz.persistence.database.schema.state import schema
+
+
+def get_arg_parser() -> argparse.ArgumentParser:
+    """Returns the parser for the command-line arguments for this pipeline."""
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('--data_input',
+                        type=str,
+                        help='BigQuery dataset to query.',
+                        default=STATE_BASE_DATASET)
+
+    parser.add_argument('--state_code',
+                        dest='state_code',
+                        type=str,
+                        help='The state_code to include in the snapshot.')
+
+    parser.add_argument('--person_filter_ids', type=int, nargs='+',
+                        help='An optional list of DB person_id values. When present, the snapshot will only include '
+                             'these people.')
+
+    parser.add_argument('--snapshot_output',
+                        type=str,
+                        help='The directory to write the snapshot files to (e.g. gs://bucket/snapshots/2020-07-01, '
+                             'or a local directory when running with the DirectRunner).',
+                        required=True)
+
+    return parser
+
+
+def run(apache_beam_pipeline_options: PipelineOptions,
+        data_input: str,
+        state_code: Optional[str],
+        person_filter_ids: Optional[List[int]],
+        snapshot_output: str):
+    """Runs the person snapshot pipeline."""
+
+    # Workaround to load SQLAlchemy objects at start of pipeline. This is necessary because the BuildRootEntity
+    # function tries to access attributes of relationship properties on the SQLAlchemy room_schema_class before they
+    # have been loaded. However, if *any* SQLAlchemy objects have been instantiated, then the relationship properties
+    # are loaded and their attributes can be successfully accessed.
+    _ = schema.StatePerson()
+
+    apache_beam_pipeline_options.view_as(SetupOptions).save_main_session = True
+
+    # Get pipeline job details
+    all_pipeline_options = apache_beam_pipeline_options.get_all_options()
+
+    input_dataset = all_pipeline_options['project'] + '.' + data_input
+
+    person_id_filter_set = set(person_filter_ids) if person_filter_ids else None
+
+    with beam.Pipeline(options=apache_beam_pipeline_options) as p:
+        _ = (p
+             | 'Load hydrated persons' >>
+             BuildHydratedPersons(dataset=input_dataset,
+                                  unifying_id_field_filter_set=person_id_filter_set,
+                                  state_code=state_code)
+             | 'Write person snapshot' >> WriteHydratedPersons(snapshot_output))
@@ -20,11 +20,11 @@ run.
 import argparse
 import datetime
 import logging
-from typing import Dict, Any, List, Tuple, Set, Optional
+from typing import Dict, Any, List, Tuple, Set, Optional, Type
 
 import apache_beam as beam
 from apache_beam.options.pipeline_options import SetupOptions, PipelineOptions
-from apache_beam.pvalue import AsDict
+from apache_beam.pvalue import AsDict, PCollection
 from apache_beam.typehints import with_input_types, with_output_types
 
 from recidiviz.calculator.calculation_data_storage_config import DATAFLOW_METRICS_TO_TABLES
@@ -36,8 +36,8 @@ from recidiviz.calculator.pipeline.program.program_event import ProgramEvent
 from recidiviz.calculator.pipeline.utils.beam_utils import ConvertDictToKVTuple
 from recidiviz.calculator.pipeline.utils.execution_utils import get_job_id, person_and_kwargs_for_identifier, \
     select_all_by_person_query
-from recidiviz.calculator.pipeline.utils.extractor_utils import BuildRootEntity
 from recidiviz.calculator.pipeline.utils.metric_utils import RecidivizMetricWritableDict
+from recidiviz.calculator.pipeline.utils.person_snapshot_utils import load_root_entities
 from recidiviz.calculator.pipeline.utils.pipeline_args_utils import add_shared_pipeline_arguments
 from recidiviz.calculator.query.state.views.reference.supervision_period_to_agent_association import \
     SUPERVISION_PERIOD_TO_AGENT_ASSOCIATION_VIEW_NAME
@@ -251,6 +251,16 @@ class ProduceProgramMetrics(beam.DoFn):
         pass  # Passing unused abstract method.
 
 
+# The root entity collections this pipeline calculates metrics from, by the name of the collection, along with
+# whether the related entities of each root entity are hydrated.
+ROOT_ENTITIES: Dict[str, Tuple[Type[entities.Entity], bool]] = {
+    'persons': (entities.StatePerson, True),
+    'program_assignments': (entities.StateProgramAssignment, True),
+    'assessments': (entities.StateAssessment, False),
+    'supervision_periods': (entities.StateSupervisionPeriod, False),
+}
+
+
 def get_arg_parser() -> argparse.ArgumentParser:
     """Returns the parser for the command-line arguments for this pipeline."""
     parser = argparse.ArgumentParser()
@@ -275,6 +285,110 @@ def get_arg_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def build_calculations(p: beam.Pipeline,
+                       root_entities: Dict[str, PCollection],
+                       apache_beam_pipeline_options: PipelineOptions,
+                       reference_dataset: str,
+                       output: str,
+                       calculation_month_count: int,
+                       metric_types: List[str],
+                       state_code: Optional[str],
+                       calculation_end_month: Optional[str],
+                       person_id_filter_set: Optional[Set[int]]):
+    """Adds the program calculations on the given |root_entities| to the pipeline |p|, writing the metrics to
+    the |output| dataset. The |root_entities| must include each collection in ROOT_ENTITIES."""
+    persons = root_entities['persons']
+    program_assignments = root_entities['program_assignments']
+    assessments = root_entities['assessments']
+    supervision_periods = root_entities['supervision_periods']
+
+    supervision_period_to_agent_association_query = select_all_by_person_query(
+        reference_dataset, SUPERVISION_PERIOD_TO_AGENT_ASSOCIATION_VIEW_NAME, state_code, person_id_filter_set)
+
+    supervision_period_to_agent_associations = (
+        p | "Read Supervision Period to Agent table from BigQuery" >>
+        beam.io.Read(beam.io.BigQuerySource
+                     (query=supervision_period_to_agent_association_query, use_standard_sql=True)))
+
+    # Convert the association table rows into key-value tuples with the value for the supervision_period_id column
+    # as the key
+    supervision_period_to_agent_associations_as_kv = (
+        supervision_period_to_agent_associations |
+        'Convert Supervision Period to Agent table to KV tuples' >>
+        beam.ParDo(ConvertDictToKVTuple(), 'supervision_period_id')
+    )
+
+    # Group each StatePerson with their other entities
+    persons_entities = (
+        {'person': persons,
+         'program_assignments': program_assignments,
+         'assessments': assessments,
+         'supervision_periods': supervision_periods
+         }
+        | 'Group StatePerson to StateProgramAssignments and' >> beam.CoGroupByKey()
+    )
+
+    # Identify ProgramEvents from the StatePerson's StateProgramAssignments
+    person_program_events = (
+        persons_entities
+        | beam.ParDo(ClassifyProgramAssignments(),
+                     AsDict(supervision_period_to_agent_associations_as_kv))
+    )
+
+    # Get pipeline job details for accessing job_id
+    all_pipeline_options = apache_beam_pipeline_options.get_all_options()
+
+    # Add timestamp for local jobs
+    job_timestamp = datetime.datetime.now().strftime('%Y-%m-%d_%H_%M_%S.%f')
+    all_pipeline_options['job_timestamp'] = job_timestamp
+
+    # Get the type of metric to calculate
+    metric_types_set = set(metric_types)
+
+    # Get program metrics
+    program_metrics = (person_program_events | 'Get Program Metrics' >>
+                       GetProgramMetrics(
+                           pipeline_options=all_pipeline_options,
+                           metric_types=metric_types_set,
+                           calculation_end_month=calculation_end_month,
+                           calculation_month_count=calculation_month_count))
+
+    if person_id_filter_set:
+        logging.warning("Non-empty person filter set - returning before writing metrics.")
+        return
+
+    # Convert the metrics into a format that's writable to BQ
+    writable_metrics = (program_metrics
+                        | 'Convert to dict to be written to BQ' >>
+                        beam.ParDo(RecidivizMetricWritableDict()).with_outputs(
+                            ProgramMetricType.PROGRAM_PARTICIPATION.value,
+                            ProgramMetricType.PROGRAM_REFERRAL.value
+                        ))
+
+    # Write the metrics to the output tables in BigQuery
+    referrals_table_id = DATAFLOW_METRICS_TO_TABLES.get(ProgramReferralMetric)
+    participation_table_id = DATAFLOW_METRICS_TO_TABLES.get(ProgramParticipationMetric)
+
+    _ = (writable_metrics.PROGRAM_REFERRAL | f"Write referral metrics to BQ table: {referrals_table_id}" >>
+         beam.io.WriteToBigQuery(
+             table=referrals_table_id,
+             dataset=output,
+             create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+             write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+             method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+         ))
+
+    _ = (writable_metrics.PROGRAM_PARTICIPATION
+         | f"Write participation metrics to BQ table: {participation_table_id}" >>
+         beam.io.WriteToBigQuery(
+             table=participation_table_id,
+             dataset=output,
+             create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+             write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+             method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+         ))
+
+
 def run(apache_beam_pipeline_options: PipelineOptions,
         data_input: str,
         reference_input: str,
@@ -283,7 +397,8 @@ def run(apache_beam_pipeline_options: PipelineOptions,
         metric_types: List[str],
         state_code: Optional[str],
         calculation_end_month: Optional[str],
-        person_filter_ids: Optional[List[int]]):
+        person_filter_ids: Optional[List[int]],
+        person_snapshot_input: Optional[str] = None):
     """Runs the program calculation pipeline."""
 
     # Workaround to load SQLAlchemy objects at start of pipeline. This is necessary because the BuildRootEntity
@@ -303,120 +418,15 @@ def run(apache_beam_pipeline_options: PipelineOptions,
     person_id_filter_set = set(person_filter_ids) if person_filter_ids else None
 
     with beam.Pipeline(options=apache_beam_pipeline_options) as p:
-        # Get StatePersons
-        persons = (p | 'Load Persons' >>
-                   BuildRootEntity(dataset=input_dataset, root_entity_class=entities.StatePerson,
-                                   unifying_id_field=entities.StatePerson.get_class_id_name(),
-                                   build_related_entities=True, unifying_id_field_filter_set=person_id_filter_set))
-
-        # Get StateProgramAssignments
-        program_assignments = (p | 'Load Program Assignments' >>
-                               BuildRootEntity(dataset=input_dataset,
-                                               root_entity_class=entities.
-                                               StateProgramAssignment,
-                                               unifying_id_field=entities.StatePerson.get_class_id_name(),
-                                               build_related_entities=True,
-                                               unifying_id_field_filter_set=person_id_filter_set,
-                                               state_code=state_code))
-
-        # Get StateAssessments
-        assessments = (p | 'Load Assessments' >>
-                       BuildRootEntity(dataset=input_dataset, root_entity_class=entities.StateAssessment,
-                                       unifying_id_field=entities.StatePerson.get_class_id_name(),
-                                       build_related_entities=False,
-                                       unifying_id_field_filter_set=person_id_filter_set,
-                                       state_code=state_code))
-
-        # Get StateSupervisionPeriods
-        supervision_periods = (p | 'Load SupervisionPeriods' >>
-                               BuildRootEntity(dataset=input_dataset, root_entity_class=entities.StateSupervisionPeriod,
-                                               unifying_id_field=entities.StatePerson.get_class_id_name(),
-                                               build_related_entities=False,
-                                               unifying_id_field_filter_set=person_id_filter_set,
-                                               state_code=state_code))
-
-        supervision_period_to_agent_association_query = select_all_by_person_query(
-            reference_dataset, SUPERVISION_PERIOD_TO_AGENT_ASSOCIATION_VIEW_NAME, state_code, person_id_filter_set)
-
-        supervision_period_to_agent_associations = (
-            p | "Read Supervision Period to Agent table from BigQuery" >>
-            beam.io.Read(beam.io.BigQuerySource
-                         (query=supervision_period_to_agent_association_query, use_standard_sql=True)))
-
-        # Convert the association table rows into key-value tuples with the value for the supervision_period_id column
-        # as the key
-        supervision_period_to_agent_associations_as_kv = (
-            supervision_period_to_agent_associations |
-            'Convert Supervision Period to Agent table to KV tuples' >>
-            beam.ParDo(ConvertDictToKVTuple(), 'supervision_period_id')
-        )
-
-        # Group each StatePerson with their other entities
-        persons_entities = (
-            {'person': persons,
-             'program_assignments': program_assignments,
-             'assessments': assessments,
-             'supervision_periods': supervision_periods
-             }
-            | 'Group StatePerson to StateProgramAssignments and' >> beam.CoGroupByKey()
-        )
-
-        # Identify ProgramEvents from the StatePerson's StateProgramAssignments
-        person_program_events = (
-            persons_entities
-            | beam.ParDo(ClassifyProgramAssignments(),
-                         AsDict(supervision_period_to_agent_associations_as_kv))
-        )
-
-        # Get pipeline job details for accessing job_id
-        all_pipeline_options = apache_beam_pipeline_options.get_all_options()
-
-        # Add timestamp for local jobs
-        job_timestamp = datetime.datetime.now().strftime('%Y-%m-%d_%H_%M_%S.%f')
-        all_pipeline_options['job_timestamp'] = job_timestamp
-
-        # Get the type of metric to calculate
-        metric_types_set = set(metric_types)
-
-        # Get program metrics
-        program_metrics = (person_program_events | 'Get Program Metrics' >>
-                           GetProgramMetrics(
-                               pipeline_options=all_pipeline_options,
-                               metric_types=metric_types_set,
-                               calculation_end_month=calculation_end_month,
-                               calculation_month_count=calculation_month_count))
-
-        if person_id_filter_set:
-            logging.warning("Non-empty person filter set - returning before writing metrics.")
-            return
-
-        # Convert the metrics into a format that's writable to BQ
-        writable_metrics = (program_metrics
-                            | 'Convert to dict to be written to BQ' >>
-                            beam.ParDo(RecidivizMetricWritableDict()).with_outputs(
-                                ProgramMetricType.PROGRAM_PARTICIPATION.value,
-                                ProgramMetricType.PROGRAM_REFERRAL.value
-                            ))
-
-        # Write the metrics to the output tables in BigQuery
-        referrals_table_id = DATAFLOW_METRICS_TO_TABLES.get(ProgramReferralMetric)
-        participation_table_id = DATAFLOW_METRICS_TO_TABLES.get(ProgramParticipationMetric)
-
-        _ = (writable_metrics.PROGRAM_REFERRAL | f"Write referral metrics to BQ table: {referrals_table_id}" >>
-             beam.io.WriteToBigQuery(
-                 table=referrals_table_id,
-                 dataset=output,
-                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
-                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
-                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
-             ))
-
-        _ = (writable_metrics.PROGRAM_PARTICIPATION
-             | f"Write participation metrics to BQ table: {participation_table_id}" >>
-             beam.io.WriteToBigQuery(
-                 table=participation_table_id,
-                 dataset=output,
-                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
-                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
-                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
-             ))
+        root_entities = load_root_entities(
+            p,
+            dataset=input_dataset,
+            root_entities=ROOT_ENTITIES,
+            unifying_id_field_filter_set=person_id_filter_set,
+            state_code=state_code,
+            person_snapshot_input=person_snapshot_input,
+            filter_persons_by_state_code=False)
+
+        build_calculations(p, root_entities, apache_beam_pipeline_options, reference_dataset, output,
+                           calculation_month_count, metric_types, state_code, calculation_end_month,
+                           person_id_filter_set)
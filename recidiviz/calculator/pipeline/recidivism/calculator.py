@@ -28,7 +28,7 @@ Attributes:
         recidivism over, from 1 to 10.
 """
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 import datetime
 from datetime import date
@@ -40,8 +40,8 @@ from recidiviz.calculator.pipeline.recidivism.release_event import \
     ReleaseEvent, RecidivismReleaseEvent, NonRecidivismReleaseEvent, \
     ReincarcerationReturnType
 from recidiviz.calculator.pipeline.utils.metric_utils import \
-    MetricMethodologyType
-from recidiviz.calculator.pipeline.utils.calculator_utils import augment_combination, last_day_of_month,\
+    MetricMethodologyType, MetricCombination
+from recidiviz.calculator.pipeline.utils.calculator_utils import last_day_of_month,\
     relevant_metric_periods, characteristics_with_person_id_fields, add_demographic_characteristics
 from recidiviz.common.constants.state.state_supervision_period import StateSupervisionPeriodSupervisionType
 from recidiviz.common.constants.state.state_supervision_violation import \
@@ -55,7 +55,7 @@ FOLLOW_UP_PERIODS = range(1, 11)
 def map_recidivism_combinations(person: StatePerson,
                                 release_events: Dict[int, List[ReleaseEvent]],
                                 metric_inclusions: Dict[ReincarcerationRecidivismMetricType, bool]) \
-        -> List[Tuple[Dict[str, Any], Any]]:
+        -> List[Tuple[MetricCombination, Any]]:
     """Transforms ReleaseEvents and a StatePerson into metric combinations.
 
     Takes in a StatePerson and all of her ReleaseEvents and returns an array
@@ -126,7 +126,7 @@ def map_recidivism_rate_combinations(
         event: ReleaseEvent,
         all_release_events: Dict[int, List[ReleaseEvent]],
         all_reincarcerations: Dict[date, Dict[str, Any]]) -> \
-        List[Tuple[Dict[str, Any], Any]]:
+        List[Tuple[MetricCombination, Any]]:
     """Maps the given event and characteristic combinations to a variety of
     metrics that track rate-based recidivism.
 
@@ -173,7 +173,7 @@ def map_recidivism_count_combinations(
         event: ReleaseEvent,
         all_reincarcerations: Dict[date, Dict[str, Any]],
         metric_period_end_date: date) -> \
-        List[Tuple[Dict[str, Any], Any]]:
+        List[Tuple[MetricCombination, Any]]:
     """Maps the given event and characteristic combinations to a variety of metrics that track count-based recidivism.
 
     If the event is a RecidivismReleaseEvent, then a count of reincarceration occurred. This produces metrics for both
@@ -518,7 +518,7 @@ def combination_rate_metrics(combo: Dict[str, Any],
                              all_release_events: Dict[int, List[ReleaseEvent]],
                              all_reincarcerations: Dict[date, Dict[str, Any]],
                              earliest_recidivism_period: Optional[int],
-                             relevant_periods: List[int]) -> List[Tuple[Dict[str, Any], int]]:
+                             relevant_periods: List[int]) -> List[Tuple[MetricCombination, int]]:
     """Returns all unique recidivism rate metrics for the given combination.
 
     For the characteristic combination, i.e. a unique metric, look at all follow-up periods to determine under which
@@ -600,7 +600,7 @@ def combination_count_metrics(combo: Dict[str, Any], event:
                               all_reincarcerations:
                               Dict[date, Dict[str, Any]],
                               metric_period_end_date: date) \
-        -> List[Tuple[Dict[str, Any], int]]:
+        -> List[Tuple[MetricCombination, int]]:
     """"Returns all unique recidivism count metrics for the given event and combination.
 
     If the event is an instance of recidivism, then for each methodology, gets a list of combos that are augmented with
@@ -656,8 +656,9 @@ def combination_count_metrics(combo: Dict[str, Any], event:
 
 def person_level_augmented_combo(combo: Dict[str, Any], event: ReleaseEvent,
                                  methodology: MetricMethodologyType,
-                                 period: Optional[int]) -> Dict[str, Any]:
-    """Returns a dictionary that has been augmented with all of the parameters that apply to the given event.
+                                 period: Optional[int]) -> MetricCombination:
+    """Returns a combination of the given combo and all of the parameters that apply to the given event. The combo is
+    shared with the combination rather than copied.
 
     Args:
         combo: the base combo to be augmented with methodology and period
@@ -666,24 +667,23 @@ def person_level_augmented_combo(combo: Dict[str, Any], event: ReleaseEvent,
         period: the follow_up_period value to add to each combo
 
     Returns:
-        The augmented combination dictionary.
+        The augmented combination.
     """
-    parameters: Dict[str, Any] = {'state_code': event.state_code,
-                                  'methodology': methodology}
+    combination = MetricCombination(combo, state_code=event.state_code, methodology=methodology)
 
     if period:
-        parameters['follow_up_period'] = period
+        combination.follow_up_period = period
 
     if isinstance(event, RecidivismReleaseEvent):
-        parameters['return_type'] = event.return_type
-        parameters['source_violation_type'] = event.source_violation_type
-        parameters['from_supervision_type'] = event.from_supervision_type
+        combination.return_type = event.return_type
+        combination.source_violation_type = event.source_violation_type
+        combination.from_supervision_type = event.from_supervision_type
 
-    return augment_combination(combo, parameters)
+    return combination
 
 
 def recidivism_value_for_metric(
-        combo: Dict[str, Any],
+        combo: Mapping[str, Any],
         event_return_type:
         Optional[ReincarcerationReturnType],
         event_from_supervision_type:
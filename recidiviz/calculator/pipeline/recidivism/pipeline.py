@@ -24,10 +24,10 @@ from __future__ import absolute_import
 import argparse
 import logging
 
-from typing import Any, Dict, List, Tuple, Set, Optional
+from typing import Any, Dict, List, Tuple, Set, Optional, Type
 import datetime
 
-from apache_beam.pvalue import AsDict
+from apache_beam.pvalue import AsDict, PCollection
 
 import apache_beam as beam
 from apache_beam.options.pipeline_options import SetupOptions, PipelineOptions
@@ -46,8 +46,8 @@ from recidiviz.calculator.pipeline.utils.entity_hydration_utils import \
     SetViolationResponseOnIncarcerationPeriod, SetViolationOnViolationsResponse
 from recidiviz.calculator.pipeline.utils.execution_utils import get_job_id, person_and_kwargs_for_identifier, \
     select_all_by_person_query
-from recidiviz.calculator.pipeline.utils.extractor_utils import BuildRootEntity
-from recidiviz.calculator.pipeline.utils.metric_utils import RecidivizMetricWritableDict
+from recidiviz.calculator.pipeline.utils.metric_utils import RecidivizMetricWritableDict, MetricCombination
+from recidiviz.calculator.pipeline.utils.person_snapshot_utils import load_root_entities
 from recidiviz.calculator.pipeline.utils.pipeline_args_utils import add_shared_pipeline_arguments
 from recidiviz.calculator.query.state.views.reference.persons_to_recent_county_of_residence import \
     PERSONS_TO_RECENT_COUNTY_OF_RESIDENCE_VIEW_NAME
@@ -161,7 +161,7 @@ class ClassifyReleaseEvents(beam.DoFn):
 
 @with_input_types(beam.typehints.Tuple[entities.StatePerson, Dict[int, List[ReleaseEvent]]],
                   beam.typehints.Dict[ReincarcerationRecidivismMetricType, bool])
-@with_output_types(beam.typehints.Tuple[Dict[str, Any], Any])
+@with_output_types(beam.typehints.Tuple[MetricCombination, Any])
 class CalculateRecidivismMetricCombinations(beam.DoFn):
     """Calculates recidivism metric combinations."""
 
@@ -192,7 +192,7 @@ class CalculateRecidivismMetricCombinations(beam.DoFn):
         pass  # Passing unused abstract method.
 
 
-@with_input_types(beam.typehints.Tuple[Dict[str, Any], Any],
+@with_input_types(beam.typehints.Tuple[beam.typehints.Union[MetricCombination, Dict[str, Any]], Any],
                   **{'runner': str,
                      'project': str,
                      'job_name': str,
@@ -210,7 +210,7 @@ class ProduceReincarcerationRecidivismMetric(beam.DoFn):
         job_id(pipeline_options) function can be called to retrieve the job_id.
 
         Args:
-            element: A tuple containing the dictionary for a given recidivism metric, and the value of that metric.
+            element: A tuple containing the MetricCombination for a given recidivism metric, and the value of that metric.
             **kwargs: This should be a dictionary with values for the
                 following keys:
                     - runner: Either 'DirectRunner' or 'DataflowRunner'
@@ -227,36 +227,31 @@ class ProduceReincarcerationRecidivismMetric(beam.DoFn):
 
         pipeline_job_id = job_id(pipeline_options)
 
-        (dict_metric_key, value) = element
+        (metric_combination, value) = element
 
         if value is None:
             # Due to how the pipeline arrives at this function, this should be
             # impossible.
             raise ValueError("No value associated with this metric key.")
 
-        if not dict_metric_key:
+        if not metric_combination:
             # Due to how the pipeline arrives at this function, this should be impossible.
-            raise ValueError("Empty dict_metric_key.")
+            raise ValueError("Empty metric_combination.")
 
-        metric_type = dict_metric_key.pop('metric_type')
+        metric_type = metric_combination['metric_type']
 
         if metric_type == ReincarcerationRecidivismMetricType.REINCARCERATION_COUNT:
-            if dict_metric_key.get('person_id') is not None:
+            if metric_combination.get('person_id') is not None:
                 # The count value for all person-level metrics should be 1
                 value = 1
 
             # For count metrics, the value is the number of returns
-            dict_metric_key['returns'] = value
-
-            recidivism_metric = ReincarcerationRecidivismCountMetric.build_from_metric_key_group(
-                dict_metric_key, pipeline_job_id)
+            recidivism_metric = ReincarcerationRecidivismCountMetric.build_from_metric_combination(
+                metric_combination, pipeline_job_id, returns=value)
         elif metric_type == ReincarcerationRecidivismMetricType.REINCARCERATION_RATE:
-            dict_metric_key['total_releases'] = 1
-            dict_metric_key['recidivated_releases'] = value
-            dict_metric_key['recidivism_rate'] = value
-
-            recidivism_metric = ReincarcerationRecidivismRateMetric.build_from_metric_key_group(
-                dict_metric_key, pipeline_job_id)
+            recidivism_metric = ReincarcerationRecidivismRateMetric.build_from_metric_combination(
+                metric_combination, pipeline_job_id,
+                total_releases=1, recidivated_releases=value, recidivism_rate=value)
         else:
             logging.error("Unexpected metric of type: %s", metric_type)
             return
@@ -268,6 +263,17 @@ class ProduceReincarcerationRecidivismMetric(beam.DoFn):
         pass  # Passing unused abstract method.
 
 
+# The root entity collections this pipeline calculates metrics from, by the name of the collection, along with
+# whether the related entities of each root entity are hydrated.
+ROOT_ENTITIES: Dict[str, Tuple[Type[entities.Entity], bool]] = {
+    'persons': (entities.StatePerson, True),
+    'incarceration_periods': (entities.StateIncarcerationPeriod, True),
+    'supervision_violations': (entities.StateSupervisionViolation, True),
+    # TODO(2769): Don't bring this in as a root entity
+    'supervision_violation_responses': (entities.StateSupervisionViolationResponse, True),
+}
+
+
 def get_arg_parser() -> argparse.ArgumentParser:
     """Returns the parser for the command-line arguments for this pipeline."""
     parser = argparse.ArgumentParser()
@@ -289,13 +295,157 @@ def get_arg_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def build_calculations(p: beam.Pipeline,
+                       root_entities: Dict[str, PCollection],
+                       apache_beam_pipeline_options: PipelineOptions,
+                       reference_dataset: str,
+                       output: str,
+                       metric_types: List[str],
+                       state_code: Optional[str],
+                       person_id_filter_set: Optional[Set[int]]):
+    """Adds the recidivism calculations on the given |root_entities| to the pipeline |p|, writing the metrics to
+    the |output| dataset. The |root_entities| must include each collection in ROOT_ENTITIES."""
+    persons = root_entities['persons']
+    incarceration_periods = root_entities['incarceration_periods']
+    supervision_violations = root_entities['supervision_violations']
+    supervision_violation_responses = root_entities['supervision_violation_responses']
+
+    # Group StateSupervisionViolationResponses and
+    # StateSupervisionViolations by person_id
+    supervision_violations_and_responses = (
+        {'violations': supervision_violations,
+         'violation_responses': supervision_violation_responses
+         } | 'Group StateSupervisionViolationResponses to '
+             'StateSupervisionViolations' >>
+        beam.CoGroupByKey()
+    )
+
+    # Set the fully hydrated StateSupervisionViolation entities on
+    # the corresponding StateSupervisionViolationResponses
+    violation_responses_with_hydrated_violations = (
+        supervision_violations_and_responses
+        | 'Set hydrated StateSupervisionViolations on '
+          'the StateSupervisionViolationResponses' >>
+        beam.ParDo(SetViolationOnViolationsResponse()))
+
+    # Group StateIncarcerationPeriods and StateSupervisionViolationResponses
+    # by person_id
+    incarceration_periods_and_violation_responses = (
+        {'incarceration_periods': incarceration_periods,
+         'violation_responses':
+             violation_responses_with_hydrated_violations}
+        | 'Group StateIncarcerationPeriods to '
+          'StateSupervisionViolationResponses' >>
+        beam.CoGroupByKey()
+    )
+
+    # Set the fully hydrated StateSupervisionViolationResponse entities on
+    # the corresponding StateIncarcerationPeriods
+    incarceration_periods_with_source_violations = (
+        incarceration_periods_and_violation_responses
+        | 'Set hydrated StateSupervisionViolationResponses on '
+        'the StateIncarcerationPeriods' >>
+        beam.ParDo(SetViolationResponseOnIncarcerationPeriod()))
+
+    # Group each StatePerson with their StateIncarcerationPeriods
+    person_and_incarceration_periods = (
+        {'person': persons,
+         'incarceration_periods':
+             incarceration_periods_with_source_violations}
+        | 'Group StatePerson to StateIncarcerationPeriods' >>
+        beam.CoGroupByKey()
+    )
+
+    # Bring in the table that associates people and their county of residence
+    person_id_to_county_query = select_all_by_person_query(
+        reference_dataset,
+        PERSONS_TO_RECENT_COUNTY_OF_RESIDENCE_VIEW_NAME,
+        # TODO(3602): Once we put state_code on StatePerson objects, we can update the
+        # persons_to_recent_county_of_residence query to have a state_code field, allowing us to also filter the
+        # output by state_code.
+        state_code_filter=None,
+        person_id_filter_set=person_id_filter_set)
+
+    person_id_to_county_kv = (
+        p
+        | "Read person_id to county associations from BigQuery" >>
+        beam.io.Read(beam.io.BigQuerySource(
+            query=person_id_to_county_query,
+            use_standard_sql=True))
+        | "Convert person_id to county association table to KV" >>
+        beam.ParDo(ConvertDictToKVTuple(), 'person_id')
+    )
+
+    # Identify ReleaseEvents events from the StatePerson's
+    # StateIncarcerationPeriods
+    person_events = (
+        person_and_incarceration_periods
+        | "ClassifyReleaseEvents" >>
+        beam.ParDo(ClassifyReleaseEvents(), AsDict(person_id_to_county_kv))
+    )
+
+    # Get pipeline job details for accessing job_id
+    all_pipeline_options = apache_beam_pipeline_options.get_all_options()
+
+    # Add timestamp for local jobs
+    job_timestamp = datetime.datetime.now().strftime('%Y-%m-%d_%H_%M_%S.%f')
+    all_pipeline_options['job_timestamp'] = job_timestamp
+
+    # Get the type of metric to calculate
+    metric_types_set = set(metric_types)
+
+    # Get recidivism metrics
+    recidivism_metrics = (person_events
+                          | 'Get Recidivism Metrics' >>
+                          GetRecidivismMetrics(
+                              pipeline_options=all_pipeline_options,
+                              metric_types=metric_types_set))
+
+    if person_id_filter_set:
+        logging.warning("Non-empty person filter set - returning before writing metrics.")
+        return
+
+    # Convert the metrics into a format that's writable to BQ
+    writable_metrics = (recidivism_metrics
+                        | 'Convert to dict to be written to BQ' >>
+                        beam.ParDo(RecidivizMetricWritableDict()).with_outputs(
+                            ReincarcerationRecidivismMetricType.REINCARCERATION_RATE.value,
+                            ReincarcerationRecidivismMetricType.REINCARCERATION_COUNT.value
+                        ))
+
+    # Write the recidivism metrics to the output tables in BigQuery
+    rates_table_id = DATAFLOW_METRICS_TO_TABLES.get(ReincarcerationRecidivismRateMetric)
+    counts_table_id = DATAFLOW_METRICS_TO_TABLES.get(ReincarcerationRecidivismCountMetric)
+
+    _ = (writable_metrics.REINCARCERATION_RATE
+         | f"Write rate metrics to BQ table: {rates_table_id}" >>
+         beam.io.WriteToBigQuery(
+             table=rates_table_id,
+             dataset=output,
+             create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+             write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+             method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+         ))
+
+    _ = (writable_metrics.REINCARCERATION_COUNT
+         | f"Write count metrics to BQ table: {counts_table_id}" >>
+         beam.io.WriteToBigQuery(
+             table=counts_table_id,
+             dataset=output,
+             create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+             write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+             method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+         ))
+
+
 def run(apache_beam_pipeline_options: PipelineOptions,
         data_input: str,
         reference_input: str,
         output: str,
         metric_types: List[str],
         state_code: Optional[str],
-        person_filter_ids: Optional[List[int]]):
+        person_filter_ids: Optional[List[int]],
+        person_snapshot_input: Optional[str] = None):
     """Runs the recidivism calculation pipeline."""
 
     # Workaround to load SQLAlchemy objects at start of pipeline. This is
@@ -317,168 +467,14 @@ def run(apache_beam_pipeline_options: PipelineOptions,
     person_id_filter_set = set(person_filter_ids) if person_filter_ids else None
 
     with beam.Pipeline(options=apache_beam_pipeline_options) as p:
-        # Get StatePersons
-        persons = (p
-                   | 'Load Persons' >>
-                   BuildRootEntity(dataset=query_dataset, root_entity_class=entities.StatePerson,
-                                   unifying_id_field=entities.StatePerson.get_class_id_name(),
-                                   build_related_entities=True, unifying_id_field_filter_set=person_id_filter_set))
-
-        # Get StateIncarcerationPeriods
-        incarceration_periods = (p
-                                 | 'Load IncarcerationPeriods' >>
-                                 BuildRootEntity(dataset=query_dataset,
-                                                 root_entity_class=entities.StateIncarcerationPeriod,
-                                                 unifying_id_field=entities.StatePerson.get_class_id_name(),
-                                                 build_related_entities=True,
-                                                 unifying_id_field_filter_set=person_id_filter_set,
-                                                 state_code=state_code
-                                                 ))
-
-        # Get StateSupervisionViolations
-        supervision_violations = \
-            (p
-             | 'Load SupervisionViolations' >>
-             BuildRootEntity(dataset=query_dataset, root_entity_class=entities.StateSupervisionViolation,
-                             unifying_id_field=entities.StatePerson.get_class_id_name(), build_related_entities=True,
-                             unifying_id_field_filter_set=person_id_filter_set,
-                             state_code=state_code
-                             ))
-
-        # TODO(2769): Don't bring this in as a root entity
-        # Get StateSupervisionViolationResponses
-        supervision_violation_responses = \
-            (p
-             | 'Load SupervisionViolationResponses' >>
-             BuildRootEntity(dataset=query_dataset, root_entity_class=entities.StateSupervisionViolationResponse,
-                             unifying_id_field=entities.StatePerson.get_class_id_name(), build_related_entities=True,
-                             unifying_id_field_filter_set=person_id_filter_set,
-                             state_code=state_code
-                             ))
-
-        # Group StateSupervisionViolationResponses and
-        # StateSupervisionViolations by person_id
-        supervision_violations_and_responses = (
-            {'violations': supervision_violations,
-             'violation_responses': supervision_violation_responses
-             } | 'Group StateSupervisionViolationResponses to '
-                 'StateSupervisionViolations' >>
-            beam.CoGroupByKey()
-        )
-
-        # Set the fully hydrated StateSupervisionViolation entities on
-        # the corresponding StateSupervisionViolationResponses
-        violation_responses_with_hydrated_violations = (
-            supervision_violations_and_responses
-            | 'Set hydrated StateSupervisionViolations on '
-              'the StateSupervisionViolationResponses' >>
-            beam.ParDo(SetViolationOnViolationsResponse()))
-
-        # Group StateIncarcerationPeriods and StateSupervisionViolationResponses
-        # by person_id
-        incarceration_periods_and_violation_responses = (
-            {'incarceration_periods': incarceration_periods,
-             'violation_responses':
-                 violation_responses_with_hydrated_violations}
-            | 'Group StateIncarcerationPeriods to '
-              'StateSupervisionViolationResponses' >>
-            beam.CoGroupByKey()
-        )
-
-        # Set the fully hydrated StateSupervisionViolationResponse entities on
-        # the corresponding StateIncarcerationPeriods
-        incarceration_periods_with_source_violations = (
-            incarceration_periods_and_violation_responses
-            | 'Set hydrated StateSupervisionViolationResponses on '
-            'the StateIncarcerationPeriods' >>
-            beam.ParDo(SetViolationResponseOnIncarcerationPeriod()))
-
-        # Group each StatePerson with their StateIncarcerationPeriods
-        person_and_incarceration_periods = (
-            {'person': persons,
-             'incarceration_periods':
-                 incarceration_periods_with_source_violations}
-            | 'Group StatePerson to StateIncarcerationPeriods' >>
-            beam.CoGroupByKey()
-        )
-
-        # Bring in the table that associates people and their county of residence
-        person_id_to_county_query = select_all_by_person_query(
-            reference_dataset,
-            PERSONS_TO_RECENT_COUNTY_OF_RESIDENCE_VIEW_NAME,
-            # TODO(3602): Once we put state_code on StatePerson objects, we can update the
-            # persons_to_recent_county_of_residence query to have a state_code field, allowing us to also filter the
-            # output by state_code.
-            state_code_filter=None,
-            person_id_filter_set=person_id_filter_set)
-
-        person_id_to_county_kv = (
-            p
-            | "Read person_id to county associations from BigQuery" >>
-            beam.io.Read(beam.io.BigQuerySource(
-                query=person_id_to_county_query,
-                use_standard_sql=True))
-            | "Convert person_id to county association table to KV" >>
-            beam.ParDo(ConvertDictToKVTuple(), 'person_id')
-        )
-
-        # Identify ReleaseEvents events from the StatePerson's
-        # StateIncarcerationPeriods
-        person_events = (
-            person_and_incarceration_periods
-            | "ClassifyReleaseEvents" >>
-            beam.ParDo(ClassifyReleaseEvents(), AsDict(person_id_to_county_kv))
-        )
-
-        # Get pipeline job details for accessing job_id
-        all_pipeline_options = apache_beam_pipeline_options.get_all_options()
-
-        # Add timestamp for local jobs
-        job_timestamp = datetime.datetime.now().strftime('%Y-%m-%d_%H_%M_%S.%f')
-        all_pipeline_options['job_timestamp'] = job_timestamp
-
-        # Get the type of metric to calculate
-        metric_types_set = set(metric_types)
-
-        # Get recidivism metrics
-        recidivism_metrics = (person_events
-                              | 'Get Recidivism Metrics' >>
-                              GetRecidivismMetrics(
-                                  pipeline_options=all_pipeline_options,
-                                  metric_types=metric_types_set))
-
-        if person_id_filter_set:
-            logging.warning("Non-empty person filter set - returning before writing metrics.")
-            return
-
-        # Convert the metrics into a format that's writable to BQ
-        writable_metrics = (recidivism_metrics
-                            | 'Convert to dict to be written to BQ' >>
-                            beam.ParDo(RecidivizMetricWritableDict()).with_outputs(
-                                ReincarcerationRecidivismMetricType.REINCARCERATION_RATE.value,
-                                ReincarcerationRecidivismMetricType.REINCARCERATION_COUNT.value
-                            ))
-
-        # Write the recidivism metrics to the output tables in BigQuery
-        rates_table_id = DATAFLOW_METRICS_TO_TABLES.get(ReincarcerationRecidivismRateMetric)
-        counts_table_id = DATAFLOW_METRICS_TO_TABLES.get(ReincarcerationRecidivismCountMetric)
-
-        _ = (writable_metrics.REINCARCERATION_RATE
-             | f"Write rate metrics to BQ table: {rates_table_id}" >>
-             beam.io.WriteToBigQuery(
-                 table=rates_table_id,
-                 dataset=output,
-                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
-                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
-                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
-             ))
-
-        _ = (writable_metrics.REINCARCERATION_COUNT
-             | f"Write count metrics to BQ table: {counts_table_id}" >>
-             beam.io.WriteToBigQuery(
-                 table=counts_table_id,
-                 dataset=output,
-                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
-                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
-                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
-             ))
+        root_entities = load_root_entities(
+            p,
+            dataset=query_dataset,
+            root_entities=ROOT_ENTITIES,
+            unifying_id_field_filter_set=person_id_filter_set,
+            state_code=state_code,
+            person_snapshot_input=person_snapshot_input,
+            filter_persons_by_state_code=False)
+
+        build_calculations(p, root_entities, apache_beam_pipeline_options, reference_dataset, output, metric_types,
+                           state_code, person_id_filter_set)
@@ -21,16 +21,16 @@ SupervisionTimeBuckets into supervision metrics, key-value pairs where the key r
 represented in the data point, and the value represents an indicator of whether the person should contribute to that
 metric.
 """
-from collections import defaultdict
 from datetime import date
 from operator import attrgetter
 from typing import Dict, List, Tuple, Any, Optional
 
 from recidiviz.calculator.pipeline.supervision.supervision_time_bucket import \
     SupervisionTimeBucket, RevocationReturnSupervisionTimeBucket, ProjectedSupervisionCompletionBucket, \
-    NonRevocationReturnSupervisionTimeBucket, SupervisionTerminationBucket
+    NonRevocationReturnSupervisionTimeBucket, SupervisionTerminationBucket, NonRevocationReturnSupervisionTimeBucketRun
+from recidiviz.calculator.pipeline.supervision.supervision_time_bucket_index import SupervisionTimeBucketIndex
 from recidiviz.calculator.pipeline.utils.calculator_utils import \
-    augmented_combo_for_calculations, relevant_metric_periods, \
+    metric_combination_for_calculations, \
     augment_combination, include_in_historical_metrics, \
     get_calculation_month_lower_bound_date, characteristics_with_person_id_fields, add_demographic_characteristics, \
     get_calculation_month_upper_bound_date
@@ -39,7 +39,7 @@ from recidiviz.calculator.pipeline.utils.assessment_utils import \
 from recidiviz.calculator.pipeline.supervision.metrics import \
     SupervisionMetricType
 from recidiviz.calculator.pipeline.utils.metric_utils import \
-    MetricMethodologyType
+    MetricMethodologyType, MetricCombination
 from recidiviz.calculator.pipeline.utils.state_utils.state_calculation_config_manager import \
     supervision_types_distinct_for_state
 from recidiviz.persistence.entity.state.entities import StatePerson
@@ -49,7 +49,7 @@ def map_supervision_combinations(person: StatePerson,
                                  supervision_time_buckets: List[SupervisionTimeBucket],
                                  metric_inclusions: Dict[SupervisionMetricType, bool],
                                  calculation_end_month: Optional[str],
-                                 calculation_month_count: int) -> List[Tuple[Dict[str, Any], Any]]:
+                                 calculation_month_count: int) -> List[Tuple[MetricCombination, Any]]:
     """Transforms SupervisionTimeBuckets and a StatePerson into metric combinations.
 
     Takes in a StatePerson and all of her SupervisionTimeBuckets and returns an array of "supervision combinations".
@@ -70,24 +70,26 @@ def map_supervision_combinations(person: StatePerson,
     Returns:
         A list of key-value tuples representing specific metric combinations and the value corresponding to that metric.
     """
-    metrics: List[Tuple[Dict[str, Any], Any]] = []
-    periods_and_buckets: Dict[int, List[SupervisionTimeBucket]] = defaultdict()
-
-    supervision_time_buckets.sort(key=attrgetter('year', 'month'))
+    metrics: List[Tuple[MetricCombination, Any]] = []
 
     calculation_month_upper_bound = get_calculation_month_upper_bound_date(calculation_end_month)
 
+    calculation_month_lower_bound = get_calculation_month_lower_bound_date(
+        calculation_month_upper_bound, calculation_month_count)
+
+    supervision_time_buckets = _expand_supervision_time_bucket_runs(
+        supervision_time_buckets, calculation_month_lower_bound, calculation_month_upper_bound)
+
+    supervision_time_buckets.sort(key=attrgetter('year', 'month'))
+
     # If the calculations include the current month, then we will calculate person-based metrics for each metric
     # period in METRIC_PERIOD_MONTHS ending with the current month
     include_metric_period_output = calculation_month_upper_bound == get_calculation_month_upper_bound_date(
         date.today().strftime('%Y-%m'))
 
-    if include_metric_period_output:
-        periods_and_buckets = _classify_buckets_by_relevant_metric_periods(supervision_time_buckets,
-                                                                           calculation_month_upper_bound)
-
-    calculation_month_lower_bound = get_calculation_month_lower_bound_date(
-        calculation_month_upper_bound, calculation_month_count)
+    bucket_index = SupervisionTimeBucketIndex(
+        supervision_time_buckets,
+        metric_period_end_date=calculation_month_upper_bound if include_metric_period_output else None)
 
     for supervision_time_bucket in supervision_time_buckets:
         if isinstance(supervision_time_bucket, ProjectedSupervisionCompletionBucket):
@@ -98,7 +100,7 @@ def map_supervision_combinations(person: StatePerson,
                 supervision_success_metrics = map_metric_combinations(
                     characteristic_combo_success, supervision_time_bucket,
                     calculation_month_upper_bound, calculation_month_lower_bound,
-                    supervision_time_buckets, periods_and_buckets,
+                    bucket_index,
                     SupervisionMetricType.SUPERVISION_SUCCESS, include_metric_period_output)
 
                 metrics.extend(supervision_success_metrics)
@@ -115,7 +117,7 @@ def map_supervision_combinations(person: StatePerson,
                 successful_sentence_length_metrics = map_metric_combinations(
                     characteristic_combo_successful_sentence_length, supervision_time_bucket,
                     calculation_month_upper_bound, calculation_month_lower_bound,
-                    supervision_time_buckets, periods_and_buckets,
+                    bucket_index,
                     SupervisionMetricType.SUPERVISION_SUCCESSFUL_SENTENCE_DAYS_SERVED, include_metric_period_output)
 
                 metrics.extend(successful_sentence_length_metrics)
@@ -128,7 +130,7 @@ def map_supervision_combinations(person: StatePerson,
                 termination_metrics = map_metric_combinations(
                     characteristic_combo_termination, supervision_time_bucket,
                     calculation_month_upper_bound, calculation_month_lower_bound,
-                    supervision_time_buckets, periods_and_buckets,
+                    bucket_index,
                     SupervisionMetricType.SUPERVISION_TERMINATION, include_metric_period_output)
 
                 metrics.extend(termination_metrics)
@@ -141,7 +143,7 @@ def map_supervision_combinations(person: StatePerson,
                 population_metrics = map_metric_combinations(
                     characteristic_combo_population, supervision_time_bucket,
                     calculation_month_upper_bound, calculation_month_lower_bound,
-                    supervision_time_buckets, periods_and_buckets,
+                    bucket_index,
                     SupervisionMetricType.SUPERVISION_POPULATION,
                     # The SupervisionPopulationMetric metric is explicitly a daily metric
                     include_metric_period_output=False)
@@ -157,7 +159,7 @@ def map_supervision_combinations(person: StatePerson,
                 compliance_metrics = map_metric_combinations(
                     characteristic_combo_compliance, supervision_time_bucket,
                     calculation_month_upper_bound, calculation_month_lower_bound,
-                    supervision_time_buckets, periods_and_buckets,
+                    bucket_index,
                     SupervisionMetricType.SUPERVISION_COMPLIANCE,
                     # The SupervisionCaseComplianceMetric metric is explicitly a daily metric
                     include_metric_period_output=False)
@@ -174,8 +176,7 @@ def map_supervision_combinations(person: StatePerson,
                         supervision_time_bucket,
                         calculation_month_upper_bound,
                         calculation_month_lower_bound,
-                        supervision_time_buckets,
-                        periods_and_buckets,
+                        bucket_index,
                         SupervisionMetricType.SUPERVISION_REVOCATION,
                         include_metric_period_output)
 
@@ -190,8 +191,7 @@ def map_supervision_combinations(person: StatePerson,
                         supervision_time_bucket,
                         calculation_month_upper_bound,
                         calculation_month_lower_bound,
-                        supervision_time_buckets,
-                        periods_and_buckets,
+                        bucket_index,
                         SupervisionMetricType.SUPERVISION_REVOCATION_ANALYSIS,
                         include_metric_period_output
                     )
@@ -208,7 +208,7 @@ def map_supervision_combinations(person: StatePerson,
                     revocation_violation_type_analysis_metrics = get_revocation_violation_type_analysis_metrics(
                         supervision_time_bucket, characteristic_combo_revocation_violation_type_analysis,
                         calculation_month_upper_bound, calculation_month_lower_bound,
-                        supervision_time_buckets, periods_and_buckets,
+                        bucket_index,
                         include_metric_period_output
                     )
 
@@ -369,11 +369,10 @@ def map_metric_combinations(
         supervision_time_bucket: SupervisionTimeBucket,
         calculation_month_upper_bound: date,
         calculation_month_lower_bound: Optional[date],
-        all_supervision_time_buckets: List[SupervisionTimeBucket],
-        periods_and_buckets: Dict[int, List[SupervisionTimeBucket]],
+        bucket_index: SupervisionTimeBucketIndex,
         metric_type: SupervisionMetricType,
         include_metric_period_output: bool) -> \
-        List[Tuple[Dict[str, Any], Any]]:
+        List[Tuple[MetricCombination, Any]]:
     """Maps the given time bucket and characteristic combinations to a variety of metrics that track supervision
      population and revocation counts.
 
@@ -382,9 +381,7 @@ def map_metric_combinations(
         supervision_time_bucket: The time bucket on supervision from which the combination was derived.
         calculation_month_upper_bound: The year and month of the last month for which metrics should be calculated.
         calculation_month_lower_bound: The date of the first month to be included in the monthly calculations
-        all_supervision_time_buckets: All of the person's SupervisionTimeBuckets
-        periods_and_buckets: Dictionary mapping metric period month lengths to the SupervisionTimeBuckets that fall in
-            that period.
+        bucket_index: The SupervisionTimeBucketIndex of all of the person's SupervisionTimeBuckets
         metric_type: The metric type to set on each combination.
         include_metric_period_output: Whether or not to include metrics for the various metric periods before the
             current month. If False, will still include metric_period_months = 0 or 1 for the current month.
@@ -407,14 +404,14 @@ def map_metric_combinations(
 
         metrics.extend(combination_supervision_monthly_metrics(
             characteristic_combo, supervision_time_bucket,
-            all_supervision_time_buckets, metric_type, is_daily_metric))
+            bucket_index, metric_type, is_daily_metric))
 
     if include_metric_period_output:
         metrics.extend(combination_supervision_metric_period_metrics(
             characteristic_combo,
             supervision_time_bucket,
             calculation_month_upper_bound,
-            periods_and_buckets,
+            bucket_index,
             metric_type
         ))
 
@@ -426,9 +423,8 @@ def get_revocation_violation_type_analysis_metrics(
         characteristic_combo: Dict[str, Any],
         calculation_month_upper_bound: date,
         calculation_month_lower_bound: Optional[date],
-        all_buckets_sorted: List[SupervisionTimeBucket],
-        periods_and_buckets: Dict[int, List[SupervisionTimeBucket]],
-        include_metric_period_output: bool) -> List[Tuple[Dict[str, Any], Any]]:
+        bucket_index: SupervisionTimeBucketIndex,
+        include_metric_period_output: bool) -> List[Tuple[MetricCombination, Any]]:
     """Produces metrics of the type SUPERVISION_REVOCATION_VIOLATION_TYPE_ANALYSIS. For each violation type list in the
     bucket's violation_type_frequency_counter, produces metrics for each violation type in the list, and one with a
     violation_count_type of 'VIOLATION' to keep track of the overall number of violations."""
@@ -445,8 +441,7 @@ def get_revocation_violation_type_analysis_metrics(
                 supervision_time_bucket,
                 calculation_month_upper_bound,
                 calculation_month_lower_bound,
-                all_buckets_sorted,
-                periods_and_buckets,
+                bucket_index,
                 SupervisionMetricType.SUPERVISION_REVOCATION_VIOLATION_TYPE_ANALYSIS,
                 include_metric_period_output
             )
@@ -465,8 +460,7 @@ def get_revocation_violation_type_analysis_metrics(
                     supervision_time_bucket,
                     calculation_month_upper_bound,
                     calculation_month_lower_bound,
-                    all_buckets_sorted,
-                    periods_and_buckets,
+                    bucket_index,
                     SupervisionMetricType.SUPERVISION_REVOCATION_VIOLATION_TYPE_ANALYSIS,
                     include_metric_period_output
                 )
@@ -479,10 +473,10 @@ def get_revocation_violation_type_analysis_metrics(
 def combination_supervision_monthly_metrics(
         combo: Dict[str, Any],
         supervision_time_bucket: SupervisionTimeBucket,
-        all_supervision_time_buckets: List[SupervisionTimeBucket],
+        bucket_index: SupervisionTimeBucketIndex,
         metric_type: SupervisionMetricType,
         is_daily_metric: bool
-) -> List[Tuple[Dict[str, Any], int]]:
+) -> List[Tuple[MetricCombination, int]]:
     """Returns all unique supervision metrics for the given time bucket and combination for the month of the bucket.
 
     First, includes an event-based count for the month the SupervisionTimeBucket represents. If this bucket of
@@ -492,7 +486,7 @@ def combination_supervision_monthly_metrics(
     Args:
         combo: A characteristic combination to convert into metrics
         supervision_time_bucket: The SupervisionTimeBucket from which the combination was derived
-        all_supervision_time_buckets: All of this person's SupervisionTimeBuckets
+        bucket_index: The SupervisionTimeBucketIndex of all of this person's SupervisionTimeBuckets
         metric_type: The type of metric being tracked by this combo
         is_daily_metric:  If True, limits person-based counts to the date of the event. If False, limits person-based
             counts to the month of the event.
@@ -501,7 +495,7 @@ def combination_supervision_monthly_metrics(
         A list of key-value tuples representing specific metric combination dictionaries and the the metric value
             corresponding to that metric.
     """
-    metrics: List[Tuple[Dict[str, Any], int]] = []
+    metrics: List[Tuple[MetricCombination, int]] = []
 
     bucket_year = supervision_time_bucket.year
     bucket_month = supervision_time_bucket.month
@@ -509,7 +503,7 @@ def combination_supervision_monthly_metrics(
     base_metric_period = 0 if is_daily_metric else 1
 
     # Add event-based combo for the base metric period of the month and year of the bucket
-    event_based_same_bucket_combo = augmented_combo_for_calculations(
+    event_based_same_bucket_combo = metric_combination_for_calculations(
         combo, supervision_time_bucket.state_code,
         bucket_year, bucket_month,
         MetricMethodologyType.EVENT, base_metric_period)
@@ -543,7 +537,7 @@ def combination_supervision_monthly_metrics(
     metrics.append((event_based_same_bucket_combo, event_combo_value))
 
     # Create the person-based combo for the base metric period of the month of the bucket
-    person_based_same_bucket_combo = augmented_combo_for_calculations(
+    person_based_same_bucket_combo = metric_combination_for_calculations(
         combo, supervision_time_bucket.state_code,
         bucket_year, bucket_month,
         MetricMethodologyType.PERSON, base_metric_period
@@ -553,57 +547,29 @@ def combination_supervision_monthly_metrics(
 
     if metric_type == SupervisionMetricType.SUPERVISION_POPULATION:
         # Get all other supervision time buckets for the same day as this one
-        buckets_in_period = [
-            bucket for bucket in all_supervision_time_buckets
-            if (isinstance(bucket, (RevocationReturnSupervisionTimeBucket, NonRevocationReturnSupervisionTimeBucket)))
-            and bucket.bucket_date == supervision_time_bucket.bucket_date
-        ]
-    elif metric_type == SupervisionMetricType.SUPERVISION_REVOCATION:
+        buckets_in_period = bucket_index.population_buckets_by_date.get(supervision_time_bucket.bucket_date, [])
+    elif metric_type in (SupervisionMetricType.SUPERVISION_REVOCATION,
+                         SupervisionMetricType.SUPERVISION_REVOCATION_ANALYSIS,
+                         SupervisionMetricType.SUPERVISION_REVOCATION_VIOLATION_TYPE_ANALYSIS):
         # Get all other revocation supervision buckets for the same month as this one
-        buckets_in_period = [
-            bucket for bucket in all_supervision_time_buckets
-            if isinstance(bucket, RevocationReturnSupervisionTimeBucket)
-            and bucket.year == bucket_year and
-            bucket.month == bucket_month
-        ]
+        buckets_in_period = bucket_index.buckets_in_month(RevocationReturnSupervisionTimeBucket,
+                                                          bucket_year, bucket_month)
     elif metric_type in (SupervisionMetricType.SUPERVISION_SUCCESS,
                          SupervisionMetricType.SUPERVISION_SUCCESSFUL_SENTENCE_DAYS_SERVED):
         # Get all other projected completion buckets for the same month as this one
-        buckets_in_period = [
-            bucket for bucket in all_supervision_time_buckets
-            if isinstance(bucket, ProjectedSupervisionCompletionBucket)
-            and bucket.year == bucket_year and
-            bucket.month == bucket_month
-        ]
+        buckets_in_period = bucket_index.buckets_in_month(ProjectedSupervisionCompletionBucket,
+                                                          bucket_year, bucket_month)
     elif metric_type == SupervisionMetricType.SUPERVISION_TERMINATION:
         # Get all other termination buckets for the same month as this one
-        buckets_in_period = [
-            bucket for bucket in all_supervision_time_buckets
-            if isinstance(bucket, SupervisionTerminationBucket)
-            and bucket.year == bucket_year and
-            bucket.month == bucket_month
-        ]
-    elif metric_type in (SupervisionMetricType.SUPERVISION_REVOCATION_ANALYSIS,
-                         SupervisionMetricType.SUPERVISION_REVOCATION_VIOLATION_TYPE_ANALYSIS):
-        # Get all other revocation supervision buckets for the same month as this one
-        buckets_in_period = [
-            bucket for bucket in all_supervision_time_buckets
-            if isinstance(bucket, RevocationReturnSupervisionTimeBucket)
-            and bucket.year == bucket_year and
-            bucket.month == bucket_month
-        ]
+        buckets_in_period = bucket_index.buckets_in_month(SupervisionTerminationBucket, bucket_year, bucket_month)
     elif metric_type == SupervisionMetricType.SUPERVISION_COMPLIANCE:
         if supervision_time_bucket.case_compliance is None:
             raise ValueError("Attempting to calculate SUPERVISION_COMPLIANCE metrics on a SupervisionTimeBucket that "
                              "has no case_compliance set.")
 
         # Get all other NonRevocationReturnSupervisionTimeBucket buckets with a set case_compliance field
-        buckets_in_period = [
-            bucket for bucket in all_supervision_time_buckets
-            if isinstance(bucket, NonRevocationReturnSupervisionTimeBucket)
-            and bucket.case_compliance is not None
-            and bucket.case_compliance.date_of_evaluation == supervision_time_bucket.case_compliance.date_of_evaluation
-        ]
+        buckets_in_period = bucket_index.compliance_buckets_by_evaluation_date.get(
+            supervision_time_bucket.case_compliance.date_of_evaluation, [])
 
     if buckets_in_period and include_supervision_in_count(
             combo,
@@ -622,9 +588,9 @@ def combination_supervision_metric_period_metrics(
         combo: Dict[str, Any],
         supervision_time_bucket: SupervisionTimeBucket,
         metric_period_end_date: date,
-        periods_and_buckets: Dict[int, List[SupervisionTimeBucket]],
+        bucket_index: SupervisionTimeBucketIndex,
         metric_type: SupervisionMetricType) \
-        -> List[Tuple[Dict[str, Any], int]]:
+        -> List[Tuple[MetricCombination, int]]:
     """Returns all unique supervision metrics for the given time bucket and combination for each of the relevant
     metric_period_months.
 
@@ -636,23 +602,25 @@ def combination_supervision_metric_period_metrics(
         supervision_time_bucket: The SupervisionTimeBucket from which the
             combination was derived
         metric_period_end_date: The day the metric periods end
-        periods_and_buckets: Dictionary mapping metric period month lengths to
-            the SupervisionTimeBuckets that fall in that period
+        bucket_index: The SupervisionTimeBucketIndex of all of this person's
+            SupervisionTimeBuckets, organized by metric period
         metric_type: The type of metric being tracked by this combo
 
     Returns:
         A list of key-value tuples representing specific metric combination dictionaries and the the metric value
             corresponding to that metric.
     """
-    metrics: List[Tuple[Dict[str, Any], int]] = []
+    metrics: List[Tuple[MetricCombination, int]] = []
 
     period_end_year = metric_period_end_date.year
     period_end_month = metric_period_end_date.month
 
-    for period_length, buckets_in_period in periods_and_buckets.items():
-        if supervision_time_bucket in buckets_in_period:
+    periods_for_bucket = bucket_index.metric_periods_by_bucket_id.get(id(supervision_time_bucket), set())
+
+    for period_length in bucket_index.buckets_by_metric_period:
+        if period_length in periods_for_bucket:
             # This event falls within this metric period
-            person_based_period_combo = augmented_combo_for_calculations(
+            person_based_period_combo = metric_combination_for_calculations(
                 combo, supervision_time_bucket.state_code,
                 period_end_year, period_end_month,
                 MetricMethodologyType.PERSON, period_length
@@ -663,25 +631,19 @@ def combination_supervision_metric_period_metrics(
             if metric_type == SupervisionMetricType.SUPERVISION_TERMINATION:
                 # Get all other supervision time buckets for this period that should contribute to an termination
                 # metric
-                relevant_buckets_in_period = [
-                    bucket for bucket in buckets_in_period
-                    if (isinstance(bucket, SupervisionTerminationBucket))
-                ]
+                relevant_buckets_in_period = bucket_index.buckets_in_metric_period(
+                    SupervisionTerminationBucket, period_length)
             elif metric_type in (SupervisionMetricType.SUPERVISION_REVOCATION,
                                  SupervisionMetricType.SUPERVISION_REVOCATION_ANALYSIS,
                                  SupervisionMetricType.SUPERVISION_REVOCATION_VIOLATION_TYPE_ANALYSIS):
                 # Get all other revocation return time buckets for this period
-                relevant_buckets_in_period = [
-                    bucket for bucket in buckets_in_period
-                    if isinstance(bucket, RevocationReturnSupervisionTimeBucket)
-                ]
+                relevant_buckets_in_period = bucket_index.buckets_in_metric_period(
+                    RevocationReturnSupervisionTimeBucket, period_length)
             elif metric_type in (SupervisionMetricType.SUPERVISION_SUCCESS,
                                  SupervisionMetricType.SUPERVISION_SUCCESSFUL_SENTENCE_DAYS_SERVED):
                 # Get all other projected completion buckets in this period
-                relevant_buckets_in_period = [
-                    bucket for bucket in buckets_in_period
-                    if (isinstance(bucket, ProjectedSupervisionCompletionBucket))
-                ]
+                relevant_buckets_in_period = bucket_index.buckets_in_metric_period(
+                    ProjectedSupervisionCompletionBucket, period_length)
 
             if relevant_buckets_in_period and include_supervision_in_count(
                     combo,
@@ -845,27 +807,25 @@ def _person_combo_value(combo: Dict[str, Any],
     return person_combo_value
 
 
-def _classify_buckets_by_relevant_metric_periods(
+def _expand_supervision_time_bucket_runs(
         supervision_time_buckets: List[SupervisionTimeBucket],
-        metric_period_end_date: date
-) -> Dict[int, List[SupervisionTimeBucket]]:
-    """Returns a dictionary mapping metric period month values to the corresponding relevant SupervisionTimeBuckets."""
-    periods_and_buckets: Dict[int, List[SupervisionTimeBucket]] = defaultdict(list)
+        calculation_month_lower_bound: Optional[date],
+        calculation_month_upper_bound: date
+) -> List[SupervisionTimeBucket]:
+    """Replaces each NonRevocationReturnSupervisionTimeBucketRun with one NonRevocationReturnSupervisionTimeBucket for
+    each day in the run that falls within the months included in the calculations. Days outside of these months can only
+    contribute to the daily SUPERVISION_POPULATION metrics, which are limited to the calculation months, so they are
+    never expanded."""
+    expanded_buckets: List[SupervisionTimeBucket] = []
 
-    # Organize the month buckets by the relevant metric periods
     for supervision_time_bucket in supervision_time_buckets:
-        bucket_start_date = date(supervision_time_bucket.year, supervision_time_bucket.month, 1)
-
-        relevant_periods = relevant_metric_periods(
-            bucket_start_date,
-            metric_period_end_date.year,
-            metric_period_end_date.month)
-
-        if relevant_periods:
-            for period in relevant_periods:
-                periods_and_buckets[period].append(supervision_time_bucket)
+        if isinstance(supervision_time_bucket, NonRevocationReturnSupervisionTimeBucketRun):
+            expanded_buckets.extend(supervision_time_bucket.expand(calculation_month_lower_bound,
+                                                                   calculation_month_upper_bound))
+        else:
+            expanded_buckets.append(supervision_time_bucket)
 
-    return periods_and_buckets
+    return expanded_buckets
 
 
 def _include_revocation_dimensions_for_metric(metric_type: SupervisionMetricType) -> bool:
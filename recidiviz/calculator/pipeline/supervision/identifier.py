@@ -16,6 +16,7 @@
 # =============================================================================
 """Identifies time buckets of supervision and classifies them as either instances of revocation or not. Also classifies
 supervision sentences as successfully completed or not."""
+import itertools
 import logging
 from collections import defaultdict
 from datetime import date
@@ -28,12 +29,13 @@ from recidiviz.calculator.pipeline.supervision.metrics import SupervisionMetricT
 from recidiviz.calculator.pipeline.supervision.supervision_case_compliance import SupervisionCaseCompliance
 from recidiviz.calculator.pipeline.supervision.supervision_time_bucket import \
     SupervisionTimeBucket, RevocationReturnSupervisionTimeBucket, \
-    NonRevocationReturnSupervisionTimeBucket, \
+    NonRevocationReturnSupervisionTimeBucket, NonRevocationReturnSupervisionTimeBucketRun, \
     ProjectedSupervisionCompletionBucket, SupervisionTerminationBucket
 from recidiviz.calculator.pipeline.utils.execution_utils import list_of_dicts_to_dict_with_keys
 from recidiviz.calculator.pipeline.utils.state_utils.us_id.us_id_revocation_identification import \
     us_id_revoked_supervision_period_if_revocation_occurred
 from recidiviz.calculator.pipeline.utils.state_utils.us_mo import us_mo_violation_utils
+from recidiviz.calculator.pipeline.utils.state_utils.us_mo.us_mo_sentence_classification import UsMoSentenceMixin
 from recidiviz.calculator.pipeline.utils.calculator_utils import \
     last_day_of_month, identify_most_severe_violation_type_and_subtype, \
     identify_most_severe_response_decision, first_day_of_next_month, VIOLATION_TYPE_SEVERITY_ORDER
@@ -113,6 +115,7 @@ def find_supervision_time_buckets(
         ssvr_agent_associations: Dict[int, Dict[Any, Any]],
         supervision_period_to_agent_associations: Dict[int, Dict[Any, Any]],
         supervision_period_judicial_district_association: List[Dict[str, Any]],
+        compress_population_buckets: bool = False
 ) -> List[SupervisionTimeBucket]:
     """Finds buckets of time that a person was on supervision and determines if they resulted in revocation return.
 
@@ -146,6 +149,9 @@ def find_supervision_time_buckets(
             about the corresponding StateAgent
         - supervision_period_judicial_district_association: a list of dictionaries with information connecting
             StateSupervisionPeriod ids to the judicial district responsible for the period of supervision
+        - compress_population_buckets: If True, consecutive days on supervision with identical attributes are
+            represented by a single NonRevocationReturnSupervisionTimeBucketRun instead of one
+            NonRevocationReturnSupervisionTimeBucket per day. The runs are expanded by the calculator.
 
     Returns:
         A list of SupervisionTimeBuckets for the person.
@@ -210,7 +216,8 @@ def find_supervision_time_buckets(
                 violation_responses,
                 supervision_contacts,
                 supervision_period_to_agent_associations,
-                judicial_district_code
+                judicial_district_code,
+                compress_population_buckets
             )
 
             supervision_termination_bucket = find_supervision_termination_bucket(
@@ -240,6 +247,9 @@ def find_supervision_time_buckets(
         incarceration_period_index)
 
     if supervision_types_distinct_for_state(state_code):
+        if compress_population_buckets:
+            # Runs must line up with every other population bucket for the day-level DUAL conversion
+            supervision_time_buckets = _split_runs_at_population_bucket_boundaries(supervision_time_buckets)
         supervision_time_buckets = _convert_buckets_to_dual(supervision_time_buckets)
     else:
         supervision_time_buckets = _expand_dual_supervision_buckets(supervision_time_buckets)
@@ -257,7 +267,8 @@ def find_time_buckets_for_supervision_period(
         violation_responses: List[StateSupervisionViolationResponse],
         supervision_contacts: List[StateSupervisionContact],
         supervision_period_to_agent_associations: Dict[int, Dict[Any, Any]],
-        judicial_district_code: Optional[str] = None
+        judicial_district_code: Optional[str] = None,
+        compress_population_buckets: bool = False
 ) -> List[SupervisionTimeBucket]:
     """Finds days that this person was on supervision for the given StateSupervisionPeriod, where the person was not
     incarcerated and did not have a revocation admission that day.
@@ -273,6 +284,8 @@ def find_time_buckets_for_supervision_period(
         - supervision_period_to_agent_associations: dictionary associating StateSupervisionPeriod ids to information
             about the corresponding StateAgent on the period
         - judicial_district_code: The judicial district responsible for the period of supervision
+        - compress_population_buckets: If True, consecutive days with identical attributes are represented by a single
+            NonRevocationReturnSupervisionTimeBucketRun instead of one bucket per day
     Returns
         - A set of unique SupervisionTimeBuckets for the person for the given StateSupervisionPeriod.
     """
@@ -284,11 +297,26 @@ def find_time_buckets_for_supervision_period(
     if start_date is None:
         return supervision_day_buckets
 
-    bucket_date = start_date
-
     end_date = termination_date if termination_date else date.today() + relativedelta(days=1)
 
-    while bucket_date < end_date:
+    if compress_population_buckets:
+        segment_start_dates = _supervision_day_change_points(start_date,
+                                                             end_date,
+                                                             supervision_sentences,
+                                                             incarceration_sentences,
+                                                             incarceration_period_index,
+                                                             assessments,
+                                                             violation_responses)
+    else:
+        segment_start_dates = []
+        bucket_date = start_date
+        while bucket_date < end_date:
+            segment_start_dates.append(bucket_date)
+            bucket_date = bucket_date + relativedelta(days=1)
+
+    for index, bucket_date in enumerate(segment_start_dates):
+        segment_end_date = segment_start_dates[index + 1] if index + 1 < len(segment_start_dates) else end_date
+
         if on_supervision_on_date(
                 bucket_date,
                 supervision_sentences,
@@ -341,35 +369,92 @@ def find_time_buckets_for_supervision_period(
                                                               assessments,
                                                               supervision_contacts)
 
-            supervision_day_buckets.append(
-                NonRevocationReturnSupervisionTimeBucket(
-                    state_code=supervision_period.state_code,
-                    year=bucket_date.year,
-                    month=bucket_date.month,
-                    bucket_date=bucket_date,
-                    supervision_type=supervision_type,
-                    case_type=case_type,
-                    assessment_score=assessment_score,
-                    assessment_level=assessment_level,
-                    assessment_type=assessment_type,
-                    most_severe_violation_type=violation_history.most_severe_violation_type,
-                    most_severe_violation_type_subtype=violation_history.most_severe_violation_type_subtype,
-                    response_count=violation_history.response_count,
-                    supervising_officer_external_id=supervising_officer_external_id,
-                    supervising_district_external_id=supervising_district_external_id,
-                    supervision_level=supervision_period.supervision_level,
-                    supervision_level_raw_text=supervision_period.supervision_level_raw_text,
-                    is_on_supervision_last_day_of_month=is_on_supervision_last_day_of_month,
-                    case_compliance=case_compliance,
-                    judicial_district_code=judicial_district_code
-                )
+            bucket_attributes = dict(
+                state_code=supervision_period.state_code,
+                year=bucket_date.year,
+                month=bucket_date.month,
+                bucket_date=bucket_date,
+                supervision_type=supervision_type,
+                case_type=case_type,
+                assessment_score=assessment_score,
+                assessment_level=assessment_level,
+                assessment_type=assessment_type,
+                most_severe_violation_type=violation_history.most_severe_violation_type,
+                most_severe_violation_type_subtype=violation_history.most_severe_violation_type_subtype,
+                response_count=violation_history.response_count,
+                supervising_officer_external_id=supervising_officer_external_id,
+                supervising_district_external_id=supervising_district_external_id,
+                supervision_level=supervision_period.supervision_level,
+                supervision_level_raw_text=supervision_period.supervision_level_raw_text,
+                is_on_supervision_last_day_of_month=is_on_supervision_last_day_of_month,
+                case_compliance=case_compliance,
+                judicial_district_code=judicial_district_code
             )
 
-        bucket_date = bucket_date + relativedelta(days=1)
+            if segment_end_date > bucket_date + relativedelta(days=1):
+                supervision_day_buckets.append(
+                    NonRevocationReturnSupervisionTimeBucketRun(
+                        **bucket_attributes,
+                        run_end_date_exclusive=segment_end_date
+                    )
+                )
+            else:
+                supervision_day_buckets.append(NonRevocationReturnSupervisionTimeBucket(**bucket_attributes))
 
     return supervision_day_buckets
 
 
+def _supervision_day_change_points(
+        start_date: date,
+        end_date: date,
+        supervision_sentences: List[StateSupervisionSentence],
+        incarceration_sentences: List[StateIncarcerationSentence],
+        incarceration_period_index: IncarcerationPeriodIndex,
+        assessments: List[StateAssessment],
+        violation_responses: List[StateSupervisionViolationResponse]) -> List[date]:
+    """Returns the sorted list of dates between the |start_date| (inclusive) and the |end_date| (exclusive) on which the
+    attributes of a daily NonRevocationReturnSupervisionTimeBucket may differ from the attributes on the preceding day.
+
+    Every day between two consecutive change points will produce a bucket with identical attributes (aside from the
+    bucket_date) to the bucket produced on the first of those days. The change points are the first and last day of
+    every month (the supervision type, case compliance and is_on_supervision_last_day_of_month can only change there),
+    incarceration admission and release dates (and the day after each admission, since a revocation admission only
+    excludes that day), assessment dates, violation response dates and, for US_MO sentences, the boundaries of the
+    supervision type spans on the sentences.
+    """
+    change_points: Set[date] = {start_date}
+
+    month_start_date = date(start_date.year, start_date.month, 1)
+    while month_start_date < end_date:
+        change_points.add(month_start_date)
+        change_points.add(last_day_of_month(month_start_date))
+        month_start_date = first_day_of_next_month(month_start_date)
+
+    for incarceration_period in incarceration_period_index.incarceration_periods:
+        if incarceration_period.admission_date:
+            change_points.add(incarceration_period.admission_date)
+            change_points.add(incarceration_period.admission_date + relativedelta(days=1))
+        if incarceration_period.release_date:
+            change_points.add(incarceration_period.release_date)
+
+    for assessment in assessments:
+        if assessment.assessment_date:
+            change_points.add(assessment.assessment_date)
+
+    for response in violation_responses:
+        if response.response_date:
+            change_points.add(response.response_date)
+
+    for sentence in itertools.chain(supervision_sentences, incarceration_sentences):
+        if isinstance(sentence, UsMoSentenceMixin):
+            for span in sentence.supervision_type_spans:
+                change_points.add(span.start_date)
+                if span.end_date:
+                    change_points.add(span.end_date)
+
+    return sorted(change_point for change_point in change_points if start_date <= change_point < end_date)
+
+
 def has_revocation_admission_on_date(
         date_in_month: date,
         incarceration_period_index: IncarcerationPeriodIndex) -> bool:
@@ -1219,6 +1304,48 @@ def _expand_dual_supervision_buckets(supervision_time_buckets: List[SupervisionT
     return supervision_time_buckets
 
 
+def _split_runs_at_population_bucket_boundaries(supervision_time_buckets: List[SupervisionTimeBucket]) -> \
+        List[SupervisionTimeBucket]:
+    """Splits every NonRevocationReturnSupervisionTimeBucketRun at the start and end dates of all other
+    NonRevocationReturnSupervisionTimeBuckets and RevocationReturnSupervisionTimeBuckets, so that any two of these
+    buckets that share a bucket_date also cover exactly the same days. Runs that are split into a single day are
+    replaced by a NonRevocationReturnSupervisionTimeBucket for that day."""
+    boundaries: Set[date] = set()
+
+    for bucket in supervision_time_buckets:
+        if isinstance(bucket, NonRevocationReturnSupervisionTimeBucketRun):
+            boundaries.add(bucket.bucket_date)
+            boundaries.add(bucket.run_end_date_exclusive)
+        elif isinstance(bucket, (RevocationReturnSupervisionTimeBucket, NonRevocationReturnSupervisionTimeBucket)):
+            boundaries.add(bucket.bucket_date)
+            boundaries.add(bucket.bucket_date + relativedelta(days=1))
+
+    sorted_boundaries = sorted(boundaries)
+
+    split_buckets: List[SupervisionTimeBucket] = []
+
+    for bucket in supervision_time_buckets:
+        if not isinstance(bucket, NonRevocationReturnSupervisionTimeBucketRun):
+            split_buckets.append(bucket)
+            continue
+
+        piece_end_dates = [boundary for boundary in sorted_boundaries
+                           if bucket.bucket_date < boundary < bucket.run_end_date_exclusive]
+        piece_end_dates.append(bucket.run_end_date_exclusive)
+
+        piece_start_date = bucket.bucket_date
+        for piece_end_date in piece_end_dates:
+            if piece_end_date == piece_start_date + relativedelta(days=1):
+                split_buckets.extend(bucket.expand(piece_start_date, piece_start_date))
+            else:
+                split_buckets.append(attr.evolve(bucket,
+                                                 bucket_date=piece_start_date,
+                                                 run_end_date_exclusive=piece_end_date))
+            piece_start_date = piece_end_date
+
+    return split_buckets
+
+
 # Each SupervisionMetricType with a list of the SupervisionTimeBuckets that contribute to that metric
 BUCKET_TYPES_FOR_METRIC: Dict[SupervisionMetricType, List[Type[SupervisionTimeBucket]]] = {
     SupervisionMetricType.SUPERVISION_TERMINATION: [SupervisionTerminationBucket],
@@ -20,14 +20,15 @@ run.
 import argparse
 import datetime
 import logging
-from typing import Dict, Any, List, Tuple, Set, Optional
+from typing import Dict, Any, List, Tuple, Set, Optional, Type
 
 import apache_beam as beam
 from apache_beam.options.pipeline_options import SetupOptions, PipelineOptions
-from apache_beam.pvalue import AsDict
+from apache_beam.pvalue import AsDict, PCollection
 from apache_beam.typehints import with_input_types, with_output_types
 
-from recidiviz.calculator.calculation_data_storage_config import DATAFLOW_METRICS_TO_TABLES
+from recidiviz.calculator.calculation_data_storage_config import DATAFLOW_METRICS_TO_TABLES, \
+    AGGREGATED_DATAFLOW_METRICS_TO_TABLES
 from recidiviz.calculator.pipeline.supervision import identifier, calculator
 from recidiviz.calculator.pipeline.supervision.metrics import \
     SupervisionMetric, SupervisionPopulationMetric, \
@@ -43,8 +44,9 @@ from recidiviz.calculator.pipeline.utils.entity_hydration_utils import \
     SetViolationResponseOnIncarcerationPeriod, SetViolationOnViolationsResponse, ConvertSentencesToStateSpecificType
 from recidiviz.calculator.pipeline.utils.execution_utils import get_job_id, person_and_kwargs_for_identifier, \
     select_all_by_person_query
-from recidiviz.calculator.pipeline.utils.extractor_utils import BuildRootEntity
-from recidiviz.calculator.pipeline.utils.metric_utils import RecidivizMetricWritableDict
+from recidiviz.calculator.pipeline.utils.metric_utils import RecidivizMetricWritableDict, MetricCombination, \
+    AggregateEventBasedMetrics, aggregated_metric_output_tag
+from recidiviz.calculator.pipeline.utils.person_snapshot_utils import load_root_entities
 from recidiviz.calculator.pipeline.utils.pipeline_args_utils import add_shared_pipeline_arguments
 from recidiviz.calculator.query.state.views.reference.ssvr_to_agent_association import \
     SSVR_TO_AGENT_ASSOCIATION_VIEW_NAME
@@ -81,11 +83,13 @@ class GetSupervisionMetrics(beam.PTransform):
     def __init__(self, pipeline_options: Dict[str, str],
                  metric_types: Set[str],
                  calculation_month_count: int,
-                 calculation_end_month: Optional[str] = None):
+                 calculation_end_month: Optional[str] = None,
+                 aggregate_event_based_metrics: bool = False):
         super(GetSupervisionMetrics, self).__init__()
         self._pipeline_options = pipeline_options
         self._calculation_end_month = calculation_end_month
         self._calculation_month_count = calculation_month_count
+        self._aggregate_event_based_metrics = aggregate_event_based_metrics
 
         month_count_string = str(calculation_month_count) if calculation_month_count != -1 else 'all'
         end_month_string = calculation_end_month if calculation_end_month else 'the current month'
@@ -112,19 +116,27 @@ class GetSupervisionMetrics(beam.PTransform):
                                'Produce SupervisionMetrics' >>
                                beam.ParDo(ProduceSupervisionMetrics(), **self._pipeline_options))
 
+        if self._aggregate_event_based_metrics:
+            # Sum the event-based counts across people, leaving the person-based SupervisionMetrics as they are
+            supervision_metrics = (supervision_metrics |
+                                   'Aggregate event-based SupervisionMetrics' >>
+                                   AggregateEventBasedMetrics(AGGREGATED_METRIC_CLASSES.values()))
+
         # Return SupervisionMetrics objects
         return supervision_metrics
 
 
 @with_input_types(beam.typehints.Tuple[int, Dict[str, Any]],
                   beam.typehints.Optional[Dict[Any, Tuple[Any, Dict[str, Any]]]],
-                  beam.typehints.Optional[Dict[Any, Tuple[Any, Dict[str, Any]]]])
+                  beam.typehints.Optional[Dict[Any, Tuple[Any, Dict[str, Any]]]],
+                  beam.typehints.Optional[bool])
 @with_output_types(beam.typehints.Tuple[entities.StatePerson, List[SupervisionTimeBucket]])
 class ClassifySupervisionTimeBuckets(beam.DoFn):
     """Classifies time on supervision according to multiple types of measurement."""
 
     #pylint: disable=arguments-differ
-    def process(self, element, ssvr_agent_associations, supervision_period_to_agent_associations):
+    def process(self, element, ssvr_agent_associations, supervision_period_to_agent_associations,
+                compress_population_buckets=False):
         """Identifies various events related to supervision relevant to calculations."""
         _, person_entities = element
 
@@ -133,6 +145,7 @@ class ClassifySupervisionTimeBuckets(beam.DoFn):
         # Add these arguments to the keyword args for the identifier
         kwargs['ssvr_agent_associations'] = ssvr_agent_associations
         kwargs['supervision_period_to_agent_associations'] = supervision_period_to_agent_associations
+        kwargs['compress_population_buckets'] = compress_population_buckets
 
         # Find the SupervisionTimeBuckets from the supervision and incarceration
         # periods
@@ -152,7 +165,7 @@ class ClassifySupervisionTimeBuckets(beam.DoFn):
                   beam.typehints.Optional[str],
                   beam.typehints.Optional[int],
                   beam.typehints.Dict[SupervisionMetricType, bool])
-@with_output_types(beam.typehints.Tuple[Dict[str, Any], Any])
+@with_output_types(beam.typehints.Tuple[MetricCombination, Any])
 class CalculateSupervisionMetricCombinations(beam.DoFn):
     """Calculates supervision metric combinations."""
 
@@ -189,7 +202,7 @@ class CalculateSupervisionMetricCombinations(beam.DoFn):
         pass  # Passing unused abstract method.
 
 
-@with_input_types(beam.typehints.Tuple[Dict[str, Any], Any],
+@with_input_types(beam.typehints.Tuple[beam.typehints.Union[MetricCombination, Dict[str, Any]], Any],
                   **{'runner': str,
                      'project': str,
                      'job_name': str,
@@ -203,64 +216,43 @@ class ProduceSupervisionMetrics(beam.DoFn):
 
         pipeline_job_id = job_id(pipeline_options)
 
-        (dict_metric_key, value) = element
+        (metric_combination, value) = element
 
         if value is None:
             # Due to how the pipeline arrives at this function, this should be impossible.
             raise ValueError("No value associated with this metric key.")
 
-        if not dict_metric_key:
+        if not metric_combination:
             # Due to how the pipeline arrives at this function, this should be impossible.
-            raise ValueError("Empty dict_metric_key.")
+            raise ValueError("Empty metric_combination.")
 
-        metric_type = dict_metric_key.pop('metric_type')
+        # The combination shares its characteristics with other combinations, so it is read but never updated
+        metric_type = metric_combination['metric_type']
 
         if metric_type == SupervisionMetricType.SUPERVISION_TERMINATION:
-            dict_metric_key['count'] = 1
-
-            supervision_metric = SupervisionTerminationMetric.build_from_metric_key_group(
-                dict_metric_key, pipeline_job_id
-            )
+            supervision_metric = SupervisionTerminationMetric.build_from_metric_combination(
+                metric_combination, pipeline_job_id, count=1)
         elif metric_type == SupervisionMetricType.SUPERVISION_POPULATION:
-            dict_metric_key['count'] = 1
-
-            supervision_metric = SupervisionPopulationMetric.build_from_metric_key_group(
-                dict_metric_key, pipeline_job_id)
+            supervision_metric = SupervisionPopulationMetric.build_from_metric_combination(
+                metric_combination, pipeline_job_id, count=1)
         elif metric_type == SupervisionMetricType.SUPERVISION_REVOCATION:
-            dict_metric_key['count'] = 1
-
-            supervision_metric = SupervisionRevocationMetric.build_from_metric_key_group(
-                dict_metric_key, pipeline_job_id)
+            supervision_metric = SupervisionRevocationMetric.build_from_metric_combination(
+                metric_combination, pipeline_job_id, count=1)
         elif metric_type == SupervisionMetricType.SUPERVISION_REVOCATION_ANALYSIS:
-            dict_metric_key['count'] = 1
-
-            supervision_metric = SupervisionRevocationAnalysisMetric.build_from_metric_key_group(
-                dict_metric_key, pipeline_job_id
-            )
+            supervision_metric = SupervisionRevocationAnalysisMetric.build_from_metric_combination(
+                metric_combination, pipeline_job_id, count=1)
         elif metric_type == SupervisionMetricType.SUPERVISION_REVOCATION_VIOLATION_TYPE_ANALYSIS:
-            dict_metric_key['count'] = value
-
-            supervision_metric = SupervisionRevocationViolationTypeAnalysisMetric.build_from_metric_key_group(
-                dict_metric_key, pipeline_job_id
-            )
+            supervision_metric = SupervisionRevocationViolationTypeAnalysisMetric.build_from_metric_combination(
+                metric_combination, pipeline_job_id, count=value)
         elif metric_type == SupervisionMetricType.SUPERVISION_SUCCESS:
-            dict_metric_key['successful_completion_count'] = value
-            dict_metric_key['projected_completion_count'] = 1
-
-            supervision_metric = SupervisionSuccessMetric.build_from_metric_key_group(
-                dict_metric_key, pipeline_job_id)
+            supervision_metric = SupervisionSuccessMetric.build_from_metric_combination(
+                metric_combination, pipeline_job_id, successful_completion_count=value, projected_completion_count=1)
         elif metric_type == SupervisionMetricType.SUPERVISION_SUCCESSFUL_SENTENCE_DAYS_SERVED:
-            dict_metric_key['successful_completion_count'] = 1
-            dict_metric_key['average_days_served'] = value
-
-            supervision_metric = SuccessfulSupervisionSentenceDaysServedMetric.build_from_metric_key_group(
-                dict_metric_key, pipeline_job_id
-            )
+            supervision_metric = SuccessfulSupervisionSentenceDaysServedMetric.build_from_metric_combination(
+                metric_combination, pipeline_job_id, successful_completion_count=1, average_days_served=value)
         elif metric_type == SupervisionMetricType.SUPERVISION_COMPLIANCE:
-            dict_metric_key['count'] = 1
-
-            supervision_metric = SupervisionCaseComplianceMetric.build_from_metric_key_group(
-                dict_metric_key, pipeline_job_id)
+            supervision_metric = SupervisionCaseComplianceMetric.build_from_metric_combination(
+                metric_combination, pipeline_job_id, count=1)
         else:
             logging.error("Unexpected metric of type: %s", metric_type)
             return
@@ -272,6 +264,35 @@ class ProduceSupervisionMetrics(beam.DoFn):
         pass  # Passing unused abstract method.
 
 
+# The root entity collections this pipeline calculates metrics from, by the name of the collection, along with
+# whether the related entities of each root entity are hydrated.
+ROOT_ENTITIES: Dict[str, Tuple[Type[entities.Entity], bool]] = {
+    'persons': (entities.StatePerson, True),
+    'incarceration_periods': (entities.StateIncarcerationPeriod, True),
+    'supervision_violations': (entities.StateSupervisionViolation, True),
+    # TODO(2769): Don't bring this in as a root entity
+    'supervision_violation_responses': (entities.StateSupervisionViolationResponse, True),
+    'supervision_sentences': (entities.StateSupervisionSentence, True),
+    'incarceration_sentences': (entities.StateIncarcerationSentence, True),
+    'supervision_periods': (entities.StateSupervisionPeriod, True),
+    'assessments': (entities.StateAssessment, False),
+    'supervision_contacts': (entities.StateSupervisionContact, False),
+}
+
+# The SupervisionMetrics, by metric type, whose event-based metrics are summed across people and written to the
+# companion tables in AGGREGATED_DATAFLOW_METRICS_TO_TABLES when the pipeline is run with --aggregate_event_based_metrics.
+AGGREGATED_METRIC_CLASSES: Dict[SupervisionMetricType, Type[SupervisionMetric]] = {
+    SupervisionMetricType.SUPERVISION_COMPLIANCE: SupervisionCaseComplianceMetric,
+    SupervisionMetricType.SUPERVISION_POPULATION: SupervisionPopulationMetric,
+    SupervisionMetricType.SUPERVISION_REVOCATION: SupervisionRevocationMetric,
+    SupervisionMetricType.SUPERVISION_REVOCATION_ANALYSIS: SupervisionRevocationAnalysisMetric,
+    SupervisionMetricType.SUPERVISION_REVOCATION_VIOLATION_TYPE_ANALYSIS:
+        SupervisionRevocationViolationTypeAnalysisMetric,
+    SupervisionMetricType.SUPERVISION_SUCCESS: SupervisionSuccessMetric,
+    SupervisionMetricType.SUPERVISION_TERMINATION: SupervisionTerminationMetric,
+}
+
+
 def get_arg_parser() -> argparse.ArgumentParser:
     """Returns the parser for the command-line arguments for this pipeline."""
     parser = argparse.ArgumentParser()
@@ -293,9 +314,342 @@ def get_arg_parser() -> argparse.ArgumentParser:
                         help='A list of the types of metric to calculate.',
                         default={'ALL'})
 
+    parser.add_argument('--compress_population_buckets',
+                        dest='compress_population_buckets',
+                        action='store_true',
+                        help='When set, consecutive days on supervision with identical attributes are classified as a '
+                             'single run of days, which is only expanded into daily buckets for the calculation '
+                             'months.',
+                        default=False)
+
+    parser.add_argument('--aggregate_event_based_metrics',
+                        dest='aggregate_event_based_metrics',
+                        action='store_true',
+                        help='When set, event-based metrics that can be aggregated and are not tied to a person are '
+                             'summed across people and written to the aggregated metrics tables. Person-level and '
+                             'person-based metrics are written as usual.',
+                        default=False)
+
     return parser
 
 
+def build_calculations(p: beam.Pipeline,
+                       root_entities: Dict[str, PCollection],
+                       apache_beam_pipeline_options: PipelineOptions,
+                       reference_dataset: str,
+                       output: str,
+                       calculation_month_count: int,
+                       metric_types: List[str],
+                       state_code: Optional[str],
+                       calculation_end_month: Optional[str],
+                       person_id_filter_set: Optional[Set[int]],
+                       compress_population_buckets: bool = False,
+                       aggregate_event_based_metrics: bool = False):
+    """Adds the supervision calculations on the given |root_entities| to the pipeline |p|, writing the metrics to
+    the |output| dataset. The |root_entities| must include each collection in ROOT_ENTITIES."""
+    persons = root_entities['persons']
+    incarceration_periods = root_entities['incarceration_periods']
+    supervision_violations = root_entities['supervision_violations']
+    supervision_violation_responses = root_entities['supervision_violation_responses']
+    supervision_sentences = root_entities['supervision_sentences']
+    incarceration_sentences = root_entities['incarceration_sentences']
+    supervision_periods = root_entities['supervision_periods']
+    assessments = root_entities['assessments']
+    supervision_contacts = root_entities['supervision_contacts']
+
+    # Bring in the table that associates StateSupervisionViolationResponses to information about StateAgents
+    ssvr_to_agent_association_query = select_all_by_person_query(
+        reference_dataset, SSVR_TO_AGENT_ASSOCIATION_VIEW_NAME, state_code, person_id_filter_set)
+
+    ssvr_to_agent_associations = (p | "Read SSVR to Agent table from BigQuery" >>
+                                  beam.io.Read(beam.io.BigQuerySource
+                                               (query=ssvr_to_agent_association_query,
+                                                use_standard_sql=True)))
+
+    # Convert the association table rows into key-value tuples with the value for the
+    # supervision_violation_response_id column as the key
+    ssvr_agent_associations_as_kv = (ssvr_to_agent_associations | 'Convert SSVR to Agent table to KV tuples' >>
+                                     beam.ParDo(ConvertDictToKVTuple(),
+                                                'supervision_violation_response_id')
+                                     )
+
+    supervision_period_to_agent_association_query = select_all_by_person_query(
+        reference_dataset, SUPERVISION_PERIOD_TO_AGENT_ASSOCIATION_VIEW_NAME, state_code, person_id_filter_set)
+
+    supervision_period_to_agent_associations = (p | "Read Supervision Period to Agent table from BigQuery" >>
+                                                beam.io.Read(beam.io.BigQuerySource
+                                                             (query=supervision_period_to_agent_association_query,
+                                                              use_standard_sql=True)))
+
+    # Convert the association table rows into key-value tuples with the value for the supervision_period_id column
+    # as the key
+    supervision_period_to_agent_associations_as_kv = (supervision_period_to_agent_associations |
+                                                      'Convert Supervision Period to Agent table to KV tuples' >>
+                                                      beam.ParDo(ConvertDictToKVTuple(),
+                                                                 'supervision_period_id')
+                                                      )
+
+    if state_code is None or state_code == 'US_MO':
+        # Bring in the reference table that includes sentence status ranking information
+        us_mo_sentence_status_query = select_all_by_person_query(
+            reference_dataset, US_MO_SENTENCE_STATUSES_VIEW_NAME, state_code, person_id_filter_set)
+
+        us_mo_sentence_statuses = (p | "Read MO sentence status table from BigQuery" >>
+                                   beam.io.Read(beam.io.BigQuerySource(query=us_mo_sentence_status_query,
+                                                                       use_standard_sql=True)))
+    else:
+        us_mo_sentence_statuses = (p | f"Generate empty MO statuses list for non-MO state run: {state_code} " >>
+                                   beam.Create([]))
+
+    us_mo_sentence_status_rankings_as_kv = (
+        us_mo_sentence_statuses |
+        'Convert MO sentence status ranking table to KV tuples' >>
+        beam.ParDo(ConvertDictToKVTuple(), 'person_id')
+    )
+
+    sentences_and_statuses = (
+        {'incarceration_sentences': incarceration_sentences,
+         'supervision_sentences': supervision_sentences,
+         'sentence_statuses': us_mo_sentence_status_rankings_as_kv}
+        | 'Group sentences to the sentence statuses for that person' >>
+        beam.CoGroupByKey()
+    )
+
+    sentences_converted = (
+        sentences_and_statuses
+        | 'Convert to state-specific sentences' >>
+        beam.ParDo(ConvertSentencesToStateSpecificType()).with_outputs('incarceration_sentences',
+                                                                       'supervision_sentences')
+    )
+
+    # Bring in the judicial districts associated with supervision_periods
+    sp_to_judicial_district_query = select_all_by_person_query(
+        reference_dataset,
+        SUPERVISION_PERIOD_JUDICIAL_DISTRICT_ASSOCIATION_VIEW_NAME,
+        state_code,
+        person_id_filter_set)
+
+    sp_to_judicial_district_kv = (
+        p | "Read supervision_period to judicial_district associations from BigQuery" >>
+        beam.io.Read(beam.io.BigQuerySource(
+            query=sp_to_judicial_district_query,
+            use_standard_sql=True))
+        | "Convert supervision_period to judicial_district association table to KV" >>
+        beam.ParDo(ConvertDictToKVTuple(), 'person_id')
+    )
+
+    # Group StateSupervisionViolationResponses and StateSupervisionViolations by person_id
+    supervision_violations_and_responses = (
+        {'violations': supervision_violations,
+         'violation_responses': supervision_violation_responses
+         } | 'Group StateSupervisionViolationResponses to '
+             'StateSupervisionViolations' >>
+        beam.CoGroupByKey()
+    )
+
+    # Set the fully hydrated StateSupervisionViolation entities on the corresponding
+    # StateSupervisionViolationResponses
+    violation_responses_with_hydrated_violations = (
+        supervision_violations_and_responses
+        | 'Set hydrated StateSupervisionViolations on '
+        'the StateSupervisionViolationResponses' >>
+        beam.ParDo(SetViolationOnViolationsResponse()))
+
+    # Group StateIncarcerationPeriods and StateSupervisionViolationResponses by person_id
+    incarceration_periods_and_violation_responses = (
+        {'incarceration_periods': incarceration_periods,
+         'violation_responses':
+             violation_responses_with_hydrated_violations}
+        | 'Group StateIncarcerationPeriods to '
+          'StateSupervisionViolationResponses' >>
+        beam.CoGroupByKey()
+    )
+
+    # Set the fully hydrated StateSupervisionViolationResponse entities on the corresponding
+    # StateIncarcerationPeriods
+    incarceration_periods_with_source_violations = (
+        incarceration_periods_and_violation_responses
+        | 'Set hydrated StateSupervisionViolationResponses on '
+        'the StateIncarcerationPeriods' >>
+        beam.ParDo(SetViolationResponseOnIncarcerationPeriod()))
+
+    # Group each StatePerson with their related entities
+    person_entities = (
+        {'person': persons,
+         'assessments': assessments,
+         'incarceration_periods':
+             incarceration_periods_with_source_violations,
+         'supervision_periods': supervision_periods,
+         'supervision_sentences': sentences_converted.supervision_sentences,
+         'incarceration_sentences': sentences_converted.incarceration_sentences,
+         'violation_responses': violation_responses_with_hydrated_violations,
+         'supervision_contacts': supervision_contacts,
+         'supervision_period_judicial_district_association': sp_to_judicial_district_kv
+         }
+        | 'Group StatePerson to all entities' >>
+        beam.CoGroupByKey()
+    )
+
+    # Identify SupervisionTimeBuckets from the StatePerson's StateSupervisionSentences and StateIncarcerationPeriods
+    person_time_buckets = (
+        person_entities
+        | 'Get SupervisionTimeBuckets' >>
+        beam.ParDo(ClassifySupervisionTimeBuckets(),
+                   AsDict(ssvr_agent_associations_as_kv),
+                   AsDict(supervision_period_to_agent_associations_as_kv),
+                   compress_population_buckets))
+
+    # Get pipeline job details for accessing job_id
+    all_pipeline_options = apache_beam_pipeline_options.get_all_options()
+
+    # Get the type of metric to calculate
+    metric_types_set = set(metric_types)
+
+    # Add timestamp for local jobs
+    job_timestamp = datetime.datetime.now().strftime('%Y-%m-%d_%H_%M_%S.%f')
+    all_pipeline_options['job_timestamp'] = job_timestamp
+
+    # Get supervision metrics
+    supervision_metrics = (person_time_buckets | 'Get Supervision Metrics' >>
+                           GetSupervisionMetrics(
+                               pipeline_options=all_pipeline_options,
+                               metric_types=metric_types_set,
+                               calculation_end_month=calculation_end_month,
+                               calculation_month_count=calculation_month_count,
+                               aggregate_event_based_metrics=aggregate_event_based_metrics))
+    if person_id_filter_set:
+        logging.warning("Non-empty person filter set - returning before writing metrics.")
+        return
+
+    aggregated_metric_types = list(AGGREGATED_METRIC_CLASSES) if aggregate_event_based_metrics else []
+
+    # Convert the metrics into a format that's writable to BQ
+    writable_metrics = (supervision_metrics | 'Convert to dict to be written to BQ' >>
+                        beam.ParDo(
+                            RecidivizMetricWritableDict(),
+                            aggregated_metric_classes={AGGREGATED_METRIC_CLASSES[metric_type]
+                                                       for metric_type in aggregated_metric_types}).with_outputs(
+                                SupervisionMetricType.SUPERVISION_COMPLIANCE.value,
+                                SupervisionMetricType.SUPERVISION_POPULATION.value,
+                                SupervisionMetricType.SUPERVISION_REVOCATION.value,
+                                SupervisionMetricType.SUPERVISION_REVOCATION_ANALYSIS.value,
+                                SupervisionMetricType.SUPERVISION_REVOCATION_VIOLATION_TYPE_ANALYSIS.value,
+                                SupervisionMetricType.SUPERVISION_SUCCESS.value,
+                                SupervisionMetricType.SUPERVISION_SUCCESSFUL_SENTENCE_DAYS_SERVED.value,
+                                SupervisionMetricType.SUPERVISION_TERMINATION.value,
+                                *[aggregated_metric_output_tag(metric_type) for metric_type in aggregated_metric_types]
+                            )
+                        )
+
+    # Write the metrics to the output tables in BigQuery
+    terminations_table_id = DATAFLOW_METRICS_TO_TABLES.get(SupervisionTerminationMetric)
+    compliance_table_id = DATAFLOW_METRICS_TO_TABLES.get(SupervisionCaseComplianceMetric)
+    populations_table_id = DATAFLOW_METRICS_TO_TABLES.get(SupervisionPopulationMetric)
+    revocations_table_id = DATAFLOW_METRICS_TO_TABLES.get(SupervisionRevocationMetric)
+    revocation_analysis_table_id = DATAFLOW_METRICS_TO_TABLES.get(SupervisionRevocationAnalysisMetric)
+    revocation_violation_type_analysis_table_id = \
+        DATAFLOW_METRICS_TO_TABLES.get(SupervisionRevocationViolationTypeAnalysisMetric)
+    successes_table_id = DATAFLOW_METRICS_TO_TABLES.get(SupervisionSuccessMetric)
+    successful_sentence_lengths_table_id = DATAFLOW_METRICS_TO_TABLES.get(
+        SuccessfulSupervisionSentenceDaysServedMetric)
+
+    _ = (writable_metrics.SUPERVISION_POPULATION
+         | f"Write population metrics to BQ table: {populations_table_id}" >>
+         beam.io.WriteToBigQuery(
+             table=populations_table_id,
+             dataset=output,
+             create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+             write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+             method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+         ))
+
+    _ = (writable_metrics.SUPERVISION_REVOCATION
+         | f"Write revocation metrics to BQ table: {revocations_table_id}" >>
+         beam.io.WriteToBigQuery(
+             table=revocations_table_id,
+             dataset=output,
+             create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+             write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+             method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+         ))
+
+    _ = (writable_metrics.SUPERVISION_SUCCESS
+         | f"Write success metrics to BQ table: {successes_table_id}" >>
+         beam.io.WriteToBigQuery(
+             table=successes_table_id,
+             dataset=output,
+             create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+             write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+             method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+         ))
+
+    _ = (writable_metrics.SUPERVISION_SUCCESSFUL_SENTENCE_DAYS_SERVED
+         | f"Write supervision successful sentence length metrics to BQ"
+           f" table: {successful_sentence_lengths_table_id}" >>
+         beam.io.WriteToBigQuery(
+             table=successful_sentence_lengths_table_id,
+             dataset=output,
+             create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+             write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+             method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+         ))
+
+    _ = (writable_metrics.SUPERVISION_TERMINATION
+         | f"Write termination metrics to BQ table: {terminations_table_id}" >>
+         beam.io.WriteToBigQuery(
+             table=terminations_table_id,
+             dataset=output,
+             create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+             write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+             method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+         ))
+
+    _ = (writable_metrics.SUPERVISION_REVOCATION_ANALYSIS
+         | f"Write revocation analyses metrics to BQ table: {revocation_analysis_table_id}" >>
+         beam.io.WriteToBigQuery(
+             table=revocation_analysis_table_id,
+             dataset=output,
+             create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+             write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+             method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+         ))
+
+    _ = (writable_metrics.SUPERVISION_REVOCATION_VIOLATION_TYPE_ANALYSIS
+         | f"Write revocation violation type analyses metrics to BQ table: "
+           f"{revocation_violation_type_analysis_table_id}" >>
+         beam.io.WriteToBigQuery(
+             table=revocation_violation_type_analysis_table_id,
+             dataset=output,
+             create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+             write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+             method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+         ))
+
+    _ = (writable_metrics.SUPERVISION_COMPLIANCE
+         | f"Write compliance metrics to BQ table: {compliance_table_id}" >>
+         beam.io.WriteToBigQuery(
+             table=compliance_table_id,
+             dataset=output,
+             create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+             write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+             method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+         ))
+
+    # Write the event-based metrics that were summed across people to their own tables in BigQuery
+    for metric_type in aggregated_metric_types:
+        aggregated_table_id = AGGREGATED_DATAFLOW_METRICS_TO_TABLES.get(AGGREGATED_METRIC_CLASSES[metric_type])
+
+        _ = (writable_metrics[aggregated_metric_output_tag(metric_type)]
+             | f"Write aggregated {metric_type.value} metrics to BQ table: {aggregated_table_id}" >>
+             beam.io.WriteToBigQuery(
+                 table=aggregated_table_id,
+                 dataset=output,
+                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
+                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
+                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
+             ))
+
+
 def run(apache_beam_pipeline_options: PipelineOptions,
         data_input: str,
         reference_input: str,
@@ -304,7 +658,10 @@ def run(apache_beam_pipeline_options: PipelineOptions,
         metric_types: List[str],
         state_code: Optional[str],
         calculation_end_month: Optional[str],
-        person_filter_ids: Optional[List[int]]):
+        person_filter_ids: Optional[List[int]],
+        compress_population_buckets: bool = False,
+        person_snapshot_input: Optional[str] = None,
+        aggregate_event_based_metrics: bool = False):
     """Runs the supervision calculation pipeline."""
 
     # Workaround to load SQLAlchemy objects at start of pipeline. This is necessary because the BuildRootEntity
@@ -324,361 +681,14 @@ def run(apache_beam_pipeline_options: PipelineOptions,
     person_id_filter_set = set(person_filter_ids) if person_filter_ids else None
 
     with beam.Pipeline(options=apache_beam_pipeline_options) as p:
-        # Get StatePersons
-        persons = (p | 'Load Persons' >> BuildRootEntity(dataset=input_dataset,
-                                                         root_entity_class=entities.StatePerson,
-                                                         unifying_id_field=entities.StatePerson.get_class_id_name(),
-                                                         build_related_entities=True,
-                                                         unifying_id_field_filter_set=person_id_filter_set,
-                                                         state_code=state_code))
-
-        # Get StateIncarcerationPeriods
-        incarceration_periods = (p | 'Load IncarcerationPeriods' >> BuildRootEntity(
-            dataset=input_dataset,
-            root_entity_class=entities.StateIncarcerationPeriod,
-            unifying_id_field=entities.StatePerson.get_class_id_name(),
-            build_related_entities=True,
-            unifying_id_field_filter_set=person_id_filter_set,
-            state_code=state_code
-        ))
-
-        # Get StateSupervisionViolations
-        supervision_violations = (p | 'Load SupervisionViolations' >> BuildRootEntity(
-            dataset=input_dataset,
-            root_entity_class=entities.StateSupervisionViolation,
-            unifying_id_field=entities.StatePerson.get_class_id_name(),
-            build_related_entities=True,
-            unifying_id_field_filter_set=person_id_filter_set,
-            state_code=state_code
-        ))
-
-        # TODO(2769): Don't bring this in as a root entity
-        # Get StateSupervisionViolationResponses
-        supervision_violation_responses = (p | 'Load SupervisionViolationResponses' >> BuildRootEntity(
-            dataset=input_dataset,
-            root_entity_class=entities.StateSupervisionViolationResponse,
-            unifying_id_field=entities.StatePerson.get_class_id_name(),
-            build_related_entities=True,
-            unifying_id_field_filter_set=person_id_filter_set,
-            state_code=state_code
-        ))
-
-        # Get StateSupervisionSentences
-        supervision_sentences = (p | 'Load SupervisionSentences' >> BuildRootEntity(
-            dataset=input_dataset,
-            root_entity_class=entities.StateSupervisionSentence,
-            unifying_id_field=entities.StatePerson.get_class_id_name(),
-            build_related_entities=True,
-            unifying_id_field_filter_set=person_id_filter_set,
-            state_code=state_code
-        ))
-
-        # Get StateIncarcerationSentences
-        incarceration_sentences = (p | 'Load IncarcerationSentences' >> BuildRootEntity(
-            dataset=input_dataset,
-            root_entity_class=entities.StateIncarcerationSentence,
-            unifying_id_field=entities.StatePerson.get_class_id_name(),
-            build_related_entities=True,
-            unifying_id_field_filter_set=person_id_filter_set,
-            state_code=state_code
-        ))
-
-        # Get StateSupervisionPeriods
-        supervision_periods = (p | 'Load SupervisionPeriods' >> BuildRootEntity(
+        root_entities = load_root_entities(
+            p,
             dataset=input_dataset,
-            root_entity_class=entities.StateSupervisionPeriod,
-            unifying_id_field=entities.StatePerson.get_class_id_name(),
-            build_related_entities=True,
+            root_entities=ROOT_ENTITIES,
             unifying_id_field_filter_set=person_id_filter_set,
-            state_code=state_code
-        ))
-
-        # Get StateAssessments
-        assessments = (p | 'Load Assessments' >> BuildRootEntity(
-            dataset=input_dataset,
-            root_entity_class=entities.StateAssessment,
-            unifying_id_field=entities.StatePerson.get_class_id_name(),
-            build_related_entities=False,
-            unifying_id_field_filter_set=person_id_filter_set,
-            state_code=state_code
-        ))
-
-        supervision_contacts = (p | 'Load StateSupervisionContacts' >> BuildRootEntity(
-            dataset=input_dataset,
-            root_entity_class=entities.StateSupervisionContact,
-            unifying_id_field=entities.StatePerson.get_class_id_name(),
-            build_related_entities=False,
-            unifying_id_field_filter_set=person_id_filter_set,
-            state_code=state_code
-        ))
-
-        # Bring in the table that associates StateSupervisionViolationResponses to information about StateAgents
-        ssvr_to_agent_association_query = select_all_by_person_query(
-            reference_dataset, SSVR_TO_AGENT_ASSOCIATION_VIEW_NAME, state_code, person_id_filter_set)
-
-        ssvr_to_agent_associations = (p | "Read SSVR to Agent table from BigQuery" >>
-                                      beam.io.Read(beam.io.BigQuerySource
-                                                   (query=ssvr_to_agent_association_query,
-                                                    use_standard_sql=True)))
-
-        # Convert the association table rows into key-value tuples with the value for the
-        # supervision_violation_response_id column as the key
-        ssvr_agent_associations_as_kv = (ssvr_to_agent_associations | 'Convert SSVR to Agent table to KV tuples' >>
-                                         beam.ParDo(ConvertDictToKVTuple(),
-                                                    'supervision_violation_response_id')
-                                         )
-
-        supervision_period_to_agent_association_query = select_all_by_person_query(
-            reference_dataset, SUPERVISION_PERIOD_TO_AGENT_ASSOCIATION_VIEW_NAME, state_code, person_id_filter_set)
-
-        supervision_period_to_agent_associations = (p | "Read Supervision Period to Agent table from BigQuery" >>
-                                                    beam.io.Read(beam.io.BigQuerySource
-                                                                 (query=supervision_period_to_agent_association_query,
-                                                                  use_standard_sql=True)))
-
-        # Convert the association table rows into key-value tuples with the value for the supervision_period_id column
-        # as the key
-        supervision_period_to_agent_associations_as_kv = (supervision_period_to_agent_associations |
-                                                          'Convert Supervision Period to Agent table to KV tuples' >>
-                                                          beam.ParDo(ConvertDictToKVTuple(),
-                                                                     'supervision_period_id')
-                                                          )
-
-        if state_code is None or state_code == 'US_MO':
-            # Bring in the reference table that includes sentence status ranking information
-            us_mo_sentence_status_query = select_all_by_person_query(
-                reference_dataset, US_MO_SENTENCE_STATUSES_VIEW_NAME, state_code, person_id_filter_set)
-
-            us_mo_sentence_statuses = (p | "Read MO sentence status table from BigQuery" >>
-                                       beam.io.Read(beam.io.BigQuerySource(query=us_mo_sentence_status_query,
-                                                                           use_standard_sql=True)))
-        else:
-            us_mo_sentence_statuses = (p | f"Generate empty MO statuses list for non-MO state run: {state_code} " >>
-                                       beam.Create([]))
-
-        us_mo_sentence_status_rankings_as_kv = (
-            us_mo_sentence_statuses |
-            'Convert MO sentence status ranking table to KV tuples' >>
-            beam.ParDo(ConvertDictToKVTuple(), 'person_id')
-        )
-
-        sentences_and_statuses = (
-            {'incarceration_sentences': incarceration_sentences,
-             'supervision_sentences': supervision_sentences,
-             'sentence_statuses': us_mo_sentence_status_rankings_as_kv}
-            | 'Group sentences to the sentence statuses for that person' >>
-            beam.CoGroupByKey()
-        )
-
-        sentences_converted = (
-            sentences_and_statuses
-            | 'Convert to state-specific sentences' >>
-            beam.ParDo(ConvertSentencesToStateSpecificType()).with_outputs('incarceration_sentences',
-                                                                           'supervision_sentences')
-        )
-
-        # Bring in the judicial districts associated with supervision_periods
-        sp_to_judicial_district_query = select_all_by_person_query(
-            reference_dataset,
-            SUPERVISION_PERIOD_JUDICIAL_DISTRICT_ASSOCIATION_VIEW_NAME,
-            state_code,
-            person_id_filter_set)
-
-        sp_to_judicial_district_kv = (
-            p | "Read supervision_period to judicial_district associations from BigQuery" >>
-            beam.io.Read(beam.io.BigQuerySource(
-                query=sp_to_judicial_district_query,
-                use_standard_sql=True))
-            | "Convert supervision_period to judicial_district association table to KV" >>
-            beam.ParDo(ConvertDictToKVTuple(), 'person_id')
-        )
-
-        # Group StateSupervisionViolationResponses and StateSupervisionViolations by person_id
-        supervision_violations_and_responses = (
-            {'violations': supervision_violations,
-             'violation_responses': supervision_violation_responses
-             } | 'Group StateSupervisionViolationResponses to '
-                 'StateSupervisionViolations' >>
-            beam.CoGroupByKey()
-        )
-
-        # Set the fully hydrated StateSupervisionViolation entities on the corresponding
-        # StateSupervisionViolationResponses
-        violation_responses_with_hydrated_violations = (
-            supervision_violations_and_responses
-            | 'Set hydrated StateSupervisionViolations on '
-            'the StateSupervisionViolationResponses' >>
-            beam.ParDo(SetViolationOnViolationsResponse()))
-
-        # Group StateIncarcerationPeriods and StateSupervisionViolationResponses by person_id
-        incarceration_periods_and_violation_responses = (
-            {'incarceration_periods': incarceration_periods,
-             'violation_responses':
-                 violation_responses_with_hydrated_violations}
-            | 'Group StateIncarcerationPeriods to '
-              'StateSupervisionViolationResponses' >>
-            beam.CoGroupByKey()
-        )
-
-        # Set the fully hydrated StateSupervisionViolationResponse entities on the corresponding
-        # StateIncarcerationPeriods
-        incarceration_periods_with_source_violations = (
-            incarceration_periods_and_violation_responses
-            | 'Set hydrated StateSupervisionViolationResponses on '
-            'the StateIncarcerationPeriods' >>
-            beam.ParDo(SetViolationResponseOnIncarcerationPeriod()))
-
-        # Group each StatePerson with their related entities
-        person_entities = (
-            {'person': persons,
-             'assessments': assessments,
-             'incarceration_periods':
-                 incarceration_periods_with_source_violations,
-             'supervision_periods': supervision_periods,
-             'supervision_sentences': sentences_converted.supervision_sentences,
-             'incarceration_sentences': sentences_converted.incarceration_sentences,
-             'violation_responses': violation_responses_with_hydrated_violations,
-             'supervision_contacts': supervision_contacts,
-             'supervision_period_judicial_district_association': sp_to_judicial_district_kv
-             }
-            | 'Group StatePerson to all entities' >>
-            beam.CoGroupByKey()
-        )
-
-        # Identify SupervisionTimeBuckets from the StatePerson's StateSupervisionSentences and StateIncarcerationPeriods
-        person_time_buckets = (
-            person_entities
-            | 'Get SupervisionTimeBuckets' >>
-            beam.ParDo(ClassifySupervisionTimeBuckets(),
-                       AsDict(ssvr_agent_associations_as_kv),
-                       AsDict(supervision_period_to_agent_associations_as_kv)))
-
-        # Get pipeline job details for accessing job_id
-        all_pipeline_options = apache_beam_pipeline_options.get_all_options()
-
-        # Get the type of metric to calculate
-        metric_types_set = set(metric_types)
-
-        # Add timestamp for local jobs
-        job_timestamp = datetime.datetime.now().strftime('%Y-%m-%d_%H_%M_%S.%f')
-        all_pipeline_options['job_timestamp'] = job_timestamp
-
-        # Get supervision metrics
-        supervision_metrics = (person_time_buckets | 'Get Supervision Metrics' >>
-                               GetSupervisionMetrics(
-                                   pipeline_options=all_pipeline_options,
-                                   metric_types=metric_types_set,
-                                   calculation_end_month=calculation_end_month,
-                                   calculation_month_count=calculation_month_count))
-        if person_id_filter_set:
-            logging.warning("Non-empty person filter set - returning before writing metrics.")
-            return
-
-        # Convert the metrics into a format that's writable to BQ
-        writable_metrics = (supervision_metrics | 'Convert to dict to be written to BQ' >>
-                            beam.ParDo(
-                                RecidivizMetricWritableDict()).with_outputs(
-                                    SupervisionMetricType.SUPERVISION_COMPLIANCE.value,
-                                    SupervisionMetricType.SUPERVISION_POPULATION.value,
-                                    SupervisionMetricType.SUPERVISION_REVOCATION.value,
-                                    SupervisionMetricType.SUPERVISION_REVOCATION_ANALYSIS.value,
-                                    SupervisionMetricType.SUPERVISION_REVOCATION_VIOLATION_TYPE_ANALYSIS.value,
-                                    SupervisionMetricType.SUPERVISION_SUCCESS.value,
-                                    SupervisionMetricType.SUPERVISION_SUCCESSFUL_SENTENCE_DAYS_SERVED.value,
-                                    SupervisionMetricType.SUPERVISION_TERMINATION.value
-                                )
-                            )
-
-        # Write the metrics to the output tables in BigQuery
-        terminations_table_id = DATAFLOW_METRICS_TO_TABLES.get(SupervisionTerminationMetric)
-        compliance_table_id = DATAFLOW_METRICS_TO_TABLES.get(SupervisionCaseComplianceMetric)
-        populations_table_id = DATAFLOW_METRICS_TO_TABLES.get(SupervisionPopulationMetric)
-        revocations_table_id = DATAFLOW_METRICS_TO_TABLES.get(SupervisionRevocationMetric)
-        revocation_analysis_table_id = DATAFLOW_METRICS_TO_TABLES.get(SupervisionRevocationAnalysisMetric)
-        revocation_violation_type_analysis_table_id = \
-            DATAFLOW_METRICS_TO_TABLES.get(SupervisionRevocationViolationTypeAnalysisMetric)
-        successes_table_id = DATAFLOW_METRICS_TO_TABLES.get(SupervisionSuccessMetric)
-        successful_sentence_lengths_table_id = DATAFLOW_METRICS_TO_TABLES.get(
-            SuccessfulSupervisionSentenceDaysServedMetric)
-
-        _ = (writable_metrics.SUPERVISION_POPULATION
-             | f"Write population metrics to BQ table: {populations_table_id}" >>
-             beam.io.WriteToBigQuery(
-                 table=populations_table_id,
-                 dataset=output,
-                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
-                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
-                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
-             ))
-
-        _ = (writable_metrics.SUPERVISION_REVOCATION
-             | f"Write revocation metrics to BQ table: {revocations_table_id}" >>
-             beam.io.WriteToBigQuery(
-                 table=revocations_table_id,
-                 dataset=output,
-                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
-                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
-                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
-             ))
-
-        _ = (writable_metrics.SUPERVISION_SUCCESS
-             | f"Write success metrics to BQ table: {successes_table_id}" >>
-             beam.io.WriteToBigQuery(
-                 table=successes_table_id,
-                 dataset=output,
-                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
-                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
-                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
-             ))
-
-        _ = (writable_metrics.SUPERVISION_SUCCESSFUL_SENTENCE_DAYS_SERVED
-             | f"Write supervision successful sentence length metrics to BQ"
-               f" table: {successful_sentence_lengths_table_id}" >>
-             beam.io.WriteToBigQuery(
-                 table=successful_sentence_lengths_table_id,
-                 dataset=output,
-                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
-                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
-                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
-             ))
-
-        _ = (writable_metrics.SUPERVISION_TERMINATION
-             | f"Write termination metrics to BQ table: {terminations_table_id}" >>
-             beam.io.WriteToBigQuery(
-                 table=terminations_table_id,
-                 dataset=output,
-                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
-                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
-                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
-             ))
-
-        _ = (writable_metrics.SUPERVISION_REVOCATION_ANALYSIS
-             | f"Write revocation analyses metrics to BQ table: {revocation_analysis_table_id}" >>
-             beam.io.WriteToBigQuery(
-                 table=revocation_analysis_table_id,
-                 dataset=output,
-                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
-                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
-                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
-             ))
+            state_code=state_code,
+            person_snapshot_input=person_snapshot_input)
 
-        _ = (writable_metrics.SUPERVISION_REVOCATION_VIOLATION_TYPE_ANALYSIS
-             | f"Write revocation violation type analyses metrics to BQ table: "
-               f"{revocation_violation_type_analysis_table_id}" >>
-             beam.io.WriteToBigQuery(
-                 table=revocation_violation_type_analysis_table_id,
-                 dataset=output,
-                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
-                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
-                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
-             ))
-
-        _ = (writable_metrics.SUPERVISION_COMPLIANCE
-             | f"Write compliance metrics to BQ table: {compliance_table_id}" >>
-             beam.io.WriteToBigQuery(
-                 table=compliance_table_id,
-                 dataset=output,
-                 create_disposition=beam.io.BigQueryDisposition.CREATE_NEVER,
-                 write_disposition=beam.io.BigQueryDisposition.WRITE_APPEND,
-                 method=beam.io.WriteToBigQuery.Method.FILE_LOADS
-             ))
+        build_calculations(p, root_entities, apache_beam_pipeline_options, reference_dataset, output,
+                           calculation_month_count, metric_types, state_code, calculation_end_month,
+                           person_id_filter_set, compress_population_buckets, aggregate_event_based_metrics)
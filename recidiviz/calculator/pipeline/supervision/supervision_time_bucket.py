@@ -15,7 +15,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
 """Buckets of time on supervision that may have included a revocation."""
-from datetime import date
+from datetime import date, timedelta
 from typing import Optional, List
 
 import attr
@@ -147,6 +147,45 @@ class NonRevocationReturnSupervisionTimeBucket(SupervisionTimeBucket, ViolationT
         raise ValueError('Must set is_on_supervision_last_day_of_month!')
 
 
+@attr.s(frozen=True)
+class NonRevocationReturnSupervisionTimeBucketRun(NonRevocationReturnSupervisionTimeBucket):
+    """Models a run of consecutive days on supervision, all within the same month, for which every attribute of the
+    corresponding daily NonRevocationReturnSupervisionTimeBucket is identical except for the bucket_date.
+
+    The bucket_date on the run is the first day of the run. Runs never include the last day of a month, so
+    is_on_supervision_last_day_of_month is always False and case_compliance is always None on a run.
+    """
+
+    # The day after the last day in this run
+    run_end_date_exclusive: date = attr.ib(default=None)
+
+    def expand(self,
+               lower_bound_inclusive: Optional[date] = None,
+               upper_bound_inclusive: Optional[date] = None) -> List[NonRevocationReturnSupervisionTimeBucket]:
+        """Returns one NonRevocationReturnSupervisionTimeBucket for each day in this run, limited to the days that fall
+        between the optional |lower_bound_inclusive| and |upper_bound_inclusive| dates."""
+        start_date = self.bucket_date
+        if lower_bound_inclusive and lower_bound_inclusive > start_date:
+            start_date = lower_bound_inclusive
+
+        end_date_exclusive = self.run_end_date_exclusive
+        if upper_bound_inclusive and upper_bound_inclusive < end_date_exclusive:
+            end_date_exclusive = upper_bound_inclusive + timedelta(days=1)
+
+        template = NonRevocationReturnSupervisionTimeBucket(
+            **{field.name: getattr(self, field.name)
+               for field in attr.fields(NonRevocationReturnSupervisionTimeBucket)})
+
+        day_buckets: List[NonRevocationReturnSupervisionTimeBucket] = []
+
+        bucket_date = start_date
+        while bucket_date < end_date_exclusive:
+            day_buckets.append(attr.evolve(template, bucket_date=bucket_date))
+            bucket_date = bucket_date + timedelta(days=1)
+
+        return day_buckets
+
+
 @attr.s(frozen=True)
 class ProjectedSupervisionCompletionBucket(SupervisionTimeBucket):
     """Models a month in which supervision was projected to complete.
@@ -0,0 +1,161 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""A class for caching information about a person's SupervisionTimeBuckets for use in the supervision calculator."""
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple, Type
+
+import attr
+
+from recidiviz.calculator.pipeline.supervision.supervision_time_bucket import SupervisionTimeBucket, \
+    RevocationReturnSupervisionTimeBucket, NonRevocationReturnSupervisionTimeBucket, \
+    ProjectedSupervisionCompletionBucket, SupervisionTerminationBucket
+from recidiviz.calculator.pipeline.utils.calculator_utils import relevant_metric_periods
+
+# The SupervisionTimeBucket types that buckets are grouped by in the index
+_INDEXED_BUCKET_TYPES: Tuple[Type[SupervisionTimeBucket], ...] = (
+    RevocationReturnSupervisionTimeBucket,
+    NonRevocationReturnSupervisionTimeBucket,
+    ProjectedSupervisionCompletionBucket,
+    SupervisionTerminationBucket,
+)
+
+
+@attr.s
+class SupervisionTimeBucketIndex:
+    """A class for caching information about a person's SupervisionTimeBuckets for use in the supervision calculator.
+
+    All lists in the index preserve the relative order of the buckets in |supervision_time_buckets|, which is expected
+    to be sorted in ascending order by year and month.
+    """
+
+    supervision_time_buckets: List[SupervisionTimeBucket] = attr.ib()
+
+    # The last day of the most recent metric period. If unset, buckets are not organized by metric period.
+    metric_period_end_date: Optional[date] = attr.ib(default=None)
+
+    # A dictionary mapping bucket_date values to the RevocationReturnSupervisionTimeBucket and
+    # NonRevocationReturnSupervisionTimeBucket buckets on that date
+    population_buckets_by_date: Dict[date, List[SupervisionTimeBucket]] = attr.ib()
+
+    @population_buckets_by_date.default
+    def _population_buckets_by_date(self) -> Dict[date, List[SupervisionTimeBucket]]:
+        population_buckets_by_date: Dict[date, List[SupervisionTimeBucket]] = defaultdict(list)
+
+        for bucket in self.supervision_time_buckets:
+            if isinstance(bucket, (RevocationReturnSupervisionTimeBucket, NonRevocationReturnSupervisionTimeBucket)):
+                population_buckets_by_date[bucket.bucket_date].append(bucket)
+
+        return population_buckets_by_date
+
+    # A dictionary mapping (bucket type, year, month) to the buckets of that type in that month
+    buckets_by_type_and_month: Dict[Tuple[Type[SupervisionTimeBucket], int, int], List[SupervisionTimeBucket]] = \
+        attr.ib()
+
+    @buckets_by_type_and_month.default
+    def _buckets_by_type_and_month(self) -> \
+            Dict[Tuple[Type[SupervisionTimeBucket], int, int], List[SupervisionTimeBucket]]:
+        buckets_by_type_and_month: Dict[Tuple[Type[SupervisionTimeBucket], int, int], List[SupervisionTimeBucket]] = \
+            defaultdict(list)
+
+        for bucket in self.supervision_time_buckets:
+            buckets_by_type_and_month[(_indexed_bucket_type(bucket), bucket.year, bucket.month)].append(bucket)
+
+        return buckets_by_type_and_month
+
+    # A dictionary mapping case_compliance.date_of_evaluation values to the NonRevocationReturnSupervisionTimeBuckets
+    # with a case_compliance evaluated on that date
+    compliance_buckets_by_evaluation_date: Dict[date, List[SupervisionTimeBucket]] = attr.ib()
+
+    @compliance_buckets_by_evaluation_date.default
+    def _compliance_buckets_by_evaluation_date(self) -> Dict[date, List[SupervisionTimeBucket]]:
+        compliance_buckets_by_evaluation_date: Dict[date, List[SupervisionTimeBucket]] = defaultdict(list)
+
+        for bucket in self.supervision_time_buckets:
+            if isinstance(bucket, NonRevocationReturnSupervisionTimeBucket) and bucket.case_compliance is not None:
+                compliance_buckets_by_evaluation_date[bucket.case_compliance.date_of_evaluation].append(bucket)
+
+        return compliance_buckets_by_evaluation_date
+
+    # A dictionary mapping metric period month lengths to the buckets that fall in that period, in the order in which
+    # the periods are first encountered in |supervision_time_buckets|
+    buckets_by_metric_period: Dict[int, List[SupervisionTimeBucket]] = attr.ib()
+
+    @buckets_by_metric_period.default
+    def _buckets_by_metric_period(self) -> Dict[int, List[SupervisionTimeBucket]]:
+        buckets_by_metric_period: Dict[int, List[SupervisionTimeBucket]] = defaultdict(list)
+
+        if self.metric_period_end_date is None:
+            return buckets_by_metric_period
+
+        for bucket in self.supervision_time_buckets:
+            relevant_periods = relevant_metric_periods(
+                date(bucket.year, bucket.month, 1),
+                self.metric_period_end_date.year,
+                self.metric_period_end_date.month)
+
+            for period in relevant_periods:
+                buckets_by_metric_period[period].append(bucket)
+
+        return buckets_by_metric_period
+
+    # A dictionary mapping (bucket type, metric period month length) to the buckets of that type in that period
+    buckets_by_type_and_metric_period: Dict[Tuple[Type[SupervisionTimeBucket], int], List[SupervisionTimeBucket]] = \
+        attr.ib()
+
+    @buckets_by_type_and_metric_period.default
+    def _buckets_by_type_and_metric_period(self) -> \
+            Dict[Tuple[Type[SupervisionTimeBucket], int], List[SupervisionTimeBucket]]:
+        buckets_by_type_and_metric_period: \
+            Dict[Tuple[Type[SupervisionTimeBucket], int], List[SupervisionTimeBucket]] = defaultdict(list)
+
+        for period, buckets in self.buckets_by_metric_period.items():
+            for bucket in buckets:
+                buckets_by_type_and_metric_period[(_indexed_bucket_type(bucket), period)].append(bucket)
+
+        return buckets_by_type_and_metric_period
+
+    # A dictionary mapping the id() of each bucket to the set of metric period month lengths that the bucket falls in
+    metric_periods_by_bucket_id: Dict[int, Set[int]] = attr.ib()
+
+    @metric_periods_by_bucket_id.default
+    def _metric_periods_by_bucket_id(self) -> Dict[int, Set[int]]:
+        metric_periods_by_bucket_id: Dict[int, Set[int]] = defaultdict(set)
+
+        for period, buckets in self.buckets_by_metric_period.items():
+            for bucket in buckets:
+                metric_periods_by_bucket_id[id(bucket)].add(period)
+
+        return metric_periods_by_bucket_id
+
+    def buckets_in_month(self, bucket_type: Type[SupervisionTimeBucket],
+                         year: int, month: int) -> List[SupervisionTimeBucket]:
+        """Returns the buckets of the given type in the given year and month."""
+        return self.buckets_by_type_and_month.get((bucket_type, year, month), [])
+
+    def buckets_in_metric_period(self, bucket_type: Type[SupervisionTimeBucket],
+                                 period: int) -> List[SupervisionTimeBucket]:
+        """Returns the buckets of the given type that fall in the metric period of the given month length."""
+        return self.buckets_by_type_and_metric_period.get((bucket_type, period), [])
+
+
+def _indexed_bucket_type(bucket: SupervisionTimeBucket) -> Type[SupervisionTimeBucket]:
+    for bucket_type in _INDEXED_BUCKET_TYPES:
+        if isinstance(bucket, bucket_type):
+            return bucket_type
+
+    raise ValueError(f"Bucket is of unexpected SupervisionTimeBucket type: {bucket}")
@@ -24,7 +24,7 @@ from dateutil.relativedelta import relativedelta
 
 from recidiviz.calculator.pipeline.utils.state_utils.us_mo import us_mo_violation_utils
 from recidiviz.calculator.pipeline.utils.execution_utils import year_and_month_for_today
-from recidiviz.calculator.pipeline.utils.metric_utils import MetricMethodologyType
+from recidiviz.calculator.pipeline.utils.metric_utils import MetricMethodologyType, MetricCombination
 from recidiviz.common.constants.state.external_id_types import US_ID_DOC, US_MO_DOC, US_PA_CONTROL, US_PA_PBPP
 from recidiviz.common.constants.state.state_supervision_violation import \
     StateSupervisionViolationType
@@ -309,6 +309,25 @@ def augmented_combo_for_calculations(combo: Dict[str, Any],
     return augment_combination(combo, parameters)
 
 
+def metric_combination_for_calculations(combo: Dict[str, Any],
+                                        state_code: str,
+                                        year: int,
+                                        month: Optional[int],
+                                        methodology: MetricMethodologyType,
+                                        metric_period_months: Optional[int]) -> MetricCombination:
+    """Returns a MetricCombination of the given combo dictionary and the given parameters of the calculation. Sets the
+    same parameters as augmented_combo_for_calculations, without copying the combo."""
+    combination = MetricCombination(combo, state_code=state_code, methodology=methodology, year=year)
+
+    if month:
+        combination.month = month
+
+    if metric_period_months is not None:
+        combination.metric_period_months = metric_period_months
+
+    return combination
+
+
 def person_external_id_to_include(pipeline: str,
                                   state_code: str,
                                   person: StatePerson) -> Optional[str]:
@@ -18,7 +18,8 @@
 calculations."""
 import abc
 import logging
-from typing import Any, Dict, Optional, Type, Tuple, Set
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Type, Tuple, Set
 
 from more_itertools import one
 
@@ -635,14 +636,13 @@ class _HydrateRootEntitiesWithRelationshipPropertyEntities(beam.DoFn):
 
         The hydration works like this:
 
-        For each root entity, go through the each property name for all of the
-        attributes on the entity that are relationships to other entities. If
-        there is a corresponding relationship property group for this property
-        name in the entities_dict, then iterate through that group to see if
-        the root_id attached to that entity matches the root_entity id. When
-        you find a related entity that should be connected to the root_entity,
-        add this entity as a related property on the root_entity. This process
-        hydrates all given related properties on each root_entity.
+        First, index each relationship property group in the entities_dict by
+        the root_id attached to each of its entities. Then, for each root
+        entity, go through the each property name for all of the attributes on
+        the entity that are relationships to other entities, and look up the
+        related entities indexed under the root_entity id for this property
+        name. Add these entities as a related property on the root_entity. This
+        process hydrates all given related properties on each root_entity.
         """
         schema_class = kwargs.get('schema_class')
 
@@ -659,18 +659,25 @@ class _HydrateRootEntitiesWithRelationshipPropertyEntities(beam.DoFn):
         # Get the root entities
         root_entities = entities_dict.get(schema_class.__tablename__)
 
-        for root_entity in root_entities:
-            for property_name in relationship_property_names:
-                # Get the hydrated instances of this property
-                relationship_property_group = \
-                    entities_dict.get(property_name)
+        # Index the hydrated instances of each property by root id
+        entities_by_root_id_by_property: Dict[str, Dict[Any, List[Any]]] = {}
+        for property_name in relationship_property_names:
+            relationship_property_group = entities_dict.get(property_name)
 
-                if not relationship_property_group:
-                    continue
+            if not relationship_property_group:
+                continue
+
+            entities_by_root_id: Dict[Any, List[Any]] = defaultdict(list)
+            for root_id, entity in relationship_property_group:
+                entities_by_root_id[root_id].append(entity)
 
-                entities = [entity
-                            for root_id, entity in relationship_property_group
-                            if root_id == root_entity.get_id()]
+            entities_by_root_id_by_property[property_name] = \
+                entities_by_root_id
+
+        for root_entity in root_entities:
+            for property_name, entities_by_root_id in \
+                    entities_by_root_id_by_property.items():
+                entities = entities_by_root_id.get(root_entity.get_id())
 
                 if not entities:
                     continue
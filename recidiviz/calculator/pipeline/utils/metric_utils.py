@@ -17,8 +17,10 @@
 """Base class for metrics we calculate."""
 
 import datetime
+from collections.abc import Mapping
 from datetime import date
-from typing import Any, Dict, Optional, cast, List
+from functools import lru_cache
+from typing import Any, Dict, Optional, cast, List, Iterator, Tuple, Iterable, Type
 from enum import Enum
 
 import apache_beam as beam
@@ -117,6 +119,33 @@ class RecidivizMetric(BuildableAttr):
 
         return recidiviz_metric
 
+    @classmethod
+    def build_from_metric_combination(cls, combination: 'MetricCombination', job_id: str, **values: Any) -> \
+            'RecidivizMetric':
+        """Builds a metric of this class from the given |combination| and metric |values|, such as the count. Values
+        are read straight from the combination into the metric's fields, in the order of the metric's schema, without
+        building an intermediate dictionary. Entries of the combination that are not fields of this metric are
+        ignored."""
+        if not combination:
+            raise ValueError("The metric combination is empty.")
+
+        values['job_id'] = job_id
+        values['created_on'] = date.today()
+
+        field_values = []
+        for field, default in _metric_init_fields(cls):
+            if field in values:
+                value = values[field]
+            elif field in combination:
+                value = combination[field]
+            elif default is attr.NOTHING:
+                raise ValueError(f"No value for required field {field} when building {cls.__name__}.")
+            else:
+                value = default
+            field_values.append(value)
+
+        return cls(*field_values)
+
     @classmethod
     def bq_schema_for_metric_table(cls) -> List[bigquery.SchemaField]:
         """Returns the necessary BigQuery schema for the RecidivizMetric, which is a list of SchemaField objects
@@ -140,6 +169,100 @@ class RecidivizMetric(BuildableAttr):
                 for field, attribute in attr.fields_dict(cls).items()]
 
 
+@lru_cache(maxsize=None)
+def _metric_init_fields(metric_cls: type) -> Tuple[Tuple[str, Any], ...]:
+    """Returns the name and default of each field set through the __init__ of the given metric class, in the order of
+    the __init__ arguments."""
+    return tuple((field.name, field.default) for field in attr.fields(metric_cls) if field.init)
+
+
+class _Unset:
+    """Marks a parameter that is not set on a MetricCombination. Unpickles to the module's single instance."""
+
+    def __reduce__(self):
+        return '_UNSET'
+
+
+_UNSET = _Unset()
+
+
+class MetricCombination(Mapping):
+    """A compact, read-only metric combination, produced by the calculators for each metric a person contributes to.
+
+    The characteristics of an event are shared by all of the metrics calculated from it, and only the parameters of the
+    calculation (methodology, period, etc.) differ between them. Rather than copying the characteristics into a new
+    dictionary for each metric, a combination keeps a reference to the shared |characteristics| and stores the
+    parameters in slots. The characteristics must therefore not be updated once combinations referencing them have
+    been created.
+
+    Combinations can be read like a dictionary, where a parameter that is set takes precedence over a characteristic
+    with the same key.
+    """
+    PARAMETER_FIELDS = ('state_code', 'methodology', 'year', 'month', 'metric_period_months', 'follow_up_period',
+                        'return_type', 'from_supervision_type', 'source_violation_type')
+
+    __slots__ = ('characteristics',) + PARAMETER_FIELDS
+
+    def __init__(self,
+                 characteristics: Dict[str, Any],
+                 *,
+                 state_code: Any = _UNSET,
+                 methodology: Any = _UNSET,
+                 year: Any = _UNSET,
+                 month: Any = _UNSET,
+                 metric_period_months: Any = _UNSET,
+                 follow_up_period: Any = _UNSET,
+                 return_type: Any = _UNSET,
+                 from_supervision_type: Any = _UNSET,
+                 source_violation_type: Any = _UNSET):
+        self.characteristics = characteristics
+        self.state_code = state_code
+        self.methodology = methodology
+        self.year = year
+        self.month = month
+        self.metric_period_months = metric_period_months
+        self.follow_up_period = follow_up_period
+        self.return_type = return_type
+        self.from_supervision_type = from_supervision_type
+        self.source_violation_type = source_violation_type
+
+    def __getitem__(self, key: str) -> Any:
+        if key in MetricCombination.PARAMETER_FIELDS:
+            value = getattr(self, key)
+            if value is not _UNSET:
+                return value
+        return self.characteristics[key]
+
+    def __contains__(self, key: object) -> bool:
+        if isinstance(key, str) and key in MetricCombination.PARAMETER_FIELDS and getattr(self, key) is not _UNSET:
+            return True
+        return key in self.characteristics
+
+    def __iter__(self) -> Iterator[str]:
+        parameters = self._set_parameters()
+        for key in self.characteristics:
+            if key not in parameters:
+                yield key
+        yield from parameters
+
+    def __len__(self) -> int:
+        parameters = self._set_parameters()
+        return len(parameters) + sum(1 for key in self.characteristics if key not in parameters)
+
+    def __repr__(self) -> str:
+        return f'MetricCombination({dict(self)})'
+
+    def copy(self) -> 'MetricCombination':
+        """Returns a new combination with the same characteristics and parameters."""
+        combination_copy = MetricCombination(self.characteristics)
+        for field in MetricCombination.PARAMETER_FIELDS:
+            setattr(combination_copy, field, getattr(self, field))
+        return combination_copy
+
+    def _set_parameters(self) -> List[str]:
+        return [field for field in MetricCombination.PARAMETER_FIELDS if getattr(self, field) is not _UNSET]
+
+
 @attr.s
 class PersonLevelMetric(BuildableAttr):
     """Base class for modeling a person-level metric."""
@@ -190,6 +313,10 @@ class RecidivizMetricWritableDict(beam.DoFn):
         For a list of required formats, see the "Data types" section of:
             https://beam.apache.org/documentation/io/built-in/google-bigquery/
 
+        Event-based metrics of the classes in the optional |aggregated_metric_classes| keyword argument that are not
+        tied to a person have been summed across people by AggregateEventBasedMetrics, and are tagged with
+        aggregated_metric_output_tag so that they can be written to their companion tables.
+
         Args:
             element: A RecidivizMetric
 
@@ -197,13 +324,131 @@ class RecidivizMetricWritableDict(beam.DoFn):
             A dictionary representation of the RecidivizMetric in the format Dict[str, Any] so that it can be written to
                 BigQuery using beam.io.WriteToBigQuery.
         """
+        aggregated_metric_classes = kwargs.get('aggregated_metric_classes')
+
         element_dict = json_serializable_metric_key(element.__dict__)
 
         if isinstance(element, RecidivizMetric):
-            yield beam.pvalue.TaggedOutput(element.metric_type.value, element_dict)
+            if aggregated_metric_classes and _is_aggregated_metric(element, aggregated_metric_classes):
+                yield beam.pvalue.TaggedOutput(aggregated_metric_output_tag(element.metric_type), element_dict)
+            else:
+                yield beam.pvalue.TaggedOutput(element.metric_type.value, element_dict)
         else:
             raise ValueError("Attempting to convert an object that is not a RecidivizMetric into a writable dict"
                              "for BigQuery.")
 
     def to_runner_api_parameter(self, _):
         pass  # Passing unused abstract method.
+
+
+# The fields of event-based metrics that hold counts, which are summed when the metrics are aggregated across people
+_SUMMED_METRIC_FIELDS = ('count', 'successful_completion_count', 'projected_completion_count')
+
+# The fields of metrics that are not dimensions of aggregated event-based metrics
+_NON_DIMENSION_METRIC_FIELDS = ('job_id', 'created_on', 'updated_on', 'person_id', 'person_external_id') + \
+    _SUMMED_METRIC_FIELDS
+
+_AGGREGATED_METRICS_OUTPUT_TAG = 'event_based_metrics_to_aggregate'
+
+
+def aggregated_metric_output_tag(metric_type: RecidivizMetricType) -> str:
+    """Returns the output tag of RecidivizMetricWritableDict for the aggregated event-based metrics of the given
+    |metric_type|."""
+    return f'{metric_type.value}_AGGREGATED'
+
+
+class AggregateEventBasedMetrics(beam.PTransform):
+    """Sums the event-based metrics of the given |metric_classes| that are not tied to a person across people.
+
+    Event-based metrics without a person_id that share the same value for every dimension are combined into a single
+    metric of the same class, with each count field set to the sum of the counts of the combined metrics. All other
+    metrics, including person-level event-based metrics and every person-based metric, are passed through unchanged.
+    Only metrics whose values are all counts can be aggregated.
+    """
+
+    def __init__(self, metric_classes: Iterable[Type[RecidivizMetric]]):
+        super(AggregateEventBasedMetrics, self).__init__()
+        self._metric_classes = set(metric_classes)
+
+    def expand(self, input_or_inputs):
+        split_metrics = (input_or_inputs
+                         | 'Split out event-based metrics to aggregate' >>
+                         beam.ParDo(_KeyEventBasedMetricsToAggregate(), metric_classes=self._metric_classes)
+                         .with_outputs(_AGGREGATED_METRICS_OUTPUT_TAG, main='unaggregated_metrics'))
+
+        aggregated_metrics = (split_metrics[_AGGREGATED_METRICS_OUTPUT_TAG]
+                              | 'Sum event-based metrics by dimensions' >>
+                              beam.CombinePerKey(_SumEventBasedMetricsFn())
+                              | 'Drop event-based metric dimensions' >> beam.Values())
+
+        return ((split_metrics.unaggregated_metrics, aggregated_metrics)
+                | 'Merge aggregated and unaggregated metrics' >> beam.Flatten())
+
+
+class _KeyEventBasedMetricsToAggregate(beam.DoFn):
+    """Tags each event-based metric of one of the given |metric_classes| that is not tied to a person for aggregation,
+    keyed by its class and its dimensions. All other metrics are output as is."""
+
+    def process(self, element, *args, **kwargs):
+        metric_classes = kwargs.get('metric_classes')
+
+        if _is_aggregated_metric(element, metric_classes):
+            yield beam.pvalue.TaggedOutput(_AGGREGATED_METRICS_OUTPUT_TAG,
+                                           (_event_based_metric_dimensions(element), element))
+        else:
+            yield element
+
+    def to_runner_api_parameter(self, _):
+        pass  # Passing unused abstract method.
+
+
+def _is_aggregated_metric(metric: RecidivizMetric, metric_classes: Iterable[Type[RecidivizMetric]]) -> bool:
+    """Returns whether the given metric is an event-based metric of one of the |metric_classes| that is not tied to a
+    person, and is therefore summed across people. Person-level metrics are still read from the per-person tables."""
+    return type(metric) in metric_classes and metric.methodology == MetricMethodologyType.EVENT \
+        and getattr(metric, 'person_id', None) is None
+
+
+def _event_based_metric_dimensions(metric: RecidivizMetric) -> Tuple[Any, ...]:
+    """Returns the class name and the dimension values of the given metric, in a form that can be deterministically
+    encoded as the key of the aggregation."""
+    dimensions = {field: getattr(metric, field) for field, _ in _metric_init_fields(type(metric))
+                  if field not in _NON_DIMENSION_METRIC_FIELDS}
+
+    return (type(metric).__name__,) + tuple(json_serializable_metric_key(dimensions).items())
+
+
+@lru_cache(maxsize=None)
+def _fields_in_metric(metric_cls: type, field_names: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Returns the names in |field_names| that are fields of the given metric class."""
+    metric_fields = attr.fields_dict(metric_cls)
+    return tuple(field for field in field_names if field in metric_fields)
+
+
+class _SumEventBasedMetricsFn(beam.CombineFn):
+    """Combines metrics of the same class and dimensions into a copy of the first of them, whose count fields hold the
+    sums of the counts of all of them."""
+
+    def create_accumulator(self, *args, **kwargs):
+        return None
+
+    def add_input(self, mutable_accumulator, element, *args, **kwargs):
+        if mutable_accumulator is None:
+            return attr.evolve(element)
+
+        for field in _fields_in_metric(type(element), _SUMMED_METRIC_FIELDS):
+            setattr(mutable_accumulator, field, getattr(mutable_accumulator, field) + getattr(element, field))
+
+        return mutable_accumulator
+
+    def merge_accumulators(self, accumulators, *args, **kwargs):
+        merged_accumulator = None
+
+        for accumulator in accumulators:
+            if accumulator is not None:
+                merged_accumulator = self.add_input(merged_accumulator, accumulator)
+
+        return merged_accumulator
+
+    def extract_output(self, accumulator, *args, **kwargs):
+        return accumulator
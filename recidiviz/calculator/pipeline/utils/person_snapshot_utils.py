@@ -0,0 +1,226 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Utils for building, writing and reading person snapshots.
+
+A person snapshot is the set of hydrated root entities for every person in the state dataset, extracted from BigQuery
+once and written to a file set of pickled, gzipped TFRecord shards (in GCS, or in a local directory when running with
+the DirectRunner). Calculation pipelines that are given a snapshot read their root entities from it instead of each
+re-extracting the same entity graphs from BigQuery.
+"""
+# pylint: disable=abstract-method, arguments-differ
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+import apache_beam as beam
+from apache_beam import coders
+from apache_beam.io.filesystem import CompressionTypes
+from apache_beam.pvalue import PBegin, PCollection
+
+from recidiviz.calculator.pipeline.utils.extractor_utils import BuildRootEntity
+from recidiviz.persistence.entity.state import entities
+
+# The root entity collections stored in a person snapshot, by the name of the collection, along with whether the
+# related entities of each root entity are hydrated. This covers every root entity that the calculation pipelines load.
+PERSON_SNAPSHOT_ROOT_ENTITIES: Dict[str, Tuple[Type[entities.Entity], bool]] = {
+    'persons': (entities.StatePerson, True),
+    'assessments': (entities.StateAssessment, False),
+    'sentence_groups': (entities.StateSentenceGroup, True),
+    'incarceration_sentences': (entities.StateIncarcerationSentence, True),
+    'supervision_sentences': (entities.StateSupervisionSentence, True),
+    'incarceration_periods': (entities.StateIncarcerationPeriod, True),
+    'supervision_periods': (entities.StateSupervisionPeriod, True),
+    'supervision_violations': (entities.StateSupervisionViolation, True),
+    'supervision_violation_responses': (entities.StateSupervisionViolationResponse, True),
+    'supervision_contacts': (entities.StateSupervisionContact, False),
+    'program_assignments': (entities.StateProgramAssignment, True),
+}
+
+_SNAPSHOT_FILE_NAME_SUFFIX = '.tfrecord.gz'
+
+
+def snapshot_file_path_prefix(snapshot_path: str) -> str:
+    """Returns the prefix of the shard files for the snapshot in the |snapshot_path| directory."""
+    return snapshot_path.rstrip('/') + '/hydrated_persons'
+
+
+def snapshot_file_pattern(snapshot_path: str) -> str:
+    """Returns the pattern matching all shard files for the snapshot in the |snapshot_path| directory."""
+    return snapshot_file_path_prefix(snapshot_path) + '*' + _SNAPSHOT_FILE_NAME_SUFFIX
+
+
+class BuildHydratedPersons(beam.PTransform):
+    """Extracts every root entity collection in PERSON_SNAPSHOT_ROOT_ENTITIES from BigQuery and groups them by person,
+    producing (person_id, {collection_name: [Entity]}) tuples."""
+
+    def __init__(self,
+                 dataset: str,
+                 unifying_id_field_filter_set: Optional[Set[int]] = None,
+                 state_code: Optional[str] = None):
+        super(BuildHydratedPersons, self).__init__()
+        self._dataset = dataset
+        self._unifying_id_field_filter_set = unifying_id_field_filter_set
+        self._state_code = state_code
+
+    def expand(self, input_or_inputs):
+        root_entities = {
+            name: (input_or_inputs
+                   | f'Load {name}' >>
+                   BuildRootEntity(dataset=self._dataset,
+                                   root_entity_class=root_entity_class,
+                                   unifying_id_field=entities.StatePerson.get_class_id_name(),
+                                   build_related_entities=build_related_entities,
+                                   unifying_id_field_filter_set=self._unifying_id_field_filter_set,
+                                   state_code=self._state_code))
+            for name, (root_entity_class, build_related_entities) in PERSON_SNAPSHOT_ROOT_ENTITIES.items()
+        }
+
+        return (root_entities
+                | 'Group root entities by person' >> beam.CoGroupByKey()
+                | 'Convert grouped root entities to lists' >> beam.Map(_grouped_entities_to_lists))
+
+
+def _grouped_entities_to_lists(element: Tuple[int, Dict[str, Iterable[Any]]]) -> Tuple[int, Dict[str, List[Any]]]:
+    person_id, entities_by_name = element
+    return person_id, {name: list(grouped_entities) for name, grouped_entities in entities_by_name.items()}
+
+
+class WriteHydratedPersons(beam.PTransform):
+    """Writes (person_id, {collection_name: [Entity]}) tuples to the snapshot file set in the |snapshot_path|
+    directory."""
+
+    def __init__(self, snapshot_path: str):
+        super(WriteHydratedPersons, self).__init__()
+        self._snapshot_path = snapshot_path
+
+    def expand(self, input_or_inputs):
+        return (input_or_inputs
+                | 'Write hydrated persons' >>
+                beam.io.WriteToTFRecord(snapshot_file_path_prefix(self._snapshot_path),
+                                        coder=coders.PickleCoder(),
+                                        file_name_suffix=_SNAPSHOT_FILE_NAME_SUFFIX,
+                                        compression_type=CompressionTypes.GZIP))
+
+
+class ReadHydratedPersons(beam.PTransform):
+    """Reads the snapshot file set in the |snapshot_path| directory and splits it into one PCollection of
+    (person_id, Entity) tuples per requested root entity collection, matching the output of BuildRootEntity for that
+    collection. The result is tagged by collection name, e.g. result.persons.
+
+    When |unifying_id_field_filter_set| or |state_code| are set, only the entities of those persons or of that state
+    are produced, the same way BuildRootEntity filters its BigQuery queries.
+
+    Each collection is hydrated as configured in PERSON_SNAPSHOT_ROOT_ENTITIES, regardless of how the reading pipeline
+    would have extracted it from BigQuery.
+    """
+
+    def __init__(self,
+                 snapshot_path: str,
+                 root_entity_names: Iterable[str],
+                 unifying_id_field_filter_set: Optional[Set[int]] = None,
+                 state_code: Optional[str] = None):
+        super(ReadHydratedPersons, self).__init__()
+        self._snapshot_path = snapshot_path
+        self._root_entity_names = list(root_entity_names)
+        self._unifying_id_field_filter_set = unifying_id_field_filter_set
+        self._state_code = state_code
+
+        unknown_names = set(self._root_entity_names) - set(PERSON_SNAPSHOT_ROOT_ENTITIES)
+        if unknown_names:
+            raise ValueError(f'Root entity collections {sorted(unknown_names)} are not stored in person snapshots.')
+
+    def expand(self, input_or_inputs):
+        return (input_or_inputs
+                | 'Read hydrated persons' >>
+                beam.io.ReadFromTFRecord(snapshot_file_pattern(self._snapshot_path),
+                                         coder=coders.PickleCoder(),
+                                         compression_type=CompressionTypes.GZIP)
+                | 'Split hydrated persons into root entities' >>
+                beam.ParDo(_SplitHydratedPerson(),
+                           root_entity_names=self._root_entity_names,
+                           unifying_id_field_filter_set=self._unifying_id_field_filter_set,
+                           state_code=self._state_code).with_outputs(*self._root_entity_names))
+
+
+class _SplitHydratedPerson(beam.DoFn):
+    """Yields each requested root entity of a hydrated person as a (person_id, Entity) tuple, tagged with the name of
+    its collection."""
+
+    def process(self, element, *args, **kwargs):
+        root_entity_names = kwargs.get('root_entity_names')
+        unifying_id_field_filter_set = kwargs.get('unifying_id_field_filter_set')
+        state_code = kwargs.get('state_code')
+
+        person_id, entities_by_name = element
+
+        if unifying_id_field_filter_set and person_id not in unifying_id_field_filter_set:
+            return
+
+        for name in root_entity_names:
+            for entity in entities_by_name.get(name, []):
+                if state_code and entity.state_code != state_code:
+                    continue
+                yield beam.pvalue.TaggedOutput(name, (person_id, entity))
+
+    def to_runner_api_parameter(self, _):
+        pass  # Passing unused abstract method.
+
+
+def load_root_entities(pipeline: PBegin,
+                       dataset: str,
+                       root_entities: Dict[str, Tuple[Type[entities.Entity], bool]],
+                       unifying_id_field_filter_set: Optional[Set[int]],
+                       state_code: Optional[str],
+                       person_snapshot_input: Optional[str],
+                       filter_persons_by_state_code: bool = True) -> Dict[str, PCollection]:
+    """Returns a PCollection of (person_id, Entity) tuples for each of the given |root_entities|, keyed by collection
+    name, where each value is the root entity class and whether its related entities should be hydrated.
+
+    When |person_snapshot_input| is set, the root entities are read from that person snapshot, in which case every
+    collection name must be a key of PERSON_SNAPSHOT_ROOT_ENTITIES. The hydration flags in |root_entities| are not
+    applied to snapshot collections, which are hydrated as configured in PERSON_SNAPSHOT_ROOT_ENTITIES, so a collection
+    may come with related entities that the pipeline would not have extracted from BigQuery. Requesting related
+    entities that the snapshot does not store raises a ValueError.
+
+    Otherwise, each collection is extracted from the |dataset| in BigQuery. If |filter_persons_by_state_code| is False,
+    the StatePersons extracted from BigQuery are not filtered by |state_code|. Entities read from a snapshot are always
+    filtered by |state_code|.
+    """
+    if person_snapshot_input:
+        for name, (_, build_related_entities) in root_entities.items():
+            if name in PERSON_SNAPSHOT_ROOT_ENTITIES and build_related_entities \
+                    and not PERSON_SNAPSHOT_ROOT_ENTITIES[name][1]:
+                raise ValueError(f'Person snapshots do not store the related entities of [{name}].')
+
+        snapshot_entities = (pipeline
+                             | 'Load root entities from person snapshot' >>
+                             ReadHydratedPersons(person_snapshot_input,
+                                                 root_entity_names=root_entities.keys(),
+                                                 unifying_id_field_filter_set=unifying_id_field_filter_set,
+                                                 state_code=state_code))
+        return {name: snapshot_entities[name] for name in root_entities}
+
+    return {
+        name: (pipeline
+               | f'Load {name}' >>
+               BuildRootEntity(dataset=dataset,
+                               root_entity_class=root_entity_class,
+                               unifying_id_field=entities.StatePerson.get_class_id_name(),
+                               build_related_entities=build_related_entities,
+                               unifying_id_field_filter_set=unifying_id_field_filter_set,
+                               state_code=state_code
+                               if filter_persons_by_state_code or root_entity_class != entities.StatePerson else None))
+        for name, (root_entity_class, build_related_entities) in root_entities.items()
+    }
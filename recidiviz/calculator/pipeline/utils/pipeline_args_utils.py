@@ -53,6 +53,12 @@ def add_shared_pipeline_arguments(parser: argparse.ArgumentParser, include_calcu
                         help='An optional list of DB person_id values. When present, the pipeline will only calculate '
                              'metrics for these people and will not output to BQ.')
 
+    parser.add_argument('--person_snapshot_input',
+                        type=str,
+                        help='An optional path to a person snapshot written by the person_snapshot pipeline (e.g. '
+                             'gs://bucket/snapshots/2020-07-01). When present, root entities are read from the '
+                             'snapshot instead of being extracted from the data_input dataset.')
+
     if include_calculation_limit_args:
         # Only for pipelines that may receive these arguments
         parser.add_argument('--calculation_end_month',
@@ -67,7 +67,7 @@ def export_view_data_to_cloud_storage():
             for view in [view_builder.build() for view_builder in view_builders]
         ]
 
-        bq_client.export_query_results_to_cloud_storage(views_to_export)
+        bq_client.export_query_results_to_cloud_storage_pipelined(views_to_export)
 
 
 def parse_arguments(argv):
@@ -18,7 +18,9 @@
 """Contains logic related to EntityEnums."""
 
 import re
-from typing import Dict, Optional
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple, Union
 
 from aenum import Enum, EnumMeta
 from opencensus.stats import aggregation, measure, view
@@ -34,7 +36,28 @@ enum_errors_view = view.View("recidiviz/converter/enum_error_count",
                              [monitoring.TagKey.REGION,
                               monitoring.TagKey.ENTITY_TYPE],
                              m_enum_errors, aggregation.SumAggregation())
-monitoring.register_views([enum_errors_view])
+m_enum_parse_cache_hits = measure.MeasureInt(
+    "converter/enum_parse_cache_hit_count",
+    "The number of enum parses served from the enum parse cache", "1")
+m_enum_parse_cache_misses = measure.MeasureInt(
+    "converter/enum_parse_cache_miss_count",
+    "The number of enum parses not found in the enum parse cache", "1")
+enum_parse_cache_hits_view = view.View(
+    "recidiviz/converter/enum_parse_cache_hit_count",
+    "The sum of enum parse cache hits",
+    [monitoring.TagKey.REGION],
+    m_enum_parse_cache_hits, aggregation.SumAggregation())
+enum_parse_cache_misses_view = view.View(
+    "recidiviz/converter/enum_parse_cache_miss_count",
+    "The sum of enum parse cache misses",
+    [monitoring.TagKey.REGION],
+    m_enum_parse_cache_misses, aggregation.SumAggregation())
+monitoring.register_views([enum_errors_view, enum_parse_cache_hits_view,
+                           enum_parse_cache_misses_view])
+
+# The maximum number of (enum class, label) parse results cached for each
+# EnumOverrides object.
+ENUM_PARSE_CACHE_MAX_SIZE = 10000
 
 
 class EnumParsingError(Exception):
@@ -47,6 +70,87 @@ class EnumParsingError(Exception):
         super().__init__(msg)
 
 
+class EnumParseCache:
+    """Bounded LRU cache of the results of parsing raw labels into enums of a
+    given class, for a single EnumOverrides object. Caches either the parsed
+    value or the EnumParsingError raised while parsing.
+
+    Hit and miss counts across all caches are reported to monitoring by
+    record_enum_parse_cache_stats().
+    """
+
+    _stats_lock = threading.Lock()
+    _hits = 0
+    _misses = 0
+
+    def __init__(self, max_size: int = ENUM_PARSE_CACHE_MAX_SIZE):
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._results: \
+            'OrderedDict[Tuple[EntityEnumMeta, str], Union[Optional[EntityEnum], EnumParsingError]]' = OrderedDict()
+
+    def get_or_parse(self,
+                     enum_cls: 'EntityEnumMeta',
+                     label: str,
+                     parse_fn: Callable[[], Optional['EntityEnum']]) -> Optional['EntityEnum']:
+        """Returns the cached result of parsing |label| into |enum_cls|,
+        calling |parse_fn| to parse it on a cache miss. Raises the parsing
+        error if |label| could not be parsed."""
+        key = (enum_cls, label)
+        with self._lock:
+            hit = key in self._results
+            if hit:
+                self._results.move_to_end(key)
+                result = self._results[key]
+        EnumParseCache._record(hit)
+
+        if not hit:
+            try:
+                result = parse_fn()
+            except EnumParsingError as e:
+                result = e
+            with self._lock:
+                self._results[key] = result
+                if len(self._results) > self._max_size:
+                    self._results.popitem(last=False)
+
+        if isinstance(result, EnumParsingError):
+            raise result.with_traceback(None)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @classmethod
+    def _record(cls, hit: bool):
+        with cls._stats_lock:
+            if hit:
+                cls._hits += 1
+            else:
+                cls._misses += 1
+
+    @classmethod
+    def pop_stats(cls) -> Tuple[int, int]:
+        """Returns the (hits, misses) counts across all caches since the last
+        call, resetting them."""
+        with cls._stats_lock:
+            stats = (cls._hits, cls._misses)
+            cls._hits = 0
+            cls._misses = 0
+        return stats
+
+
+def record_enum_parse_cache_stats():
+    """Reports the enum parse cache hits and misses since the last call to
+    monitoring."""
+    hits, misses = EnumParseCache.pop_stats()
+    if not hits and not misses:
+        return
+    with monitoring.measurements({}) as m:
+        m.measure_int_put(m_enum_parse_cache_hits, hits)
+        m.measure_int_put(m_enum_parse_cache_misses, misses)
+
+
 class EntityEnumMeta(EnumMeta):
     """Metaclass for mappable enums."""
 
@@ -88,13 +192,20 @@ class EntityEnumMeta(EnumMeta):
     def _parse_to_enum(cls, label: str, enum_overrides: 'EnumOverrides') -> Optional['EntityEnum']:
         """Attempts to parse |label| using the default map of |cls| and the
         provided |override_map|. Ignores punctuation by treating punctuation as
-        a separator, e.g. `(N/A)` will map to the same value as `N A`."""
+        a separator, e.g. `(N/A)` will map to the same value as `N A`.
+
+        Results are cached per |enum_overrides| object, since the same raw
+        labels are parsed over and over during ingest."""
+        return enum_overrides.parse_cache.get_or_parse(
+            cls, label, lambda: cls._parse_to_enum_uncached(label, enum_overrides))
+
+    def _parse_to_enum_uncached(cls, label: str, enum_overrides: 'EnumOverrides') -> Optional['EntityEnum']:
         label = normalize(label, remove_punctuation=True)
-        if enum_overrides.should_ignore(label, cls):
+        if enum_overrides.should_ignore(label, cls, is_normalized=True):
             return None
 
         try:
-            overridden_value = enum_overrides.parse(label, cls)
+            overridden_value = enum_overrides.parse(label, cls, is_normalized=True)
         except Exception as e:
             if isinstance(e, EnumParsingError):
                 raise e
@@ -23,7 +23,7 @@ from typing import Dict, Optional
 import attr
 
 from recidiviz.common.str_field_utils import normalize
-from recidiviz.common.constants.entity_enum import EntityEnum, EntityEnumMeta
+from recidiviz.common.constants.entity_enum import EntityEnum, EntityEnumMeta, EnumParseCache
 
 EnumMapper = Callable[[str], Optional[EntityEnum]]
 EnumIgnorePredicate = Callable[[str], bool]
@@ -41,23 +41,31 @@ class EnumOverrides:
     _ignores: Dict[EntityEnumMeta, Set[str]] = attr.ib()
     _ignore_predicates_dict: Dict[EntityEnumMeta, Set[EnumIgnorePredicate]] = attr.ib()
 
-    def should_ignore(self, label: str, enum_class: EntityEnumMeta) -> bool:
-        label = normalize(label, remove_punctuation=True)
+    # Cache of EntityEnumMeta.parse results using these overrides. Safe to share for the lifetime of this object,
+    # since the overrides can't change once built.
+    parse_cache: EnumParseCache = attr.ib(factory=EnumParseCache, init=False, eq=False, repr=False)
+
+    def should_ignore(self, label: str, enum_class: EntityEnumMeta, is_normalized: bool = False) -> bool:
+        if not is_normalized:
+            label = normalize(label, remove_punctuation=True)
         predicate_calls = (predicate(label) for predicate in self._ignore_predicates_dict[enum_class])
         return label in self._ignores[enum_class] or any(predicate_calls)
 
     def parse(self,
               label: str,
-              enum_class: EntityEnumMeta) -> Optional[EntityEnum]:
-        label = normalize(label, remove_punctuation=True)
-        if self.should_ignore(label, enum_class):
+              enum_class: EntityEnumMeta,
+              is_normalized: bool = False) -> Optional[EntityEnum]:
+        if not is_normalized:
+            label = normalize(label, remove_punctuation=True)
+        if self.should_ignore(label, enum_class, is_normalized=True):
             return None
 
         direct_lookup = self._str_mappings_dict[enum_class].get(label)
         if direct_lookup:
             return direct_lookup
 
-        matches = {mapper(label) for mapper in self._mappers_dict[enum_class] if mapper(label) is not None}
+        mapped_values = (mapper(label) for mapper in self._mappers_dict[enum_class])
+        matches = {mapped_value for mapped_value in mapped_values if mapped_value is not None}
         if len(matches) > 1:
             raise ValueError("Overrides map matched too many values from label {}: [{}]".format(label, matches))
         if matches:
@@ -66,11 +74,17 @@ class EnumOverrides:
 
     # pylint: disable=protected-access
     def to_builder(self) -> 'Builder':
+        # Copy the mappings so that changes to the builder don't modify (and invalidate the parse cache of) these
+        # overrides.
         builder = self.Builder()
-        builder._str_mappings_dict = self._str_mappings_dict
-        builder._mappers_dict = self._mappers_dict
-        builder._ignores = self._ignores
-        builder._ignore_predicates_dict = self._ignore_predicates_dict
+        for enum_class, str_mappings in self._str_mappings_dict.items():
+            builder._str_mappings_dict[enum_class] = dict(str_mappings)
+        for enum_class, mappers in self._mappers_dict.items():
+            builder._mappers_dict[enum_class] = set(mappers)
+        for enum_class, ignores in self._ignores.items():
+            builder._ignores[enum_class] = set(ignores)
+        for enum_class, ignore_predicates in self._ignore_predicates_dict.items():
+            builder._ignore_predicates_dict[enum_class] = set(ignore_predicates)
         return builder
 
     @classmethod
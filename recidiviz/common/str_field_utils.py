@@ -23,8 +23,10 @@ import datetime
 import locale
 import re
 import string
+import threading
+from collections import OrderedDict
 from distutils.util import strtobool  # pylint: disable=no-name-in-module
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Pattern
 
 import dateparser
 from dateutil.relativedelta import relativedelta
@@ -181,6 +183,43 @@ def _is_str_field_zeros(str_field: str) -> bool:
     return False
 
 
+# Matches the time portion of a datetime string, e.g. '13:05', '13:05:06' or '13:05:06.123'
+_TIME_REGEX_STR = r'(?P<hour>\d{1,2}):(?P<minute>\d{2})(?::(?P<second>\d{2})(?:\.(?P<fraction>\d{1,6}))?)?'
+
+# Compiled regexes for common absolute date formats that can be parsed without dateparser. Each must only match
+# strings that dateparser parses to the same value, with US (month first) ordering for slash and dash dates.
+_FAST_PATH_DATE_REGEXES: Tuple[Pattern, ...] = (
+    # YYYY-MM-DD, YYYY/MM/DD
+    re.compile(r'(?P<year>\d{4})(?P<sep>[-/])(?P<month>\d{1,2})(?P=sep)(?P<day>\d{1,2})'),
+    # MM/DD/YYYY, MM-DD-YYYY
+    re.compile(r'(?P<month>\d{1,2})(?P<sep>[-/])(?P<day>\d{1,2})(?P=sep)(?P<year>\d{4})'),
+    # YYYY-MM-DD HH:MM[:SS[.ffffff]], YYYY-MM-DDTHH:MM[:SS[.ffffff]]
+    re.compile(r'(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})[ T]' + _TIME_REGEX_STR),
+    # MM/DD/YYYY HH:MM[:SS[.ffffff]]
+    re.compile(r'(?P<month>\d{1,2})/(?P<day>\d{1,2})/(?P<year>\d{4}) ' + _TIME_REGEX_STR),
+)
+
+# The fast path date regexes, in the order they should be tried. Whenever a regex matches, it is moved to the front,
+# so that the format of the column currently being parsed is tried first.
+_fast_path_date_regexes_by_recency: List[Pattern] = list(_FAST_PATH_DATE_REGEXES)
+
+# The maximum number of date strings whose dateparser results are cached.
+DATEPARSER_RESULT_CACHE_MAX_SIZE = 10000
+
+# Keyed by the date string, the RELATIVE_BASE and, when there is no RELATIVE_BASE, the current date, since dateparser
+# fills in the components missing from strings like '2019' from the current date.
+_dateparser_result_cache: \
+    'OrderedDict[Tuple[str, Optional[datetime.datetime], Optional[datetime.date]], datetime.datetime]' = OrderedDict()
+_dateparser_result_cache_lock = threading.Lock()
+
+# Words that make the result of parsing a string without a RELATIVE_BASE depend on the current time. Matched
+# regardless of adjacent digits, since munge_date_string produces strings like '1year 2month'.
+_RELATIVE_DATE_WORDS_REGEX = re.compile(
+    r'(?<![a-z])(ago|in|now|today|yesterday|tomorrow|(second|minute|hour|day|week|month|year)s?)(?![a-z])',
+    re.IGNORECASE)
+_FOUR_DIGIT_YEAR_REGEX = re.compile(r'\d{4}')
+
+
 def parse_datetime(
         date_string: str, from_dt: Optional[datetime.datetime] = None
     ) -> Optional[datetime.datetime]:
@@ -197,12 +236,25 @@ def parse_datetime(
             raise ValueError(f'Parsed date for string [{date_string}] is unexpectedly None.')
         return datetime.datetime(year=as_date.year, month=as_date.month, day=as_date.day)
 
+    fast_path_parsed = _parse_datetime_fast_path(date_string)
+    if fast_path_parsed:
+        return fast_path_parsed
+
+    date_string = munge_date_string(date_string)
+
+    cache_key = (date_string, from_dt, datetime.date.today() if from_dt is None else None)
+    is_cacheable = from_dt is not None or _is_independent_of_current_time(date_string)
+    if is_cacheable:
+        with _dateparser_result_cache_lock:
+            cached = _dateparser_result_cache.get(cache_key)
+            if cached:
+                _dateparser_result_cache.move_to_end(cache_key)
+                return cached
+
     settings: Dict[str, Any] = {'PREFER_DAY_OF_MONTH': 'first'}
     if from_dt:
         settings['RELATIVE_BASE'] = from_dt
 
-    date_string = munge_date_string(date_string)
-
     # Only special-case strings that start with a - (to avoid parsing regular
     # timestamps like '2016-05-14') and that include non punctuation (to avoid
     # ingested values like '--')
@@ -212,11 +264,56 @@ def parse_datetime(
         parsed = dateparser.parse(
             date_string, languages=['en'], settings=settings)
     if parsed:
+        if is_cacheable:
+            with _dateparser_result_cache_lock:
+                _dateparser_result_cache[cache_key] = parsed
+                if len(_dateparser_result_cache) > DATEPARSER_RESULT_CACHE_MAX_SIZE:
+                    _dateparser_result_cache.popitem(last=False)
         return parsed
 
     raise ValueError("cannot parse date: %s" % date_string)
 
 
+def _is_independent_of_current_time(date_string: str) -> bool:
+    """Returns True if parsing |date_string| without a RELATIVE_BASE depends on the current time at most through the
+    current date, i.e. it has an explicit year and is not relative."""
+    return bool(_FOUR_DIGIT_YEAR_REGEX.search(date_string)) and not _RELATIVE_DATE_WORDS_REGEX.search(date_string)
+
+
+def _parse_datetime_fast_path(date_string: str) -> Optional[datetime.datetime]:
+    """Parses |date_string| if it is in one of a few common absolute date formats, without going through
+    dateparser. Returns None if the string is not in one of these formats or is not a valid date, in which case it
+    should be parsed by dateparser."""
+    global _fast_path_date_regexes_by_recency
+
+    regexes = _fast_path_date_regexes_by_recency
+    for i, regex in enumerate(regexes):
+        match = regex.fullmatch(date_string)
+        if not match:
+            continue
+
+        groups = match.groupdict()
+        fraction = groups.get('fraction')
+        try:
+            parsed = datetime.datetime(
+                year=int(groups['year']),
+                month=int(groups['month']),
+                day=int(groups['day']),
+                hour=int(groups.get('hour') or 0),
+                minute=int(groups.get('minute') or 0),
+                second=int(groups.get('second') or 0),
+                microsecond=int(fraction.ljust(6, '0')) if fraction else 0)
+        except ValueError:
+            # Out of range values (e.g. month 13) are left to dateparser, which may reorder the components
+            return None
+
+        if i:
+            _fast_path_date_regexes_by_recency = [regex] + regexes[:i] + regexes[i + 1:]
+        return parsed
+
+    return None
+
+
 def _has_non_punctuation(date_string: str) -> bool:
     return any(ch not in string.punctuation for ch in date_string)
 
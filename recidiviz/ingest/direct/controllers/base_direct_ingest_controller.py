@@ -261,14 +261,26 @@ class BaseDirectIngestController(Ingestor,
         logging.info("Successfully parsed data for ingest run [%s]",
                      self._job_tag(args))
 
-        ingest_info_proto = \
-            ingest_utils.convert_ingest_info_to_proto(ingest_info)
+        ingest_metadata = self._get_ingest_metadata(args)
 
-        logging.info("Successfully converted ingest_info to proto for ingest "
-                     "run [%s]", self._job_tag(args))
+        if self._should_convert_ingest_info_without_proto():
+            persist_success = persistence.write_ingest_info_py(
+                ingest_info, ingest_metadata,
+                num_shards=self._get_persistence_num_shards(),
+                use_bulk_snapshot_updates=
+                self._should_use_bulk_snapshot_updates())
+        else:
+            ingest_info_proto = \
+                ingest_utils.convert_ingest_info_to_proto(ingest_info)
 
-        ingest_metadata = self._get_ingest_metadata(args)
-        persist_success = persistence.write(ingest_info_proto, ingest_metadata)
+            logging.info("Successfully converted ingest_info to proto for "
+                         "ingest run [%s]", self._job_tag(args))
+
+            persist_success = persistence.write(
+                ingest_info_proto, ingest_metadata,
+                num_shards=self._get_persistence_num_shards(),
+                use_bulk_snapshot_updates=
+                self._should_use_bulk_snapshot_updates())
 
         if not persist_success:
             raise DirectIngestError(
@@ -278,6 +290,29 @@ class BaseDirectIngestController(Ingestor,
         logging.info("Successfully persisted for ingest run [%s]",
                      self._job_tag(args))
 
+    def _should_convert_ingest_info_without_proto(self) -> bool:
+        """Subclasses should override to return True if parsed IngestInfo
+        objects should be converted directly to persistence entities instead of
+        first being converted to an ingest_info proto. Only supported for
+        state-level controllers.
+        """
+        return False
+
+    def _get_persistence_num_shards(self) -> int:
+        """Subclasses should override to return the number of shards the people
+        in a single file should be split into for entity matching and writing.
+        Each shard is persisted in its own process and transaction. Defaults to
+        persisting the whole file in a single transaction.
+        """
+        return 1
+
+    def _should_use_bulk_snapshot_updates(self) -> bool:
+        """Subclasses should override to return True if historical snapshots
+        should be fetched and inserted in bulk when persisting. Defaults to
+        updating snapshots one entity at a time.
+        """
+        return False
+
     def _get_ingest_metadata(self, args: IngestArgsType) -> IngestMetadata:
         return IngestMetadata(self.region.region_code,
                               self.region.jurisdiction_id,
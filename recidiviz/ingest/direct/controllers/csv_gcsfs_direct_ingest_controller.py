@@ -19,7 +19,10 @@ GCSFileSystem.
 """
 
 import abc
+import csv
 import inspect
+import io
+import logging
 import os
 from typing import List, Optional, Callable
 
@@ -54,6 +57,20 @@ class DirectIngestFileSplittingGcsfsCsvReaderDelegate(SplittingGcsfsCsvReaderDel
     def transform_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         return df
 
+    def supports_raw_chunks(self) -> bool:
+        return True
+
+    def on_raw_chunk(self, encoding: str, chunk_num: int, contents: str) -> bool:
+        output_path = self.get_output_path(chunk_num=chunk_num)
+
+        logging.info('Writing raw chunk [%d] to output path [%s]', chunk_num, output_path.abs_path())
+        self.fs.upload_from_string(output_path, contents, 'text/csv')
+        logging.info('Done writing to output path')
+
+        columns = next(csv.reader(io.StringIO(contents)))
+        self.output_paths_with_columns.append((output_path, columns))
+        return True
+
     def get_output_path(self, chunk_num: int):
         name, _extension = os.path.splitext(self.path.file_name)
 
@@ -89,18 +106,8 @@ class CsvGcsfsDirectIngestController(GcsfsDirectIngestController):
             self,
             line_limit: int,
             path: GcsfsFilePath) -> bool:
-        delegate = ReadOneGcsfsCsvReaderDelegate()
-
-        # Read a chunk up to one line bigger than the acceptable size
-        self.csv_reader.streaming_read(path, delegate=delegate, chunk_size=(line_limit + 1))
-
-        if delegate.df is None:
-            # If the file is empty, it's fine.
-            return True
-
-        # If length of the only chunk is less than or equal to the acceptable
-        # size, file meets line limit.
-        return len(delegate.df) <= line_limit
+        # Stop counting as soon as we have seen one row more than the acceptable size
+        return self.csv_reader.count_rows(path, stop_after=line_limit) <= line_limit
 
     def _split_file(self, path: GcsfsFilePath) -> List[GcsfsFilePath]:
         parts = filename_parts_from_path(path)
@@ -110,7 +117,7 @@ class CsvGcsfsDirectIngestController(GcsfsDirectIngestController):
             raise ValueError(f'Splitting raw files unsupported. Attempting to split [{path.abs_path()}]')
 
         delegate = DirectIngestFileSplittingGcsfsCsvReaderDelegate(path, self.fs, self.temp_output_directory_path)
-        self.csv_reader.streaming_read(path, delegate=delegate, chunk_size=self.ingest_file_split_line_limit)
+        self.csv_reader.streaming_split(path, delegate=delegate, chunk_size=self.ingest_file_split_line_limit)
         output_paths = [path for path, _ in delegate.output_paths_with_columns]
 
         return output_paths
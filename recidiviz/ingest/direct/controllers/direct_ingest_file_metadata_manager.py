@@ -17,7 +17,7 @@
 """A class that handles writing metadata about each direct ingest file to disk."""
 import abc
 import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 from recidiviz.ingest.direct.controllers.gcsfs_direct_ingest_utils import GcsfsIngestViewExportArgs
 from recidiviz.ingest.direct.controllers.gcsfs_path import GcsfsFilePath
@@ -49,6 +49,19 @@ class DirectIngestFileMetadataManager:
         """Writes a new row to the appropriate metadata table for a new, unprocessed raw file, or updates the existing
         metadata row for this path with the appropriate file discovery time."""
 
+    @abc.abstractmethod
+    def mark_files_as_discovered(self, paths: List[GcsfsFilePath]) -> None:
+        """Marks each of the provided paths that has not yet been discovered (see has_file_been_discovered) as
+        discovered, as if by mark_file_as_discovered, reading and writing all metadata rows in a single transaction.
+        Paths that have already been discovered are left unchanged."""
+
+    @abc.abstractmethod
+    def get_file_metadata_for_paths(self,
+                                    paths: List[GcsfsFilePath]) -> Dict[GcsfsFilePath, DirectIngestFileMetadata]:
+        """Returns metadata information for each of the provided paths that has been registered in the appropriate
+        metadata table, reading all rows in a single transaction. Paths that have not been registered are omitted.
+        """
+
     @abc.abstractmethod
     def get_file_metadata(self,
                           path: GcsfsFilePath) -> DirectIngestFileMetadata:
@@ -273,6 +273,7 @@ class DirectIngestRawFileImportManager:
                                        delegate=delegate,
                                        chunk_size=self.upload_chunk_size,
                                        encodings_to_try=file_config.encodings_to_try(),
+                                       detect_encoding=True,
                                        index_col=False,
                                        header=None,
                                        skiprows=1,
@@ -16,7 +16,11 @@
 # =============================================================================
 """Streaming read functionality for Google Cloud Storage CSV files."""
 import abc
-from typing import Iterator, List, Optional
+import codecs
+import io
+import logging
+import re
+from typing import Iterator, List, Optional, IO, AnyStr, Generic
 
 import gcsfs
 import pandas as pd
@@ -29,6 +33,12 @@ COMMON_RAW_FILE_ENCODINGS = [
     'ISO-8859-1'  # Also known as 'latin-1', used in the census and lots of other government data
 ]
 
+# The number of bytes read from GCS at a time when decoding a file in encoding detection mode
+DETECT_ENCODING_READ_BLOCK_SIZE = 1024 * 1024
+
+# The number of bytes (or characters) read at a time when scanning a file for CSV row boundaries
+ROW_SCAN_READ_BLOCK_SIZE = 1024 * 1024
+
 
 class GcsfsCsvReaderDelegate:
     """A delegate for handling various events that happen during a GcsfsCsvReader streaming_read() call."""
@@ -36,7 +46,9 @@ class GcsfsCsvReaderDelegate:
     @abc.abstractmethod
     def on_start_read_with_encoding(self, encoding: str) -> None:
         """Called when we attempt to start reading the file with a particular encoding. This may get called multiple
-        times during the course of a single streaming_read() call if one of the encodings fails.
+        times during the course of a single streaming_read() call if one of the encodings fails. When reading with
+        detect_encoding=True, the file may end up being read with a later encoding without this being called again -
+        the encoding the file was actually read with is passed to on_file_read_success().
         """
 
     @abc.abstractmethod
@@ -71,6 +83,21 @@ class GcsfsCsvReaderDelegate:
     def on_file_read_success(self, encoding: str) -> None:
         """Called when the streaming read has successfully completed."""
 
+    def supports_raw_chunks(self) -> bool:
+        """Returns True if this delegate implements on_raw_chunk(). Delegates that do not are handed the chunks of a
+        streaming_split() call as DataFrames through on_dataframe() instead."""
+        return False
+
+    def on_raw_chunk(self, encoding: str, chunk_num: int, contents: str) -> bool:
+        """Called once for each chunk of raw CSV text read in a streaming_split() call, if supports_raw_chunks()
+        returns True. Each chunk contains the header row of the file followed by the original text of up to chunk_size
+        rows.
+
+        Implementations should return True if iteration should continue to the next chunk (if there is one), or False if
+        we can successfully terminate the read.
+        """
+        raise NotImplementedError
+
 
 class GcsfsCsvReader:
     """Class providing streaming read functionality for Google Cloud Storage CSV files."""
@@ -89,11 +116,17 @@ class GcsfsCsvReader:
         token = 'google_default' if not environment.in_gae() else 'cloud'
         return self.gcs_file_system.open(path.uri(), encoding=encoding, token=token)
 
+    def _binary_file_pointer_for_path(self, path: GcsfsFilePath):
+        """Returns a file pointer for reading the raw bytes at the given path."""
+        token = 'google_default' if not environment.in_gae() else 'cloud'
+        return self.gcs_file_system.open(path.uri(), mode='rb', token=token)
+
     def streaming_read(self,
                        path: GcsfsFilePath,
                        delegate: GcsfsCsvReaderDelegate,
                        chunk_size: int,
                        encodings_to_try: Optional[List[str]] = None,
+                       detect_encoding: bool = False,
                        **kwargs):
         """
         Performs a streaming read of the CSV at the provided path. Will attempt to decode file with multiple encoding
@@ -105,16 +138,27 @@ class GcsfsCsvReader:
             delegate: A delegate for handling read chunks one by one.
             chunk_size: The max number of rows each chunk of the CSV should have.
             encodings_to_try: If provided, the ordered list of file encodings we should try for the given file.
+            detect_encoding: If True, decodes the raw bytes of the file ourselves so that when a later encoding in
+                encodings_to_try can pick up where the failing one left off (i.e. everything read so far decodes to the
+                same text in both), we switch to that encoding without restarting the read. Otherwise, the file is
+                re-read from the beginning with the next encoding.
             kwargs: Key-value args passed through to the pandas read_csv() call.
         """
 
         if not encodings_to_try:
             encodings_to_try = COMMON_RAW_FILE_ENCODINGS
 
-        for encoding in encodings_to_try:
+        encoding_index = 0
+        while encoding_index < len(encodings_to_try):
+            encoding = encodings_to_try[encoding_index]
             delegate.on_start_read_with_encoding(encoding)
+            stream: Optional[_EncodingFallbackTextStream] = None
             try:
-                with self._file_pointer_for_path(path, encoding=encoding) as fp:
+                with (self._binary_file_pointer_for_path(path) if detect_encoding
+                      else self._file_pointer_for_path(path, encoding=encoding)) as fp:
+                    if detect_encoding:
+                        fp = stream = _EncodingFallbackTextStream(fp, encodings_to_try[encoding_index:])
+
                     try:
                         reader: Iterator[pd.DataFrame] = pd.read_csv(
                             # Note: Pandas read_csv() also accepts GCS gs:// URIs directly, but it does not properly
@@ -130,20 +174,327 @@ class GcsfsCsvReader:
                         reader = iter([])
 
                     for i, df in enumerate(reader):
+                        if stream:
+                            encoding = stream.encoding
                         continue_iteration = delegate.on_dataframe(encoding=encoding, chunk_num=i, df=df)
                         if not continue_iteration:
                             break
 
+                    if stream:
+                        encoding = stream.encoding
                     delegate.on_file_read_success(encoding)
                     return
             except UnicodeError as e:
+                if stream:
+                    # The read may have switched to a later encoding before failing
+                    encoding = stream.encoding
+                    encoding_index += stream.encoding_index
+                should_throw = delegate.on_unicode_decode_error(encoding, e)
+                if should_throw:
+                    raise e
+            except Exception as e:
+                should_throw = delegate.on_exception(encoding, e)
+                if should_throw:
+                    raise e
+            encoding_index += 1
+
+        raise ValueError(f'Unable to read path [{path.abs_path()}] for any of these encodings: {encodings_to_try}')
+
+    def count_rows(self, path: GcsfsFilePath, stop_after: Optional[int] = None, separator: str = ',') -> int:
+        """Returns the number of data rows (i.e. not counting the header row) in the CSV at the provided path.
+
+        Scans the raw bytes of the file for row boundaries without decoding or parsing the file, counting rows the same
+        way pandas read_csv() would with default quoting (newlines inside quoted fields do not end a row and blank lines
+        are skipped). This assumes the file is in an ASCII-compatible encoding, which is true for all
+        COMMON_RAW_FILE_ENCODINGS.
+
+        Args:
+            path: The GCS path to read.
+            stop_after: If provided, stops reading the file as soon as we find more than this many data rows and
+                returns stop_after + 1.
+            separator: The field separator used in the file.
+        """
+        scanner = _CsvRowScanner(separator=separator.encode('ascii'), quotechar=b'"', newline=b'\n')
+        num_rows = 0
+        with self._binary_file_pointer_for_path(path) as fp:
+            while True:
+                block = fp.read(ROW_SCAN_READ_BLOCK_SIZE)
+                if not block:
+                    break
+                num_rows += len(scanner.feed(block))
+                if stop_after is not None and num_rows - 1 > stop_after:
+                    return stop_after + 1
+
+        if scanner.finish():
+            num_rows += 1
+
+        # Do not count the header row
+        num_data_rows = max(num_rows - 1, 0)
+        return num_data_rows if stop_after is None else min(num_data_rows, stop_after + 1)
+
+    def streaming_split(self,
+                        path: GcsfsFilePath,
+                        delegate: GcsfsCsvReaderDelegate,
+                        chunk_size: int,
+                        encodings_to_try: Optional[List[str]] = None,
+                        separator: str = ','):
+        """
+        Performs a streaming read of the CSV at the provided path, handing the original text of every chunk_size rows
+        (prefixed with the header row of the file) to the delegate's on_raw_chunk(). Rows are found the same way as in
+        count_rows(), so the file is never parsed into DataFrames. The file is decoded as in a streaming_read() call
+        with detect_encoding=True. If the delegate does not support raw chunks, the file is instead read with exactly
+        that streaming_read() call, handing each chunk to on_dataframe().
+
+        Args:
+            path: The GCS path to read.
+            delegate: A delegate for handling raw chunks one by one.
+            chunk_size: The max number of rows each chunk of the CSV should have.
+            encodings_to_try: If provided, the ordered list of file encodings we should try for the given file.
+            separator: The field separator used in the file.
+        """
+
+        if not delegate.supports_raw_chunks():
+            # The delegate only handles DataFrames, so fall back to a chunked DataFrame read of the file
+            self.streaming_read(path, delegate=delegate, chunk_size=chunk_size, encodings_to_try=encodings_to_try,
+                                detect_encoding=True, sep=separator)
+            return
+
+        if not encodings_to_try:
+            encodings_to_try = COMMON_RAW_FILE_ENCODINGS
+
+        encoding_index = 0
+        while encoding_index < len(encodings_to_try):
+            encoding = encodings_to_try[encoding_index]
+            delegate.on_start_read_with_encoding(encoding)
+            stream: Optional[_EncodingFallbackTextStream] = None
+            try:
+                with self._binary_file_pointer_for_path(path) as fp:
+                    stream = _EncodingFallbackTextStream(fp, encodings_to_try[encoding_index:])
+                    for i, contents in enumerate(_split_rows(stream, chunk_size, separator)):
+                        continue_iteration = delegate.on_raw_chunk(encoding=stream.encoding, chunk_num=i,
+                                                                   contents=contents)
+                        if not continue_iteration:
+                            break
+
+                    delegate.on_file_read_success(stream.encoding)
+                    return
+            except UnicodeError as e:
+                if stream:
+                    # The read may have switched to a later encoding before failing
+                    encoding = stream.encoding
+                    encoding_index += stream.encoding_index
                 should_throw = delegate.on_unicode_decode_error(encoding, e)
                 if should_throw:
                     raise e
-                continue
             except Exception as e:
                 should_throw = delegate.on_exception(encoding, e)
                 if should_throw:
                     raise e
+            encoding_index += 1
 
         raise ValueError(f'Unable to read path [{path.abs_path()}] for any of these encodings: {encodings_to_try}')
+
+
+def _split_rows(stream: IO[str], chunk_size: int, separator: str) -> Iterator[str]:
+    """Yields the header row of the CSV in the given text stream followed by the original text of up to chunk_size rows
+    at a time. If the file has a header but no rows, yields a single chunk with just the header."""
+    scanner = _CsvRowScanner(separator=separator, quotechar='"', newline='\n')
+
+    header: Optional[str] = None
+    chunk_parts: List[str] = []
+    num_rows_in_chunk = 0
+    num_chunks = 0
+
+    while True:
+        block = stream.read(ROW_SCAN_READ_BLOCK_SIZE)
+        if not block:
+            break
+
+        row_start = 0
+        for row_end in scanner.feed(block):
+            chunk_parts.append(block[row_start:row_end])
+            row_start = row_end
+
+            if header is None:
+                header = ''.join(chunk_parts)
+                chunk_parts = []
+                continue
+
+            num_rows_in_chunk += 1
+            if num_rows_in_chunk == chunk_size:
+                yield header + ''.join(chunk_parts)
+                num_chunks += 1
+                chunk_parts = []
+                num_rows_in_chunk = 0
+
+        chunk_parts.append(block[row_start:])
+
+    if scanner.finish():
+        if header is None:
+            # A header row with no trailing newline and no other rows
+            header = ''.join(chunk_parts) + '\n'
+            chunk_parts = []
+        else:
+            num_rows_in_chunk += 1
+
+    if header is None:
+        # The file is empty
+        return
+
+    if num_rows_in_chunk or not num_chunks:
+        yield header + ''.join(chunk_parts)
+
+
+class _CsvRowScanner(Generic[AnyStr]):
+    """Finds the boundaries between CSV rows in a stream of text or bytes fed in one block at a time, without parsing
+    the fields in each row.
+
+    Follows the same rules as pandas read_csv() with default arguments: a quote character only starts a quoted field at
+    the beginning of a field, doubled quote characters inside a quoted field are escaped quotes, newlines inside quoted
+    fields do not end a row, and lines that are empty or only whitespace are not rows.
+    """
+
+    def __init__(self, separator: AnyStr, quotechar: AnyStr, newline: AnyStr):
+        self._separator = separator
+        self._quotechar = quotechar
+        self._newline = newline
+        alternation = '|' if isinstance(newline, str) else b'|'
+        self._pattern = re.compile(re.escape(quotechar) + alternation + re.escape(newline))  # type: ignore
+
+        self._in_quotes = False
+        # Whether the current row has any content so far
+        self._row_has_content = False
+        # The last character of the previous block, which starts out as a newline since the file starts a new row
+        self._previous_char: AnyStr = newline
+        # Whether the previous block ended with a quote that closed a quoted field
+        self._previous_block_ended_with_closing_quote = False
+
+    def feed(self, block: AnyStr) -> List[int]:
+        """Scans the next block of the file, returning the offsets in the block just past the end of each non-blank row
+        that ends in this block."""
+        row_ends: List[int] = []
+        segment_start = 0
+        closing_quote_pos = -1 if self._previous_block_ended_with_closing_quote else -2
+
+        for match in self._pattern.finditer(block):
+            pos = match.start()
+            if block[pos:pos + 1] == self._quotechar:
+                self._row_has_content = True
+                if self._in_quotes:
+                    self._in_quotes = False
+                    closing_quote_pos = pos
+                else:
+                    previous_char = block[pos - 1:pos] if pos > 0 else self._previous_char
+                    if previous_char in (self._separator, self._newline) or closing_quote_pos == pos - 1:
+                        # Either the start of a quoted field, or the second quote of an escaped quote
+                        self._in_quotes = True
+                continue
+
+            if self._in_quotes:
+                continue
+
+            if not self._row_has_content and block[segment_start:pos].strip():
+                self._row_has_content = True
+
+            if self._row_has_content:
+                row_ends.append(pos + 1)
+
+            self._row_has_content = False
+            segment_start = pos + 1
+
+        if not self._in_quotes and not self._row_has_content and block[segment_start:].strip():
+            self._row_has_content = True
+
+        if block:
+            self._previous_char = block[-1:]
+            self._previous_block_ended_with_closing_quote = closing_quote_pos == len(block) - 1
+
+        return row_ends
+
+    def finish(self) -> bool:
+        """Called once all blocks have been fed. Returns True if the file ends with a non-blank row that has no trailing
+        newline."""
+        return self._row_has_content
+
+
+class _EncodingFallbackTextStream(io.TextIOBase):
+    """A read-only text stream over a binary file that decodes the file with the first of the provided encodings,
+    falling back to the next encoding in the list on a decode error without re-reading the file.
+
+    We can only fall back to an encoding mid-stream if every byte read so far decodes to the exact same text with that
+    encoding as with the current one (for example, a file that is entirely ASCII up until its first ISO-8859-1
+    character), since that text may already have been handed off to the caller. If no such encoding is available, the
+    decode error is raised and the caller must restart the read.
+    """
+
+    def __init__(self, fp: IO[bytes], encodings: List[str]):
+        super().__init__()
+        self._fp = fp
+        self._encodings = encodings
+        self._block_size = DETECT_ENCODING_READ_BLOCK_SIZE
+        self._decoders = [codecs.getincrementaldecoder(encoding)() for encoding in encodings]
+
+        # The index of the encoding we are currently decoding with
+        self.encoding_index = 0
+
+        # Indices of the later encodings that have decoded every byte read so far to the same text as the current one
+        self._fallback_indices = list(range(1, len(encodings)))
+
+        self._buffer = ''
+        self._eof = False
+
+    @property
+    def encoding(self) -> str:
+        return self._encodings[self.encoding_index]
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        while not self._eof and (size is None or size < 0 or len(self._buffer) < size):
+            self._buffer += self._decode_next_block()
+
+        if size is None or size < 0:
+            size = len(self._buffer)
+
+        result, self._buffer = self._buffer[:size], self._buffer[size:]
+        return result
+
+    def readline(self, size: Optional[int] = -1) -> str:
+        while not self._eof and '\n' not in self._buffer:
+            self._buffer += self._decode_next_block()
+
+        line_end = self._buffer.find('\n') + 1 or len(self._buffer)
+        if size is not None and 0 <= size < line_end:
+            line_end = size
+
+        result, self._buffer = self._buffer[:line_end], self._buffer[line_end:]
+        return result
+
+    def _decode_next_block(self) -> str:
+        block = self._fp.read(self._block_size)
+        final = not block
+
+        fallback_texts = {}
+        for fallback_index in self._fallback_indices:
+            try:
+                fallback_texts[fallback_index] = self._decoders[fallback_index].decode(block, final=final)
+            except UnicodeError:
+                pass
+
+        try:
+            text = self._decoders[self.encoding_index].decode(block, final=final)
+        except UnicodeError:
+            if not fallback_texts:
+                raise
+
+            previous_encoding = self.encoding
+            self.encoding_index = min(fallback_texts)
+            text = fallback_texts[self.encoding_index]
+            logging.info('Unable to decode file with encoding [%s], continuing with encoding [%s]',
+                         previous_encoding, self.encoding)
+
+        self._fallback_indices = [fallback_index for fallback_index, fallback_text in fallback_texts.items()
+                                  if fallback_index > self.encoding_index and fallback_text == text]
+        self._eof = final
+        return text
@@ -148,9 +148,8 @@ class GcsfsDirectIngestController(
             can_start_ingest=start_ingest)
 
     def _register_all_new_paths_in_metadata(self, paths: List[GcsfsFilePath]):
-        for path in paths:
-            if not self.file_metadata_manager.has_file_been_discovered(path):
-                self.file_metadata_manager.mark_file_as_discovered(path)
+        if paths:
+            self.file_metadata_manager.mark_files_as_discovered(paths)
 
     def handle_new_files(self, can_start_ingest: bool):
         """Searches the ingest directory for new/unprocessed files. Normalizes
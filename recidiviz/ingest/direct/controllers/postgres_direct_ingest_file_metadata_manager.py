@@ -18,7 +18,7 @@
 Postgres table.
 """
 import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Set
 
 from recidiviz.ingest.direct.controllers.direct_ingest_file_metadata_manager import DirectIngestFileMetadataManager
 from recidiviz.ingest.direct.controllers.direct_ingest_gcs_file_system import DIRECT_INGEST_UNPROCESSED_PREFIX
@@ -155,6 +155,87 @@ class PostgresDirectIngestFileMetadataManager(DirectIngestFileMetadataManager):
         finally:
             session.close()
 
+    def mark_files_as_discovered(self, paths: List[GcsfsFilePath]) -> None:
+        for path in paths:
+            if not path.file_name.startswith(DIRECT_INGEST_UNPROCESSED_PREFIX):
+                raise ValueError('Expect only unprocessed paths in this function.')
+
+        session = SessionFactory.for_schema_base(OperationsBase)
+
+        try:
+            rows_by_file_name = dao.get_file_metadata_rows_for_paths(session, self.region_code, paths)
+            dt = datetime.datetime.utcnow()
+            seen_file_names: Set[str] = set()
+            new_rows = []
+            for path in paths:
+                if path.file_name in seen_file_names:
+                    continue
+                seen_file_names.add(path.file_name)
+
+                parts = filename_parts_from_path(path)
+                rows = rows_by_file_name.get(path.file_name, [])
+                if parts.file_type == GcsfsDirectIngestFileType.INGEST_VIEW:
+                    if len(rows) != 1:
+                        raise ValueError(
+                            f'Unexpected number of metadata results for path {path.abs_path()}: [{len(rows)}]')
+                    metadata = rows[0]
+                    if metadata.discovery_time is None:
+                        if not metadata.export_time:
+                            metadata.export_time = dt
+                        metadata.discovery_time = dt
+                elif parts.file_type == GcsfsDirectIngestFileType.RAW_DATA:
+                    if len(rows) != 1:
+                        new_rows.append(
+                            schema.DirectIngestRawFileMetadata(
+                                region_code=self.region_code,
+                                file_tag=parts.file_tag,
+                                normalized_file_name=path.file_name,
+                                discovery_time=dt,
+                                processed_time=None,
+                                datetimes_contained_upper_bound_inclusive=parts.utc_upload_datetime
+                            )
+                        )
+                else:
+                    raise ValueError(f'Unexpected path type: {parts.file_type}')
+            session.add_all(new_rows)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def get_file_metadata_for_paths(self,
+                                    paths: List[GcsfsFilePath]) -> Dict[GcsfsFilePath, DirectIngestFileMetadata]:
+        session = SessionFactory.for_schema_base(OperationsBase)
+
+        try:
+            rows_by_file_name = dao.get_file_metadata_rows_for_paths(session, self.region_code, paths)
+
+            metadata_by_path: Dict[GcsfsFilePath, DirectIngestFileMetadata] = {}
+            for path in paths:
+                rows = rows_by_file_name.get(path.file_name)
+                if not rows:
+                    continue
+                if len(rows) != 1:
+                    raise ValueError(
+                        f'Unexpected number of metadata results for path {path.abs_path()}: [{len(rows)}]')
+                metadata = rows[0]
+
+                if isinstance(metadata, schema.DirectIngestRawFileMetadata):
+                    metadata_by_path[path] = self._raw_file_schema_metadata_as_entity(metadata)
+                elif isinstance(metadata, schema.DirectIngestIngestFileMetadata):
+                    metadata_by_path[path] = self._ingest_file_schema_metadata_as_entity(metadata)
+                else:
+                    raise ValueError(f'Unexpected metadata type: {type(metadata)}')
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+        return metadata_by_path
+
     def get_file_metadata(self, path: GcsfsFilePath) -> DirectIngestFileMetadata:
         session = SessionFactory.for_schema_base(OperationsBase)
 
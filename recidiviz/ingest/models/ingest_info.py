@@ -16,6 +16,8 @@
 # =============================================================================
 
 """Represents data scraped for a single individual."""
+import hashlib
+import json
 from abc import abstractmethod
 from typing import List, Optional
 
@@ -62,6 +64,9 @@ class IngestObject:
     def __repr__(self):
         return to_repr(self)
 
+    def fingerprint(self) -> str:
+        return fingerprint(self)
+
     @abstractmethod
     def __setattr__(self, key, value):
         """Implement using restricted_setattr"""
@@ -89,6 +94,9 @@ class IngestInfo(IngestObject):
     def __repr__(self):
         return to_repr(self, exclude=['_state_people_by_id'])
 
+    def fingerprint(self) -> str:
+        return fingerprint(self, exclude=['_state_people_by_id'])
+
     def __setattr__(self, name, value):
         restricted_setattr(self, '_state_people_by_id', name, value)
 
@@ -1661,6 +1669,30 @@ def to_repr(obj, exclude=None):
     return '{}({})'.format(obj.__class__.__name__, ', '.join(args))
 
 
+def fingerprint(obj, exclude=None) -> str:
+    """Returns a stable hash of the object's fields and all of its children. The order of repeated children does not
+    affect the result, so objects that are equal after a deep sort() always have the same fingerprint."""
+    if exclude is None:
+        exclude = []
+    fields = []
+    for key, val in sorted(vars(obj).items()):
+        if key in exclude:
+            continue
+        if isinstance(val, list):
+            val = sorted(_fingerprint_value(elem) for elem in val)
+        else:
+            val = _fingerprint_value(val)
+        fields.append([key, val])
+    serialized = json.dumps([obj.__class__.__name__, fields])
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+def _fingerprint_value(val) -> str:
+    if isinstance(val, IngestObject):
+        return val.fingerprint()
+    return repr(val)
+
+
 def restricted_setattr(self, last_field, name, value):
     if isinstance(value, str) and (value == '' or value.isspace()):
         value = None
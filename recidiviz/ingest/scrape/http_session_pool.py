@@ -0,0 +1,178 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Keeps a pool of keep-alive HTTP sessions that scrapers fetch pages with.
+
+Each worker thread holds one requests.Session per region, so consecutive page
+fetches for a region reuse open connections to the scraped site and the proxy
+rather than paying for a new TCP/TLS handshake on every page.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, Optional
+
+import attr
+import requests
+from opencensus.stats import aggregation, measure, view
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from recidiviz.utils import monitoring
+
+m_fetch_latency = measure.MeasureFloat(
+    'ingest/scrape/fetch_page_latency',
+    'The time taken to fetch a page', 'ms')
+m_fetches = measure.MeasureInt(
+    'ingest/scrape/fetch_page_count',
+    'The count of pages fetched', '1')
+m_new_connections = measure.MeasureInt(
+    'ingest/scrape/fetch_page_new_connections',
+    'The count of connections opened to fetch pages', '1')
+
+fetch_latency_view = view.View(
+    'recidiviz/ingest/scrape/fetch_page_latency',
+    'The distribution of page fetch latencies',
+    [monitoring.TagKey.REGION, monitoring.TagKey.STATUS],
+    m_fetch_latency,
+    aggregation.DistributionAggregation(
+        [25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]))
+fetch_count_view = view.View(
+    'recidiviz/ingest/scrape/fetch_page_count',
+    'The sum of pages fetched',
+    [monitoring.TagKey.REGION, monitoring.TagKey.STATUS],
+    m_fetches, aggregation.SumAggregation())
+new_connections_view = view.View(
+    'recidiviz/ingest/scrape/fetch_page_new_connections',
+    'The sum of connections opened to fetch pages, which together with the '
+    'count of pages fetched gives the connection reuse rate',
+    [monitoring.TagKey.REGION, monitoring.TagKey.STATUS],
+    m_new_connections, aggregation.SumAggregation())
+monitoring.register_views(
+    [fetch_latency_view, fetch_count_view, new_connections_view])
+
+
+@attr.s(frozen=True)
+class HttpPoolConfig:
+    """Connection pool settings for the sessions of a region. Any of these can
+    be overridden with the `http_pool` field of the region's manifest."""
+
+    # Number of hosts (site and proxy) to keep connection pools for.
+    pool_connections: int = attr.ib(default=10)
+
+    # Number of open connections to keep per host.
+    pool_maxsize: int = attr.ib(default=10)
+
+    # Number of times to retry a failed connection, read or idempotent request
+    # that got one of |retry_statuses|, and the backoff between attempts.
+    max_retries: int = attr.ib(default=3)
+    backoff_factor: float = attr.ib(default=0.5)
+    retry_statuses: tuple = attr.ib(default=(502, 503, 504), converter=tuple)
+
+
+class _BlockAllCookiesPolicy(DefaultCookiePolicy):
+    """Keeps response cookies out of the session's cookie jar. Scrapers pass
+    cookies explicitly on each request, so a pooled session must not carry
+    cookies over from one scrape task to the next."""
+
+    def set_ok(self, cookie, request):
+        return False
+
+
+_local = threading.local()
+
+
+def get_session(region_code: str,
+                overrides: Optional[Dict[str, Any]] = None) -> requests.Session:
+    """Returns the current thread's session for the region with the given
+    |region_code|, creating it with the given pool config |overrides| if this
+    thread has not fetched a page for the region yet."""
+    sessions = getattr(_local, 'sessions', None)
+    if sessions is None:
+        sessions = _local.sessions = {}
+
+    if region_code not in sessions:
+        sessions[region_code] = _create_session(
+            HttpPoolConfig(**(overrides or {})))
+    return sessions[region_code]
+
+
+def close_sessions() -> None:
+    """Closes all of the current thread's sessions and their connections."""
+    sessions = getattr(_local, 'sessions', {})
+    for session in sessions.values():
+        session.close()
+    sessions.clear()
+
+
+def _create_session(config: HttpPoolConfig) -> requests.Session:
+    session = requests.Session()
+    session.cookies.set_policy(_BlockAllCookiesPolicy())
+
+    retries = Retry(total=config.max_retries,
+                    backoff_factor=config.backoff_factor,
+                    status_forcelist=config.retry_statuses,
+                    raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=config.pool_connections,
+                          pool_maxsize=config.pool_maxsize,
+                          max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+@contextmanager
+def measure_fetch(region_code: str, session: requests.Session):
+    """Records the latency of the fetch made inside the block and the number
+    of new connections it had to open, tagged by whether it succeeded."""
+    connections_before = _count_connections_opened(session)
+    start = time.perf_counter()
+    status = 'COMPLETED'
+    try:
+        yield
+    except Exception:
+        status = 'FAILED'
+        raise
+    finally:
+        latency_ms = (time.perf_counter() - start) * 1000
+        new_connections = \
+            max(_count_connections_opened(session) - connections_before, 0)
+        with monitoring.measurements({
+                monitoring.TagKey.REGION: region_code,
+                monitoring.TagKey.STATUS: status}) as measurements:
+            measurements.measure_float_put(m_fetch_latency, latency_ms)
+            measurements.measure_int_put(m_fetches, 1)
+            measurements.measure_int_put(m_new_connections, new_connections)
+
+
+def _count_connections_opened(session: requests.Session) -> int:
+    """Returns the number of connections the session's adapters have opened
+    across all of their direct and proxied host pools."""
+    total = 0
+    for adapter in set(session.adapters.values()):
+        if not isinstance(adapter, HTTPAdapter):
+            continue
+        managers = [adapter.poolmanager, *adapter.proxy_manager.values()]
+        for manager in managers:
+            # Iterating the pool container directly is not supported, so go
+            # through its keys.
+            for key in manager.pools.keys():
+                pool = manager.pools.get(key)
+                if pool is not None:
+                    total += pool.num_connections
+    return total
@@ -29,8 +29,8 @@ import urllib3
 
 from recidiviz.ingest.ingestor import Ingestor
 from recidiviz.ingest.models.scrape_key import ScrapeKey
-from recidiviz.ingest.scrape import (constants, scraper_utils, sessions,
-                                     tracker)
+from recidiviz.ingest.scrape import (constants, http_session_pool,
+                                     scraper_utils, sessions, tracker)
 from recidiviz.ingest.scrape.constants import BATCH_PUBSUB_TYPE
 from recidiviz.ingest.scrape.scraper_cloud_task_manager import \
     ScraperCloudTaskManager
@@ -255,13 +255,15 @@ class Scraper(Ingestor, metaclass=abc.ABCMeta):
                                    scraper_start_time=datetime.now(),
                                    next_task=self.get_initial_task()))
 
-    @staticmethod
-    def fetch_page(url, headers=None, cookies=None, params=None,
+    def fetch_page(self, url, headers=None, cookies=None, params=None,
                    post_data=None, json_data=None, should_proxy=True):
         """Fetch content from a URL. If data is None (the default), we perform
         a GET for the page. If the data is set, it must be a dict of parameters
         to use as POST data in a POST request to the url.
 
+        Requests go through this worker's pooled session for the region, so
+        connections to the site and proxy are kept alive between pages.
+
         Args:
             url: (string) URL to fetch content from
             headers: (dict) any headers to send in addition to the default
@@ -286,21 +288,26 @@ class Scraper(Ingestor, metaclass=abc.ABCMeta):
         if 'User-Agent' not in headers:
             headers.update(scraper_utils.get_headers())
 
+        region = self.get_region()
+        session = http_session_pool.get_session(region.region_code,
+                                                region.http_pool)
         try:
-            if post_data is None and json_data is None:
-                page = requests.get(
-                    url, proxies=proxies, headers=headers, cookies=cookies,
-                    params=params, verify=False)
-            elif params is None:
-                page = requests.post(
-                    url, proxies=proxies, headers=headers, cookies=cookies,
-                    data=post_data, json=json_data, verify=False)
-            else:
-                raise ValueError(
-                    "Both params ({}) for a GET request and either post_data "
-                    "({}) or json_data ({}) for a POST request were set." \
-                        .format(params, post_data, json_data))
-            page.raise_for_status()
+            with http_session_pool.measure_fetch(region.region_code, session):
+                if post_data is None and json_data is None:
+                    page = session.get(
+                        url, proxies=proxies, headers=headers,
+                        cookies=cookies, params=params, verify=False)
+                elif params is None:
+                    page = session.post(
+                        url, proxies=proxies, headers=headers,
+                        cookies=cookies, data=post_data, json=json_data,
+                        verify=False)
+                else:
+                    raise ValueError(
+                        "Both params ({}) for a GET request and either "
+                        "post_data ({}) or json_data ({}) for a POST request "
+                        "were set.".format(params, post_data, json_data))
+                page.raise_for_status()
         except requests.exceptions.RequestException as ce:
             raise FetchPageError(ce.request, ce.response)
 
@@ -134,14 +134,28 @@ def _dedup_people(ingest_infos: List[IngestInfo]) -> IngestInfo:
     unique_people: List[Person] = []
     duplicate_people: List[Person] = []
 
+    # People are bucketed by fingerprint so that each person is only compared
+    # against the (almost always zero or one) people with the same fingerprint,
+    # with full equality still checked in case of a hash collision.
+    unique_people_by_fingerprint: Dict[str, List[Person]] = {}
+    duplicate_people_by_fingerprint: Dict[str, List[Person]] = {}
+
     for ingest_info in ingest_infos:
         for person in ingest_info.people:
             # Sort deeply so that repeated fields are compared in a consistent
             # order.
             person.sort()
-            if person not in unique_people:
+            person_fingerprint = person.fingerprint()
+            matching_unique_people = unique_people_by_fingerprint.setdefault(
+                person_fingerprint, [])
+            matching_duplicate_people = \
+                duplicate_people_by_fingerprint.setdefault(
+                    person_fingerprint, [])
+            if person not in matching_unique_people:
+                matching_unique_people.append(person)
                 unique_people.append(person)
-            elif person not in duplicate_people:
+            elif person not in matching_duplicate_people:
+                matching_duplicate_people.append(person)
                 duplicate_people.append(person)
     if duplicate_people:
         logging.info("Removed %d duplicate people: %s", len(duplicate_people),
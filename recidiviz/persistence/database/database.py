@@ -37,16 +37,21 @@ _DUMMY_BOOKING_ID = -1
 def write_people(session: Session,
                  people: List[SchemaPersonType],
                  metadata: IngestMetadata,
-                 orphaned_entities: List[DatabaseEntity] = None):
+                 orphaned_entities: List[DatabaseEntity] = None,
+                 use_bulk_snapshot_updates: bool = False):
     """
     Converts the given |people| into (SchemaPersonType) objects and persists
     their corresponding record trees. Returns the list of persisted
     (SchemaPersonType) objects.
+
+    If |use_bulk_snapshot_updates| is True, historical snapshots are fetched and
+    inserted in bulk. See BaseHistoricalSnapshotUpdater.
     """
     if not orphaned_entities:
         orphaned_entities = []
 
-    return _save_record_trees(session, people, orphaned_entities, metadata)
+    return _save_record_trees(session, people, orphaned_entities, metadata,
+                              use_bulk_snapshot_updates)
 
 
 def write_person(session: Session,
@@ -71,7 +76,8 @@ def write_person(session: Session,
 def _save_record_trees(session: Session,
                        root_people: List[SchemaPersonType],
                        orphaned_entities: List[DatabaseEntity],
-                       metadata: IngestMetadata):
+                       metadata: IngestMetadata,
+                       use_bulk_snapshot_updates: bool = False):
     """Persists all record trees rooted at |root_people|. Also performs any
     historical snapshot updates required for any entities in any of these
     record trees. Returns the list of persisted (SchemaPersonType) objects.
@@ -129,7 +135,8 @@ def _save_record_trees(session: Session,
             f"Unexpected system level [{metadata.system_level}]")
 
     update_snapshots.update_historical_snapshots(
-        session, merged_root_people, merged_orphaned_entities, metadata)
+        session, merged_root_people, merged_orphaned_entities, metadata,
+        use_bulk_operations=use_bulk_snapshot_updates)
 
     return merged_root_people
 
@@ -24,10 +24,15 @@ Run this export locally with the following command:
 
 """
 import argparse
+from concurrent import futures
 from http import HTTPStatus
 import json
 import logging
 import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import sqlalchemy
 
 import flask
 from flask import request
@@ -113,22 +118,10 @@ def export_all_then_load_all(big_query_client: BigQueryClient, schema_type: Sche
     4. Load Tables A, B, C in parallel.
     """
 
-    if schema_type == SchemaType.JAILS:
-        tables_to_export = export_config.COUNTY_TABLES_TO_EXPORT
-        base_tables_dataset_ref = big_query_client.dataset_ref_for_id(county_dataset_config.COUNTY_BASE_DATASET)
-        export_queries = export_config.COUNTY_TABLE_EXPORT_QUERIES
-    elif schema_type == SchemaType.STATE:
-        tables_to_export = export_config.STATE_TABLES_TO_EXPORT
-        base_tables_dataset_ref = big_query_client.dataset_ref_for_id(state_dataset_config.STATE_BASE_DATASET)
-        export_queries = export_config.STATE_TABLE_EXPORT_QUERIES
-    elif schema_type == SchemaType.OPERATIONS:
-        tables_to_export = export_config.OPERATIONS_TABLES_TO_EXPORT
-        base_tables_dataset_ref = big_query_client.dataset_ref_for_id(operations_dataset_config.OPERATIONS_BASE_DATASET)
-        export_queries = export_config.OPERATIONS_TABLE_EXPORT_QUERIES
-    else:
-        logging.error("Invalid schema_type requested. Must be"
-                      " SchemaType.JAILS, or SchemaType.STATE or SchemaType.OPERATIONS.")
+    export_params = _export_params_for_schema_type(big_query_client, schema_type)
+    if not export_params:
         return
+    tables_to_export, base_tables_dataset_ref, export_queries = export_params
 
     logging.info("Beginning CloudSQL export")
     cloudsql_export.export_all_tables(schema_type,
@@ -140,6 +133,104 @@ def export_all_then_load_all(big_query_client: BigQueryClient, schema_type: Sche
         big_query_client, base_tables_dataset_ref, tables_to_export, schema_type)
 
 
+def export_all_and_load_all_pipelined(big_query_client: BigQueryClient,
+                                      schema_type: SchemaType,
+                                      max_concurrent_exports: int = 1):
+    """Export all tables from Cloud SQL in the given schema and load them to
+    BigQuery, starting the BigQuery load of each table as soon as its export
+    completes.
+
+    At most |max_concurrent_exports| exports run at once. This defaults to 1,
+    since Cloud SQL only supports one operation at a time per instance. Loads
+    are not limited, and overlap with the exports of the remaining tables.
+
+    For example, for tables A, B, C:
+    1. Export Table A
+    2. Export Table B, while loading Table A
+    3. Export Table C, while loading Tables A, B
+    4. Load Tables A, B, C until all are complete.
+    """
+    export_params = _export_params_for_schema_type(big_query_client, schema_type)
+    if not export_params:
+        return
+    tables_to_export, base_tables_dataset_ref, export_queries = export_params
+
+    logging.info("Beginning pipelined CloudSQL export and BQ table load of "
+                 "[%d] tables with up to [%d] concurrent exports",
+                 len(tables_to_export), max_concurrent_exports)
+    start = time.perf_counter()
+    load_futures: List[futures.Future] = []
+    with futures.ThreadPoolExecutor(max_workers=max_concurrent_exports) as export_executor, \
+            futures.ThreadPoolExecutor(max_workers=max(len(tables_to_export), 1)) as load_executor:
+        export_futures = {
+            export_executor.submit(_export_table_timed, schema_type, table.name, export_queries): table.name
+            for table in tables_to_export
+        }
+        for export_future in futures.as_completed(export_futures):
+            table_name = export_futures[export_future]
+            if export_future.result():
+                load_futures.append(load_executor.submit(
+                    _load_table_timed, big_query_client, base_tables_dataset_ref, table_name, schema_type))
+            else:
+                logging.error("Skipping BigQuery load of table [%s], "
+                              "which failed to export.", table_name)
+
+        num_loaded = sum(1 for load_future in futures.as_completed(load_futures) if load_future.result())
+
+    logging.info("Exported and loaded [%d] of [%d] tables in [%.2f] seconds",
+                 num_loaded, len(tables_to_export), time.perf_counter() - start)
+
+
+def _export_params_for_schema_type(big_query_client: BigQueryClient, schema_type: SchemaType) \
+        -> Optional[Tuple[Tuple[sqlalchemy.Table, ...], bigquery.dataset.DatasetReference, Dict[str, str]]]:
+    """Returns the tables to export, the BigQuery dataset to load them into and
+    the export queries for the given schema, or None if the schema_type is
+    invalid."""
+    if schema_type == SchemaType.JAILS:
+        return (export_config.COUNTY_TABLES_TO_EXPORT,
+                big_query_client.dataset_ref_for_id(county_dataset_config.COUNTY_BASE_DATASET),
+                export_config.COUNTY_TABLE_EXPORT_QUERIES)
+    if schema_type == SchemaType.STATE:
+        return (export_config.STATE_TABLES_TO_EXPORT,
+                big_query_client.dataset_ref_for_id(state_dataset_config.STATE_BASE_DATASET),
+                export_config.STATE_TABLE_EXPORT_QUERIES)
+    if schema_type == SchemaType.OPERATIONS:
+        return (export_config.OPERATIONS_TABLES_TO_EXPORT,
+                big_query_client.dataset_ref_for_id(operations_dataset_config.OPERATIONS_BASE_DATASET),
+                export_config.OPERATIONS_TABLE_EXPORT_QUERIES)
+
+    logging.error("Invalid schema_type requested. Must be"
+                  " SchemaType.JAILS, or SchemaType.STATE or SchemaType.OPERATIONS.")
+    return None
+
+
+def _export_table_timed(schema_type: SchemaType, table_name: str, export_queries: Dict[str, str]) -> bool:
+    try:
+        export_query = export_queries[table_name]
+    except KeyError:
+        logging.exception(
+            "Unknown table name [%s]. Is it listed in "
+            "the TABLES_TO_EXPORT for the %s schema_type?", table_name, schema_type)
+        return False
+
+    start = time.perf_counter()
+    export_success = cloudsql_export.export_table(schema_type, table_name, export_query)
+    logging.info("Export of table [%s] finished in [%.2f] seconds with success [%s]",
+                 table_name, time.perf_counter() - start, export_success)
+    return export_success
+
+
+def _load_table_timed(big_query_client: BigQueryClient,
+                      dataset_ref: bigquery.dataset.DatasetReference,
+                      table_name: str,
+                      schema_type: SchemaType) -> bool:
+    start = time.perf_counter()
+    load_success = bq_load.start_table_load_and_wait(big_query_client, dataset_ref, table_name, schema_type)
+    logging.info("Load of table [%s] finished in [%.2f] seconds with success [%s]",
+                 table_name, time.perf_counter() - start, load_success)
+    return load_success
+
+
 export_manager_blueprint = flask.Blueprint('export_manager', __name__)
 
 
@@ -301,4 +392,4 @@ if __name__ == '__main__':
         raise ValueError(f"Unsupported schema type {known_args.local_export_schema_type}")
 
     with local_project_id_override(known_args.project_id):
-        export_all_then_load_all(BigQueryClientImpl(), local_export_schema_type)
+        export_all_and_load_all_pipelined(BigQueryClientImpl(), local_export_schema_type)
@@ -23,11 +23,12 @@ See BaseHistoricalSnapshotUpdater for further documentation.
 
 import abc
 from datetime import datetime
+import functools
 import logging
 from collections import defaultdict
 
 from types import ModuleType
-from typing import List, Generic, Type, Set, Callable, Optional, Dict
+from typing import Any, List, Generic, Type, Set, Callable, Optional, Dict
 
 import attr
 
@@ -44,6 +45,10 @@ from recidiviz.persistence.database.schema_utils import \
     HISTORICAL_TABLE_CLASS_SUFFIX
 from recidiviz.persistence.entity.entity_utils import SchemaEdgeDirectionChecker
 
+# Name of the temporary table the master entity ids are staged in when
+# fetching the most recent snapshots in bulk
+_SNAPSHOT_ENTITY_IDS_TEMP_TABLE_NAME = 'snapshot_entity_ids'
+
 
 class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
     """
@@ -59,8 +64,16 @@ class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
         referencing the primary key column 'person_id' on table 'person')
     If either of these assumptions are broken, this module will not behave
     as expected.
+
+    If |use_bulk_operations| is True, the ids of all master entities are staged
+    in a temporary table to fetch their most recent snapshots, instead of being
+    interpolated into the snapshot queries, and new snapshots are inserted in
+    bulk instead of being merged into the session one at a time.
     """
 
+    def __init__(self, use_bulk_operations: bool = False):
+        self._use_bulk_operations = use_bulk_operations
+
     @abc.abstractmethod
     def get_system_level(self) -> SystemLevel:
         """Returns the system level for this snapshot updater."""
@@ -134,9 +147,14 @@ class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
         logging.info("%s master entities registered for snapshot check",
                      len(context_registry.all_contexts()))
 
-        most_recent_snapshots = \
-            self._fetch_most_recent_snapshots_for_all_entities(
-                session, root_entities, schema)
+        if self._use_bulk_operations:
+            most_recent_snapshots = \
+                self._fetch_most_recent_snapshots_for_all_entities_bulk(
+                    session, root_entities, schema)
+        else:
+            most_recent_snapshots = \
+                self._fetch_most_recent_snapshots_for_all_entities(
+                    session, root_entities, schema)
         for snapshot in most_recent_snapshots:
             context_registry.add_snapshot(snapshot, schema)
 
@@ -153,9 +171,20 @@ class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
         logging.info(
             "Provided start and end times set for registered entities")
 
+        new_snapshots: List[DatabaseEntity] = []
+        add_new_snapshot: Callable[[DatabaseEntity], Any] = \
+            new_snapshots.append if self._use_bulk_operations \
+            else session.merge
         for snapshot_context in context_registry.all_contexts():
             self._write_snapshots(session, snapshot_context,
-                                  ingest_metadata.ingest_time, schema)
+                                  ingest_metadata.ingest_time, schema,
+                                  add_new_snapshot)
+
+        if new_snapshots:
+            # Sorted so that all snapshots of a type are inserted in one batch
+            session.bulk_save_objects(
+                sorted(new_snapshots,
+                       key=lambda snapshot: type(snapshot).__name__))
 
         logging.info("All historical snapshots written")
 
@@ -168,13 +197,8 @@ class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
         all graphs reachable from |root_entities|, if one exists.
         """
 
-        # Consolidate all master entity IDs for each type, so that each
-        # historical table only needs to be queried once
-        ids_by_entity_type_name: Dict[str, Set[int]] = defaultdict(set)
-        self._execute_action_for_all_entities(
-            root_entities,
-            lambda entity: ids_by_entity_type_name[type(entity).__name__]
-            .add(entity.get_primary_key()))
+        ids_by_entity_type_name = self._get_ids_by_entity_type_name(
+            root_entities)
 
         snapshots: List[DatabaseEntity] = []
         for type_name, ids in ids_by_entity_type_name.items():
@@ -183,6 +207,90 @@ class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
                 session, master_class, ids, schema))
         return snapshots
 
+    def _fetch_most_recent_snapshots_for_all_entities_bulk(
+            self,
+            session: Session,
+            root_entities: List[DatabaseEntity],
+            schema: ModuleType) -> List[DatabaseEntity]:
+        """Returns a list containing the most recent snapshot for each entity in
+        all graphs reachable from |root_entities|, if one exists.
+
+        Rather than interpolating the ids of all entities into the queries, the
+        ids of all types are inserted into a temporary table in a single batch,
+        which each historical table is then joined against. The temporary table
+        is created and dropped within the current transaction.
+        """
+        ids_by_entity_type_name = self._get_ids_by_entity_type_name(
+            root_entities)
+        staged_ids = [{'entity_type': type_name, 'entity_id': entity_id}
+                      for type_name, ids in ids_by_entity_type_name.items()
+                      for entity_id in ids]
+        if not staged_ids:
+            return []
+
+        session.execute(text(
+            f'CREATE TEMPORARY TABLE {_SNAPSHOT_ENTITY_IDS_TEMP_TABLE_NAME} '
+            f'(entity_type VARCHAR(255) NOT NULL, entity_id INTEGER NOT NULL)'))
+        session.execute(
+            text(f'INSERT INTO {_SNAPSHOT_ENTITY_IDS_TEMP_TABLE_NAME} '
+                 f'(entity_type, entity_id) VALUES (:entity_type, :entity_id)'),
+            staged_ids)
+
+        snapshots: List[DatabaseEntity] = []
+        for type_name in ids_by_entity_type_name:
+            master_class = getattr(schema, type_name)
+            history_table_class = _get_historical_class(master_class, schema)
+            snapshots.extend(
+                session.query(history_table_class).from_statement(
+                    text(self._most_recent_open_snapshots_for_staged_ids_query(
+                        master_class, history_table_class)))
+                .params(entity_type=type_name)
+                .all())
+
+        session.execute(
+            text(f'DROP TABLE {_SNAPSHOT_ENTITY_IDS_TEMP_TABLE_NAME}'))
+        return snapshots
+
+    @staticmethod
+    def _most_recent_open_snapshots_for_staged_ids_query(
+            master_class: Type, history_table_class: Type) -> str:
+        """Returns a query selecting the most recent snapshot of each entity
+        of |master_class| staged in the temporary ids table, if that snapshot is
+        open. See _fetch_most_recent_snapshots_for_entity_type.
+        """
+        history_table_name = history_table_class.__table__.name
+        # See module assumption #2
+        master_table_primary_key_col_name = \
+            master_class.get_primary_key_column_name()
+
+        return f'''
+        SELECT history.*
+        FROM {history_table_name} history
+        JOIN {_SNAPSHOT_ENTITY_IDS_TEMP_TABLE_NAME} staged_ids
+        ON staged_ids.entity_type = :entity_type
+          AND staged_ids.entity_id = history.{master_table_primary_key_col_name}
+        WHERE history.valid_to IS NULL
+          AND history.valid_from = (
+            SELECT MAX(valid_from)
+            FROM {history_table_name} most_recent
+            WHERE most_recent.{master_table_primary_key_col_name} =
+                history.{master_table_primary_key_col_name}
+          )
+        '''
+
+    def _get_ids_by_entity_type_name(
+            self, root_entities: List[DatabaseEntity]) -> Dict[str, Set[int]]:
+        """Returns the ids of all entities in all graphs reachable from
+        |root_entities|, grouped by entity type name."""
+        # Consolidate all master entity IDs for each type, so that each
+        # historical table only needs to be queried once
+        ids_by_entity_type_name: Dict[str, Set[int]] = defaultdict(set)
+        self._execute_action_for_all_entities(
+            root_entities,
+            lambda entity: ids_by_entity_type_name[type(entity).__name__]
+            .add(entity.get_primary_key()))
+        return ids_by_entity_type_name
+
     def _fetch_most_recent_snapshots_for_entity_type(
             self,
             session: Session,
@@ -256,10 +364,12 @@ class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
                          session: Session,
                          context: '_SnapshotContext',
                          snapshot_time: datetime,
-                         schema: ModuleType) -> None:
+                         schema: ModuleType,
+                         add_new_snapshot: Callable[[DatabaseEntity], Any]) \
+            -> None:
         """
         Writes snapshots for any new entities and any entities that have
-        changes.
+        changes. New snapshots are passed to |add_new_snapshot|.
 
         If an entity has no existing snapshots and has a provided start time
         earlier than |snapshot_time|, will backdate the snapshot to the provided
@@ -290,17 +400,17 @@ class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
 
         if context.most_recent_snapshot is None:
             self._write_snapshots_for_new_entities(
-                session, context, snapshot_time, schema)
+                context, snapshot_time, schema, add_new_snapshot)
         else:
             self._write_snapshots_for_existing_entities(
-                session, context, snapshot_time, schema)
+                session, context, snapshot_time, schema, add_new_snapshot)
 
     def _write_snapshots_for_new_entities(
             self,
-            session: Session,
             context: '_SnapshotContext',
             snapshot_time: datetime,
-            schema) -> None:
+            schema,
+            add_new_snapshot: Callable[[DatabaseEntity], Any]) -> None:
         """Writes snapshots for any new entities, including any required manual
         adjustments based on provided start and end times
         """
@@ -336,7 +446,7 @@ class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
         # Snapshot must be merged separately from record tree, as they are not
         # included in the ORM model relationships (to avoid needing to load
         # the entire snapshot chain at once)
-        session.merge(new_historical_snapshot)
+        add_new_snapshot(new_historical_snapshot)
 
         # If both start and end time were provided, an earlier snapshot needs to
         # be created, reflecting the state of the entity before its current
@@ -350,13 +460,14 @@ class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
 
             self.post_process_initial_snapshot(context, initial_snapshot)
 
-            session.merge(initial_snapshot)
+            add_new_snapshot(initial_snapshot)
 
     def _write_snapshots_for_existing_entities(
             self,
             session: Session, context: '_SnapshotContext',
             snapshot_time: datetime,
-            schema: ModuleType) -> None:
+            schema: ModuleType,
+            add_new_snapshot: Callable[[DatabaseEntity], Any]) -> None:
         """Writes snapshot updates for entities that already have snapshots
         present in the database
         """
@@ -370,7 +481,7 @@ class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
         # Snapshot must be merged separately from record tree, as they are not
         # included in the ORM model relationships (to avoid needing to load
         # the entire snapshot chain at once)
-        session.merge(new_historical_snapshot)
+        add_new_snapshot(new_historical_snapshot)
 
         # Close last snapshot if one is present
         if context.most_recent_snapshot is not None:
@@ -501,6 +612,7 @@ class BaseHistoricalSnapshotUpdater(Generic[SchemaPersonType]):
                 entity.get_primary_key())  # type: ignore
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def _get_shared_column_property_names(entity_class_a: Type,
                                           entity_class_b: Type) -> List[str]:
         """Returns a set of all column property names shared between
@@ -42,7 +42,8 @@ from recidiviz.persistence.database.schema.state import schema as state_schema
 def update_historical_snapshots(session: Session,
                                 root_people: List[SchemaPersonType],
                                 orphaned_schema_objects: List[DatabaseEntity],
-                                ingest_metadata: IngestMetadata) -> None:
+                                ingest_metadata: IngestMetadata,
+                                use_bulk_operations: bool = False) -> None:
     """For all entities in all record trees rooted at |root_people| and all
     entities in |orphaned_schema_objects|, performs any required historical
     snapshot updates.
@@ -56,13 +57,18 @@ def update_historical_snapshots(session: Session,
     start time of |snapshot_time|.
 
     If neither of these cases applies, no action will be taken on the entity.
+
+    If |use_bulk_operations| is True, snapshots are fetched and inserted in bulk.
+    See BaseHistoricalSnapshotUpdater.
     """
     if all(isinstance(person, county_schema.Person) for person in root_people):
-        CountyHistoricalSnapshotUpdater().update_historical_snapshots(
+        CountyHistoricalSnapshotUpdater(
+            use_bulk_operations).update_historical_snapshots(
             session, root_people, orphaned_schema_objects, ingest_metadata)
     elif all(isinstance(person,
                         state_schema.StatePerson) for person in root_people):
-        StateHistoricalSnapshotUpdater().update_historical_snapshots(
+        StateHistoricalSnapshotUpdater(
+            use_bulk_operations).update_historical_snapshots(
             session, root_people, orphaned_schema_objects, ingest_metadata)
     else:
         raise ValueError(f'Expected all types to be the same type, and one of '
@@ -16,7 +16,8 @@
 # =============================================================================
 """Data Access Object (DAO) with logic for accessing operations DB information from a SQL Database."""
 import datetime
-from typing import Union, Optional, List
+from collections import defaultdict
+from typing import Union, Optional, List, Dict
 
 from more_itertools import one
 
@@ -75,6 +76,42 @@ def get_file_metadata_row_for_path(
     return one(results)
 
 
+def get_file_metadata_rows_for_paths(
+        session: Session,
+        region_code: str,
+        paths: List[GcsfsFilePath]
+) -> Dict[str, List[Union[schema.DirectIngestRawFileMetadata, schema.DirectIngestIngestFileMetadata]]]:
+    """Returns all metadata rows for the provided paths, keyed by normalized file name, using at most one query per
+    file type. File names that have not yet been registered in the appropriate metadata table are omitted.
+    """
+
+    file_names_by_type: Dict[GcsfsDirectIngestFileType, List[str]] = defaultdict(list)
+    for path in paths:
+        file_names_by_type[filename_parts_from_path(path).file_type].append(path.file_name)
+
+    results: List[Union[schema.DirectIngestRawFileMetadata, schema.DirectIngestIngestFileMetadata]] = []
+    for file_type, file_names in file_names_by_type.items():
+        if file_type == GcsfsDirectIngestFileType.INGEST_VIEW:
+            results.extend(session.query(schema.DirectIngestIngestFileMetadata).filter_by(
+                region_code=region_code,
+                is_invalidated=False
+            ).filter(schema.DirectIngestIngestFileMetadata.normalized_file_name.in_(file_names)).all())
+        elif file_type == GcsfsDirectIngestFileType.RAW_DATA:
+            results.extend(session.query(schema.DirectIngestRawFileMetadata).filter_by(
+                region_code=region_code
+            ).filter(schema.DirectIngestRawFileMetadata.normalized_file_name.in_(file_names)).all())
+        else:
+            raise ValueError(f'Unexpected path type: {file_type}')
+
+    rows_by_file_name: Dict[
+        str, List[Union[schema.DirectIngestRawFileMetadata, schema.DirectIngestIngestFileMetadata]]] = \
+        defaultdict(list)
+    for result in results:
+        rows_by_file_name[result.normalized_file_name].append(result)
+
+    return rows_by_file_name
+
+
 def get_ingest_view_metadata_for_export_job(
         session: Session,
         region_code: str,
@@ -22,7 +22,8 @@ import logging
 from collections import defaultdict
 from enum import Enum, auto
 from types import ModuleType
-from typing import Dict, List, Set, Type, Sequence, Optional, Union, cast, Iterable
+from typing import AbstractSet, Dict, FrozenSet, List, Set, Tuple, Type, Sequence, Optional, Union, cast, \
+    Iterable
 from functools import lru_cache
 
 import attr
@@ -93,11 +94,17 @@ class SchemaEdgeDirectionChecker:
         self._class_hierarchy_map: Dict[str, int] = \
             _build_class_hierarchy_map(class_hierarchy, module)
 
+        # Cache of is_back_edge results, keyed by (from class, field name). Edge direction only depends on the
+        # class of the object and the schema, so this never needs to be invalidated.
+        self._is_back_edge_cache: Dict[Tuple[type, str], bool] = {}
+
     @classmethod
+    @lru_cache(maxsize=None)
     def state_direction_checker(cls):
         return cls(_STATE_CLASS_HIERARCHY, state_entities)
 
     @classmethod
+    @lru_cache(maxsize=None)
     def county_direction_checker(cls):
         return cls(_COUNTY_CLASS_HIERARCHY, county_entities)
 
@@ -117,17 +124,29 @@ class SchemaEdgeDirectionChecker:
                 to_field_name is a back edge, i.e. it travels in a direction
                 opposite to the class hierarchy.
         """
-        from_class_name = from_obj.__class__.__name__
-
         if isinstance(from_obj, DatabaseEntity):
-            to_class_name = \
-                from_obj.get_relationship_property_class_name(to_field_name)
-        elif isinstance(from_obj, Entity):
+            return self.is_database_entity_back_edge(from_obj.__class__, to_field_name)
+
+        cache_key = (from_obj.__class__, to_field_name)
+        if cache_key not in self._is_back_edge_cache:
+            if not isinstance(from_obj, Entity):
+                raise ValueError(f'Unexpected type [{type(from_obj)}]')
             to_class_name = get_non_flat_property_class_name(from_obj,
                                                              to_field_name)
-        else:
-            raise ValueError(f'Unexpected type [{type(from_obj)}]')
-
+            self._is_back_edge_cache[cache_key] = self._is_back_edge_to_class_name(
+                from_obj.__class__.__name__, to_class_name)
+        return self._is_back_edge_cache[cache_key]
+
+    def is_database_entity_back_edge(self, from_cls: Type[DatabaseEntity], to_field_name: str) -> bool:
+        """Same as is_back_edge, for an edge from any object of the DatabaseEntity class |from_cls|."""
+        cache_key = (from_cls, to_field_name)
+        if cache_key not in self._is_back_edge_cache:
+            to_class_name = from_cls.get_relationship_property_class_name(to_field_name)
+            self._is_back_edge_cache[cache_key] = self._is_back_edge_to_class_name(
+                from_cls.__name__, to_class_name)
+        return self._is_back_edge_cache[cache_key]
+
+    def _is_back_edge_to_class_name(self, from_class_name: str, to_class_name: Optional[str]) -> bool:
         if to_class_name is None:
             return False
 
@@ -259,8 +278,8 @@ def get_set_entity_field_names(
         entity: CoreEntity,
         entity_field_type: EntityFieldType) -> Set[str]:
     result = set()
-    for field_name in get_all_core_entity_field_names(entity,
-                                                      entity_field_type):
+    for field_name in _get_all_core_entity_field_names(entity,
+                                                       entity_field_type):
         v = entity.get_field(field_name)
         if isinstance(v, list):
             if v:
@@ -276,6 +295,16 @@ def get_all_core_entity_field_names(
     """Returns a set of field_names that correspond to any set fields on the
     provided |entity| that match the provided |entity_field_type|.
     """
+    return set(_get_all_core_entity_field_names(entity, entity_field_type))
+
+
+def _get_all_core_entity_field_names(
+        entity: CoreEntity,
+        entity_field_type: EntityFieldType) -> AbstractSet[str]:
+    """Returns a set of field_names that correspond to any set fields on the
+    provided |entity| that match the provided |entity_field_type|. The returned
+    set may be shared between calls and must not be modified.
+    """
     if entity.get_entity_name().startswith('state_'):
         direction_checker = SchemaEdgeDirectionChecker.state_direction_checker()
     else:
@@ -283,9 +312,8 @@ def get_all_core_entity_field_names(
             SchemaEdgeDirectionChecker.county_direction_checker()
 
     if isinstance(entity, DatabaseEntity):
-        return _get_all_database_entity_field_names(entity,
-                                                    entity_field_type,
-                                                    direction_checker)
+        return _get_database_entity_field_names_by_type(
+            entity.__class__, direction_checker)[entity_field_type]
     if isinstance(entity, Entity):
         return _get_all_entity_field_names(entity,
                                            entity_field_type,
@@ -294,42 +322,39 @@ def get_all_core_entity_field_names(
     raise ValueError(f"Invalid entity type [{type(entity)}]")
 
 
-def _get_all_database_entity_field_names(entity: DatabaseEntity,
-                                         entity_field_type: EntityFieldType,
-                                         direction_checker):
-    """Returns a set of field_names that correspond to any set fields on the
-    provided DatabaseEntity |entity| that match the provided
-    |entity_field_type|.
+@lru_cache(maxsize=None)
+def _get_database_entity_field_names_by_type(
+        entity_cls: Type[DatabaseEntity],
+        direction_checker: SchemaEdgeDirectionChecker) -> Dict[EntityFieldType, FrozenSet[str]]:
+    """Returns a dictionary mapping each EntityFieldType to the field_names on
+    the provided DatabaseEntity class |entity_cls| of that type. Field names
+    only depend on the schema, so this is computed once per class.
     """
     back_edges = set()
     forward_edges = set()
     flat_fields = set()
     foreign_keys = set()
 
-    for relationship_field_name in entity.get_relationship_property_names():
-        if direction_checker.is_back_edge(entity, relationship_field_name):
+    for relationship_field_name in entity_cls.get_relationship_property_names():
+        if direction_checker.is_database_entity_back_edge(entity_cls, relationship_field_name):
             back_edges.add(relationship_field_name)
         else:
             forward_edges.add(relationship_field_name)
 
-    for foreign_key_name in entity.get_foreign_key_names():
+    for foreign_key_name in entity_cls.get_foreign_key_names():
         foreign_keys.add(foreign_key_name)
 
-    for column_field_name in entity.get_column_property_names():
+    for column_field_name in entity_cls.get_column_property_names():
         if column_field_name not in foreign_keys:
             flat_fields.add(column_field_name)
 
-    if entity_field_type is EntityFieldType.FLAT_FIELD:
-        return flat_fields
-    if entity_field_type is EntityFieldType.FOREIGN_KEYS:
-        return foreign_keys
-    if entity_field_type is EntityFieldType.FORWARD_EDGE:
-        return forward_edges
-    if entity_field_type is EntityFieldType.BACK_EDGE:
-        return back_edges
-    if entity_field_type is EntityFieldType.ALL:
-        return flat_fields | foreign_keys | forward_edges | back_edges
-    raise ValueError(f"Unrecognized EntityFieldType [{entity_field_type}] on entity [{entity}]")
+    return {
+        EntityFieldType.FLAT_FIELD: frozenset(flat_fields),
+        EntityFieldType.FOREIGN_KEYS: frozenset(foreign_keys),
+        EntityFieldType.FORWARD_EDGE: frozenset(forward_edges),
+        EntityFieldType.BACK_EDGE: frozenset(back_edges),
+        EntityFieldType.ALL: frozenset(flat_fields | foreign_keys | forward_edges | back_edges),
+    }
 
 
 def _get_all_entity_field_names(entity: Entity,
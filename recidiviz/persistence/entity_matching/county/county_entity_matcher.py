@@ -20,7 +20,7 @@ ingested entities."""
 
 import logging
 from collections import defaultdict
-from typing import List, Dict, cast, Set, Tuple
+from typing import List, Dict, cast, Set, Tuple, Optional
 
 from recidiviz.common.constants.bond import BondStatus
 from recidiviz.common.constants.charge import ChargeStatus
@@ -83,6 +83,76 @@ class CountyEntityMatcher(BaseEntityMatcher[entities.Person]):
         return matches_with_external_id + matches_without_external_ids
 
 
+# Key of a block of people without external ids which can only match each
+# other: (full name, whether the birthdate is inferred, birthdate year).
+_PersonBlockKey = Tuple[str, bool, Optional[int]]
+
+
+class _DbPersonIndex:
+    """
+    Blocking index over a list of DB people, used to narrow down the DB people
+    that must be compared against an ingested person with is_person_match.
+    People with an external id are indexed by that id. People without one are
+    indexed by full name and birthdate year, since is_person_match requires an
+    exact full name match and a birthdate match (exact, or within a year if
+    both birthdates are inferred from age).
+    """
+    def __init__(self, db_people: List[entities.Person]):
+        self._num_db_people = len(db_people)
+        self._people_by_external_id: \
+            Dict[str, List[Tuple[int, entities.Person]]] = defaultdict(list)
+        self._people_by_block_key: \
+            Dict[_PersonBlockKey, List[Tuple[int, entities.Person]]] = \
+            defaultdict(list)
+        # Number of is_person_match comparisons skipped because the DB person
+        # was not in the ingested person's candidate block.
+        self.comparisons_avoided = 0
+
+        for position, db_person in enumerate(db_people):
+            if db_person.external_id:
+                self._people_by_external_id[db_person.external_id].append(
+                    (position, db_person))
+                continue
+            block_key = self._block_key(db_person)
+            if block_key:
+                self._people_by_block_key[block_key].append(
+                    (position, db_person))
+
+    @staticmethod
+    def _block_key(person: entities.Person) -> Optional[_PersonBlockKey]:
+        if not person.full_name:
+            return None
+        year = person.birthdate.year if person.birthdate else None
+        return person.full_name, bool(person.birthdate_inferred_from_age), year
+
+    def get_candidates(self, ingested_person: entities.Person) \
+            -> List[entities.Person]:
+        """Returns the DB people that could match the provided
+        |ingested_person|, in their original relative order."""
+        if ingested_person.external_id:
+            positioned_people = self._people_by_external_id.get(
+                ingested_person.external_id, [])
+        else:
+            positioned_people = []
+            block_key = self._block_key(ingested_person)
+            if block_key:
+                full_name, birthdate_inferred, year = block_key
+                if birthdate_inferred and year is not None:
+                    for block_year in (year - 1, year, year + 1):
+                        positioned_people.extend(
+                            self._people_by_block_key.get(
+                                (full_name, birthdate_inferred, block_year),
+                                []))
+                    positioned_people.sort(key=lambda p: p[0])
+                else:
+                    positioned_people = self._people_by_block_key.get(
+                        block_key, [])
+
+        self.comparisons_avoided += \
+            self._num_db_people - len(positioned_people)
+        return [db_person for _, db_person in positioned_people]
+
+
 def match_people_and_return_error_count(
         *, db_people: List[entities.Person],
         ingested_people: List[entities.Person]) -> MatchedEntities:
@@ -95,13 +165,14 @@ def match_people_and_return_error_count(
     orphaned_entities = []
     error_count = 0
     matched_people_by_db_id: Dict[int, entities.Person] = {}
+    db_person_index = _DbPersonIndex(db_people)
 
     for ingested_person in ingested_people:
         try:
             ingested_person_orphans: List[Entity] = []
             match_person(
                 ingested_person=ingested_person,
-                db_people=db_people,
+                db_people=db_person_index.get_candidates(ingested_person),
                 orphaned_entities=ingested_person_orphans,
                 matched_people_by_db_id=matched_people_by_db_id)
 
@@ -115,6 +186,11 @@ def match_people_and_return_error_count(
             increment_error(e.entity_name)
             error_count += 1
 
+    logging.info(
+        'Avoided %d of %d person match comparisons by blocking DB people',
+        db_person_index.comparisons_avoided,
+        len(db_people) * len(ingested_people))
+
     schema_people = converter.convert_entity_people_to_schema_people(people)
     schema_orphaned_entities = \
         converter.convert_entities_to_schema(orphaned_entities)
@@ -47,7 +47,7 @@ from recidiviz.persistence.entity_matching.state.state_matching_utils import \
     convert_to_placeholder, is_multiple_id_entity, \
     get_external_id_keys_from_multiple_id_entity, get_multiple_id_classes, \
     read_db_entity_trees_of_cls_to_merge, get_multiparent_classes, \
-    db_id_or_object_id
+    db_id_or_object_id, is_external_id_match_class
 from recidiviz.persistence.entity.entity_utils import is_placeholder, \
     get_set_entity_field_names, get_all_core_entity_field_names, \
     get_all_db_objs_from_tree, get_all_db_objs_from_trees, \
@@ -81,6 +81,96 @@ class _EntityWithParentInfo:
         self.linked_parents = linked_parents
 
 
+class _DbEntityTreeIndex:
+    """
+    Index of a list of sibling DB EntityTrees by (entity class, external id).
+    Used to narrow down the DB trees that must be compared against an ingested
+    entity which can only match DB entities of the same class with the same
+    external id (see is_external_id_match_class). DB trees whose entities have
+    no external id are always returned as candidates.
+    """
+    def __init__(self, db_entity_trees: List[EntityTree]):
+        # Maps id() of each indexed DB entity to its position in the original
+        # list and its tree.
+        self._positioned_trees_by_entity_id: \
+            Dict[int, Tuple[int, EntityTree]] = {}
+        self._key_by_entity_id: \
+            Dict[int, Optional[Tuple[Type[DatabaseEntity], str]]] = {}
+        self._trees_by_key: \
+            Dict[Tuple[Type[DatabaseEntity], str], List[EntityTree]] = \
+            defaultdict(list)
+        self._unkeyed_trees: List[EntityTree] = []
+
+        for position, db_entity_tree in enumerate(db_entity_trees):
+            self._positioned_trees_by_entity_id[id(db_entity_tree.entity)] = \
+                (position, db_entity_tree)
+            self._add(db_entity_tree)
+
+    @staticmethod
+    def _key_for_entity(entity: DatabaseEntity) \
+            -> Optional[Tuple[Type[DatabaseEntity], str]]:
+        if not is_external_id_match_class(entity.__class__):
+            return None
+        external_id = entity.get_external_id()
+        if external_id is None:
+            return None
+        return entity.__class__, external_id
+
+    def _add(self, db_entity_tree: EntityTree):
+        key = self._key_for_entity(db_entity_tree.entity)
+        self._key_by_entity_id[id(db_entity_tree.entity)] = key
+        if key is None:
+            self._unkeyed_trees.append(db_entity_tree)
+        else:
+            self._trees_by_key[key].append(db_entity_tree)
+
+    def _position(self, db_entity_tree: EntityTree) -> int:
+        return self._positioned_trees_by_entity_id[
+            id(db_entity_tree.entity)][0]
+
+    def get_candidates(self, ingested_entity: DatabaseEntity) \
+            -> Optional[List[EntityTree]]:
+        """Returns the DB trees that could match the provided
+        |ingested_entity|, in their original relative order, or None if the
+        |ingested_entity| cannot be matched via this index.
+        """
+        key = self._key_for_entity(ingested_entity)
+        if key is None:
+            return None
+
+        keyed_trees = self._trees_by_key.get(key, [])
+        if not self._unkeyed_trees:
+            return keyed_trees
+        if not keyed_trees:
+            return self._unkeyed_trees
+        return sorted(keyed_trees + self._unkeyed_trees, key=self._position)
+
+    def update(self, db_entity_trees: List[EntityTree]):
+        """Re-indexes any of the provided |db_entity_trees| that are in this
+        index, e.g. after matching has merged a new external id onto them.
+        """
+        for db_entity_tree in db_entity_trees:
+            entity = db_entity_tree.entity
+            if id(entity) not in self._positioned_trees_by_entity_id:
+                continue
+            old_key = self._key_by_entity_id[id(entity)]
+            if old_key == self._key_for_entity(entity):
+                continue
+
+            _, indexed_tree = self._positioned_trees_by_entity_id[id(entity)]
+            if old_key is None:
+                self._unkeyed_trees.remove(indexed_tree)
+            else:
+                self._trees_by_key[old_key].remove(indexed_tree)
+            self._add(indexed_tree)
+            self._sort_trees_for_entity(entity)
+
+    def _sort_trees_for_entity(self, entity: DatabaseEntity):
+        key = self._key_by_entity_id[id(entity)]
+        trees = self._unkeyed_trees if key is None else self._trees_by_key[key]
+        trees.sort(key=self._position)
+
+
 # TODO(2504): Rename `ingested` and `db` entities to something more generic that
 # still accurately describes that one is being merged onto the other.
 class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
@@ -116,6 +206,12 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
         self.entities_to_convert_to_placeholder_or_expunge:\
             List[DatabaseEntity] = []
 
+        # Counts of calls to _get_match and of is_match comparisons performed
+        # while matching, keyed by ingested entity name. Logged at the end of
+        # run_match if log_entity_counts is set.
+        self.match_call_counts: Dict[str, int] = defaultdict(int)
+        self.match_comparison_counts: Dict[str, int] = defaultdict(int)
+
         # Delegate object with all state specific logic
         self.state_matching_delegate = state_matching_delegate
 
@@ -242,6 +338,8 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
         that contains the results of matching.
         """
         self.set_session(session)
+        self.match_call_counts.clear()
+        self.match_comparison_counts.clear()
         logging.info(
             "[Entity matching] Converting ingested entities to DB entities "
             "at time [%s].", datetime.datetime.now().isoformat())
@@ -299,8 +397,20 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
         # entity matching
         check_not_dirty(session)
 
+        if self.log_entity_counts:
+            self._log_match_comparison_counts()
+
         return matched_entities_builder.build()
 
+    def _log_match_comparison_counts(self):
+        log_lines = ['Entity match comparison counter']
+        for entity_name in sorted(self.match_call_counts):
+            log_lines.append(
+                f'{entity_name}: {self.match_call_counts[entity_name]} '
+                f'matches, {self.match_comparison_counts[entity_name]} '
+                f'comparisons')
+        logging.info('\n'.join(log_lines))
+
     def _run_match(self,
                    ingested_persons: List[schema.StatePerson],
                    db_persons: List[schema.StatePerson]) \
@@ -717,13 +827,18 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
         individual_match_results: List[IndividualMatchResult] = []
         matched_entities_by_db_id: Dict[int, List[DatabaseEntity]] = {}
         error_count = 0
+        db_entity_tree_index = _DbEntityTreeIndex(db_entity_trees)
         for ingested_entity_tree in ingested_entity_trees:
             try:
                 match_result = self._match_entity_tree(
                     ingested_entity_tree=ingested_entity_tree,
                     db_entity_trees=db_entity_trees,
                     matched_entities_by_db_ids=matched_entities_by_db_id,
-                    root_entity_cls=root_entity_cls)
+                    root_entity_cls=root_entity_cls,
+                    db_entity_tree_index=db_entity_tree_index)
+                # Merging may have changed the external ids of matched DB
+                # entities, so keep the index in sync for later siblings.
+                db_entity_tree_index.update(match_result.merged_entity_trees)
                 individual_match_results.append(match_result)
                 error_count += match_result.error_count
             except EntityMatchingError as e:
@@ -774,11 +889,15 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
             *, ingested_entity_tree: EntityTree,
             db_entity_trees: List[EntityTree],
             matched_entities_by_db_ids: Dict[int, List[DatabaseEntity]],
-            root_entity_cls: Type) -> IndividualMatchResult:
+            root_entity_cls: Type,
+            db_entity_tree_index: Optional[_DbEntityTreeIndex] = None) \
+            -> IndividualMatchResult:
         """Attempts to match the provided |ingested_entity_tree| to one of the
         provided |db_entity_trees|. If a successful match is found, merges the
         ingested entity onto the matching database entity and performs entity
-        matching on all children of the matched entities.
+        matching on all children of the matched entities. If provided,
+        |db_entity_tree_index| must index the |db_entity_trees| and is used to
+        narrow down the match candidates.
         Returns the results of matching as an IndividualMatchResult.
         """
 
@@ -790,7 +909,8 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
                 root_entity_cls=root_entity_cls)
 
         db_match_tree = self._get_match(ingested_entity_tree,
-                                        db_entity_trees)
+                                        db_entity_trees,
+                                        db_entity_tree_index)
 
         if not db_match_tree:
             return self._match_unmatched_tree(
@@ -1220,16 +1340,25 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
     def _get_match(
             self,
             ingested_entity_tree: EntityTree,
-            db_entity_trees: List[EntityTree]
+            db_entity_trees: List[EntityTree],
+            db_entity_tree_index: Optional[_DbEntityTreeIndex] = None
     ) -> Optional[EntityTree]:
         """With the provided |ingested_entity_tree|, this attempts to find a
         match among the provided |db_entity_trees|. If a match is found, it is
         returned.
         """
-        db_match_candidates = db_entity_trees
+        self.match_call_counts[
+            ingested_entity_tree.entity.get_entity_name()] += 1
+
+        db_match_candidates: List[EntityTree] = db_entity_trees
         if isinstance(ingested_entity_tree.entity, self.root_entity_cls):
             db_match_candidates = self.get_cached_matches(
                 ingested_entity_tree.entity)
+        elif db_entity_tree_index is not None:
+            indexed_candidates = db_entity_tree_index.get_candidates(
+                ingested_entity_tree.entity)
+            if indexed_candidates is not None:
+                db_match_candidates = indexed_candidates
 
         # Entities that can have multiple external IDs need special casing to
         # handle the fact that multiple DB entities could match the provided
@@ -1240,7 +1369,8 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
                 db_entity_trees=db_match_candidates)
         else:
             exact_match = entity_matching_utils.get_only_match(
-                ingested_entity_tree, db_match_candidates, is_match)
+                ingested_entity_tree, db_match_candidates,
+                self._counting_is_match)
 
         if not exact_match:
             exact_match = \
@@ -1256,6 +1386,13 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
 
         return exact_match
 
+    def _counting_is_match(self,
+                           ingested_entity: EntityTree,
+                           db_entity: EntityTree) -> bool:
+        self.match_comparison_counts[
+            ingested_entity.entity.get_entity_name()] += 1
+        return is_match(ingested_entity, db_entity)
+
     def _get_only_match_for_multiple_id_entity(
             self,
             ingested_entity_tree: EntityTree,
@@ -1272,7 +1409,7 @@ class StateEntityMatcher(BaseEntityMatcher[entities.StatePerson]):
         """
 
         db_matches = entity_matching_utils.get_all_matches(
-            ingested_entity_tree, db_entity_trees, is_match)
+            ingested_entity_tree, db_entity_trees, self._counting_is_match)
 
         if not db_matches:
             return None
@@ -114,6 +114,21 @@ def _is_match(*,
     return ingested_entity.get_external_id() == db_entity.get_external_id()
 
 
+def is_external_id_match_class(cls: Type[DatabaseEntity]) -> bool:
+    """Returns True if entities of the provided |cls| with a non-null external id only match (via is_match) entities of
+    the same class with the same external id. This must be kept in sync with the special cases in _is_match above.
+    """
+    return not issubclass(cls, (schema.StatePerson,
+                                schema.StatePersonExternalId,
+                                schema.StatePersonAlias,
+                                schema.StatePersonRace,
+                                schema.StatePersonEthnicity,
+                                schema.StateSupervisionViolationResponseDecisionEntry,
+                                schema.StateSupervisionViolatedConditionEntry,
+                                schema.StateSupervisionViolationTypeEntry,
+                                schema.StateSupervisionCaseTypeEntry))
+
+
 def nonnull_fields_entity_match(
         ingested_entity: EntityTree,
         db_entity: EntityTree,
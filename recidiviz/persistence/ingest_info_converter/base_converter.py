@@ -17,17 +17,16 @@
 
 """Converts scraped IngestInfo data to the persistence layer entity."""
 
-import copy
 import logging
 from abc import abstractmethod
 from typing import List, Generic
 
 import attr
 
-from recidiviz.common.constants.entity_enum import EnumParsingError
+from recidiviz.common.constants.entity_enum import EnumParsingError, \
+    record_enum_parse_cache_stats
 from recidiviz.common.constants.person_characteristics import PROTECTED_CLASSES
 from recidiviz.common.ingest_metadata import IngestMetadata
-from recidiviz.ingest.models.ingest_info_pb2 import IngestInfo
 from recidiviz.persistence.entity.entities import EntityPersonType
 
 
@@ -40,10 +39,9 @@ class IngestInfoConversionResult(Generic[EntityPersonType]):
 
 
 class BaseConverter(Generic[EntityPersonType]):
-    """Base class for all data converters of IngestInfo proto objects."""
+    """Base class for all data converters of IngestInfo objects."""
 
-    def __init__(self, ingest_info: IngestInfo, metadata: IngestMetadata):
-        self.ingest_info = copy.deepcopy(ingest_info)
+    def __init__(self, metadata: IngestMetadata):
         self.metadata = metadata
 
     def run_convert(self) -> IngestInfoConversionResult:
@@ -68,6 +66,8 @@ class BaseConverter(Generic[EntityPersonType]):
                 general_parsing_errors += 1
                 raise e
 
+        record_enum_parse_cache_stats()
+
         return IngestInfoConversionResult(
             people=people,
             enum_parsing_errors=enum_parsing_errors,
@@ -41,7 +41,8 @@ class CountyConverter(BaseConverter[entities.Person]):
     """Converts between ingest_info objects and persistence layer entity."""
 
     def __init__(self, ingest_info: IngestInfo, metadata: IngestMetadata):
-        super().__init__(ingest_info, metadata)
+        super().__init__(metadata)
+        self.ingest_info = copy.deepcopy(ingest_info)
 
         self.bookings = {b.booking_id: b for b in ingest_info.bookings}
         self.arrests = {a.arrest_id: a for a in ingest_info.arrests}
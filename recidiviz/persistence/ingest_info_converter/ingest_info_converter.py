@@ -17,31 +17,48 @@
 """Converts scraped IngestInfo data to the persistence layer entity."""
 
 from recidiviz.common.ingest_metadata import IngestMetadata, SystemLevel
-from recidiviz.ingest.models.ingest_info_pb2 import IngestInfo
+from recidiviz.ingest.models import ingest_info_pb2, ingest_info
 from recidiviz.persistence.ingest_info_converter.base_converter import \
     BaseConverter, IngestInfoConversionResult
 from recidiviz.persistence.ingest_info_converter.county.county_converter \
     import CountyConverter
 from recidiviz.persistence.ingest_info_converter.state.state_converter import \
     StateConverter
+from recidiviz.persistence.ingest_info_converter.state.state_py_converter \
+    import StatePyConverter
 
 
 def convert_to_persistence_entities(
-        ingest_info: IngestInfo, metadata: IngestMetadata
+        ingest_info_proto: ingest_info_pb2.IngestInfo, metadata: IngestMetadata
 ) -> IngestInfoConversionResult:
-    converter = _get_converter(ingest_info, metadata)
+    converter = _get_converter(ingest_info_proto, metadata)
     return converter.run_convert()
 
 
-def _get_converter(ingest_info: IngestInfo, metadata: IngestMetadata) \
-        -> BaseConverter:
+def convert_py_to_persistence_entities(
+        ingest_info_py: ingest_info.IngestInfo, metadata: IngestMetadata
+) -> IngestInfoConversionResult:
+    """Converts an ingest_info python object directly to persistence entities,
+    without first converting it to an ingest_info proto. Only supported for
+    state-level ingest."""
+    if metadata.system_level != SystemLevel.STATE:
+        raise ValueError(
+            "Converting ingest_info python objects without a proto is only "
+            "supported for system level [{}], found [{}]"
+            .format(SystemLevel.STATE, metadata.system_level))
+
+    return StatePyConverter(ingest_info_py, metadata).run_convert()
+
+
+def _get_converter(ingest_info_proto: ingest_info_pb2.IngestInfo,
+                   metadata: IngestMetadata) -> BaseConverter:
     system_level = metadata.system_level
 
     if system_level == SystemLevel.COUNTY:
-        return CountyConverter(ingest_info, metadata)
+        return CountyConverter(ingest_info_proto, metadata)
 
     if system_level == SystemLevel.STATE:
-        return StateConverter(ingest_info, metadata)
+        return StateConverter(ingest_info_proto, metadata)
 
     raise ValueError("Ingest metadata includes invalid system level of [{}]"
                      .format(system_level))
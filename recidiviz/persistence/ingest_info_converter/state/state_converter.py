@@ -17,6 +17,8 @@
 
 """Converts ingested IngestInfo data to the persistence layer entities."""
 
+import copy
+
 from recidiviz.ingest.models.ingest_info_pb2 import StateSentenceGroup, \
     StatePerson, StateSupervisionSentence, StateIncarcerationSentence, \
     StateCharge, StateIncarcerationPeriod, StateSupervisionPeriod, \
@@ -47,7 +49,8 @@ class StateConverter(BaseConverter[entities.StatePerson]):
     for state-level entities."""
 
     def __init__(self, ingest_info, metadata):
-        super().__init__(ingest_info, metadata)
+        super().__init__(metadata)
+        self.ingest_info = copy.deepcopy(ingest_info)
 
         self.aliases = {a.state_alias_id: a for a in ingest_info.state_aliases}
         self.person_races = {pr.state_person_race_id: pr for pr
@@ -0,0 +1,629 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ============================================================================
+
+"""Converts ingested IngestInfo python objects directly to the persistence
+layer entities, without a round trip through an ingest_info proto."""
+
+import copy
+from typing import Dict, List, Optional, Tuple, Type
+
+from recidiviz.common.common_utils import create_synthetic_id
+from recidiviz.common.ingest_metadata import IngestMetadata
+from recidiviz.ingest.models.ingest_info import IngestInfo, IngestObject, \
+    StatePerson, StateIncarcerationIncident, StateSupervisionContact, \
+    StateSentenceGroup, StateSupervisionSentence, StateIncarcerationSentence, \
+    StateEarlyDischarge, StateFine, StateCharge, StateCourtCase, \
+    StateIncarcerationPeriod, StateSupervisionPeriod, \
+    StateSupervisionViolation, StateSupervisionViolationResponse, \
+    StateAssessment, StateProgramAssignment, StateParoleDecision, StateAgent, \
+    StatePersonExternalId
+from recidiviz.persistence.entity.state import entities
+from recidiviz.persistence.ingest_info_converter.base_converter import \
+    BaseConverter
+from recidiviz.persistence.ingest_info_converter.state.entity_helpers import \
+    state_person, state_alias, state_person_race, state_person_ethnicity, \
+    state_assessment, state_person_external_id, state_sentence_group, \
+    state_supervision_sentence, state_incarceration_sentence, state_charge, \
+    state_bond, state_court_case, state_incarceration_period, \
+    state_supervision_period, state_parole_decision, \
+    state_incarceration_incident, state_supervision_violation, \
+    state_supervision_violation_response, state_fine, state_agent, \
+    state_incarceration_incident_outcome, state_program_assignment, \
+    state_supervision_violation_type_entry, \
+    state_supervision_violated_condition_entry, \
+    state_supervision_violation_response_decision_entry, \
+    state_supervision_case_type_entry, state_early_discharge, \
+    state_supervision_contact
+
+
+# The children of each ingest_info class, in the order that
+# ingest_utils.convert_ingest_info_to_proto visits them.
+_CHILD_FIELDS: Dict[Type[IngestObject], List[str]] = {
+    StatePerson: [
+        'state_person_races', 'state_person_ethnicities',
+        'state_person_external_ids', 'state_aliases', 'supervising_officer',
+        'state_assessments', 'state_program_assignments',
+        'state_sentence_groups'],
+    StateAssessment: ['conducting_agent'],
+    StateProgramAssignment: ['referring_agent'],
+    StateSentenceGroup: [
+        'state_supervision_sentences', 'state_incarceration_sentences',
+        'state_fines'],
+    StateSupervisionSentence: [
+        'state_charges', 'state_incarceration_periods',
+        'state_supervision_periods', 'state_early_discharges'],
+    StateIncarcerationSentence: [
+        'state_charges', 'state_incarceration_periods',
+        'state_supervision_periods', 'state_early_discharges'],
+    StateFine: ['state_charges'],
+    StateCharge: ['state_court_case', 'state_bond'],
+    StateCourtCase: ['judge'],
+    StateIncarcerationPeriod: [
+        'source_supervision_violation_response',
+        'state_incarceration_incidents', 'state_parole_decisions',
+        'state_assessments', 'state_program_assignments'],
+    StateIncarcerationIncident: [
+        'responding_officer', 'state_incarceration_incident_outcomes'],
+    StateParoleDecision: ['decision_agents'],
+    StateSupervisionPeriod: [
+        'supervising_officer', 'state_supervision_case_type_entries',
+        'state_supervision_violation_entries', 'state_supervision_contacts',
+        'state_assessments', 'state_program_assignments'],
+    StateSupervisionViolation: [
+        'state_supervision_violation_types',
+        'state_supervision_violated_conditions',
+        'state_supervision_violation_responses'],
+    StateSupervisionViolationResponse: [
+        'state_supervision_violation_response_decisions', 'decision_agents'],
+    StateSupervisionContact: ['contacted_agent'],
+}
+
+# Children that convert_ingest_info_to_proto links to their parent without
+# visiting their own children.
+_UNVISITED_CHILD_FIELDS = {'source_supervision_violation_response'}
+
+
+class StatePyConverter(BaseConverter[entities.StatePerson]):
+    """Converts between ingest_info python objects and persistence layer
+    entities for state-level entities.
+
+    Produces the same entities as converting the proto returned by
+    ingest_utils.convert_ingest_info_to_proto with a StateConverter, but walks
+    the children of each ingested object directly instead of building a proto
+    and a map of ids for each entity type. Objects that share an id are first
+    merged the way the proto conversion merges them, see _IngestObjectMerger.
+    The provided |ingest_info| is not modified.
+    """
+
+    def __init__(self, ingest_info: IngestInfo, metadata: IngestMetadata):
+        super().__init__(metadata)
+        merger = _IngestObjectMerger()
+        merged_people: Dict[int, StatePerson] = {}
+        for ingest_person in ingest_info.state_people:
+            merged_person = merger.merge(ingest_person)
+            merged_people.setdefault(id(merged_person), merged_person)
+        self.state_people: List[StatePerson] = list(merged_people.values())
+
+    def _is_complete(self) -> bool:
+        if self.state_people:
+            return False
+        return True
+
+    def _pop_person(self) -> StatePerson:
+        return self.state_people.pop()
+
+    def _compliant_log_person(self, ingest_person):
+        """Don't log any information about state people."""
+
+    def _convert_person(self, ingest_person: StatePerson) \
+            -> entities.StatePerson:
+        """Converts an ingest_info StatePerson to a persistence entity."""
+        state_person_builder = entities.StatePerson.builder()
+
+        state_person.copy_fields_to_builder(
+            state_person_builder, ingest_person, self.metadata)
+
+        state_person_builder.aliases = [
+            state_alias.convert(alias, self.metadata)
+            for alias in ingest_person.state_aliases
+        ]
+        state_person_builder.races = [
+            state_person_race.convert(race, self.metadata)
+            for race in ingest_person.state_person_races
+        ]
+        state_person_builder.ethnicities = [
+            state_person_ethnicity.convert(ethnicity, self.metadata)
+            for ethnicity in ingest_person.state_person_ethnicities
+        ]
+        state_person_builder.assessments = [
+            self._convert_assessment(assessment)
+            for assessment in ingest_person.state_assessments
+        ]
+        state_person_builder.program_assignments = [
+            self._convert_program_assignment(assignment)
+            for assignment in ingest_person.state_program_assignments
+        ]
+        state_person_builder.external_ids = [
+            self._convert_person_external_id(external_id)
+            for external_id in ingest_person.state_person_external_ids
+        ]
+        state_person_builder.sentence_groups = [
+            self._convert_sentence_group(sentence_group)
+            for sentence_group in ingest_person.state_sentence_groups
+        ]
+
+        if ingest_person.supervising_officer:
+            state_person_builder.supervising_officer = \
+                state_agent.convert(ingest_person.supervising_officer,
+                                    self.metadata)
+
+        return state_person_builder.build()
+
+    def _convert_person_external_id(
+            self, ingest_external_id: StatePersonExternalId) \
+            -> entities.StatePersonExternalId:
+        """Converts an ingest_info StatePersonExternalId to a persistence
+        entity.
+
+        The entity helper expects the synthetic id that
+        ingest_utils.convert_ingest_info_to_proto builds from the external id
+        and id type, so the conversion runs on a copy with that id.
+        """
+        synthetic_external_id = StatePersonExternalId(
+            state_person_external_id_id=create_synthetic_id(
+                external_id=ingest_external_id.state_person_external_id_id,
+                id_type=ingest_external_id.id_type),
+            id_type=ingest_external_id.id_type,
+            state_code=ingest_external_id.state_code)
+        return state_person_external_id.convert(synthetic_external_id,
+                                                self.metadata)
+
+    def _convert_sentence_group(self,
+                                ingest_sentence_group: StateSentenceGroup) \
+            -> entities.StateSentenceGroup:
+        """Converts an ingest_info StateSentenceGroup to a persistence
+        entity."""
+        sentence_group_builder = entities.StateSentenceGroup.builder()
+
+        state_sentence_group.copy_fields_to_builder(sentence_group_builder,
+                                                    ingest_sentence_group,
+                                                    self.metadata)
+
+        sentence_group_builder.supervision_sentences = [
+            self._convert_supervision_sentence(sentence)
+            for sentence in ingest_sentence_group.state_supervision_sentences
+        ]
+        sentence_group_builder.incarceration_sentences = [
+            self._convert_incarceration_sentence(sentence)
+            for sentence
+            in ingest_sentence_group.state_incarceration_sentences
+        ]
+        sentence_group_builder.fines = [
+            self._convert_fine(fine)
+            for fine in ingest_sentence_group.state_fines
+        ]
+
+        return sentence_group_builder.build()
+
+    def _convert_supervision_sentence(
+            self, ingest_supervision_sentence: StateSupervisionSentence) \
+            -> entities.StateSupervisionSentence:
+        """Converts an ingest_info StateSupervisionSentence to a persistence
+        entity."""
+        supervision_sentence_builder = \
+            entities.StateSupervisionSentence.builder()
+
+        state_supervision_sentence.copy_fields_to_builder(
+            supervision_sentence_builder,
+            ingest_supervision_sentence,
+            self.metadata)
+
+        self._copy_children_to_sentence(supervision_sentence_builder,
+                                        ingest_supervision_sentence)
+
+        return supervision_sentence_builder.build()
+
+    def _convert_incarceration_sentence(
+            self, ingest_incarceration_sentence: StateIncarcerationSentence) \
+            -> entities.StateIncarcerationSentence:
+        """Converts an ingest_info StateIncarcerationSentence to a persistence
+        entity."""
+        incarceration_sentence_builder = \
+            entities.StateIncarcerationSentence.builder()
+
+        state_incarceration_sentence.copy_fields_to_builder(
+            incarceration_sentence_builder,
+            ingest_incarceration_sentence,
+            self.metadata)
+
+        self._copy_children_to_sentence(incarceration_sentence_builder,
+                                        ingest_incarceration_sentence)
+
+        return incarceration_sentence_builder.build()
+
+    def _convert_early_discharge(
+            self, ingest_early_discharge: StateEarlyDischarge) \
+            -> entities.StateEarlyDischarge:
+        """Converts an ingest_info StateEarlyDischarge to a persistence
+        entity."""
+        early_discharge_builder = entities.StateEarlyDischarge.builder()
+
+        state_early_discharge.copy_fields_to_builder(
+            early_discharge_builder, ingest_early_discharge, self.metadata)
+
+        return early_discharge_builder.build()
+
+    def _convert_fine(self, ingest_fine: StateFine) -> entities.StateFine:
+        """Converts an ingest_info StateFine to a persistence entity."""
+        state_fine_builder = entities.StateFine.builder()
+
+        state_fine.copy_fields_to_builder(
+            state_fine_builder, ingest_fine, self.metadata)
+
+        self._copy_children_to_sentence(
+            state_fine_builder, ingest_fine, copy_periods=False,
+            copy_early_discharges=False)
+
+        return state_fine_builder.build()
+
+    def _copy_children_to_sentence(self,
+                                   sentence_builder,
+                                   ingest_sentence,
+                                   copy_periods=True,
+                                   copy_early_discharges=True):
+        """Copies all entity children from the provided |ingest_sentence| onto
+        the |sentence_builder|. If |copy_periods| is False, does not copy
+        incarceration/supervision periods. If |copy_early_discharges| is False,
+        does not copy early discharges.
+        """
+        sentence_builder.charges = [
+            self._convert_charge(charge)
+            for charge in ingest_sentence.state_charges
+        ]
+
+        if copy_early_discharges:
+            sentence_builder.early_discharges = [
+                self._convert_early_discharge(early_discharge)
+                for early_discharge in ingest_sentence.state_early_discharges
+            ]
+
+        if copy_periods:
+            sentence_builder.incarceration_periods = [
+                self._convert_incarceration_period(period)
+                for period in ingest_sentence.state_incarceration_periods
+            ]
+            sentence_builder.supervision_periods = [
+                self._convert_supervision_period(period)
+                for period in ingest_sentence.state_supervision_periods
+            ]
+
+    def _convert_charge(self, ingest_charge: StateCharge) \
+            -> entities.StateCharge:
+        """Converts an ingest_info StateCharge to a persistence entity."""
+        charge_builder = entities.StateCharge.builder()
+
+        state_charge.copy_fields_to_builder(
+            charge_builder, ingest_charge, self.metadata)
+
+        if ingest_charge.state_bond:
+            charge_builder.bond = state_bond.convert(ingest_charge.state_bond,
+                                                     self.metadata)
+        if ingest_charge.state_court_case:
+            charge_builder.court_case = \
+                self._convert_court_case(ingest_charge.state_court_case)
+
+        return charge_builder.build()
+
+    def _convert_court_case(self, ingest_court_case: StateCourtCase) \
+            -> entities.StateCourtCase:
+        court_case_builder = entities.StateCourtCase.builder()
+
+        state_court_case.copy_fields_to_builder(court_case_builder,
+                                                ingest_court_case,
+                                                self.metadata)
+
+        court_case_builder.judge = self._convert_agent(ingest_court_case.judge)
+
+        return court_case_builder.build()
+
+    def _convert_incarceration_period(
+            self, ingest_incarceration_period: StateIncarcerationPeriod) \
+            -> entities.StateIncarcerationPeriod:
+        """Converts an ingest_info StateIncarcerationPeriod to a persistence
+        entity."""
+        incarceration_period_builder = \
+            entities.StateIncarcerationPeriod.builder()
+
+        state_incarceration_period.copy_fields_to_builder(
+            incarceration_period_builder,
+            ingest_incarceration_period,
+            self.metadata)
+
+        incarceration_period_builder.incarceration_incidents = [
+            self._convert_incarceration_incident(incident)
+            for incident
+            in ingest_incarceration_period.state_incarceration_incidents
+        ]
+        incarceration_period_builder.parole_decisions = [
+            self._convert_parole_decision(decision)
+            for decision in ingest_incarceration_period.state_parole_decisions
+        ]
+        incarceration_period_builder.assessments = [
+            self._convert_assessment(assessment)
+            for assessment in ingest_incarceration_period.state_assessments
+        ]
+        incarceration_period_builder.program_assignments = [
+            self._convert_program_assignment(assignment)
+            for assignment
+            in ingest_incarceration_period.state_program_assignments
+        ]
+
+        if ingest_incarceration_period.source_supervision_violation_response:
+            incarceration_period_builder.\
+                source_supervision_violation_response = \
+                self._convert_supervision_violation_response(
+                    ingest_incarceration_period.
+                    source_supervision_violation_response)
+
+        return incarceration_period_builder.build()
+
+    def _convert_supervision_period(
+            self, ingest_supervision_period: StateSupervisionPeriod) \
+            -> entities.StateSupervisionPeriod:
+        """Converts an ingest_info StateSupervisionPeriod to a persistence
+        entity."""
+        supervision_period_builder = \
+            entities.StateSupervisionPeriod.builder()
+
+        state_supervision_period.copy_fields_to_builder(
+            supervision_period_builder,
+            ingest_supervision_period,
+            self.metadata)
+
+        supervision_period_builder.supervising_officer = \
+            self._convert_agent(ingest_supervision_period.supervising_officer)
+        supervision_period_builder.supervision_violation_entries = [
+            self._convert_supervision_violation(violation)
+            for violation
+            in ingest_supervision_period.state_supervision_violation_entries
+        ]
+        supervision_period_builder.assessments = [
+            self._convert_assessment(assessment)
+            for assessment in ingest_supervision_period.state_assessments
+        ]
+        supervision_period_builder.program_assignments = [
+            self._convert_program_assignment(assignment)
+            for assignment
+            in ingest_supervision_period.state_program_assignments
+        ]
+        supervision_period_builder.case_type_entries = [
+            state_supervision_case_type_entry.convert(case_type,
+                                                      self.metadata)
+            for case_type
+            in ingest_supervision_period.state_supervision_case_type_entries
+        ]
+        supervision_period_builder.supervision_contacts = [
+            self._convert_supervision_contact(contact)
+            for contact in ingest_supervision_period.state_supervision_contacts
+        ]
+
+        return supervision_period_builder.build()
+
+    def _convert_supervision_violation(
+            self, ingest_supervision_violation: StateSupervisionViolation) \
+            -> entities.StateSupervisionViolation:
+        """Converts an ingest_info StateSupervisionViolation to a persistence
+        entity."""
+        supervision_violation_builder = \
+            entities.StateSupervisionViolation.builder()
+
+        state_supervision_violation.copy_fields_to_builder(
+            supervision_violation_builder,
+            ingest_supervision_violation,
+            self.metadata)
+
+        supervision_violation_builder.supervision_violation_responses = [
+            self._convert_supervision_violation_response(response)
+            for response in
+            ingest_supervision_violation.state_supervision_violation_responses
+        ]
+        supervision_violation_builder.supervision_violation_types = [
+            state_supervision_violation_type_entry.convert(type_entry,
+                                                           self.metadata)
+            for type_entry in
+            ingest_supervision_violation.state_supervision_violation_types
+        ]
+        supervision_violation_builder.supervision_violated_conditions = [
+            state_supervision_violated_condition_entry.convert(
+                condition_entry, self.metadata)
+            for condition_entry in
+            ingest_supervision_violation.state_supervision_violated_conditions
+        ]
+
+        return supervision_violation_builder.build()
+
+    def _convert_supervision_violation_response(
+            self,
+            ingest_supervision_violation_response:
+            StateSupervisionViolationResponse
+    ) -> entities.StateSupervisionViolationResponse:
+        """Converts an ingest_info StateSupervisionViolationResponse to a
+        persistence entity."""
+        supervision_violation_response_builder = \
+            entities.StateSupervisionViolationResponse.builder()
+
+        state_supervision_violation_response.copy_fields_to_builder(
+            supervision_violation_response_builder,
+            ingest_supervision_violation_response,
+            self.metadata)
+
+        supervision_violation_response_builder.decision_agents = [
+            state_agent.convert(agent, self.metadata)
+            for agent in ingest_supervision_violation_response.decision_agents
+        ]
+        supervision_violation_response_builder.\
+            supervision_violation_response_decisions = [
+                state_supervision_violation_response_decision_entry.convert(
+                    decision_entry, self.metadata)
+                for decision_entry in
+                ingest_supervision_violation_response.
+                state_supervision_violation_response_decisions
+            ]
+
+        return supervision_violation_response_builder.build()
+
+    def _convert_assessment(self, ingest_assessment: StateAssessment) \
+            -> entities.StateAssessment:
+        """Converts an ingest_info StateAssessment to a persistence entity."""
+        assessment_builder = entities.StateAssessment.builder()
+
+        state_assessment.copy_fields_to_builder(assessment_builder,
+                                                ingest_assessment,
+                                                self.metadata)
+
+        assessment_builder.conducting_agent = \
+            self._convert_agent(ingest_assessment.conducting_agent)
+
+        return assessment_builder.build()
+
+    def _convert_program_assignment(
+            self, ingest_assignment: StateProgramAssignment) \
+            -> entities.StateProgramAssignment:
+        """Converts an ingest_info StateProgramAssignment to a persistence
+        entity."""
+        program_assignment_builder = entities.StateProgramAssignment.builder()
+
+        state_program_assignment.copy_fields_to_builder(
+            program_assignment_builder, ingest_assignment, self.metadata)
+
+        program_assignment_builder.referring_agent = \
+            self._convert_agent(ingest_assignment.referring_agent)
+
+        return program_assignment_builder.build()
+
+    def _convert_incarceration_incident(
+            self, ingest_incident: StateIncarcerationIncident) \
+            -> entities.StateIncarcerationIncident:
+        """Converts an ingest_info StateIncarcerationIncident to a persistence
+        entity."""
+        incident_builder = entities.StateIncarcerationIncident.builder()
+
+        state_incarceration_incident.copy_fields_to_builder(incident_builder,
+                                                            ingest_incident,
+                                                            self.metadata)
+
+        incident_builder.responding_officer = \
+            self._convert_agent(ingest_incident.responding_officer)
+        incident_builder.incarceration_incident_outcomes = [
+            state_incarceration_incident_outcome.convert(outcome,
+                                                         self.metadata)
+            for outcome in ingest_incident.state_incarceration_incident_outcomes
+        ]
+
+        return incident_builder.build()
+
+    def _convert_supervision_contact(
+            self, ingest_contact: StateSupervisionContact) \
+            -> entities.StateSupervisionContact:
+        """Converts an ingest_info StateSupervisionContact to a persistence
+        entity."""
+        contact_builder = entities.StateSupervisionContact.builder()
+
+        state_supervision_contact.copy_fields_to_builder(
+            contact_builder, ingest_contact, self.metadata)
+
+        contact_builder.contacted_agent = \
+            self._convert_agent(ingest_contact.contacted_agent)
+
+        return contact_builder.build()
+
+    def _convert_parole_decision(
+            self, ingest_parole_decision: StateParoleDecision) \
+            -> entities.StateParoleDecision:
+        """Converts an ingest_info StateParoleDecision to a persistence
+        entity."""
+        parole_decision_builder = entities.StateParoleDecision.builder()
+
+        state_parole_decision.copy_fields_to_builder(parole_decision_builder,
+                                                     ingest_parole_decision,
+                                                     self.metadata)
+
+        parole_decision_builder.decision_agents = [
+            state_agent.convert(agent, self.metadata)
+            for agent in ingest_parole_decision.decision_agents
+        ]
+
+        return parole_decision_builder.build()
+
+    def _convert_agent(self, ingest_agent: Optional[StateAgent]) \
+            -> Optional[entities.StateAgent]:
+        if not ingest_agent:
+            return None
+        return state_agent.convert(ingest_agent, self.metadata)
+
+
+class _IngestObjectMerger:
+    """Merges ingest_info objects that share an id, as
+    ingest_utils.convert_ingest_info_to_proto does by building a single proto
+    message per id.
+
+    Each id maps to a copy of the first object seen with it. The children of
+    every object with that id are appended to the copy, in the order the proto
+    conversion visits them, and a single child is replaced by the last one set.
+    Objects without an id are only merged with themselves.
+    """
+
+    def __init__(self):
+        self.merged_objects: Dict[Tuple[type, object], IngestObject] = {}
+
+    def merge(self, ingest_object, visit_children=True):
+        """Returns the merged copy for the id of |ingest_object|, adding the
+        children of |ingest_object| to it if |visit_children| is True."""
+        child_fields = _CHILD_FIELDS.get(type(ingest_object), [])
+        key = (type(ingest_object), self._merge_id(ingest_object))
+        merged_object = self.merged_objects.get(key)
+        if merged_object is None:
+            merged_object = copy.copy(ingest_object)
+            for field in child_fields:
+                setattr(merged_object, field,
+                        [] if isinstance(getattr(ingest_object, field), list)
+                        else None)
+            self.merged_objects[key] = merged_object
+
+        if not visit_children:
+            return merged_object
+
+        for field in child_fields:
+            child = getattr(ingest_object, field)
+            visit_grandchildren = field not in _UNVISITED_CHILD_FIELDS
+            if isinstance(child, list):
+                for list_child in child:
+                    getattr(merged_object, field).append(
+                        self.merge(list_child, visit_grandchildren))
+            elif child:
+                setattr(merged_object, field,
+                        self.merge(child, visit_grandchildren))
+        return merged_object
+
+    @staticmethod
+    def _merge_id(ingest_object) -> object:
+        if isinstance(ingest_object, StatePersonExternalId):
+            return create_synthetic_id(
+                external_id=ingest_object.state_person_external_id_id,
+                id_type=ingest_object.id_type)
+        return getattr(ingest_object, f'{ingest_object.class_name()}_id') \
+            or id(ingest_object)
@@ -30,6 +30,7 @@ from recidiviz.common.constants.person_characteristics import ResidencyStatus, \
 from recidiviz.common.ingest_metadata import IngestMetadata
 from recidiviz.common.str_field_utils import parse_dollars, normalize, \
     parse_date
+from recidiviz.ingest.models.ingest_info import IngestObject
 
 locale.setlocale(locale.LC_ALL, 'en_US.UTF-8')
 
@@ -40,11 +41,21 @@ def fn(func, field_name, proto, *additional_func_args, default=None):
     returns None.
     """
     value = None
-    if proto.HasField(field_name):
+    if has_field(proto, field_name):
         value = func(getattr(proto, field_name), *additional_func_args)
     return value if value is not None else default
 
 
+def has_field(proto, field_name) -> bool:
+    """Returns whether the field with the given |field_name| is set on the
+    |proto|, which may also be an ingest_info python object with the same
+    fields, e.g. when converting without a round trip through a proto.
+    """
+    if isinstance(proto, IngestObject):
+        return getattr(proto, field_name, None) is not None
+    return proto.HasField(field_name)
+
+
 def parse_external_id(id_str):
     """If the supplied |id_str| is generated, returns None. Otherwise
     returns the normalized version of the provided |id_str|"""
@@ -179,7 +190,7 @@ def parse_region_code_with_override(proto,
 
     if metadata and metadata.region:
         return normalize(metadata.region)
-    if proto.HasField(region_field_name):
+    if has_field(proto, region_field_name):
         return normalize(getattr(proto, region_field_name))
     return None
 
@@ -17,11 +17,19 @@
 """Contains logic for communicating with the persistence layer."""
 import datetime
 import logging
-from typing import Callable, List
+import multiprocessing
+import pickle
+import zlib
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+import attr
 
 import psycopg2
-from psycopg2.errorcodes import SERIALIZATION_FAILURE
+from psycopg2.errorcodes import DEADLOCK_DETECTED, LOCK_NOT_AVAILABLE, \
+    SERIALIZATION_FAILURE
 import sqlalchemy
+from sqlalchemy.pool import Pool
 from opencensus.stats import aggregation, measure, view
 from opencensus.stats.measurement_map import MeasurementMap
 
@@ -31,10 +39,11 @@ from recidiviz.common.constants.county.booking import CustodyStatus
 from recidiviz.common.constants.county.hold import HoldStatus
 from recidiviz.common.constants.county.sentence import SentenceStatus
 from recidiviz.common.ingest_metadata import IngestMetadata, SystemLevel
+from recidiviz.ingest.models import ingest_info as ingest_info_py
 from recidiviz.ingest.models.ingest_info_pb2 import IngestInfo
 from recidiviz.persistence import persistence_utils
 from recidiviz.persistence.database import database
-from recidiviz.persistence.database.base_schema import JailsBase
+from recidiviz.persistence.database.base_schema import JailsBase, StateBase
 from recidiviz.persistence.database.schema.county import dao as county_dao
 from recidiviz.persistence.database.schema_entity_converter import \
     schema_entity_converter as converter
@@ -42,9 +51,14 @@ from recidiviz.persistence.database.schema_utils import \
     schema_base_for_system_level
 from recidiviz.persistence.database.session import Session
 from recidiviz.persistence.database.session_factory import SessionFactory
+from recidiviz.persistence.database.sqlalchemy_engine_manager import \
+    SQLAlchemyEngineManager
 from recidiviz.persistence.entity.county import entities as county_entities
+from recidiviz.persistence.entity.entities import EntityPersonType
+from recidiviz.persistence.entity.state import entities as state_entities
 from recidiviz.persistence.entity_matching import entity_matching
 from recidiviz.persistence.entity_validator import entity_validator
+from recidiviz.persistence.errors import PersistenceError
 from recidiviz.persistence.ingest_info_converter import ingest_info_converter
 from recidiviz.persistence.ingest_info_converter.base_converter import \
     IngestInfoConversionResult
@@ -234,8 +248,7 @@ def retry_transaction(session: Session, measurements: MeasurementMap,
                 session.rollback()
                 if max_retries and num_retries >= max_retries:
                     raise
-                if isinstance(e.orig, psycopg2.OperationalError) \
-                        and e.orig.pgcode == SERIALIZATION_FAILURE:
+                if _is_serialization_failure(e):
                     logging.info('Retrying transaction due to serialization failure: %s', e)
                     num_retries += 1
                     continue
@@ -248,16 +261,56 @@ def retry_transaction(session: Session, measurements: MeasurementMap,
         session.close()
 
 
-def write(ingest_info, metadata):
+def write(ingest_info, metadata, num_shards: int = 1,
+          use_bulk_snapshot_updates: bool = False):
     """
     If in prod or if 'PERSIST_LOCALLY' is set to true, persist each person in
     the ingest_info. If a person with the given surname/birthday already exists,
     then update that person.
 
+    If |num_shards| is greater than 1, the converted people are partitioned by
+    external id and each shard is entity matched and written in its own process
+    and transaction. See _match_and_write_people_sharded().
+
+    If |use_bulk_snapshot_updates| is True, historical snapshots are fetched and
+    inserted in bulk. See BaseHistoricalSnapshotUpdater.
+
     Otherwise, simply log the given ingest_infos for debugging
     """
     ingest_info_validator.validate(ingest_info)
 
+    return _write(ingest_info, metadata,
+                  ingest_info_converter.convert_to_persistence_entities,
+                  num_shards, use_bulk_snapshot_updates)
+
+
+def write_ingest_info_py(ingest_info: ingest_info_py.IngestInfo,
+                         metadata: IngestMetadata,
+                         num_shards: int = 1,
+                         use_bulk_snapshot_updates: bool = False) -> bool:
+    """
+    Same as write(), but for an ingest_info python object, which is converted
+    directly to entities without a round trip through an ingest_info proto.
+    Only supported for state-level ingest.
+
+    The proto validation in write() is skipped: people that share an id are
+    merged by the converter, as they are when converting to a proto, and the
+    ids referenced between proto messages always exist for nested python
+    objects.
+    """
+    return _write(ingest_info, metadata,
+                  ingest_info_converter.convert_py_to_persistence_entities,
+                  num_shards, use_bulk_snapshot_updates)
+
+
+def _write(ingest_info,
+           metadata: IngestMetadata,
+           convert: Callable[[Any, IngestMetadata],
+                             IngestInfoConversionResult],
+           num_shards: int = 1,
+           use_bulk_snapshot_updates: bool = False) -> bool:
+    """Converts the people in |ingest_info| to entities with |convert|, then
+    entity matches and persists them. See write()."""
     mtags = {monitoring.TagKey.SHOULD_PERSIST: should_persist(),
              monitoring.TagKey.PERSISTED: False}
     total_people = _get_total_people(ingest_info, metadata)
@@ -265,8 +318,7 @@ def write(ingest_info, metadata):
 
         # Convert the people one at a time and count the errors as they happen.
         conversion_result: IngestInfoConversionResult = \
-            ingest_info_converter.convert_to_persistence_entities(ingest_info,
-                                                                  metadata)
+            convert(ingest_info, metadata)
 
         people, data_validation_errors = entity_validator.validate(
             conversion_result.people)
@@ -318,14 +370,27 @@ def write(ingest_info, metadata):
 
             database.write_people(
                 session, output_people, metadata,
-                orphaned_entities=entity_matching_output.orphaned_entities)
+                orphaned_entities=entity_matching_output.orphaned_entities,
+                use_bulk_snapshot_updates=use_bulk_snapshot_updates)
             logging.info("Successfully wrote to the database")
             return True
 
         try:
-            if not retry_transaction(
+            persisted = None
+            if num_shards > 1:
+                try:
+                    persisted = _match_and_write_people_sharded(
+                        people, metadata, conversion_result,
+                        data_validation_errors, num_shards,
+                        use_bulk_snapshot_updates)
+                except _ShardContentionError as e:
+                    logging.warning("Sharded write rolled back, writing all "
+                                    "people in a single transaction: %s", e)
+            if persisted is None:
+                persisted = retry_transaction(
                     SessionFactory.for_schema_base(schema_base_for_system_level(metadata.system_level)),
-                    measurements, match_and_write_people, max_retries=5):
+                    measurements, match_and_write_people, max_retries=5)
+            if not persisted:
                 return False
 
             mtags[monitoring.TagKey.PERSISTED] = True
@@ -339,7 +404,352 @@ def write(ingest_info, metadata):
         return True
 
 
-def _get_total_people(ingest_info: IngestInfo, metadata: IngestMetadata) -> int:
+class _ShardContentionError(Exception):
+    """Raised when shards of a sharded write could not all be entity matched
+    without waiting on each other, e.g. because they matched the same database
+    person. Nothing has been committed when this is raised."""
+
+
+# How long a shard waits on a row lock held by another transaction, which may
+# be another shard waiting on the parent, before giving up.
+_SHARD_LOCK_TIMEOUT_MS = 30 * 1000
+
+# How long the parent waits for each shard to report, as a backstop for shards
+# that block without hitting the lock timeout.
+_SHARD_RESULT_TIMEOUT_SECONDS = 60 * 60
+
+
+@attr.s(frozen=True)
+class _ShardMatchResult:
+    """The outcome of entity matching a single shard of people, reported by its
+    worker before anything is committed."""
+    total_root_entities: int = attr.ib()
+    entity_matching_errors: int = attr.ib()
+
+
+def _match_and_write_people_sharded(
+        people: List[EntityPersonType],
+        metadata: IngestMetadata,
+        conversion_result: IngestInfoConversionResult,
+        data_validation_errors: int,
+        num_shards: int,
+        use_bulk_snapshot_updates: bool) -> bool:
+    """Entity matches and writes |people| in up to |num_shards| shards, each in
+    its own forked process with its own transaction.
+
+    The write is two-phase. Each worker entity matches its shard and flushes the
+    matched people into its open transaction, then reports its entity matching
+    errors. Only if the errors of all shards, together with the conversion and
+    data validation errors of the file, stay under the error threshold are the
+    workers told to commit. Otherwise every worker rolls back, so that a file
+    that should be aborted is not partially persisted. A shard whose commit
+    fails after the decision does not roll back shards that already committed.
+
+    Shards that match the same database person would wait on each other's row
+    locks while holding their own until the parent decides. Workers therefore
+    give up on lock waits after _SHARD_LOCK_TIMEOUT_MS, and the parent gives up
+    on a shard that has not reported after _SHARD_RESULT_TIMEOUT_SECONDS. In
+    either case every shard rolls back and _ShardContentionError is raised, so
+    that the caller can write the people in a single transaction instead.
+    """
+    shards = _shard_people_by_external_id(people, num_shards)
+    logging.info("Entity matching and writing [%s] people in [%s] shards",
+                 len(people), len(shards))
+
+    context = multiprocessing.get_context('fork')
+    workers: List[Tuple[multiprocessing.Process, Connection]] = []
+    try:
+        for shard in shards:
+            connection, worker_connection = context.Pipe()
+            worker = context.Process(
+                target=_match_and_write_shard,
+                args=(shard, metadata, use_bulk_snapshot_updates,
+                      worker_connection))
+            worker.start()
+            worker_connection.close()
+            workers.append((worker, connection))
+
+        match_results: List[_ShardMatchResult] = []
+        for _, connection in workers:
+            if not connection.poll(_SHARD_RESULT_TIMEOUT_SECONDS):
+                raise _ShardContentionError(
+                    f"Timed out after [{_SHARD_RESULT_TIMEOUT_SECONDS}] "
+                    f"seconds waiting for a shard to be entity matched")
+            match_results.append(_receive_from_shard(connection))
+
+        total_root_entities = len(people) \
+            if metadata.system_level == SystemLevel.COUNTY \
+            else sum(result.total_root_entities for result in match_results)
+        entity_matching_errors = sum(
+            result.entity_matching_errors for result in match_results)
+        logging.info("Completed entity matching across [%s] shards with [%s] "
+                     "errors", len(shards), entity_matching_errors)
+
+        should_commit = not _should_abort(
+            total_root_entities=total_root_entities,
+            conversion_result=conversion_result,
+            entity_matching_errors=entity_matching_errors,
+            data_validation_errors=data_validation_errors)
+        if not should_commit:
+            logging.info(
+                "_should_abort_ was true after sharded entity matching")
+
+        for _, connection in workers:
+            connection.send(should_commit)
+        for _, connection in workers:
+            if not connection.poll(_SHARD_RESULT_TIMEOUT_SECONDS):
+                raise PersistenceError(
+                    f"Timed out after [{_SHARD_RESULT_TIMEOUT_SECONDS}] "
+                    f"seconds waiting for a shard to commit")
+            _receive_from_shard(connection)
+    finally:
+        # Closing the connections makes any worker still waiting for the
+        # decision roll back its transaction.
+        for _, connection in workers:
+            connection.close()
+        for worker, _ in workers:
+            worker.join(_SHARD_RESULT_TIMEOUT_SECONDS)
+            if worker.is_alive():
+                # The database rolls back the transaction of a killed worker
+                worker.terminate()
+                worker.join()
+
+    if should_commit:
+        logging.info("Successfully wrote [%s] shards to the database",
+                     len(shards))
+    return should_commit
+
+
+def _receive_from_shard(connection: Connection) -> Any:
+    """Returns the next message from a shard's worker, raising the exception
+    the worker sent instead if it failed."""
+    message = connection.recv()
+    if isinstance(message, Exception):
+        raise message
+    return message
+
+
+def _match_and_write_shard(people: List[EntityPersonType],
+                           metadata: IngestMetadata,
+                           use_bulk_snapshot_updates: bool,
+                           connection: Connection) -> None:
+    """Runs in a forked worker. Entity matches |people| and flushes them into
+    an open transaction, sends the _ShardMatchResult to the parent through
+    |connection|, then commits only if the parent replies True. Any exception
+    is sent to the parent instead.
+    """
+    _replace_inherited_connection_pools()
+    session = SessionFactory.for_schema_base(
+        schema_base_for_system_level(metadata.system_level))
+    num_retries = 0
+    try:
+        try:
+            match_result, num_retries = \
+                _match_and_flush_shard_with_retries(
+                    session, people, metadata, use_bulk_snapshot_updates)
+        except sqlalchemy.exc.DBAPIError as e:
+            if not _is_lock_contention(e):
+                raise
+            raise _ShardContentionError(
+                f"Shard waited on a lock held by another transaction: "
+                f"{e.orig}") from e
+        connection.send(match_result)
+
+        should_commit = connection.recv()
+        if should_commit:
+            num_retries = _commit_shard(
+                session, people, metadata, use_bulk_snapshot_updates,
+                match_result, num_retries)
+        else:
+            session.rollback()
+        connection.send(should_commit)
+    except Exception as e:
+        session.rollback()
+        _send_error_to_parent(connection, e)
+    finally:
+        with monitoring.measurements({}) as measurements:
+            measurements.measure_int_put(m_retries, num_retries)
+        session.close()
+        connection.close()
+
+
+_MAX_SHARD_RETRIES = 5
+
+
+def _commit_shard(session: Session,
+                  people: List[EntityPersonType],
+                  metadata: IngestMetadata,
+                  use_bulk_snapshot_updates: bool,
+                  approved_result: _ShardMatchResult,
+                  num_retries: int) -> int:
+    """Commits the matched shard in |session|, returning the total number of
+    retries. On a serialization failure the shard is matched and written again,
+    and may only be committed if it has no more entity matching errors than in
+    the |approved_result| the parent's abort check was based on."""
+    while True:
+        try:
+            session.commit()
+            return num_retries
+        except sqlalchemy.exc.DBAPIError as e:
+            session.rollback()
+            if not _is_serialization_failure(e) \
+                    or num_retries >= _MAX_SHARD_RETRIES:
+                raise
+            logging.info('Retrying shard due to serialization failure: %s', e)
+            num_retries += 1
+            retry_result = _match_and_flush_shard(
+                session, people, metadata, use_bulk_snapshot_updates)
+            if retry_result.entity_matching_errors > \
+                    approved_result.entity_matching_errors:
+                raise ValueError(
+                    f"Shard had [{retry_result.entity_matching_errors}] "
+                    f"entity matching errors on retry, more than the "
+                    f"[{approved_result.entity_matching_errors}] approved.")
+
+
+def _match_and_flush_shard_with_retries(
+        session: Session,
+        people: List[EntityPersonType],
+        metadata: IngestMetadata,
+        use_bulk_snapshot_updates: bool) -> Tuple[_ShardMatchResult, int]:
+    """Returns the result of _match_and_flush_shard, retrying on
+    serialization failures, along with the number of retries."""
+    num_retries = 0
+    while True:
+        try:
+            return _match_and_flush_shard(
+                session, people, metadata, use_bulk_snapshot_updates), \
+                num_retries
+        except sqlalchemy.exc.DBAPIError as e:
+            session.rollback()
+            if not _is_serialization_failure(e) \
+                    or num_retries >= _MAX_SHARD_RETRIES:
+                raise
+            logging.info('Retrying shard due to serialization failure: %s', e)
+            num_retries += 1
+
+
+def _match_and_flush_shard(session: Session,
+                           people: List[EntityPersonType],
+                           metadata: IngestMetadata,
+                           use_bulk_snapshot_updates: bool) \
+        -> _ShardMatchResult:
+    """Entity matches |people| and writes the matched people to |session|,
+    flushing them without committing."""
+    entity_matching_output = entity_matching.match(
+        session, metadata.region, people)
+    database.write_people(
+        session, entity_matching_output.people, metadata,
+        orphaned_entities=entity_matching_output.orphaned_entities,
+        use_bulk_snapshot_updates=use_bulk_snapshot_updates)
+    session.flush()
+    return _ShardMatchResult(
+        total_root_entities=len(people)
+        if metadata.system_level == SystemLevel.COUNTY
+        else entity_matching_output.total_root_entities,
+        entity_matching_errors=entity_matching_output.error_count)
+
+
+def _is_serialization_failure(e: sqlalchemy.exc.DBAPIError) -> bool:
+    return isinstance(e.orig, psycopg2.OperationalError) \
+        and e.orig.pgcode == SERIALIZATION_FAILURE
+
+
+def _is_lock_contention(e: sqlalchemy.exc.DBAPIError) -> bool:
+    return isinstance(e.orig, psycopg2.OperationalError) \
+        and e.orig.pgcode in (LOCK_NOT_AVAILABLE, DEADLOCK_DETECTED)
+
+
+def _send_error_to_parent(connection: Connection, e: Exception) -> None:
+    """Sends |e| to the parent, or a RuntimeError describing it if |e| cannot
+    be pickled. Does nothing if the parent has gone away."""
+    try:
+        try:
+            connection.send(e)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            connection.send(RuntimeError(f'{type(e).__name__}: {e}'))
+    except (BrokenPipeError, EOFError, OSError):
+        logging.exception("Could not report shard failure to the parent")
+
+
+# The connection pools a forked worker inherited from its parent. They stay
+# referenced for the life of the worker, which exits without garbage
+# collecting, so that their connections are never closed from the worker.
+_inherited_connection_pools: List[Pool] = []
+
+
+def _replace_inherited_connection_pools() -> None:
+    """Gives each engine in a forked worker a new, empty connection pool, so
+    that the worker opens its own database connections. The inherited pools are
+    not disposed: closing their connections would close the sockets that the
+    parent's pooled connections still use.
+
+    On Postgres, the new connections wait at most _SHARD_LOCK_TIMEOUT_MS for a
+    lock."""
+    for schema_base in (JailsBase, StateBase):
+        engine = SQLAlchemyEngineManager.get_engine_for_schema_base(schema_base)
+        if engine:
+            _inherited_connection_pools.append(engine.pool)
+            engine.pool = engine.pool.recreate()
+            if engine.dialect.name == 'postgresql':
+                sqlalchemy.event.listen(engine.pool, 'connect',
+                                        _set_shard_lock_timeout)
+
+
+def _set_shard_lock_timeout(dbapi_connection, _connection_record) -> None:
+    with dbapi_connection.cursor() as cursor:
+        cursor.execute(f'SET lock_timeout = {int(_SHARD_LOCK_TIMEOUT_MS)}')
+    dbapi_connection.commit()
+
+
+def _shard_people_by_external_id(people: List[EntityPersonType],
+                                 num_shards: int) \
+        -> List[List[EntityPersonType]]:
+    """Partitions |people| into at most |num_shards| non-empty shards, keeping
+    people that share any external id in the same shard so that they are entity
+    matched against the same database people within a single transaction.
+    People without external ids are grouped by name and birthdate instead."""
+    parents = list(range(len(people)))
+
+    def find(i: int) -> int:
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    first_index_for_key: Dict[str, int] = {}
+    for i, person in enumerate(people):
+        for key in _get_shard_keys(person):
+            if key in first_index_for_key:
+                parents[find(i)] = find(first_index_for_key[key])
+            else:
+                first_index_for_key[key] = i
+
+    shard_key_for_root: Dict[int, str] = {}
+    for i, person in enumerate(people):
+        root = find(i)
+        key = min(_get_shard_keys(person))
+        if root not in shard_key_for_root or key < shard_key_for_root[root]:
+            shard_key_for_root[root] = key
+
+    shards: List[List[EntityPersonType]] = [[] for _ in range(num_shards)]
+    for i, person in enumerate(people):
+        shard_key = shard_key_for_root[find(i)]
+        shards[zlib.crc32(shard_key.encode()) % num_shards].append(person)
+    return [shard for shard in shards if shard]
+
+
+def _get_shard_keys(person: EntityPersonType) -> Tuple[str, ...]:
+    if isinstance(person, state_entities.StatePerson) and person.external_ids:
+        return tuple(f'{external_id.id_type}:{external_id.external_id}'
+                     for external_id in person.external_ids)
+    if isinstance(person, county_entities.Person) and person.external_id:
+        return (person.external_id,)
+    return (f'{person.full_name}:{person.birthdate}',)
+
+
+def _get_total_people(ingest_info: Union[IngestInfo, ingest_info_py.IngestInfo],
+                      metadata: IngestMetadata) -> int:
     if metadata.system_level == SystemLevel.COUNTY:
         return len(ingest_info.people)
     return len(ingest_info.state_people)
@@ -184,6 +184,73 @@ class BigQueryClientImplTest(unittest.TestCase):
         self.mock_client.delete_table.assert_called_with(
             bigquery.DatasetReference(self.mock_project_id, self.mock_view.dataset_id).table(self.mock_table_id))
 
+    def test_export_query_results_to_cloud_storage_pipelined(self):
+        """export_query_results_to_cloud_storage_pipelined creates each table with an expiration, fills it from the view
+        query, exports the table and deletes it."""
+        bucket = self.mock_project_id + '-bucket'
+        query_job = futures.Future()
+        query_job.set_result([])
+        extract_job = futures.Future()
+        extract_job.set_result(None)
+        self.mock_client.query.return_value = query_job
+        self.mock_client.extract_table.return_value = extract_job
+        self.mock_client.create_table.side_effect = lambda table, exists_ok: table
+        self.bq_client.export_query_results_to_cloud_storage_pipelined([
+            ExportQueryConfig.from_view_query(
+                view=self.mock_view,
+                view_filter_clause=f'WHERE state_code = \'{state_code}\'',
+                intermediate_table_name=f'{self.mock_table_id}_{state_code}',
+                output_uri=f'gs://{bucket}/{state_code}/view.json',
+                output_format=bigquery.DestinationFormat.NEWLINE_DELIMITED_JSON)
+            for state_code in ['US_XX', 'US_YY']
+            ])
+        self.assertEqual(2, self.mock_client.query.call_count)
+        self.mock_client.update_table.assert_not_called()
+
+        # Each table is created with an expiration before its query starts
+        created_table_ids = []
+        for name, args, kwargs in self.mock_client.method_calls:
+            if name == 'create_table':
+                self.assertIsNotNone(args[0].expires)
+                created_table_ids.append(args[0].table_id)
+            elif name == 'query':
+                self.assertIn(kwargs['job_config'].destination.table_id, created_table_ids)
+        self.assertCountEqual([f'{self.mock_table_id}_US_XX', f'{self.mock_table_id}_US_YY'], created_table_ids)
+        self.assertEqual(2, self.mock_client.extract_table.call_count)
+        dataset_ref = bigquery.DatasetReference(self.mock_project_id, self.mock_view.dataset_id)
+        self.mock_client.delete_table.assert_has_calls([
+            mock.call(dataset_ref.table(f'{self.mock_table_id}_US_XX')),
+            mock.call(dataset_ref.table(f'{self.mock_table_id}_US_YY'))
+        ], any_order=True)
+
+    def test_export_query_results_to_cloud_storage_pipelined_query_fails(self):
+        """If a query job fails, the error is raised and the other configs are still exported."""
+        bucket = self.mock_project_id + '-bucket'
+        failed_query_job = futures.Future()
+        failed_query_job.set_exception(exceptions.BadRequest('!'))
+        query_job = futures.Future()
+        query_job.set_result([])
+        extract_job = futures.Future()
+        extract_job.set_result(None)
+        self.mock_client.query.side_effect = [failed_query_job, query_job]
+        self.mock_client.extract_table.return_value = extract_job
+        with futures.ThreadPoolExecutor(max_workers=1) as executor, \
+                mock.patch('recidiviz.big_query.big_query_client.futures.ThreadPoolExecutor', return_value=executor):
+            with self.assertRaises(exceptions.BadRequest):
+                self.bq_client.export_query_results_to_cloud_storage_pipelined([
+                    ExportQueryConfig.from_view_query(
+                        view=self.mock_view,
+                        view_filter_clause=f'WHERE state_code = \'{state_code}\'',
+                        intermediate_table_name=f'{self.mock_table_id}_{state_code}',
+                        output_uri=f'gs://{bucket}/{state_code}/view.json',
+                        output_format=bigquery.DestinationFormat.NEWLINE_DELIMITED_JSON)
+                    for state_code in ['US_XX', 'US_YY']
+                ])
+        self.mock_client.extract_table.assert_called_once()
+        self.mock_client.delete_table.assert_called_once_with(
+            bigquery.DatasetReference(self.mock_project_id, self.mock_view.dataset_id).table(
+                f'{self.mock_table_id}_US_YY'))
+
     def test_create_table_from_query(self):
         """Tests that the create_table_from_query function calls the function to create a table from a query."""
         self.bq_client.create_table_from_query_async(self.mock_dataset_id, self.mock_table_id,
@@ -0,0 +1,135 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for big_query_view_dag_walker.py."""
+import threading
+import time
+import unittest
+from typing import List
+
+from recidiviz.big_query.big_query_view import BigQueryView
+from recidiviz.big_query.big_query_view_dag_walker import BigQueryViewDagWalker
+
+_PROJECT_ID = 'fake-recidiviz-project'
+
+
+def _view(dataset_id: str, view_id: str, query: str, materialized_view_table_id=None) -> BigQueryView:
+    return BigQueryView(project_id=_PROJECT_ID,
+                        dataset_id=dataset_id,
+                        view_id=view_id,
+                        view_query_template=query,
+                        materialized_view_table_id=materialized_view_table_id)
+
+
+class BigQueryViewDagWalkerTest(unittest.TestCase):
+    """Tests for BigQueryViewDagWalker."""
+
+    def setUp(self) -> None:
+        self.view_a = _view('dataset_1', 'view_a', 'SELECT * FROM `{project_id}.raw_data.table`',
+                            materialized_view_table_id='view_a_table')
+        self.view_b = _view('dataset_1', 'view_b', 'SELECT * FROM `{project_id}.dataset_1.view_a_table`')
+        self.view_c = _view('dataset_2', 'view_c', 'SELECT 1')
+        self.view_d = _view('dataset_2', 'view_d',
+                            'SELECT * FROM `{project_id}.dataset_1.view_b` '
+                            'JOIN `{project_id}.dataset_2.view_c` USING (person_id)')
+
+    def test_dag_edges(self):
+        walker = BigQueryViewDagWalker([self.view_d, self.view_c, self.view_b, self.view_a])
+
+        self.assertEqual(set(), walker.nodes_by_key[('dataset_1', 'view_a')].parent_keys)
+        self.assertEqual({('dataset_1', 'view_a')}, walker.nodes_by_key[('dataset_1', 'view_b')].parent_keys)
+        self.assertEqual({('dataset_1', 'view_b'), ('dataset_2', 'view_c')},
+                         walker.nodes_by_key[('dataset_2', 'view_d')].parent_keys)
+        self.assertEqual({('dataset_2', 'view_d')}, walker.nodes_by_key[('dataset_2', 'view_c')].child_keys)
+
+    def test_process_dag_respects_dependencies(self):
+        walker = BigQueryViewDagWalker([self.view_d, self.view_c, self.view_b, self.view_a])
+        processed: List[str] = []
+        lock = threading.Lock()
+
+        def _process(view: BigQueryView) -> str:
+            time.sleep(0.01)
+            with lock:
+                processed.append(view.view_id)
+            return view.view_id
+
+        results = walker.process_dag(_process)
+
+        self.assertEqual({self.view_a: 'view_a', self.view_b: 'view_b', self.view_c: 'view_c', self.view_d: 'view_d'},
+                         results)
+        self.assertLess(processed.index('view_a'), processed.index('view_b'))
+        self.assertLess(processed.index('view_b'), processed.index('view_d'))
+        self.assertLess(processed.index('view_c'), processed.index('view_d'))
+
+    def test_process_dag_processes_independent_views_concurrently(self):
+        views = [_view('dataset', f'view_{i}', 'SELECT 1') for i in range(3)]
+        barrier = threading.Barrier(len(views), timeout=5)
+
+        # Each view waits for all the others to start, which only succeeds if they are processed concurrently
+        results = BigQueryViewDagWalker(views).process_dag(lambda view: barrier.wait() is not None)
+
+        self.assertEqual({view: True for view in views}, results)
+
+    def test_process_dag_raises_and_stops(self):
+        walker = BigQueryViewDagWalker([self.view_a, self.view_b])
+        processed: List[str] = []
+
+        def _process(view: BigQueryView) -> None:
+            processed.append(view.view_id)
+            raise ValueError('Failed')
+
+        with self.assertRaises(ValueError):
+            walker.process_dag(_process)
+
+        self.assertEqual(['view_a'], processed)
+
+    def test_process_dag_raises_and_cancels_queued_views(self):
+        views = [_view('dataset', f'view_{i}', 'SELECT 1') for i in range(3)]
+        processed: List[str] = []
+
+        def _process(view: BigQueryView) -> None:
+            processed.append(view.view_id)
+            if view.view_id == 'view_0':
+                raise ValueError('Failed')
+            # Gives the walker time to cancel the views still queued behind this one
+            time.sleep(0.1)
+
+        with self.assertRaises(ValueError):
+            BigQueryViewDagWalker(views).process_dag(_process, max_workers=1)
+
+        self.assertNotIn('view_2', processed)
+
+    def test_ignores_unknown_and_self_references(self):
+        view = _view('dataset', 'view', 'SELECT * FROM `{project_id}.dataset.view` JOIN `other-project.dataset.other`')
+
+        walker = BigQueryViewDagWalker([view])
+
+        self.assertEqual(set(), walker.nodes_by_key[('dataset', 'view')].parent_keys)
+
+    def test_cycle_raises(self):
+        view_1 = _view('dataset', 'view_1', 'SELECT * FROM `{project_id}.dataset.view_2`')
+        view_2 = _view('dataset', 'view_2', 'SELECT * FROM `{project_id}.dataset.view_1`')
+        view_3 = _view('dataset', 'view_3', 'SELECT 1')
+
+        with self.assertRaises(ValueError) as e:
+            BigQueryViewDagWalker([view_1, view_2, view_3])
+
+        self.assertIn('dataset.view_1', str(e.exception))
+        self.assertNotIn('dataset.view_3', str(e.exception))
+
+    def test_duplicate_views_raise(self):
+        with self.assertRaises(ValueError):
+            BigQueryViewDagWalker([self.view_a, self.view_a])
@@ -64,7 +64,7 @@ class ViewManagerTest(unittest.TestCase):
         self.mock_client.dataset_ref_for_id.assert_called_with(_DATASET_NAME)
         self.mock_client.create_dataset_if_necessary.assert_called_with(dataset)
         self.mock_client.create_or_update_view.assert_has_calls(
-            [mock.call(dataset, view_builder.build()) for view_builder in mock_view_builders])
+            [mock.call(dataset, view_builder.build()) for view_builder in mock_view_builders], any_order=True)
 
     def test_create_dataset_and_update_views_for_view_builders_materialized_views_only(self):
         """Test that create_dataset_and_update_views_for_view_builders only updates views that have a set
@@ -89,7 +89,7 @@ class ViewManagerTest(unittest.TestCase):
         self.mock_client.create_dataset_if_necessary.assert_called_with(dataset)
         self.mock_client.create_or_update_view.assert_has_calls(
             [mock.call(dataset, view_builder.build()) for view_builder in mock_view_builders
-             if view_builder.build().materialized_view_table_id is not None])
+             if view_builder.build().materialized_view_table_id is not None], any_order=True)
 
     def test_create_dataset_and_update_views(self):
         """Test that create_dataset_and_update_views creates a dataset if necessary, and updates all views."""
@@ -108,4 +108,5 @@ class ViewManagerTest(unittest.TestCase):
 
         self.mock_client.dataset_ref_for_id.assert_called_with(_DATASET_NAME)
         self.mock_client.create_dataset_if_necessary.assert_called_with(dataset)
-        self.mock_client.create_or_update_view.assert_has_calls([mock.call(dataset, view) for view in mock_views])
+        self.mock_client.create_or_update_view.assert_has_calls([mock.call(dataset, view) for view in mock_views],
+                                                                any_order=True)
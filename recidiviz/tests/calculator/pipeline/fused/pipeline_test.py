@@ -0,0 +1,90 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+# pylint: disable=wrong-import-order
+
+"""Tests for fused/pipeline.py."""
+import unittest
+
+import apache_beam as beam
+from apache_beam.testing.test_pipeline import TestPipeline
+from apache_beam.testing.util import assert_that, equal_to
+
+from recidiviz.calculator.pipeline.fused import pipeline
+
+
+class TestFusedPipeline(unittest.TestCase):
+    """Tests for the fused calculation pipeline."""
+
+    def testGetArgParser_Defaults(self):
+        known_args, _ = pipeline.get_arg_parser().parse_known_args([])
+
+        self.assertEqual(['incarceration', 'program', 'recidivism', 'supervision'], known_args.pipelines)
+        self.assertEqual({'ALL'}, known_args.metric_types)
+        self.assertFalse(known_args.compress_population_buckets)
+        self.assertFalse(known_args.aggregate_event_based_metrics)
+
+    def testGetArgParser_AcceptsMetricTypesOfAllPipelines(self):
+        known_args, _ = pipeline.get_arg_parser().parse_known_args(
+            ['--pipelines', 'recidivism', 'supervision',
+             '--metric_types', 'REINCARCERATION_RATE', 'SUPERVISION_POPULATION'])
+
+        self.assertEqual(['recidivism', 'supervision'], known_args.pipelines)
+        self.assertEqual(['REINCARCERATION_RATE', 'SUPERVISION_POPULATION'], known_args.metric_types)
+
+    def testMetricTypesByPipeline_All(self):
+        metric_types = pipeline.metric_types_by_pipeline(['incarceration', 'supervision'], {'ALL'})
+
+        self.assertEqual({'incarceration': {'ALL'}, 'supervision': {'ALL'}}, metric_types)
+
+    def testMetricTypesByPipeline_SkipsPipelinesWithoutRequestedMetrics(self):
+        metric_types = pipeline.metric_types_by_pipeline(
+            ['incarceration', 'program', 'supervision'],
+            {'INCARCERATION_ADMISSION', 'SUPERVISION_REVOCATION', 'SUPERVISION_POPULATION', 'REINCARCERATION_RATE'})
+
+        self.assertEqual({'incarceration': {'INCARCERATION_ADMISSION'},
+                          'supervision': {'SUPERVISION_REVOCATION', 'SUPERVISION_POPULATION'}},
+                         metric_types)
+
+    def testMetricTypesByPipeline_NoMatchingPipelines(self):
+        with self.assertRaises(ValueError):
+            pipeline.metric_types_by_pipeline(['program'], {'REINCARCERATION_RATE'})
+
+    def testCalculatePipelineMetrics_SharedRootEntities(self):
+        """Tests that the calculations of several pipelines can read the same root entities in one job, even when
+        they use the same step labels."""
+
+        def build_calculations(p, root_entities, output):
+            persons = root_entities['persons']
+            extra = (p | 'Create reference rows' >> beam.Create([(1, 'reference')]))
+
+            calculated = ((persons, extra)
+                          | 'Flatten' >> beam.Flatten()
+                          | 'Tag with output' >> beam.Map(lambda element: (output, element[0])))
+
+            assert_that(calculated, equal_to([(output, 1), (output, 1)]))
+
+        test_pipeline = TestPipeline()
+        root_entities = {'persons': test_pipeline | beam.Create([(1, 'person')])}
+
+        _ = (root_entities
+             | 'Calculate first metrics' >>
+             pipeline.CalculatePipelineMetrics(build_calculations, output='first'))
+        _ = (root_entities
+             | 'Calculate second metrics' >>
+             pipeline.CalculatePipelineMetrics(build_calculations, output='second'))
+
+        test_pipeline.run()
@@ -28,7 +28,8 @@ from recidiviz.calculator.pipeline.supervision.metrics import \
 from recidiviz.calculator.pipeline.supervision.supervision_case_compliance import SupervisionCaseCompliance
 from recidiviz.calculator.pipeline.supervision.supervision_time_bucket import \
     NonRevocationReturnSupervisionTimeBucket, SupervisionTimeBucket, \
-    RevocationReturnSupervisionTimeBucket, ProjectedSupervisionCompletionBucket, SupervisionTerminationBucket
+    RevocationReturnSupervisionTimeBucket, ProjectedSupervisionCompletionBucket, SupervisionTerminationBucket, \
+    NonRevocationReturnSupervisionTimeBucketRun
 from recidiviz.calculator.pipeline.utils import calculator_utils
 from recidiviz.calculator.pipeline.utils.calculator_utils import last_day_of_month
 from recidiviz.calculator.pipeline.utils.metric_utils import \
@@ -731,6 +732,67 @@ class TestMapSupervisionCombinations(unittest.TestCase):
         self.assertEqual(expected_combinations_count, len(supervision_combinations))
         assert all(value == 1 for _combination, value in supervision_combinations)
 
+    def test_map_supervision_combinations_bucket_runs(self):
+        """Tests the map_supervision_combinations function where consecutive days on supervision are represented by
+        NonRevocationReturnSupervisionTimeBucketRuns, which should produce the same combinations as the daily buckets,
+        and should only be expanded for the months included in the calculations."""
+        person = StatePerson.new_with_defaults(person_id=12345,
+                                               birthdate=date(1984, 8, 31),
+                                               gender=Gender.FEMALE)
+
+        supervision_time_bucket_runs = [
+            NonRevocationReturnSupervisionTimeBucketRun(
+                state_code='US_MO', year=2018, month=3,
+                bucket_date=date(2018, 3, 10),
+                is_on_supervision_last_day_of_month=False,
+                supervision_type=StateSupervisionPeriodSupervisionType.PAROLE,
+                run_end_date_exclusive=date(2018, 3, 31)),
+            NonRevocationReturnSupervisionTimeBucket(
+                state_code='US_MO', year=2018, month=3,
+                bucket_date=date(2018, 3, 31),
+                is_on_supervision_last_day_of_month=True,
+                supervision_type=StateSupervisionPeriodSupervisionType.PAROLE),
+            NonRevocationReturnSupervisionTimeBucketRun(
+                state_code='US_MO', year=2018, month=4,
+                bucket_date=date(2018, 4, 1),
+                is_on_supervision_last_day_of_month=False,
+                supervision_type=StateSupervisionPeriodSupervisionType.PAROLE,
+                run_end_date_exclusive=date(2018, 4, 12)),
+        ]
+
+        daily_buckets = [
+            NonRevocationReturnSupervisionTimeBucket(
+                state_code='US_MO', year=day.year, month=day.month,
+                bucket_date=day,
+                is_on_supervision_last_day_of_month=(day == last_day_of_month(day)),
+                supervision_type=StateSupervisionPeriodSupervisionType.PAROLE)
+            for day in [date(2018, 3, x) for x in range(10, 32)] + [date(2018, 4, x) for x in range(1, 12)]
+        ]
+
+        run_combinations = calculator.map_supervision_combinations(
+            person, supervision_time_bucket_runs, ALL_METRICS_INCLUSIONS_DICT,
+            calculation_end_month='2018-04',
+            calculation_month_count=-1
+        )
+
+        daily_combinations = calculator.map_supervision_combinations(
+            person, daily_buckets, ALL_METRICS_INCLUSIONS_DICT,
+            calculation_end_month='2018-04',
+            calculation_month_count=-1
+        )
+
+        self.assertCountEqual(daily_combinations, run_combinations)
+
+        limited_run_combinations = calculator.map_supervision_combinations(
+            person, supervision_time_bucket_runs, ALL_METRICS_INCLUSIONS_DICT,
+            calculation_end_month='2018-04',
+            calculation_month_count=1
+        )
+
+        april_buckets = [bucket for bucket in daily_buckets if bucket.month == 4]
+
+        self.assertEqual(expected_metric_combos_count(april_buckets), len(limited_run_combinations))
+
     def test_map_supervision_combinations_overlapping_days(self):
         """Tests the map_supervision_combinations function where the person was serving multiple supervision sentences
         simultaneously in a given month."""
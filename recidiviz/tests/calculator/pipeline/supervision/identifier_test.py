@@ -36,7 +36,8 @@ from recidiviz.calculator.pipeline.supervision.metrics import SupervisionMetricT
 from recidiviz.calculator.pipeline.supervision.supervision_time_bucket import \
     NonRevocationReturnSupervisionTimeBucket, \
     RevocationReturnSupervisionTimeBucket,\
-    ProjectedSupervisionCompletionBucket, SupervisionTerminationBucket
+    ProjectedSupervisionCompletionBucket, SupervisionTerminationBucket, NonRevocationReturnSupervisionTimeBucketRun, \
+    SupervisionTimeBucket
 from recidiviz.calculator.pipeline.utils.state_utils.us_mo.us_mo_sentence_classification import SupervisionTypeSpan
 from recidiviz.calculator.pipeline.utils.supervision_period_index import SupervisionPeriodIndex
 from recidiviz.calculator.pipeline.utils.supervision_period_utils import SUPERVISION_PERIOD_PROXIMITY_MONTH_LIMIT
@@ -3455,6 +3456,114 @@ class TestClassifySupervisionTimeBuckets(unittest.TestCase):
 
         self.assertCountEqual(supervision_time_buckets, expected_buckets)
 
+    def test_find_supervision_time_buckets_compress_population_buckets_us_mo(self):
+        """Tests that the find_supervision_time_buckets function produces the same buckets when the population buckets
+        are compressed into runs, where overlapping supervision periods of different types are converted to DUAL."""
+        first_supervision_period = \
+            StateSupervisionPeriod.new_with_defaults(
+                supervision_period_id=111,
+                external_id='sp1',
+                status=StateSupervisionPeriodStatus.TERMINATED,
+                state_code='US_MO',
+                start_date=date(2018, 1, 5),
+                termination_date=date(2018, 6, 19),
+                termination_reason=StateSupervisionPeriodTerminationReason.DISCHARGE,
+                supervision_type=None
+            )
+
+        second_supervision_period = \
+            StateSupervisionPeriod.new_with_defaults(
+                supervision_period_id=222,
+                external_id='sp2',
+                status=StateSupervisionPeriodStatus.TERMINATED,
+                state_code='US_MO',
+                start_date=date(2018, 3, 12),
+                termination_date=date(2018, 4, 23),
+                termination_reason=StateSupervisionPeriodTerminationReason.DISCHARGE,
+                supervision_type=None
+            )
+
+        supervision_sentence = \
+            FakeUsMoSupervisionSentence.fake_sentence_from_sentence(
+                StateSupervisionSentence.new_with_defaults(
+                    supervision_sentence_id=111,
+                    start_date=date(2017, 1, 1),
+                    completion_date=date(2018, 6, 19),
+                    external_id='ss1',
+                    status=StateSentenceStatus.COMPLETED,
+                    supervision_periods=[first_supervision_period],
+                    supervision_type=StateSupervisionType.PROBATION
+                ),
+                supervision_type_spans=[
+                    SupervisionTypeSpan(
+                        start_date=first_supervision_period.start_date,
+                        end_date=first_supervision_period.termination_date,
+                        supervision_type=StateSupervisionType.PROBATION
+                    ),
+                    SupervisionTypeSpan(
+                        start_date=first_supervision_period.termination_date,
+                        end_date=None,
+                        supervision_type=None
+                    )
+                ]
+            )
+
+        incarceration_sentence = \
+            FakeUsMoIncarcerationSentence.fake_sentence_from_sentence(
+                StateIncarcerationSentence.new_with_defaults(
+                    incarceration_sentence_id=123,
+                    external_id='is1',
+                    start_date=date(2017, 1, 1),
+                    completion_date=date(2018, 4, 23),
+                    supervision_periods=[second_supervision_period]
+                ),
+                supervision_type_spans=[
+                    SupervisionTypeSpan(
+                        start_date=second_supervision_period.start_date,
+                        end_date=second_supervision_period.termination_date,
+                        supervision_type=StateSupervisionType.PAROLE
+                    ),
+                    SupervisionTypeSpan(
+                        start_date=second_supervision_period.termination_date,
+                        end_date=None,
+                        supervision_type=None
+                    )
+                ]
+            )
+
+        assessment = StateAssessment.new_with_defaults(
+            state_code='US_MO',
+            assessment_type=StateAssessmentType.ORAS,
+            assessment_score=33,
+            assessment_level=StateAssessmentLevel.HIGH,
+            assessment_date=date(2018, 2, 10)
+        )
+
+        find_buckets_args = (
+            [supervision_sentence],
+            [incarceration_sentence],
+            [first_supervision_period, second_supervision_period],
+            [],
+            [assessment],
+            [],
+            [],
+            DEFAULT_SSVR_AGENT_ASSOCIATIONS,
+            DEFAULT_SUPERVISION_PERIOD_AGENT_ASSOCIATIONS,
+            DEFAULT_SUPERVISION_PERIOD_JUDICIAL_DISTRICT_ASSOCIATIONS
+        )
+
+        daily_buckets = identifier.find_supervision_time_buckets(*find_buckets_args)
+
+        compressed_buckets = identifier.find_supervision_time_buckets(
+            *find_buckets_args, compress_population_buckets=True)
+
+        self.assertTrue(any(isinstance(bucket, NonRevocationReturnSupervisionTimeBucketRun)
+                            for bucket in compressed_buckets))
+        self.assertTrue(any(bucket.supervision_type == StateSupervisionPeriodSupervisionType.DUAL
+                            for bucket in daily_buckets))
+        self.assertLess(len(compressed_buckets), len(daily_buckets))
+        self.assertCountEqual(daily_buckets, expand_bucket_runs(compressed_buckets))
+
     def test_find_supervision_time_buckets_infer_supervision_type_dual_us_id(self):
         """Tests the find_supervision_time_buckets function where the supervision type is taken from a `DUAL`
         supervision period. Asserts that the DUAL buckets are NOT expanded into separate PROBATION and PAROLE buckets.
@@ -4746,6 +4855,95 @@ class TestFindTimeBucketsForSupervisionPeriod(unittest.TestCase):
             incarceration_period.admission_date
         ))
 
+    def test_find_time_buckets_for_supervision_period_compress_population_buckets(self):
+        """Tests that the find_time_buckets_for_supervision_period function produces runs of days that expand to the
+        same buckets as the daily output when assessments, violation responses and incarceration change the attributes
+        of the buckets over the course of the supervision period."""
+        supervision_period = \
+            StateSupervisionPeriod.new_with_defaults(
+                supervision_period_id=111,
+                external_id='sp1',
+                state_code='US_ND',
+                start_date=date(2016, 7, 5),
+                termination_date=date(2018, 5, 19),
+                supervision_type=StateSupervisionType.PROBATION
+            )
+
+        incarceration_period = \
+            StateIncarcerationPeriod.new_with_defaults(
+                incarceration_period_id=111,
+                external_id='ip1',
+                state_code='US_ND',
+                admission_date=date(2017, 4, 25),
+                admission_reason=StateIncarcerationPeriodAdmissionReason.PROBATION_REVOCATION,
+                release_date=date(2017, 6, 12),
+                release_reason=ReleaseReason.SENTENCE_SERVED
+            )
+
+        supervision_sentence = \
+            StateSupervisionSentence.new_with_defaults(
+                supervision_sentence_id=111,
+                start_date=date(2016, 1, 1),
+                external_id='ss1',
+                supervision_type=StateSupervisionType.PROBATION,
+                status=StateSentenceStatus.COMPLETED,
+                completion_date=date(2018, 5, 19),
+                supervision_periods=[supervision_period]
+            )
+
+        assessments = [
+            StateAssessment.new_with_defaults(
+                state_code='US_ND',
+                assessment_type=StateAssessmentType.LSIR,
+                assessment_score=score,
+                assessment_date=assessment_date
+            ) for score, assessment_date in [(17, date(2016, 9, 13)), (29, date(2017, 8, 2))]
+        ]
+
+        violation_responses = [
+            StateSupervisionViolationResponse.new_with_defaults(
+                state_code='US_ND',
+                supervision_violation_response_id=_DEFAULT_SSVR_ID,
+                response_type=StateSupervisionViolationResponseType.VIOLATION_REPORT,
+                response_date=date(2017, 3, 14),
+                supervision_violation=StateSupervisionViolation.new_with_defaults(
+                    state_code='US_ND',
+                    supervision_violation_id=123,
+                    violation_date=date(2017, 3, 1),
+                    supervision_violation_types=[
+                        StateSupervisionViolationTypeEntry.new_with_defaults(
+                            state_code='US_ND',
+                            violation_type=StateSupervisionViolationType.FELONY
+                        )
+                    ]
+                )
+            )
+        ]
+
+        incarceration_period_index = IncarcerationPeriodIndex(incarceration_periods=[incarceration_period])
+        supervision_period_index = SupervisionPeriodIndex(supervision_periods=[supervision_period])
+
+        find_buckets_args = (
+            [supervision_sentence],
+            [],
+            supervision_period,
+            supervision_period_index,
+            incarceration_period_index,
+            assessments,
+            violation_responses,
+            [],
+            DEFAULT_SUPERVISION_PERIOD_AGENT_ASSOCIATIONS
+        )
+
+        daily_buckets = identifier.find_time_buckets_for_supervision_period(*find_buckets_args)
+
+        compressed_buckets = identifier.find_time_buckets_for_supervision_period(
+            *find_buckets_args, compress_population_buckets=True)
+
+        # Each month has at most one run before the last day of the month, plus the change points within the month
+        self.assertLess(len(compressed_buckets), len(daily_buckets) / 10)
+        self.assertCountEqual(daily_buckets, expand_bucket_runs(compressed_buckets))
+
     def test_find_time_buckets_for_supervision_period_incarceration_ends_same_month(self):
         """Tests the find_time_buckets_for_supervision_period function when there is an incarceration period with a
         revocation admission before the supervision period's termination_date, and the supervision_period and the
@@ -8543,6 +8741,20 @@ def expected_non_revocation_return_time_buckets(
     return expected_buckets
 
 
+def expand_bucket_runs(supervision_time_buckets: List[SupervisionTimeBucket]) -> List[SupervisionTimeBucket]:
+    """Returns the |supervision_time_buckets| with every NonRevocationReturnSupervisionTimeBucketRun replaced by the
+    daily buckets it represents."""
+    expanded_buckets: List[SupervisionTimeBucket] = []
+
+    for bucket in supervision_time_buckets:
+        if isinstance(bucket, NonRevocationReturnSupervisionTimeBucketRun):
+            expanded_buckets.extend(bucket.expand())
+        else:
+            expanded_buckets.append(bucket)
+
+    return expanded_buckets
+
+
 class TestFindAssessmentScoreChange(unittest.TestCase):
     """Tests the find_assessment_score_change function."""
     def test_find_assessment_score_change(self):
@@ -0,0 +1,82 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for supervision_time_bucket_index.py."""
+import unittest
+from datetime import date
+
+from recidiviz.calculator.pipeline.supervision.supervision_time_bucket import \
+    NonRevocationReturnSupervisionTimeBucket, RevocationReturnSupervisionTimeBucket, SupervisionTerminationBucket
+from recidiviz.calculator.pipeline.supervision.supervision_time_bucket_index import SupervisionTimeBucketIndex
+from recidiviz.common.constants.state.state_supervision_period import StateSupervisionPeriodSupervisionType
+
+
+class TestSupervisionTimeBucketIndex(unittest.TestCase):
+    """Tests the SupervisionTimeBucketIndex."""
+    def setUp(self):
+        self.population_bucket_1 = NonRevocationReturnSupervisionTimeBucket(
+            state_code='US_ND', year=2018, month=3, bucket_date=date(2018, 3, 30),
+            is_on_supervision_last_day_of_month=False,
+            supervision_type=StateSupervisionPeriodSupervisionType.PROBATION)
+        self.population_bucket_2 = NonRevocationReturnSupervisionTimeBucket(
+            state_code='US_ND', year=2018, month=3, bucket_date=date(2018, 3, 31),
+            is_on_supervision_last_day_of_month=True,
+            supervision_type=StateSupervisionPeriodSupervisionType.PROBATION)
+        self.revocation_bucket = RevocationReturnSupervisionTimeBucket(
+            state_code='US_ND', year=2018, month=3, bucket_date=date(2018, 3, 31),
+            is_on_supervision_last_day_of_month=True,
+            supervision_type=StateSupervisionPeriodSupervisionType.PAROLE)
+        self.termination_bucket = SupervisionTerminationBucket(
+            state_code='US_ND', year=2019, month=10, bucket_date=date(2019, 10, 3),
+            supervision_type=StateSupervisionPeriodSupervisionType.PAROLE)
+
+        self.buckets = [self.population_bucket_1, self.population_bucket_2, self.revocation_bucket,
+                        self.termination_bucket]
+
+    def test_population_buckets_by_date(self):
+        bucket_index = SupervisionTimeBucketIndex(self.buckets)
+
+        self.assertEqual([self.population_bucket_1],
+                         bucket_index.population_buckets_by_date[date(2018, 3, 30)])
+        self.assertEqual([self.population_bucket_2, self.revocation_bucket],
+                         bucket_index.population_buckets_by_date[date(2018, 3, 31)])
+        self.assertNotIn(date(2019, 10, 3), bucket_index.population_buckets_by_date)
+
+    def test_buckets_in_month(self):
+        bucket_index = SupervisionTimeBucketIndex(self.buckets)
+
+        self.assertEqual([self.revocation_bucket],
+                         bucket_index.buckets_in_month(RevocationReturnSupervisionTimeBucket, 2018, 3))
+        self.assertEqual([self.population_bucket_1, self.population_bucket_2],
+                         bucket_index.buckets_in_month(NonRevocationReturnSupervisionTimeBucket, 2018, 3))
+        self.assertEqual([], bucket_index.buckets_in_month(SupervisionTerminationBucket, 2018, 3))
+        self.assertEqual([self.termination_bucket],
+                         bucket_index.buckets_in_month(SupervisionTerminationBucket, 2019, 10))
+
+    def test_metric_periods(self):
+        bucket_index = SupervisionTimeBucketIndex(self.buckets, metric_period_end_date=date(2019, 10, 31))
+
+        self.assertEqual({36}, bucket_index.metric_periods_by_bucket_id[id(self.revocation_bucket)])
+        self.assertEqual({3, 6, 12, 36}, bucket_index.metric_periods_by_bucket_id[id(self.termination_bucket)])
+        self.assertEqual([self.revocation_bucket],
+                         bucket_index.buckets_in_metric_period(RevocationReturnSupervisionTimeBucket, 36))
+        self.assertEqual([], bucket_index.buckets_in_metric_period(RevocationReturnSupervisionTimeBucket, 12))
+
+    def test_metric_periods_no_end_date(self):
+        bucket_index = SupervisionTimeBucketIndex(self.buckets)
+
+        self.assertEqual({}, bucket_index.buckets_by_metric_period)
+        self.assertNotIn(id(self.termination_bucket), bucket_index.metric_periods_by_bucket_id)
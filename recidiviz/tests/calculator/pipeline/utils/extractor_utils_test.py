@@ -20,6 +20,8 @@
 
 
 """Tests for utils/extractor_utils.py."""
+import logging
+import time
 from typing import Type
 
 import unittest
@@ -1697,6 +1699,85 @@ class TestHydrateRootEntityWithRelationshipPropertyEntities(unittest.TestCase):
 
         test_pipeline.run()
 
+    def testHydrateRelationshipsOnEntities_ManyChildren(self):
+        """Micro-benchmark for hydrating a person with many sentence groups,
+        each with many sentences, on the DirectRunner."""
+        person_id = 143
+        num_sentence_groups = 200
+        num_sentences_per_group = 10
+
+        def _sentence_group(sentence_group_id):
+            return entities.StateSentenceGroup.new_with_defaults(
+                sentence_group_id=sentence_group_id,
+                status=StateSentenceStatus.SERVING,
+                state_code='us_ca')
+
+        def _incarceration_sentence(sentence_group_id, index):
+            return entities.StateIncarcerationSentence.new_with_defaults(
+                incarceration_sentence_id=sentence_group_id * 100 + index,
+                status=StateSentenceStatus.SERVING,
+                state_code='us_ca')
+
+        def _supervision_sentence(sentence_group_id, index):
+            return entities.StateSupervisionSentence.new_with_defaults(
+                supervision_sentence_id=sentence_group_id * 100 + index,
+                status=StateSentenceStatus.SERVING,
+                state_code='us_ca')
+
+        sentence_group_ids = range(1, num_sentence_groups + 1)
+        sentence_indices = range(num_sentences_per_group)
+
+        element = [(person_id, {
+            schema.StateSentenceGroup.__tablename__: [
+                _sentence_group(sentence_group_id)
+                for sentence_group_id in sentence_group_ids],
+            'incarceration_sentences': [
+                (sentence_group_id,
+                 _incarceration_sentence(sentence_group_id, index))
+                for index in sentence_indices
+                for sentence_group_id in sentence_group_ids],
+            'supervision_sentences': [
+                (sentence_group_id,
+                 _supervision_sentence(sentence_group_id, index))
+                for index in sentence_indices
+                for sentence_group_id in sentence_group_ids],
+        })]
+
+        expected_output = []
+        for sentence_group_id in sentence_group_ids:
+            sentence_group = _sentence_group(sentence_group_id)
+            sentence_group.incarceration_sentences = [
+                _incarceration_sentence(sentence_group_id, index)
+                for index in sentence_indices]
+            sentence_group.supervision_sentences = [
+                _supervision_sentence(sentence_group_id, index)
+                for index in sentence_indices]
+            expected_output.append((person_id, sentence_group))
+
+        hydrate_kwargs = {'schema_class': schema.StateSentenceGroup}
+
+        test_pipeline = TestPipeline()
+
+        output = (
+            test_pipeline
+            | "Convert to PCollection" >>
+            beam.Create(element)
+            | "Hydrate sentence groups with relationship property entities" >>
+            beam.ParDo(
+                extractor_utils.
+                _HydrateRootEntitiesWithRelationshipPropertyEntities(),
+                **hydrate_kwargs)
+        )
+
+        assert_that(output, equal_to(expected_output))
+
+        start = time.perf_counter()
+        test_pipeline.run()
+        logging.info("Hydrated %d sentence groups with %d sentences in %.2fs",
+                     num_sentence_groups,
+                     2 * num_sentence_groups * num_sentences_per_group,
+                     time.perf_counter() - start)
+
 
 class TestRepackageUnifyingIdParentIdStructure(unittest.TestCase):
     """Tests the RepackageUnifyingIdParentIdStructure DoFn."""
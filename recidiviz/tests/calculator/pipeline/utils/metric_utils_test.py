@@ -15,8 +15,14 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
 """Tests the functions in the metric_utils file."""
+import pickle
 import unittest
+from datetime import date
+
+import apache_beam as beam
 import pytest
+from apache_beam.testing.test_pipeline import TestPipeline
+from apache_beam.testing.util import assert_that, equal_to
 from google.cloud import bigquery
 from google.cloud.bigquery import SchemaField
 
@@ -32,7 +38,8 @@ from recidiviz.calculator.pipeline.supervision.metrics import SupervisionMetricT
     SupervisionRevocationAnalysisMetric, SupervisionRevocationViolationTypeAnalysisMetric, SupervisionSuccessMetric, \
     SuccessfulSupervisionSentenceDaysServedMetric, SupervisionCaseComplianceMetric
 from recidiviz.calculator.pipeline.utils.metric_utils import MetricMethodologyType, json_serializable_metric_key, \
-    RecidivizMetric
+    RecidivizMetric, MetricCombination, AggregateEventBasedMetrics, RecidivizMetricWritableDict, \
+    aggregated_metric_output_tag
 from recidiviz.common.constants.person_characteristics import Gender, Race, Ethnicity
 
 
@@ -220,3 +227,163 @@ class TestRecidivizMetricType(unittest.TestCase):
 
         # Assert that all metric type values are unique
         self.assertEqual(len(set(all_metric_type_values)), len(all_metric_type_values))
+
+
+class TestMetricCombination(unittest.TestCase):
+    """Tests the MetricCombination class."""
+    def test_metric_combination(self):
+        characteristics = {'gender': Gender.MALE, 'age_bucket': '25-29', 'year': 1999}
+
+        combination = MetricCombination(characteristics, state_code='US_XX',
+                                        methodology=MetricMethodologyType.PERSON, year=2000)
+
+        self.assertEqual({'gender': Gender.MALE,
+                          'age_bucket': '25-29',
+                          'state_code': 'US_XX',
+                          'methodology': MetricMethodologyType.PERSON,
+                          'year': 2000}, dict(combination))
+        self.assertEqual(5, len(combination))
+        self.assertIn('state_code', combination)
+        self.assertNotIn('month', combination)
+        self.assertIsNone(combination.get('month'))
+
+    def test_metric_combination_copy(self):
+        characteristics = {'gender': Gender.MALE}
+        combination = MetricCombination(characteristics, state_code='US_XX', year=2000)
+
+        combination_copy = combination.copy()
+        combination_copy.month = 3
+
+        self.assertIs(characteristics, combination_copy.characteristics)
+        self.assertNotIn('month', combination)
+        self.assertEqual(3, combination_copy['month'])
+
+    def test_metric_combination_pickle(self):
+        combination = MetricCombination({'gender': Gender.MALE}, state_code='US_XX', year=2000)
+
+        unpickled_combination = pickle.loads(pickle.dumps(combination))
+
+        self.assertEqual(dict(combination), dict(unpickled_combination))
+        self.assertNotIn('month', unpickled_combination)
+
+
+class TestBuildFromMetricCombination(unittest.TestCase):
+    """Tests the RecidivizMetric.build_from_metric_combination function."""
+    def test_build_from_metric_combination(self):
+        characteristics = {'gender': Gender.MALE,
+                           'age_bucket': '25-29',
+                           'person_id': 12345,
+                           'metric_type': SupervisionMetricType.SUPERVISION_POPULATION}
+        combination = MetricCombination(characteristics, state_code='US_XX',
+                                        methodology=MetricMethodologyType.PERSON, year=2000, month=3,
+                                        metric_period_months=1)
+
+        metric = SupervisionPopulationMetric.build_from_metric_combination(combination, 'job_id', count=1)
+
+        expected_metric = SupervisionPopulationMetric.build_from_dictionary({
+            'job_id': 'job_id',
+            'created_on': date.today(),
+            'state_code': 'US_XX',
+            'methodology': MetricMethodologyType.PERSON,
+            'year': 2000,
+            'month': 3,
+            'metric_period_months': 1,
+            'gender': Gender.MALE,
+            'age_bucket': '25-29',
+            'person_id': 12345,
+            'count': 1
+        })
+
+        self.assertEqual(expected_metric, metric)
+
+    def test_build_from_metric_combination_empty(self):
+        with pytest.raises(ValueError):
+            SupervisionPopulationMetric.build_from_metric_combination(MetricCombination({}), 'job_id', count=1)
+
+    def test_build_from_metric_combination_missing_required_field(self):
+        combination = MetricCombination({'gender': Gender.MALE}, methodology=MetricMethodologyType.PERSON)
+
+        with pytest.raises(ValueError):
+            SupervisionPopulationMetric.build_from_metric_combination(combination, 'job_id', count=1)
+
+
+class TestAggregateEventBasedMetrics(unittest.TestCase):
+    """Tests the AggregateEventBasedMetrics transform."""
+    @staticmethod
+    def _population_metric(person_id, methodology, supervising_officer_external_id='OFFICER_1', race=None):
+        return SupervisionPopulationMetric.build_from_dictionary({
+            'job_id': 'job_id',
+            'state_code': 'US_XX',
+            'methodology': methodology,
+            'year': 2000,
+            'month': 3,
+            'metric_period_months': 0,
+            'race': race or [Race.WHITE],
+            'supervising_officer_external_id': supervising_officer_external_id,
+            'date_of_supervision': date(2000, 3, 31),
+            'person_id': person_id,
+            'person_external_id': f'EXTERNAL_{person_id}' if person_id is not None else None,
+            'count': 1
+        })
+
+    def test_aggregate_event_based_metrics(self):
+        person_based_metric = self._population_metric(1, MetricMethodologyType.PERSON)
+        success_metric = SupervisionSuccessMetric.build_from_dictionary({
+            'job_id': 'job_id',
+            'state_code': 'US_XX',
+            'methodology': MetricMethodologyType.EVENT,
+            'year': 2000,
+            'month': 3,
+            'person_id': 1,
+            'successful_completion_count': 1,
+            'projected_completion_count': 1
+        })
+
+        person_level_metrics = [
+            self._population_metric(1, MetricMethodologyType.EVENT),
+            self._population_metric(2, MetricMethodologyType.EVENT),
+        ]
+
+        metrics = person_level_metrics + [
+            self._population_metric(None, MetricMethodologyType.EVENT),
+            self._population_metric(None, MetricMethodologyType.EVENT),
+            self._population_metric(None, MetricMethodologyType.EVENT),
+            self._population_metric(None, MetricMethodologyType.EVENT, supervising_officer_external_id='OFFICER_2'),
+            self._population_metric(None, MetricMethodologyType.EVENT, race=[Race.BLACK, Race.WHITE]),
+            person_based_metric,
+            success_metric
+        ]
+
+        expected_metrics = [
+            self._population_metric(None, MetricMethodologyType.EVENT),
+            self._population_metric(None, MetricMethodologyType.EVENT, supervising_officer_external_id='OFFICER_2'),
+            self._population_metric(None, MetricMethodologyType.EVENT, race=[Race.BLACK, Race.WHITE]),
+            person_based_metric,
+            success_metric
+        ] + person_level_metrics
+        expected_metrics[0].count = 3
+
+        test_pipeline = TestPipeline()
+        output = (test_pipeline
+                  | beam.Create(metrics)
+                  | AggregateEventBasedMetrics([SupervisionPopulationMetric]))
+
+        assert_that(output, equal_to(expected_metrics))
+
+        test_pipeline.run()
+
+    def test_recidiviz_metric_writable_dict_aggregated_metrics(self):
+        event_based_metric = self._population_metric(None, MetricMethodologyType.EVENT)
+        person_level_event_based_metric = self._population_metric(1, MetricMethodologyType.EVENT)
+        person_based_metric = self._population_metric(1, MetricMethodologyType.PERSON)
+
+        outputs = [
+            tagged_output.tag
+            for metric in (event_based_metric, person_level_event_based_metric, person_based_metric)
+            for tagged_output in RecidivizMetricWritableDict().process(
+                metric, aggregated_metric_classes={SupervisionPopulationMetric})
+        ]
+
+        self.assertEqual([aggregated_metric_output_tag(SupervisionMetricType.SUPERVISION_POPULATION),
+                          SupervisionMetricType.SUPERVISION_POPULATION.value,
+                          SupervisionMetricType.SUPERVISION_POPULATION.value], outputs)
@@ -0,0 +1,176 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+# pylint: disable=wrong-import-order
+
+"""Tests for utils/person_snapshot_utils.py."""
+import tempfile
+import unittest
+from datetime import date
+
+import apache_beam as beam
+from apache_beam.testing.test_pipeline import TestPipeline
+from apache_beam.testing.util import assert_that, equal_to
+from mock import MagicMock, patch
+
+from recidiviz.calculator.pipeline.utils import person_snapshot_utils
+from recidiviz.common.constants.state.state_assessment import StateAssessmentClass, StateAssessmentType
+from recidiviz.persistence.database.schema.state import schema
+from recidiviz.persistence.database.schema_entity_converter.state.schema_entity_converter import \
+    StateSchemaToEntityConverter
+from recidiviz.persistence.database.schema_utils import get_state_table_classes
+from recidiviz.persistence.entity.state import entities
+from recidiviz.persistence.entity.state.entities import Gender, ResidencyStatus
+from recidiviz.tests.calculator.calculator_test_utils import normalized_database_base_dict
+from recidiviz.tests.calculator.pipeline.fake_bigquery import FakeReadFromBigQueryFactory
+
+
+class TestPersonSnapshot(unittest.TestCase):
+    """Tests for writing and reading person snapshots."""
+
+    def setUp(self) -> None:
+        self.snapshot_dir = tempfile.TemporaryDirectory()
+        self.snapshot_path = self.snapshot_dir.name
+
+    def tearDown(self) -> None:
+        self.snapshot_dir.cleanup()
+
+    def _write_snapshot(self, hydrated_persons):
+        test_pipeline = TestPipeline()
+        _ = (test_pipeline
+             | beam.Create(hydrated_persons)
+             | person_snapshot_utils.WriteHydratedPersons(self.snapshot_path))
+        test_pipeline.run()
+
+    def testBuildWriteAndReadHydratedPersons(self):
+        fake_person_id = 12345
+
+        fake_person = schema.StatePerson(
+            person_id=fake_person_id, full_name='Bernard Madoff', birthdate=date(1970, 1, 1), gender=Gender.MALE,
+            residency_status=ResidencyStatus.PERMANENT, state_code='US_XX')
+
+        assessment = schema.StateAssessment(
+            assessment_class=StateAssessmentClass.RISK,
+            assessment_type=StateAssessmentType.LSIR,
+            assessment_date=date(2012, 4, 1),
+            state_code='US_XX',
+            assessment_score=29,
+            assessment_id=184672,
+            person_id=fake_person_id)
+
+        data_dict = {table.name: [] for table in get_state_table_classes()}
+        data_dict[schema.StatePerson.__tablename__] = [normalized_database_base_dict(fake_person)]
+        data_dict[schema.StateAssessment.__tablename__] = [normalized_database_base_dict(assessment)]
+
+        assessment_entity = StateSchemaToEntityConverter().convert(assessment)
+        person_entity = StateSchemaToEntityConverter().convert(fake_person)
+        person_entity.assessments = [StateSchemaToEntityConverter().convert(assessment)]
+
+        dataset = 'recidiviz-123.state'
+
+        with patch('recidiviz.calculator.pipeline.utils.extractor_utils.ReadFromBigQuery',
+                   FakeReadFromBigQueryFactory().create_fake_bq_source_constructor(dataset, data_dict)):
+            test_pipeline = TestPipeline()
+            _ = (test_pipeline
+                 | person_snapshot_utils.BuildHydratedPersons(dataset=dataset)
+                 | person_snapshot_utils.WriteHydratedPersons(self.snapshot_path))
+            test_pipeline.run()
+
+        test_pipeline = TestPipeline()
+        output = (test_pipeline
+                  | person_snapshot_utils.ReadHydratedPersons(self.snapshot_path,
+                                                              root_entity_names=['persons', 'assessments',
+                                                                                 'supervision_periods']))
+
+        assert_that(output.persons, equal_to([(fake_person_id, person_entity)]), label='Assert persons')
+        assert_that(output.assessments, equal_to([(fake_person_id, assessment_entity)]), label='Assert assessments')
+        assert_that(output.supervision_periods, equal_to([]), label='Assert supervision periods')
+
+        test_pipeline.run()
+
+    def testReadHydratedPersons_Filters(self):
+        person_1 = entities.StatePerson.new_with_defaults(person_id=1, state_code='US_XX')
+        person_2 = entities.StatePerson.new_with_defaults(person_id=2, state_code='US_XX')
+        person_3 = entities.StatePerson.new_with_defaults(person_id=3, state_code='US_YY')
+
+        self._write_snapshot([(1, {'persons': [person_1]}),
+                              (2, {'persons': [person_2]}),
+                              (3, {'persons': [person_3]})])
+
+        test_pipeline = TestPipeline()
+        output = (test_pipeline
+                  | person_snapshot_utils.ReadHydratedPersons(self.snapshot_path,
+                                                              root_entity_names=['persons'],
+                                                              unifying_id_field_filter_set={1, 3},
+                                                              state_code='US_XX'))
+
+        assert_that(output.persons, equal_to([(1, person_1)]))
+
+        test_pipeline.run()
+
+    def testLoadRootEntities_FromSnapshot(self):
+        person = entities.StatePerson.new_with_defaults(person_id=1, state_code='US_XX')
+        supervision_period = entities.StateSupervisionPeriod.new_with_defaults(
+            supervision_period_id=11, state_code='US_XX')
+
+        self._write_snapshot([(1, {'persons': [person], 'supervision_periods': [supervision_period]})])
+
+        test_pipeline = TestPipeline()
+        root_entities = person_snapshot_utils.load_root_entities(
+            test_pipeline,
+            dataset='recidiviz-123.state',
+            root_entities={'persons': (entities.StatePerson, True),
+                           'supervision_periods': (entities.StateSupervisionPeriod, False)},
+            unifying_id_field_filter_set=None,
+            state_code=None,
+            person_snapshot_input=self.snapshot_path)
+
+        self.assertEqual({'persons', 'supervision_periods'}, set(root_entities))
+        assert_that(root_entities['persons'], equal_to([(1, person)]), label='Assert persons')
+        assert_that(root_entities['supervision_periods'], equal_to([(1, supervision_period)]),
+                    label='Assert supervision periods')
+
+        test_pipeline.run()
+
+    def testLoadRootEntities_FromSnapshot_RelatedEntitiesNotStored(self):
+        with self.assertRaises(ValueError):
+            person_snapshot_utils.load_root_entities(
+                TestPipeline(),
+                dataset='recidiviz-123.state',
+                root_entities={'assessments': (entities.StateAssessment, True)},
+                unifying_id_field_filter_set=None,
+                state_code=None,
+                person_snapshot_input=self.snapshot_path)
+
+    def testLoadRootEntities_FromBigQuery_PersonsNotFilteredByStateCode(self):
+        with patch.object(person_snapshot_utils, 'BuildRootEntity') as mock_build_root_entity:
+            person_snapshot_utils.load_root_entities(
+                MagicMock(),
+                dataset='recidiviz-123.state',
+                root_entities={'persons': (entities.StatePerson, True),
+                               'assessments': (entities.StateAssessment, False)},
+                unifying_id_field_filter_set=None,
+                state_code='US_XX',
+                person_snapshot_input=None,
+                filter_persons_by_state_code=False)
+
+        state_codes = {kwargs['root_entity_class']: kwargs['state_code']
+                       for _, kwargs in mock_build_root_entity.call_args_list}
+        self.assertEqual({entities.StatePerson: None, entities.StateAssessment: 'US_XX'}, state_codes)
+
+    def testReadHydratedPersons_UnknownRootEntityName(self):
+        with self.assertRaises(ValueError):
+            person_snapshot_utils.ReadHydratedPersons(self.snapshot_path, root_entity_names=['persons', 'charges'])
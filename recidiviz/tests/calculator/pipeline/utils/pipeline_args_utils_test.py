@@ -26,9 +26,10 @@ class TestPipelineArgsUtils(unittest.TestCase):
     """Unittests for helpers in pipeline_args_utils.py."""
 
     DEFAULT_INCARCERATION_PIPELINE_ARGS =   \
-        Namespace(calculation_month_count=1, calculation_end_month=None,
+        Namespace(aggregate_event_based_metrics=False, calculation_month_count=1, calculation_end_month=None,
                   data_input='state', output='dataflow_metrics', metric_types={'ALL'},
-                  person_filter_ids=None, reference_input='reference_tables', state_code=None)
+                  person_filter_ids=None, person_snapshot_input=None, reference_input='reference_tables',
+                  state_code=None)
 
     DEFAULT_APACHE_BEAM_OPTIONS_DICT = {
         'runner': 'DataflowRunner',
@@ -99,9 +100,11 @@ class TestPipelineArgsUtils(unittest.TestCase):
 
         # Assert
         expected_incarceration_pipeline_args = \
-            Namespace(calculation_month_count=6, calculation_end_month='2009-07',
+            Namespace(aggregate_event_based_metrics=False, calculation_month_count=6,
+                      calculation_end_month='2009-07',
                       data_input='county', output='dataflow_metrics_2', metric_types={'ALL'},
-                      person_filter_ids=None, reference_input='reference_tables_2', state_code=None)
+                      person_filter_ids=None, person_snapshot_input=None, reference_input='reference_tables_2',
+                      state_code=None)
 
         self.assertEqual(incarceration_pipeline_args, expected_incarceration_pipeline_args)
 
@@ -144,3 +147,21 @@ class TestPipelineArgsUtils(unittest.TestCase):
 
         self.assertEqual(incarceration_pipeline_args, expected_incarceration_pipeline_args)
         self.assertEqual(pipeline_options.get_all_options(drop_default=True), self.DEFAULT_APACHE_BEAM_OPTIONS_DICT)
+
+    def test_incarceration_pipeline_specify_person_snapshot_input(self):
+        # Arrange
+        argv = ['--job_name', 'incarceration-args-test',
+                '--project', 'recidiviz-staging',
+                '--person_snapshot_input', 'gs://recidiviz-staging-person-snapshots/2020-07-01']
+
+        # Act
+        incarceration_pipeline_args, apache_beam_args = incarceration_pipeline.get_arg_parser().parse_known_args(argv)
+        pipeline_options = get_apache_beam_pipeline_options_from_args(apache_beam_args)
+
+        # Assert
+        expected_incarceration_pipeline_args = Namespace(**self.DEFAULT_INCARCERATION_PIPELINE_ARGS.__dict__)
+        expected_incarceration_pipeline_args.person_snapshot_input = \
+            'gs://recidiviz-staging-person-snapshots/2020-07-01'
+
+        self.assertEqual(incarceration_pipeline_args, expected_incarceration_pipeline_args)
+        self.assertEqual(pipeline_options.get_all_options(drop_default=True), self.DEFAULT_APACHE_BEAM_OPTIONS_DICT)
@@ -85,4 +85,4 @@ class ViewExportManagerTest(unittest.TestCase):
         view_export_manager.export_view_data_to_cloud_storage()
 
         mock_view_update_manager.assert_called()
-        self.mock_client.export_query_results_to_cloud_storage.assert_called()
+        self.mock_client.export_query_results_to_cloud_storage_pipelined.assert_called()
@@ -19,7 +19,7 @@
 import unittest
 from typing import Optional
 
-from recidiviz.common.constants.entity_enum import EntityEnum, EnumParsingError
+from recidiviz.common.constants.entity_enum import EntityEnum, EnumParsingError, EnumParseCache
 from recidiviz.common.constants.enum_overrides import EnumOverrides
 
 
@@ -117,3 +117,40 @@ class EntityEnumTest(unittest.TestCase):
 
         with self.assertRaises(EnumParsingError):
             FakeEntityEnum.parse('A STRING TO PARSE', overrides)
+
+    def testParse_CachesResult(self):
+        mapper_calls = []
+
+        def counting_mapper(raw_text: str) -> Optional[FakeEntityEnum]:
+            mapper_calls.append(raw_text)
+            return FakeEntityEnum.BANANA if raw_text == 'BAN' else None
+
+        overrides_builder = EnumOverrides.Builder()
+        overrides_builder.add_mapper(counting_mapper, FakeEntityEnum)
+        overrides = overrides_builder.build()
+
+        EnumParseCache.pop_stats()
+        self.assertEqual(FakeEntityEnum.BANANA, FakeEntityEnum.parse('ban', overrides))
+        self.assertEqual(FakeEntityEnum.BANANA, FakeEntityEnum.parse('ban', overrides))
+        self.assertEqual(['BAN'], mapper_calls)
+        self.assertEqual((1, 1), EnumParseCache.pop_stats())
+
+    def testParse_CachesError(self):
+        overrides = EnumOverrides.empty()
+        for _ in range(2):
+            with self.assertRaises(EnumParsingError) as e:
+                FakeEntityEnum.parse('invalid', overrides)
+            self.assertEqual(FakeEntityEnum, e.exception.entity_type)
+        self.assertEqual(1, len(overrides.parse_cache))
+
+    def testParseCache_EvictsLeastRecentlyUsed(self):
+        cache = EnumParseCache(max_size=2)
+        cache.get_or_parse(FakeEntityEnum, 'a', lambda: FakeEntityEnum.BANANA)
+        cache.get_or_parse(FakeEntityEnum, 'b', lambda: FakeEntityEnum.STRAWBERRY)
+        cache.get_or_parse(FakeEntityEnum, 'a', lambda: FakeEntityEnum.PASSION_FRUIT)
+        cache.get_or_parse(FakeEntityEnum, 'c', lambda: FakeEntityEnum.PASSION_FRUIT)
+
+        self.assertEqual(2, len(cache))
+        self.assertEqual(FakeEntityEnum.BANANA,
+                         cache.get_or_parse(FakeEntityEnum, 'a', lambda: None))
+        self.assertIsNone(cache.get_or_parse(FakeEntityEnum, 'b', lambda: None))
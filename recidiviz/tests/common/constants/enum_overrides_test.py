@@ -73,3 +73,15 @@ class EnumOverridesTest(unittest.TestCase):
         overrides = overrides_builder.build()
 
         self.assertTrue(overrides.should_ignore('NONE', ChargeClass))
+
+    def test_toBuilder_doesNotModifyOriginal(self):
+        overrides_builder = EnumOverrides.Builder()
+        overrides_builder.add('A', Race.ASIAN)
+        overrides = overrides_builder.build()
+
+        updated_overrides = overrides.to_builder().add('B', Race.BLACK).ignore('A', Race).build()
+
+        self.assertEqual(overrides.parse('A', Race), Race.ASIAN)
+        self.assertIsNone(overrides.parse('B', Race))
+        self.assertIsNone(updated_overrides.parse('A', Race))
+        self.assertEqual(updated_overrides.parse('B', Race), Race.BLACK)
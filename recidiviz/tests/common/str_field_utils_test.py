@@ -18,11 +18,13 @@
 import datetime
 from unittest import TestCase
 
+import dateparser
 import pytest
+from freezegun import freeze_time
 
 from recidiviz.common.str_field_utils import parse_days, parse_dollars, \
     parse_bool, parse_date, parse_datetime, parse_days_from_duration_pieces, parse_int, parse_date_from_date_pieces, \
-    safe_parse_date_from_date_pieces
+    safe_parse_date_from_date_pieces, _parse_datetime_fast_path
 
 
 class TestStrFieldUtils(TestCase):
@@ -156,6 +158,35 @@ class TestStrFieldUtils(TestCase):
         assert parse_datetime('0 0 0') is None
         assert parse_datetime('0000-00-00') is None
 
+    def test_parseDateTime_fastPathMatchesDateparser(self):
+        date_strings = [
+            '2019-03-04', '2019-3-4', '2019/03/04', '3/4/2019', '03/04/2019', '03-04-2019', '12/31/1999',
+            '2019-03-04 13:05', '2019-03-04 13:05:06', '2019-03-04T13:05:06', '2019-03-04 13:05:06.123',
+            '3/4/2019 1:05', '3/4/2019 13:05:06', '0019-03-04',
+        ]
+        for date_string in date_strings:
+            fast_path_parsed = _parse_datetime_fast_path(date_string)
+            self.assertIsNotNone(fast_path_parsed, date_string)
+            self.assertEqual(
+                dateparser.parse(date_string, languages=['en'], settings={'PREFER_DAY_OF_MONTH': 'first'}),
+                fast_path_parsed, date_string)
+            self.assertEqual(fast_path_parsed, parse_datetime(date_string))
+
+    def test_parseDateTime_fastPathFallsBackToDateparser(self):
+        # Not valid in the matched format, but dateparser reorders the components
+        self.assertIsNone(_parse_datetime_fast_path('2019-13-01'))
+        self.assertEqual(datetime.datetime(2019, 1, 13), parse_datetime('2019-13-01'))
+
+        self.assertIsNone(_parse_datetime_fast_path('Jan 1, 2018'))
+        with pytest.raises(ValueError):
+            parse_datetime('2019-02-30')
+
+    def test_parseDateTime_missingComponentsFilledFromCurrentDate(self):
+        with freeze_time('2020-05-15'):
+            self.assertEqual(datetime.datetime(2019, 5, 1), parse_datetime('2019'))
+        with freeze_time('2020-06-15'):
+            self.assertEqual(datetime.datetime(2019, 6, 1), parse_datetime('2019'))
+
     def test_parseDate(self):
         assert parse_date('Jan 1, 2018') == \
                datetime.date(year=2018, month=1, day=1)
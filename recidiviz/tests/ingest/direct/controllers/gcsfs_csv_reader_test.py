@@ -16,11 +16,14 @@
 # =============================================================================
 """Tests for the GcsfsCsvReader."""
 
+import io
+import tempfile
 import unittest
+from typing import Optional
 
 import gcsfs
 import pandas as pd
-from mock import create_autospec
+from mock import create_autospec, patch
 
 from recidiviz.ingest.direct.controllers.gcsfs_csv_reader import GcsfsCsvReader, GcsfsCsvReaderDelegate, \
     COMMON_RAW_FILE_ENCODINGS
@@ -33,6 +36,7 @@ class TestGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
 
     def __init__(self):
         self.dataframes = []
+        self.raw_chunks = []
         self.encodings_attempted = []
         self.decode_errors = 0
         self.exceptions = 0
@@ -45,6 +49,13 @@ class TestGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
         self.dataframes.append((encoding, df))
         return True
 
+    def supports_raw_chunks(self) -> bool:
+        return True
+
+    def on_raw_chunk(self, encoding: str, chunk_num: int, contents: str) -> bool:
+        self.raw_chunks.append((encoding, contents))
+        return True
+
     def on_unicode_decode_error(self, encoding: str, e: UnicodeError) -> bool:
         self.decode_errors += 1
         return False
@@ -62,14 +73,15 @@ class TestGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
 def _fake_gcsfs_open(
         path_str: str,
         *,
-        encoding: str,
+        mode: str = 'r',
+        encoding: Optional[str] = None,
         # pylint: disable=unused-argument
         token: str):
     if not path_str.startswith('gs://'):
         raise ValueError(f'Expected gs:// path URI, got this instead: {path_str}')
 
     # Convert to local absolute path
-    return open('/' + path_str[len('gs://'):], encoding=encoding)
+    return open('/' + path_str[len('gs://'):], mode=mode, encoding=encoding)
 
 
 class GcsfsCsvReaderTest(unittest.TestCase):
@@ -199,3 +211,186 @@ class GcsfsCsvReaderTest(unittest.TestCase):
         self.assertEqual({'UTF-8'}, {encoding for encoding, df in delegate.dataframes})
         self.assertEqual(0, delegate.decode_errors)
         self.assertEqual(1, delegate.exceptions)
+
+    def test_read_with_failure_first_detect_encoding(self):
+        file_path = fixtures.as_filepath('encoded_latin_1.csv')
+        delegate = TestGcsfsCsvReaderDelegate()
+        self.reader.streaming_read(GcsfsFilePath.from_absolute_path(file_path), delegate=delegate, chunk_size=1,
+                                   detect_encoding=True)
+
+        # The file is ASCII up until the first ISO-8859-1 character, so we can switch encodings without restarting
+        self.assertEqual(['UTF-8'], delegate.encodings_attempted)
+        self.assertEqual('ISO-8859-1', delegate.successful_encoding)
+        self.assertEqual(4, len(delegate.dataframes))
+        self.assertEqual(['?', '+', '\x80', '£'], [df['symbol'].iloc[0] for _, df in delegate.dataframes])
+        self.assertEqual(0, delegate.decode_errors)
+        self.assertEqual(0, delegate.exceptions)
+
+    @patch('recidiviz.ingest.direct.controllers.gcsfs_csv_reader.DETECT_ENCODING_READ_BLOCK_SIZE', 8)
+    def test_read_with_failure_first_detect_encoding_small_blocks(self):
+        file_path = fixtures.as_filepath('encoded_latin_1.csv')
+        delegate = TestGcsfsCsvReaderDelegate()
+        self.reader.streaming_read(GcsfsFilePath.from_absolute_path(file_path), delegate=delegate, chunk_size=1,
+                                   detect_encoding=True)
+
+        self.assertEqual(['UTF-8'], delegate.encodings_attempted)
+        self.assertEqual('ISO-8859-1', delegate.successful_encoding)
+        self.assertEqual(['?', '+', '\x80', '£'], [df['symbol'].iloc[0] for _, df in delegate.dataframes])
+        self.assertEqual(0, delegate.decode_errors)
+
+    @patch('recidiviz.ingest.direct.controllers.gcsfs_csv_reader.DETECT_ENCODING_READ_BLOCK_SIZE', 8)
+    def test_read_detect_encoding_diverged_before_failure(self):
+        with tempfile.NamedTemporaryFile(suffix='.csv') as f:
+            # Valid UTF-8 for a few blocks, then a byte that is only valid ISO-8859-1
+            f.write(b'symbol,name\n\xc2\xa3,pound\n\x80,euro\n')
+            f.flush()
+
+            delegate = TestGcsfsCsvReaderDelegate()
+            self.reader.streaming_read(GcsfsFilePath.from_absolute_path(f.name), delegate=delegate, chunk_size=1,
+                                       detect_encoding=True)
+
+        # Text that differs between the two encodings was already read, so the read must restart
+        self.assertEqual(['UTF-8', 'ISO-8859-1'], delegate.encodings_attempted)
+        self.assertEqual('ISO-8859-1', delegate.successful_encoding)
+        self.assertEqual(['Â£', '\x80'], [df['symbol'].iloc[0] for _, df in delegate.dataframes])
+        self.assertEqual(1, delegate.decode_errors)
+
+    def test_read_with_no_failure_detect_encoding(self):
+        file_path = fixtures.as_filepath('encoded_utf_8.csv')
+        delegate = TestGcsfsCsvReaderDelegate()
+        self.reader.streaming_read(GcsfsFilePath.from_absolute_path(file_path), delegate=delegate, chunk_size=1,
+                                   detect_encoding=True)
+
+        self.assertEqual(['UTF-8'], delegate.encodings_attempted)
+        self.assertEqual('UTF-8', delegate.successful_encoding)
+        self.assertEqual(['?', '+', '\x80', '£'], [df['symbol'].iloc[0] for _, df in delegate.dataframes])
+        self.assertEqual(0, delegate.decode_errors)
+
+    def test_read_no_encodings_match_detect_encoding(self):
+        file_path = fixtures.as_filepath('encoded_latin_1.csv')
+        delegate = TestGcsfsCsvReaderDelegate()
+        encodings_to_try = ['UTF-8', 'UTF-16']
+        with self.assertRaises(ValueError):
+            self.reader.streaming_read(GcsfsFilePath.from_absolute_path(file_path),
+                                       delegate=delegate, chunk_size=10, encodings_to_try=encodings_to_try,
+                                       detect_encoding=True)
+        self.assertEqual(encodings_to_try, delegate.encodings_attempted)
+        self.assertIsNone(delegate.successful_encoding)
+        self.assertEqual(0, len(delegate.dataframes))
+        self.assertEqual(2, delegate.decode_errors)
+
+    def test_read_completely_empty_file_detect_encoding(self):
+        empty_file_path = fixtures.as_filepath('tagA.csv')
+
+        delegate = TestGcsfsCsvReaderDelegate()
+        self.reader.streaming_read(GcsfsFilePath.from_absolute_path(empty_file_path), delegate=delegate, chunk_size=1,
+                                   detect_encoding=True)
+        self._validate_empty_file_result(delegate)
+
+
+_QUOTED_CSV_CONTENTS = (
+    b'id,name,notes\n'
+    b'1,"Doe, Jane","Line one\nLine two"\n'
+    b'\n'
+    b'2,Smith,"She said ""hi""\n"\n'
+    b'   \n'
+    b'3,O"Brien,plain\r\n'
+    b'4,Lee,"\xc2\xa3"'
+)
+
+
+class GcsfsCsvReaderRowsTest(unittest.TestCase):
+    """Tests for the GcsfsCsvReader methods that work with raw CSV rows."""
+
+    def setUp(self) -> None:
+        self.mock_gcsfs = create_autospec(gcsfs.GCSFileSystem)
+        self.mock_gcsfs.open = _fake_gcsfs_open
+        self.reader = GcsfsCsvReader(self.mock_gcsfs)
+
+        self.temp_file = tempfile.NamedTemporaryFile(suffix='.csv')
+        self.temp_file.write(_QUOTED_CSV_CONTENTS)
+        self.temp_file.flush()
+        self.path = GcsfsFilePath.from_absolute_path(self.temp_file.name)
+
+    def tearDown(self) -> None:
+        self.temp_file.close()
+
+    def test_count_rows(self):
+        expected = len(pd.read_csv(io.BytesIO(_QUOTED_CSV_CONTENTS), dtype=str))
+        self.assertEqual(4, expected)
+        self.assertEqual(expected, self.reader.count_rows(self.path))
+
+    @patch('recidiviz.ingest.direct.controllers.gcsfs_csv_reader.ROW_SCAN_READ_BLOCK_SIZE', 3)
+    def test_count_rows_small_blocks(self):
+        self.assertEqual(4, self.reader.count_rows(self.path))
+
+    def test_count_rows_stop_after(self):
+        self.assertEqual(3, self.reader.count_rows(self.path, stop_after=2))
+        self.assertEqual(4, self.reader.count_rows(self.path, stop_after=4))
+        self.assertEqual(4, self.reader.count_rows(self.path, stop_after=10))
+
+    def test_count_rows_empty_files(self):
+        self.assertEqual(0, self.reader.count_rows(GcsfsFilePath.from_absolute_path(fixtures.as_filepath('tagA.csv'))))
+        self.assertEqual(0, self.reader.count_rows(GcsfsFilePath.from_absolute_path(fixtures.as_filepath('tagB.csv'))))
+
+    def _assert_split_matches_pandas(self, chunk_size: int):
+        delegate = TestGcsfsCsvReaderDelegate()
+        self.reader.streaming_split(self.path, delegate=delegate, chunk_size=chunk_size)
+
+        self.assertEqual('UTF-8', delegate.successful_encoding)
+        expected_df = pd.read_csv(io.BytesIO(_QUOTED_CSV_CONTENTS), dtype=str)
+        chunk_dfs = [pd.read_csv(io.StringIO(contents), dtype=str) for _, contents in delegate.raw_chunks]
+
+        self.assertEqual([chunk_size] * (len(expected_df) // chunk_size) + (
+            [len(expected_df) % chunk_size] if len(expected_df) % chunk_size else []),
+                         [len(df) for df in chunk_dfs])
+        pd.testing.assert_frame_equal(expected_df, pd.concat(chunk_dfs, ignore_index=True))
+
+    def test_streaming_split(self):
+        for chunk_size in (1, 2, 3, 4, 10):
+            self._assert_split_matches_pandas(chunk_size)
+
+    @patch('recidiviz.ingest.direct.controllers.gcsfs_csv_reader.ROW_SCAN_READ_BLOCK_SIZE', 3)
+    @patch('recidiviz.ingest.direct.controllers.gcsfs_csv_reader.DETECT_ENCODING_READ_BLOCK_SIZE', 5)
+    def test_streaming_split_small_blocks(self):
+        for chunk_size in (1, 3):
+            self._assert_split_matches_pandas(chunk_size)
+
+    def test_streaming_split_dataframe_delegate(self):
+        class _DataFrameDelegate(TestGcsfsCsvReaderDelegate):
+            def supports_raw_chunks(self) -> bool:
+                return False
+
+        delegate = _DataFrameDelegate()
+        self.reader.streaming_split(self.path, delegate=delegate, chunk_size=3)
+
+        self.assertEqual('UTF-8', delegate.successful_encoding)
+        self.assertEqual([], delegate.raw_chunks)
+        expected_df = pd.read_csv(io.BytesIO(_QUOTED_CSV_CONTENTS), dtype=str)
+        self.assertEqual([3, 1], [len(df) for _, df in delegate.dataframes])
+        pd.testing.assert_frame_equal(expected_df, pd.concat([df for _, df in delegate.dataframes],
+                                                             ignore_index=True))
+
+    def test_streaming_split_header_only(self):
+        delegate = TestGcsfsCsvReaderDelegate()
+        self.reader.streaming_split(GcsfsFilePath.from_absolute_path(fixtures.as_filepath('tagB.csv')),
+                                    delegate=delegate, chunk_size=2)
+        self.assertEqual(1, len(delegate.raw_chunks))
+        _, contents = delegate.raw_chunks[0]
+        self.assertEqual(0, len(pd.read_csv(io.StringIO(contents), dtype=str)))
+
+    def test_streaming_split_empty_file(self):
+        delegate = TestGcsfsCsvReaderDelegate()
+        self.reader.streaming_split(GcsfsFilePath.from_absolute_path(fixtures.as_filepath('tagA.csv')),
+                                    delegate=delegate, chunk_size=2)
+        self.assertEqual([], delegate.raw_chunks)
+        self.assertEqual('UTF-8', delegate.successful_encoding)
+
+    def test_streaming_split_latin_1(self):
+        delegate = TestGcsfsCsvReaderDelegate()
+        self.reader.streaming_split(GcsfsFilePath.from_absolute_path(fixtures.as_filepath('encoded_latin_1.csv')),
+                                    delegate=delegate, chunk_size=3)
+        self.assertEqual('ISO-8859-1', delegate.successful_encoding)
+        self.assertEqual([('ISO-8859-1', 'symbol,name\n?,question mark\n+,plus\n\x80,euro\n'),
+                          ('ISO-8859-1', 'symbol,name\n£,pound\n')],
+                         delegate.raw_chunks)
@@ -163,6 +163,75 @@ class PostgresDirectIngestFileMetadataManagerTest(unittest.TestCase):
 
         self.assertEqual(datetime.datetime(2015, 1, 2, 3, 5, 6, 7), metadata.processed_time)
 
+    def test_mark_files_as_discovered_raw(self):
+        raw_unprocessed_path_1 = self._make_unprocessed_path('bucket/file_tag.csv',
+                                                             GcsfsDirectIngestFileType.RAW_DATA,
+                                                             dt=datetime.datetime(2015, 1, 2, 3, 3, 3, 3))
+        raw_unprocessed_path_2 = self._make_unprocessed_path('bucket/file_tag.csv',
+                                                             GcsfsDirectIngestFileType.RAW_DATA,
+                                                             dt=datetime.datetime(2015, 1, 3, 3, 3, 3, 3))
+
+        with freeze_time('2015-01-02T03:04:06'):
+            self.metadata_manager.mark_file_as_discovered(raw_unprocessed_path_1)
+
+        self.assertEqual([raw_unprocessed_path_1],
+                         list(self.metadata_manager.get_file_metadata_for_paths(
+                             [raw_unprocessed_path_1, raw_unprocessed_path_2]).keys()))
+
+        with freeze_time('2015-01-04T03:04:06'):
+            self.metadata_manager.mark_files_as_discovered([raw_unprocessed_path_1, raw_unprocessed_path_2])
+            # Marking again is a no-op
+            self.metadata_manager.mark_files_as_discovered([raw_unprocessed_path_1, raw_unprocessed_path_2])
+
+        metadata_by_path = self.metadata_manager.get_file_metadata_for_paths(
+            [raw_unprocessed_path_1, raw_unprocessed_path_2])
+
+        self.assertEqual(self.metadata_manager.get_file_metadata(raw_unprocessed_path_1),
+                         metadata_by_path[raw_unprocessed_path_1])
+        self.assertEqual(datetime.datetime(2015, 1, 2, 3, 4, 6), metadata_by_path[raw_unprocessed_path_1].discovery_time)
+        self.assertEqual(datetime.datetime(2015, 1, 4, 3, 4, 6), metadata_by_path[raw_unprocessed_path_2].discovery_time)
+        self.assertEqual(2, len(SessionFactory.for_schema_base(OperationsBase).query(
+            schema.DirectIngestRawFileMetadata).all()))
+
+    def test_mark_files_as_discovered_ingest_view(self):
+        args = GcsfsIngestViewExportArgs(
+            ingest_view_name='file_tag',
+            upper_bound_datetime_prev=None,
+            upper_bound_datetime_to_export=datetime.datetime(2015, 1, 2, 2, 2, 2, 2)
+        )
+        ingest_view_unprocessed_path = self._make_unprocessed_path('bucket/file_tag.csv',
+                                                                   GcsfsDirectIngestFileType.INGEST_VIEW)
+        raw_unprocessed_path = self._make_unprocessed_path('bucket/file_tag.csv',
+                                                           GcsfsDirectIngestFileType.RAW_DATA)
+
+        ingest_file_metadata = self.metadata_manager.register_ingest_file_export_job(args)
+        self.metadata_manager.register_ingest_view_export_file_name(ingest_file_metadata,
+                                                                    ingest_view_unprocessed_path)
+        self.assertFalse(self.metadata_manager.has_file_been_discovered(ingest_view_unprocessed_path))
+
+        with freeze_time('2015-01-02T03:07:07'):
+            self.metadata_manager.mark_files_as_discovered([ingest_view_unprocessed_path, raw_unprocessed_path])
+        with freeze_time('2015-01-02T03:08:08'):
+            self.metadata_manager.mark_files_as_discovered([ingest_view_unprocessed_path])
+
+        self.assertTrue(self.metadata_manager.has_file_been_discovered(ingest_view_unprocessed_path))
+        self.assertTrue(self.metadata_manager.has_file_been_discovered(raw_unprocessed_path))
+        metadata = self.metadata_manager.get_file_metadata(ingest_view_unprocessed_path)
+        self.assertEqual(datetime.datetime(2015, 1, 2, 3, 7, 7), metadata.discovery_time)
+        self.assertEqual(datetime.datetime(2015, 1, 2, 3, 7, 7), metadata.export_time)
+
+    def test_mark_files_as_discovered_errors(self):
+        raw_processed_path = self._make_processed_path('bucket/file_tag.csv',
+                                                       GcsfsDirectIngestFileType.RAW_DATA)
+        with self.assertRaises(ValueError):
+            self.metadata_manager.mark_files_as_discovered([raw_processed_path])
+
+        # Ingest view files must be registered before they are discovered
+        ingest_view_unprocessed_path = self._make_unprocessed_path('bucket/file_tag.csv',
+                                                                   GcsfsDirectIngestFileType.INGEST_VIEW)
+        with self.assertRaises(ValueError):
+            self.metadata_manager.mark_files_as_discovered([ingest_view_unprocessed_path])
+
     def test_get_metadata_for_raw_files_discovered_after_datetime_empty(self):
         self.assertEqual(
             [],
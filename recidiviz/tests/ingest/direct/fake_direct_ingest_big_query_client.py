@@ -93,6 +93,9 @@ class FakeDirectIngestBigQueryClient(BigQueryClient):
             self.fs.test_add_path(export_path)
             self.exported_file_tags.append(filename_parts_from_path(export_path).file_tag)
 
+    def export_query_results_to_cloud_storage_pipelined(self, export_configs: List[ExportQueryConfig]) -> None:
+        self.export_query_results_to_cloud_storage(export_configs)
+
     def run_query_async(self, query_str: str) -> bigquery.QueryJob:
         raise ValueError('Must be implemented for use in tests.')
 
@@ -19,6 +19,7 @@ GcsfsDirectIngestControllers.
 """
 
 import abc
+import copy
 import datetime
 import os
 import unittest
@@ -29,12 +30,15 @@ from mock import patch, Mock
 from sqlalchemy.ext.declarative import DeclarativeMeta
 
 from recidiviz import IngestInfo
+from recidiviz.common.ingest_metadata import IngestMetadata, SystemLevel
 from recidiviz.ingest.direct.controllers.gcsfs_direct_ingest_controller import \
     GcsfsDirectIngestController
 from recidiviz.ingest.direct.controllers.gcsfs_direct_ingest_utils import GcsfsIngestViewExportArgs
+from recidiviz.ingest.scrape import ingest_utils
 from recidiviz.persistence.database.base_schema import OperationsBase
 from recidiviz.persistence.database.schema.operations import schema as operations_schema
 from recidiviz.persistence.database.session_factory import SessionFactory
+from recidiviz.persistence.ingest_info_converter import ingest_info_converter
 from recidiviz.tests.ingest.direct.direct_ingest_util import \
     build_gcsfs_controller_for_tests, ingest_args_for_fixture_file
 from recidiviz.tests.ingest.direct.fake_direct_ingest_gcs_file_system import FakeDirectIngestGCSFileSystem
@@ -143,8 +147,27 @@ class BaseDirectIngestControllerTests(unittest.TestCase):
 
         self.assertEqual(expected, final_info)
 
+        if self.controller.system_level == SystemLevel.STATE:
+            self.assert_conversion_without_proto_matches(
+                final_info, self.controller._get_ingest_metadata(args))
+
         return final_info
 
+    def assert_conversion_without_proto_matches(self,
+                                                ingest_info: IngestInfo,
+                                                metadata: IngestMetadata):
+        """Asserts that converting the |ingest_info| directly to entities
+        produces the same result as converting it via an ingest_info proto."""
+        ingest_info_proto = ingest_utils.convert_ingest_info_to_proto(
+            copy.deepcopy(ingest_info))
+        expected_result = ingest_info_converter.convert_to_persistence_entities(
+            ingest_info_proto, metadata)
+
+        result = ingest_info_converter.convert_py_to_persistence_entities(
+            ingest_info, metadata)
+
+        self.assertEqual(expected_result, result)
+
     @staticmethod
     def invalidate_ingest_view_metadata():
         session = SessionFactory.for_schema_base(OperationsBase)
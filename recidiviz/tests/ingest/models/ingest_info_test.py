@@ -242,3 +242,25 @@ class TestIngestInfo(unittest.TestCase):
         ii.sort()
         ii_reversed.sort()
         self.assertEqual(ii, ii_reversed)
+
+    def test_fingerprint(self):
+        b1 = ingest_info.Booking(admission_date='1', charges=[ingest_info.Charge(name='a'), ingest_info.Charge()])
+        b2 = ingest_info.Booking(admission_date='2')
+
+        ii = IngestInfo(people=[ingest_info.Person(person_id='1', bookings=[b1, b2])])
+        ii_reversed = IngestInfo(people=[ingest_info.Person(person_id='1', bookings=[b2, b1])])
+
+        self.assertEqual(ii.fingerprint(), ii_reversed.fingerprint())
+        self.assertEqual(ii.people[0].fingerprint(), ii_reversed.people[0].fingerprint())
+
+        b2.admission_date = '3'
+        self.assertNotEqual(ii.fingerprint(), IngestInfo(people=[ingest_info.Person(
+            person_id='1', bookings=[ingest_info.Booking(admission_date='2'), b1])]).fingerprint())
+
+    def test_fingerprint_distinguishes_fields(self):
+        self.assertNotEqual(ingest_info.Person(surname='a').fingerprint(),
+                            ingest_info.Person(given_names='a').fingerprint())
+        self.assertNotEqual(ingest_info.Person(bookings=[ingest_info.Booking()]).fingerprint(),
+                            ingest_info.Person(bookings=[ingest_info.Booking(), ingest_info.Booking()]).fingerprint())
+        self.assertNotEqual(ingest_info.Person(person_id='1').fingerprint(),
+                            ingest_info.Person(person_id=1).fingerprint())
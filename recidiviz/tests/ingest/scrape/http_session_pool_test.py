@@ -0,0 +1,103 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Tests for ingest/scrape/http_session_pool.py."""
+import threading
+import unittest
+from http.client import HTTPMessage
+
+import requests
+from mock import Mock, patch
+from requests.cookies import RequestsCookieJar, extract_cookies_to_jar
+
+from recidiviz.ingest.scrape import http_session_pool
+
+
+class HttpSessionPoolTest(unittest.TestCase):
+    """Tests for the pooled scraper HTTP sessions."""
+
+    def tearDown(self) -> None:
+        http_session_pool.close_sessions()
+
+    def test_getSession_reusedPerRegion(self):
+        session = http_session_pool.get_session('us_ny')
+
+        self.assertIs(session, http_session_pool.get_session('us_ny'))
+        self.assertIsNot(session, http_session_pool.get_session('us_pa'))
+
+    def test_getSession_separatePerThread(self):
+        session = http_session_pool.get_session('us_ny')
+
+        other_thread_sessions = []
+        thread = threading.Thread(
+            target=lambda: other_thread_sessions.append(
+                http_session_pool.get_session('us_ny')))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(1, len(other_thread_sessions))
+        self.assertIsNot(session, other_thread_sessions[0])
+
+    def test_getSession_appliesOverrides(self):
+        session = http_session_pool.get_session(
+            'us_ny', {'pool_maxsize': 3, 'max_retries': 5,
+                      'retry_statuses': [503]})
+
+        adapter = session.get_adapter('https://example.com')
+        # pylint: disable=protected-access
+        self.assertEqual(3, adapter._pool_maxsize)
+        self.assertEqual(5, adapter.max_retries.total)
+        self.assertEqual({503}, set(adapter.max_retries.status_forcelist))
+
+    def test_getSession_doesNotPersistResponseCookies(self):
+        session = http_session_pool.get_session('us_ny')
+        request = requests.Request('GET', 'https://example.com').prepare()
+        headers = HTTPMessage()
+        headers['Set-Cookie'] = 'session_id=abc'
+        raw_response = Mock()
+        raw_response._original_response.msg = headers
+
+        response_cookies = RequestsCookieJar()
+        extract_cookies_to_jar(response_cookies, request, raw_response)
+        extract_cookies_to_jar(session.cookies, request, raw_response)
+
+        self.assertEqual({'session_id': 'abc'}, response_cookies.get_dict())
+        self.assertEqual({}, session.cookies.get_dict())
+
+    def test_closeSessions_createsNewSession(self):
+        session = http_session_pool.get_session('us_ny')
+
+        http_session_pool.close_sessions()
+
+        self.assertIsNot(session, http_session_pool.get_session('us_ny'))
+
+    @patch('recidiviz.utils.monitoring.measurements')
+    def test_measureFetch_recordsFailure(self, mock_measurements):
+        session = http_session_pool.get_session('us_ny')
+        mock_measurements.return_value.__enter__.return_value = \
+            mock_measurements
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            with http_session_pool.measure_fetch('us_ny', session):
+                raise requests.exceptions.ConnectionError()
+
+        mock_measurements.assert_called_with({'region': 'us_ny',
+                                              'status': 'FAILED'})
+        mock_measurements.measure_int_put.assert_any_call(
+            http_session_pool.m_fetches, 1)
+        mock_measurements.measure_int_put.assert_any_call(
+            http_session_pool.m_new_connections, 0)
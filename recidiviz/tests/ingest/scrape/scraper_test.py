@@ -424,9 +424,9 @@ class TestFetchPage(unittest.TestCase):
         response = requests.Response()
         response._content = page  # pylint: disable=protected-access
         response.status_code = 200
-        with patch('requests.get', return_value=response):
+        with patch('requests.Session.get', return_value=response):
             assert scraper.fetch_page(url).content == page
-            requests.get.assert_called_with(
+            requests.Session.get.assert_called_with(
                 url, proxies=proxies, headers=headers, cookies=None,
                 params=None, verify=False)
 
@@ -434,7 +434,7 @@ class TestFetchPage(unittest.TestCase):
         mock_proxies.assert_called_with()
         mock_headers.assert_called_with()
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     @patch('recidiviz.ingest.scrape.scraper_utils.get_headers')
     @patch('recidiviz.ingest.scrape.scraper_utils.get_proxies')
     @patch('recidiviz.utils.regions.get_region')
@@ -470,7 +470,7 @@ class TestFetchPage(unittest.TestCase):
             url, proxies=proxies, headers=headers, cookies=None,
             data=body, json=json_data, verify=False)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     @patch('recidiviz.ingest.scrape.scraper_utils.get_headers')
     @patch('recidiviz.ingest.scrape.scraper_utils.get_proxies')
     @patch('recidiviz.utils.regions.get_region')
@@ -18,6 +18,7 @@
 
 import datetime
 from unittest import TestCase
+from unittest.mock import patch
 
 from more_itertools import one
 from sqlalchemy.sql import text
@@ -502,6 +503,25 @@ class TestDatabase(TestCase):
 
         session.close()
 
+    def testWritePeople_bulkSnapshotUpdates_writesSnapshots(self):
+        session = SessionFactory.for_schema_base(JailsBase)
+        person = county_schema.Person(
+            full_name=_FULL_NAME, birthdate=_BIRTHDATE, region=_REGION,
+            jurisdiction_id=_JURISDICTION_ID)
+
+        update_historical_snapshots = \
+            database.update_snapshots.update_historical_snapshots
+        with patch.object(database.update_snapshots,
+                          'update_historical_snapshots',
+                          wraps=update_historical_snapshots) as mock_update:
+            database.write_people(session, [person], _DEFAULT_METADATA,
+                                  use_bulk_snapshot_updates=True)
+        session.commit()
+
+        self.assertTrue(mock_update.call_args[1]['use_bulk_operations'])
+        self.assertEqual(1, len(session.query(PersonHistory).all()))
+        session.close()
+
     def testWritePerson_backdatedBooking_backdatesSnapshot(self):
         person_scrape_time = datetime.datetime(year=2020, month=6, day=1)
         booking_scrape_time = datetime.datetime(year=2020, month=7, day=7)
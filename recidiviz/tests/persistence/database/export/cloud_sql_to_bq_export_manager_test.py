@@ -19,6 +19,8 @@
 import collections
 from http import HTTPStatus
 import json
+import threading
+import time
 import unittest
 from unittest import mock
 
@@ -138,6 +140,50 @@ class ExportManagerTestCounty(unittest.TestCase):
 
         mock_parent.assert_has_calls(export_all_then_load_all_calls)
 
+    @mock.patch('recidiviz.utils.metadata.project_id')
+    def test_export_all_and_load_all_pipelined(self, mock_project_id):
+        """Test that export_all_and_load_all_pipelined exports tables one at a
+            time and loads each table while the remaining tables export.
+        """
+        mock_project_id.return_value = 'test-project'
+        default_dataset = self.mock_client.dataset_ref_for_id(dataset_config.COUNTY_BASE_DATASET)
+
+        fake_cloud_sql = _FakeCloudSqlInstance()
+        first_table_loaded = threading.Event()
+
+        def export_table(schema_type, table_name, export_query):
+            if table_name == 'second_table':
+                # Only finishes once the first table is loading.
+                self.assertTrue(first_table_loaded.wait(timeout=5))
+            return fake_cloud_sql.export_table(schema_type, table_name, export_query)
+
+        def start_table_load_and_wait(_big_query_client, _dataset_ref, table_name, _schema_type):
+            if table_name == 'first_table':
+                first_table_loaded.set()
+            return True
+
+        self.mock_cloudsql_export.export_table.side_effect = export_table
+        self.mock_bq_load.start_table_load_and_wait.side_effect = start_table_load_and_wait
+
+        cloud_sql_to_bq_export_manager.export_all_and_load_all_pipelined(self.mock_client, self.schema_type)
+
+        self.assertEqual(1, fake_cloud_sql.max_concurrent_operations)
+        self.assertCountEqual(['first_table', 'second_table'], fake_cloud_sql.exported_tables)
+        self.mock_bq_load.start_table_load_and_wait.assert_has_calls([
+            mock.call(self.mock_client, default_dataset, 'first_table', self.schema_type),
+            mock.call(self.mock_client, default_dataset, 'second_table', self.schema_type),
+        ], any_order=True)
+
+    def test_export_all_and_load_all_pipelined_doesnt_load_failed_export(self):
+        self.mock_cloudsql_export.export_table.side_effect = \
+            lambda schema_type, table_name, export_query: table_name != 'first_table'
+
+        with self.assertLogs(level='ERROR'):
+            cloud_sql_to_bq_export_manager.export_all_and_load_all_pipelined(self.mock_client, self.schema_type)
+
+        self.mock_bq_load.start_table_load_and_wait.assert_called_once_with(
+            self.mock_client, mock.ANY, 'second_table', self.schema_type)
+
     def test_export_all_then_load_all_fails_invalid_module(self):
         with self.assertLogs(level='ERROR'):
             cloud_sql_to_bq_export_manager.export_all_then_load_all(self.mock_client, 'nonsense')
@@ -285,3 +331,24 @@ class ExportManagerTestCounty(unittest.TestCase):
             assert_not_called()
         mock_pubsub_helper.publish_message_to_topic.assert_called_with(
             message=message, topic=topic)
+
+
+class _FakeCloudSqlInstance:
+    """Local stand-in for a Cloud SQL instance, which tracks how many export
+    operations are running on it at once."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._num_operations = 0
+        self.max_concurrent_operations = 0
+        self.exported_tables = []
+
+    def export_table(self, _schema_type, table_name, _export_query):
+        with self._lock:
+            self._num_operations += 1
+            self.max_concurrent_operations = max(self.max_concurrent_operations, self._num_operations)
+        time.sleep(0.01)
+        with self._lock:
+            self._num_operations -= 1
+            self.exported_tables.append(table_name)
+        return True
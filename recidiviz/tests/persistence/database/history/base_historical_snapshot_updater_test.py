@@ -48,7 +48,8 @@ class BaseHistoricalSnapshotUpdaterTest(TestCase):
     @staticmethod
     def _commit_person(person: SchemaPersonType,
                        system_level: SystemLevel,
-                       ingest_time: datetime.datetime):
+                       ingest_time: datetime.datetime,
+                       use_bulk_operations: bool = False):
         act_session = SessionFactory.for_schema_base(
             schema_base_for_system_level(system_level))
         merged_person = act_session.merge(person)
@@ -57,7 +58,8 @@ class BaseHistoricalSnapshotUpdaterTest(TestCase):
                                   jurisdiction_id='12345',
                                   ingest_time=ingest_time,
                                   system_level=system_level)
-        update_historical_snapshots(act_session, [merged_person], [], metadata)
+        update_historical_snapshots(act_session, [merged_person], [], metadata,
+                                    use_bulk_operations=use_bulk_operations)
 
         act_session.commit()
         act_session.close()
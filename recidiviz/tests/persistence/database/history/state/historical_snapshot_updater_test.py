@@ -20,7 +20,9 @@ import datetime
 
 from more_itertools import one
 
-from recidiviz.common.ingest_metadata import SystemLevel
+from recidiviz.common.ingest_metadata import IngestMetadata, SystemLevel
+from recidiviz.persistence.database.history.state.historical_snapshot_updater \
+    import StateHistoricalSnapshotUpdater
 from recidiviz.persistence.database.session_factory import SessionFactory
 from recidiviz.persistence.database.schema.state import schema as state_schema
 from recidiviz.persistence.database.base_schema import StateBase
@@ -43,10 +45,35 @@ class TestStateHistoricalSnapshotUpdater(BaseHistoricalSnapshotUpdaterTest):
         fakes.teardown_in_memory_sqlite_databases()
 
     def testStateRecordTreeSnapshotUpdate(self):
+        self._run_state_record_tree_snapshot_update(use_bulk_operations=False)
+
+    def testStateRecordTreeSnapshotUpdate_bulkOperations(self):
+        self._run_state_record_tree_snapshot_update(use_bulk_operations=True)
+
+    def testStateSnapshotUpdate_bulkOperations_noEntities(self):
+        session = SessionFactory.for_schema_base(StateBase)
+
+        StateHistoricalSnapshotUpdater(
+            use_bulk_operations=True).update_historical_snapshots(
+                session, [], [], IngestMetadata(
+                    region='somewhere', jurisdiction_id='12345',
+                    ingest_time=datetime.datetime(2018, 7, 30),
+                    system_level=SystemLevel.STATE))
+        session.commit()
+
+        self.assertEqual(
+            [], session.query(state_schema.StatePersonHistory).all())
+        session.close()
+
+    def _run_state_record_tree_snapshot_update(self,
+                                               use_bulk_operations: bool):
+        """Commits a person record tree, then an update to the person, and
+        checks the snapshots written for each."""
         person = generate_schema_state_person_obj_tree()
 
         ingest_time_1 = datetime.datetime(2018, 7, 30)
-        self._commit_person(person, SystemLevel.STATE, ingest_time_1)
+        self._commit_person(person, SystemLevel.STATE, ingest_time_1,
+                            use_bulk_operations)
 
         all_schema_objects = self._get_all_schema_objects_in_db(
             state_schema.StatePerson, state_schema, [])
@@ -59,7 +86,8 @@ class TestStateHistoricalSnapshotUpdater(BaseHistoricalSnapshotUpdaterTest):
         person = one(update_session.query(state_schema.StatePerson).all())
         person.full_name = 'new name'
         ingest_time_2 = datetime.datetime(2018, 7, 31)
-        self._commit_person(person, SystemLevel.STATE, ingest_time_2)
+        self._commit_person(person, SystemLevel.STATE, ingest_time_2,
+                            use_bulk_operations)
         update_session.close()
 
         # Check that StatePerson had a new history table row written, but not
@@ -23,7 +23,8 @@ from recidiviz.persistence.database import schema_utils
 from recidiviz.persistence.database.schema.state import schema
 from recidiviz.persistence.entity.entity_utils import EntityFieldType, \
     get_set_entity_field_names, is_standalone_class, \
-    SchemaEdgeDirectionChecker, prune_dangling_placeholders_from_tree
+    SchemaEdgeDirectionChecker, prune_dangling_placeholders_from_tree, \
+    get_all_core_entity_field_names
 from recidiviz.persistence.entity.state.entities import StateSentenceGroup, \
     StateFine, StatePerson, StateSupervisionViolation
 from recidiviz.tests.persistence.database.schema.state.schema_test_utils \
@@ -104,6 +105,30 @@ class TestEntityUtils(TestCase):
             {'fines', 'person', 'person_id', 'sentence_group_id'},
             get_set_entity_field_names(entity, EntityFieldType.ALL))
 
+    def test_getDbEntityRelationshipFieldNames_unsetFieldsSameClass(self):
+        entity = schema.StateSentenceGroup(
+            fines=[schema.StateFine()],
+            person=schema.StatePerson(),
+            person_id=_ID,
+            sentence_group_id=_ID)
+        other_entity = schema.StateSentenceGroup(sentence_group_id=_ID)
+
+        self.assertEqual(
+            {'fines'},
+            get_set_entity_field_names(entity, EntityFieldType.FORWARD_EDGE))
+        self.assertEqual(
+            set(),
+            get_set_entity_field_names(other_entity, EntityFieldType.FORWARD_EDGE))
+
+    def test_getAllCoreEntityFieldNames_returnsCopy(self):
+        entity = schema.StateSentenceGroup()
+        field_names = get_all_core_entity_field_names(entity, EntityFieldType.BACK_EDGE)
+        field_names.add('fines')
+
+        self.assertEqual(
+            {'person'},
+            get_all_core_entity_field_names(entity, EntityFieldType.BACK_EDGE))
+
     def test_isStandaloneClass(self):
         for cls in schema_utils.get_non_history_state_database_entities():
             if cls == schema.StateAgent:
@@ -132,6 +157,14 @@ class TestEntityUtils(TestCase):
         self.assertFalse(direction_checker.is_higher_ranked(
             StateSupervisionViolation, StateSupervisionViolation))
 
+    def test_schemaEdgeDirectionChecker_isBackEdge(self):
+        direction_checker = SchemaEdgeDirectionChecker.state_direction_checker()
+        self.assertIs(direction_checker, SchemaEdgeDirectionChecker.state_direction_checker())
+        self.assertTrue(direction_checker.is_back_edge(schema.StateSentenceGroup(), 'person'))
+        self.assertFalse(direction_checker.is_back_edge(schema.StateSentenceGroup(), 'fines'))
+        self.assertTrue(direction_checker.is_back_edge(StateSentenceGroup.new_with_defaults(), 'person'))
+        self.assertFalse(direction_checker.is_back_edge(StateSentenceGroup.new_with_defaults(), 'fines'))
+
     def test_pruneDanglingPlaceholders_isDangling(self):
         # Arrange
         dangling_placeholder_person = generate_person()
@@ -373,6 +373,50 @@ class TestCountyEntityMatcher(TestCase):
         self.assertEqual(len(matched_entities.orphaned_entities), 0)
         self.assertEqual(ingested_person, expected_person)
 
+    def test_dbPersonIndex_getCandidates(self):
+        db_person_external_id = entities.Person.new_with_defaults(
+            person_id=_ID, external_id=_EXTERNAL_ID, full_name=_FULL_NAME,
+            birthdate=_DATE)
+        db_person_inferred = entities.Person.new_with_defaults(
+            person_id=_ID_ANOTHER, full_name=_FULL_NAME, birthdate=_DATE,
+            birthdate_inferred_from_age=True)
+        db_person_inferred_far = entities.Person.new_with_defaults(
+            person_id=_PERSON_ID_ANOTHER, full_name=_FULL_NAME,
+            birthdate=datetime(2016, 12, 13),
+            birthdate_inferred_from_age=True)
+        db_person_other_name = entities.Person.new_with_defaults(
+            person_id=_PERSON_ID, full_name=_NAME, birthdate=_DATE)
+        db_people = [db_person_external_id, db_person_inferred,
+                     db_person_inferred_far, db_person_other_name]
+
+        index = county_entity_matcher._DbPersonIndex(db_people)
+
+        self.assertEqual(
+            [db_person_external_id],
+            index.get_candidates(entities.Person.new_with_defaults(
+                external_id=_EXTERNAL_ID)))
+        self.assertEqual(
+            [db_person_inferred],
+            index.get_candidates(entities.Person.new_with_defaults(
+                full_name=_FULL_NAME, birthdate=_DATE_2,
+                birthdate_inferred_from_age=True)))
+        self.assertEqual(
+            [db_person_other_name],
+            index.get_candidates(entities.Person.new_with_defaults(
+                full_name=_NAME, birthdate=_DATE)))
+        self.assertEqual(
+            [], index.get_candidates(entities.Person.new_with_defaults(
+                full_name=_NAME_2, birthdate=_DATE)))
+        self.assertEqual(4 * 4 - 3, index.comparisons_avoided)
+
+        # Every DB person that matches is a candidate.
+        for ingested_person in db_people:
+            for db_person in db_people:
+                if county_matching_utils.is_person_match(
+                        db_entity=db_person, ingested_entity=ingested_person):
+                    self.assertIn(db_person,
+                                  index.get_candidates(ingested_person))
+
     def test_matchBooking_duplicateMatch_throws(self):
         db_booking = entities.Booking.new_with_defaults(
             booking_id=_ID, admission_date=_DATE, admission_date_inferred=True,
@@ -16,6 +16,7 @@
 # =============================================================================
 """Tests for state_entity_matcher.py."""
 import datetime
+import unittest
 from typing import List
 
 import attr
@@ -55,8 +56,12 @@ from recidiviz.persistence.entity.state.entities import StatePersonAlias, \
     StateSupervisionCaseTypeEntry
 from recidiviz.persistence.entity_matching import entity_matching
 from recidiviz.persistence.entity_matching.state import state_matching_utils
+from recidiviz.persistence.entity_matching.entity_matching_types import \
+    EntityTree
 from recidiviz.persistence.entity_matching.state.\
     base_state_matching_delegate import BaseStateMatchingDelegate
+from recidiviz.persistence.entity_matching.state.state_entity_matcher import \
+    _DbEntityTreeIndex
 from recidiviz.tests.persistence.database.schema.state.schema_test_utils \
     import generate_person, generate_external_id, generate_court_case, \
     generate_charge, generate_fine, generate_incarceration_sentence, \
@@ -3417,3 +3422,56 @@ class TestStateEntityMatching(BaseStateEntityMatcherTest):
         self.assert_people_match_pre_and_post_commit([expected_person], matched_entities.people, session)
         self.assert_no_errors(matched_entities)
         self.assertEqual(1, matched_entities.total_root_entities)
+
+
+class TestDbEntityTreeIndex(unittest.TestCase):
+    """Tests for the _DbEntityTreeIndex used to narrow down match candidates."""
+
+    def setUp(self) -> None:
+        self.db_placeholder = generate_incarceration_period(
+            person=None, state_code=_STATE_CODE)
+        self.db_ip = generate_incarceration_period(
+            person=None, external_id=_EXTERNAL_ID, state_code=_STATE_CODE)
+        self.db_ip_2 = generate_incarceration_period(
+            person=None, external_id=_EXTERNAL_ID_2, state_code=_STATE_CODE)
+        self.db_trees = [EntityTree(entity=entity, ancestor_chain=[])
+                         for entity in (self.db_ip, self.db_placeholder,
+                                        self.db_ip_2)]
+
+    def test_getCandidates(self):
+        index = _DbEntityTreeIndex(self.db_trees)
+        ingested_ip = generate_incarceration_period(
+            person=None, external_id=_EXTERNAL_ID_2, state_code=_STATE_CODE)
+
+        candidates = index.get_candidates(ingested_ip)
+
+        self.assertEqual([self.db_placeholder, self.db_ip_2],
+                         [tree.entity for tree in candidates])
+
+    def test_getCandidates_noExternalId(self):
+        index = _DbEntityTreeIndex(self.db_trees)
+        ingested_ip = generate_incarceration_period(
+            person=None, state_code=_STATE_CODE)
+
+        self.assertIsNone(index.get_candidates(ingested_ip))
+
+    def test_getCandidates_notExternalIdMatchClass(self):
+        index = _DbEntityTreeIndex(
+            [EntityTree(entity=generate_alias(person=None, state_code=_STATE_CODE, full_name=_FULL_NAME),
+                        ancestor_chain=[])])
+        ingested_alias = generate_alias(person=None, state_code=_STATE_CODE, full_name=_FULL_NAME)
+
+        self.assertIsNone(index.get_candidates(ingested_alias))
+
+    def test_update_externalIdChanged(self):
+        index = _DbEntityTreeIndex(self.db_trees)
+        self.db_placeholder.external_id = _EXTERNAL_ID_3
+        ingested_ip = generate_incarceration_period(
+            person=None, external_id=_EXTERNAL_ID_3, state_code=_STATE_CODE)
+
+        index.update([EntityTree(entity=self.db_placeholder, ancestor_chain=[])])
+
+        self.assertEqual([self.db_placeholder],
+                         [tree.entity for tree in index.get_candidates(ingested_ip)])
+        self.assertEqual([self.db_ip_2],
+                         [tree.entity for tree in index.get_candidates(self.db_ip_2)])
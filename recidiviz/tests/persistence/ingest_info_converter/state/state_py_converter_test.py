@@ -0,0 +1,209 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for the ingest info state_py_converter."""
+import copy
+import datetime
+import unittest
+
+from recidiviz.common.ingest_metadata import IngestMetadata, SystemLevel
+from recidiviz.ingest.models.ingest_info import IngestInfo, \
+    StateSupervisionViolationResponse
+from recidiviz.ingest.scrape import ingest_utils
+from recidiviz.persistence.ingest_info_converter import ingest_info_converter
+
+_INGEST_TIME = datetime.datetime(year=2019, month=2, day=13, hour=12)
+_JURISDICTION_ID = 'JURISDICTION_ID'
+
+
+class TestIngestInfoStatePyConverter(unittest.TestCase):
+    """Test converting IngestInfo python objects to Persistence layer objects
+    without a round trip through an ingest_info proto."""
+
+    def setUp(self):
+        self.maxDiff = None
+        self.metadata = IngestMetadata('us_nd', _JURISDICTION_ID, _INGEST_TIME,
+                                       system_level=SystemLevel.STATE)
+
+    def _assert_matches_proto_conversion(self, ingest_info: IngestInfo):
+        ingest_info_before = copy.deepcopy(ingest_info)
+        expected_result = ingest_info_converter.convert_to_persistence_entities(
+            ingest_utils.convert_ingest_info_to_proto(
+                copy.deepcopy(ingest_info)),
+            self.metadata)
+
+        result = ingest_info_converter.convert_py_to_persistence_entities(
+            ingest_info, self.metadata)
+
+        self.assertEqual(expected_result, result)
+        self.assertEqual(ingest_info_before, ingest_info)
+
+    def testConvert_FullIngestInfo(self):
+        ingest_info = IngestInfo()
+        person = ingest_info.create_state_person(
+            state_person_id='PERSON_ID', surname='SURNAME',
+            birthdate='1/1/1980')
+        person.create_state_person_race(race='WHITE')
+        person.create_state_person_ethnicity(ethnicity='HISPANIC')
+        person.create_state_alias(full_name='LONNY BREAUX')
+        person.create_state_person_external_id(
+            state_person_external_id_id='EXTERNAL_ID', id_type='US_ND_SID')
+        person.create_state_agent(state_agent_id='AGENT_ID_PO',
+                                  full_name='AGENT PO')
+        person.create_state_assessment(
+            state_assessment_id='ASSESSMENT_ID',
+            assessment_class='MENTAL_HEALTH').create_state_agent(
+                state_agent_id='AGENT_ID1', full_name='AGENT WILLIAMS')
+        person.create_state_program_assignment(
+            state_program_assignment_id='PROGRAM_ASSIGNMENT_ID',
+            participation_status='DISCHARGED', program_id='PROGRAM_ID',
+            program_location_id='PROGRAM_LOCATION_ID').create_state_agent(
+                state_agent_id='AGENT_ID4', full_name='AGENT PO')
+
+        sentence_group = person.create_state_sentence_group(
+            state_sentence_group_id='GROUP_ID')
+        supervision_sentence = sentence_group.create_state_supervision_sentence(
+            state_supervision_sentence_id='SUPERVISION_SENTENCE_ID',
+            completion_date='1/2/2111')
+        supervision_sentence.create_state_early_discharge(
+            state_early_discharge_id='EARLY_DISCHARGE_ID')
+        charge = supervision_sentence.create_state_charge(
+            state_charge_id='CHARGE_ID', classification_type='M',
+            ncic_code='1234')
+        charge.create_state_bond(state_bond_id='BOND_ID', status='POSTED')
+        charge.create_state_court_case(
+            state_court_case_id='CASE_ID', status='DISMISSED',
+            court_type='PRESENT_WITHOUT_INFO').create_state_agent(
+                state_agent_id='JUDGE_AGENT_ID', full_name='JUDGE JUDY')
+
+        supervision_period = \
+            supervision_sentence.create_state_supervision_period(
+                state_supervision_period_id='S_PERIOD_ID',
+                supervision_level='MED', conditions=['CURFEW', 'DRINKING'])
+        supervision_period.create_state_agent(
+            state_agent_id='AGENT_ID_SUPERVISING', full_name='SUPERVISING')
+        supervision_period.create_state_supervision_case_type_entry(
+            case_type='DOMESTIC_VIOLENCE')
+        supervision_period.create_state_supervision_contact(
+            state_supervision_contact_id='CONTACT_ID',
+            status='COMPLETED').create_state_agent(
+                state_agent_id='AGENT_ID_CONTACT', full_name='CONTACT')
+        violation = supervision_period.create_state_supervision_violation(
+            state_supervision_violation_id='VIOLATION_ID')
+        violation.create_state_supervision_violation_type_entry(
+            violation_type='FELONY')
+        violation.create_state_supervision_violated_condition_entry(
+            condition='CURFEW')
+        violation_response = \
+            violation.create_state_supervision_violation_response(
+                state_supervision_violation_response_id='RESPONSE_ID',
+                response_type='CITATION')
+        violation_response.\
+            create_state_supervision_violation_response_decision_entry(
+                decision='REVOCATION', revocation_type='REINCARCERATION')
+        violation_response.create_state_agent(
+            state_agent_id='AGENT_ID_TERM', full_name='AGENT TERMINATOR')
+
+        incarceration_sentence = \
+            sentence_group.create_state_incarceration_sentence(
+                state_incarceration_sentence_id='INCARCERATION_SENTENCE_ID')
+        incarceration_sentence.create_state_charge(
+            state_charge_id='CHARGE_ID2')
+        incarceration_period = \
+            incarceration_sentence.create_state_incarceration_period(
+                state_incarceration_period_id='I_PERIOD_ID',
+                incarceration_type='STATE_PRISON')
+        incarceration_period.source_supervision_violation_response = \
+            copy.deepcopy(violation_response)
+        incident = incarceration_period.create_state_incarceration_incident(
+            state_incarceration_incident_id='INCIDENT_ID',
+            incident_type='CONTRABAND')
+        incident.create_state_agent(state_agent_id='AGENT_ID2',
+                                    full_name='AGENT HERNANDEZ')
+        incident.create_state_incarceration_incident_outcome(
+            state_incarceration_incident_outcome_id='INCIDENT_OUTCOME_ID',
+            outcome_type='GOOD_TIME_LOSS')
+        incarceration_period.create_state_parole_decision(
+            state_parole_decision_id='DECISION_ID').create_state_agent(
+                state_agent_id='AGENT_ID3', full_name='AGENT SMITH')
+
+        sentence_group.create_state_fine(
+            state_fine_id='FINE_ID', status='PAID').create_state_charge(
+                state_charge_id='CHARGE_ID3')
+
+        ingest_info.create_state_person(state_person_id='PERSON_ID2',
+                                        full_name='OTHER PERSON')
+
+        self._assert_matches_proto_conversion(ingest_info)
+
+    def testConvert_DuplicateIds_MergedLikeProtoConversion(self):
+        ingest_info = IngestInfo()
+        person = ingest_info.create_state_person(
+            state_person_id='PERSON_ID', surname='FIRST')
+        person.create_state_person_race(race='WHITE')
+        person.create_state_assessment(
+            state_assessment_id='ASSESSMENT_ID').create_state_agent(
+                state_agent_id='AGENT_ID', full_name='FIRST AGENT')
+        sentence_group = person.create_state_sentence_group(
+            state_sentence_group_id='GROUP_ID')
+        sentence_group.create_state_supervision_sentence(
+            state_supervision_sentence_id='SUPERVISION_SENTENCE_ID'
+        ).create_state_charge(
+            state_charge_id='CHARGE_ID', ncic_code='1234'
+        ).create_state_court_case(state_court_case_id='CASE_ID')
+        incarceration_period = sentence_group.create_state_incarceration_sentence(
+            state_incarceration_sentence_id='INCARCERATION_SENTENCE_ID'
+        ).create_state_incarceration_period(
+            state_incarceration_period_id='I_PERIOD_ID')
+        incarceration_period.source_supervision_violation_response = \
+            StateSupervisionViolationResponse(
+                state_supervision_violation_response_id='RESPONSE_ID')
+        incarceration_period.source_supervision_violation_response.\
+            create_state_supervision_violation_response_decision_entry(
+                decision='REVOCATION')
+
+        duplicate_person = ingest_info.create_state_person(
+            state_person_id='PERSON_ID', surname='SECOND')
+        duplicate_person.create_state_person_race(race='BLACK')
+        duplicate_person.create_state_agent(
+            state_agent_id='AGENT_ID', full_name='SECOND AGENT')
+        duplicate_person.create_state_sentence_group(
+            state_sentence_group_id='GROUP_ID', status='SERVING'
+        ).create_state_fine(state_fine_id='FINE_ID').create_state_charge(
+            state_charge_id='CHARGE_ID', ncic_code='5678')
+
+        ingest_info.create_state_person(state_person_id='PERSON_ID2')
+
+        self._assert_matches_proto_conversion(ingest_info)
+
+    def testConvert_EnumParsingErrors(self):
+        ingest_info = IngestInfo()
+        ingest_info.create_state_person(state_person_id='PERSON_ID',
+                                        gender='NOT_A_GENDER')
+        ingest_info.create_state_person(
+            state_person_id='PERSON_ID2').create_state_sentence_group(
+                state_sentence_group_id='GROUP_ID', status='NOT_A_STATUS')
+
+        self._assert_matches_proto_conversion(ingest_info)
+
+    def testConvert_CountyIngestInfo_Throws(self):
+        metadata = IngestMetadata('us_tx_brazos', _JURISDICTION_ID,
+                                  _INGEST_TIME,
+                                  system_level=SystemLevel.COUNTY)
+
+        with self.assertRaises(ValueError):
+            ingest_info_converter.convert_py_to_persistence_entities(
+                IngestInfo(), metadata)
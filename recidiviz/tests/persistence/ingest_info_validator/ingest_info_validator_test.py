@@ -19,8 +19,10 @@
 import unittest
 import pytest
 
+from recidiviz.ingest.models import ingest_info as ingest_info_py
 from recidiviz.ingest.models.ingest_info_pb2 import IngestInfo, Person, \
     Booking, Arrest, Charge, Bond, Sentence
+from recidiviz.ingest.scrape import ingest_utils
 from recidiviz.persistence.ingest_info_validator import ingest_info_validator
 from recidiviz.persistence.ingest_info_validator.ingest_info_validator import \
     ValidationError
@@ -94,6 +96,17 @@ class TestValidator(unittest.TestCase):
 
         self.assertEqual(result, expected_result)
 
+    def test_duplicate_ids_py(self):
+        # Arrange
+        ingest_info = ingest_info_py.IngestInfo()
+        ingest_info.create_state_person(state_person_id=PERSON_1)
+        ingest_info.create_state_person(state_person_id=PERSON_1)
+        ingest_info.create_state_person(state_person_id=EXTRA_PERSON)
+
+        # Act
+        ingest_info_validator.validate(
+            ingest_utils.convert_ingest_info_to_proto(ingest_info))
+
     def test_non_existing_id(self):
         # Arrange
         ingest_info = IngestInfo()
@@ -32,20 +32,26 @@ from recidiviz.common.constants.charge import ChargeStatus
 from recidiviz.common.constants.county.booking import CustodyStatus
 from recidiviz.common.constants.county.hold import HoldStatus
 from recidiviz.common.constants.county.sentence import SentenceStatus
-from recidiviz.common.ingest_metadata import IngestMetadata
+from recidiviz.common.constants.state.external_id_types import US_ND_ELITE, \
+    US_ND_SID
+from recidiviz.common.ingest_metadata import IngestMetadata, SystemLevel
+from recidiviz.ingest.models import ingest_info as ingest_info_py
 from recidiviz.ingest.models.ingest_info_pb2 import IngestInfo, Charge, \
     Sentence
 from recidiviz.persistence import persistence
 from recidiviz.persistence.database import database
 from recidiviz.persistence.database.base_schema import \
-    JailsBase
+    JailsBase, StateBase
 from recidiviz.persistence.database.schema.county import schema, \
     dao as county_dao
+from recidiviz.persistence.database.schema.state import dao as state_dao
 from recidiviz.persistence.database.schema_entity_converter import (
     schema_entity_converter as converter,
 )
 from recidiviz.persistence.database.session_factory import SessionFactory
 from recidiviz.persistence.entity.county import entities as county_entities
+from recidiviz.tests.persistence.database.schema.state.schema_test_utils \
+    import generate_external_id, generate_person
 from recidiviz.tests.utils import fakes
 
 ARREST_ID = 'ARREST_ID_1'
@@ -87,6 +93,11 @@ DEFAULT_METADATA = IngestMetadata.new_with_defaults(
     region='region_code',
     jurisdiction_id='12345678',
     ingest_time=datetime(year=1000, month=1, day=1))
+STATE_METADATA = IngestMetadata.new_with_defaults(
+    region='us_nd',
+    jurisdiction_id='12345678',
+    ingest_time=datetime(year=1000, month=1, day=1),
+    system_level=SystemLevel.STATE)
 ID = 1
 ID_2 = 2
 ID_3 = 3
@@ -271,6 +282,42 @@ class TestPersistence(TestCase):
         assert result[0].full_name == _format_full_name(FULL_NAME_3)
         assert result[1].full_name == _format_full_name(FULL_NAME_2)
 
+    @patch.object(persistence, '_write')
+    def test_writeIngestInfoPy_duplicateStatePersonIds_writes(self, mock_write):
+        # Arrange
+        ingest_info = ingest_info_py.IngestInfo()
+        ingest_info.create_state_person(state_person_id=EXTERNAL_PERSON_ID)
+        ingest_info.create_state_person(state_person_id=EXTERNAL_PERSON_ID)
+
+        # Act
+        persistence.write_ingest_info_py(ingest_info, DEFAULT_METADATA)
+
+        # Assert
+        mock_write.assert_called_once()
+
+    def test_shardPeopleByExternalId(self):
+        # Arrange
+        person_1 = county_entities.Person.new_with_defaults(
+            external_id=EXTERNAL_PERSON_ID)
+        person_1_dup = county_entities.Person.new_with_defaults(
+            external_id=EXTERNAL_PERSON_ID, full_name=FULL_NAME_1)
+        people = [person_1, person_1_dup] + [
+            county_entities.Person.new_with_defaults(
+                external_id='{}_{}'.format(EXTERNAL_ID, i)) for i in range(20)]
+
+        # Act
+        shards = persistence._shard_people_by_external_id(  # pylint: disable=protected-access
+            people, 4)
+
+        # Assert
+        assert 1 < len(shards) <= 4
+        assert all(shards)
+        assert sorted(id(person) for shard in shards for person in shard) == \
+            sorted(id(person) for person in people)
+        shard_with_person_1 = next(
+            shard for shard in shards if person_1 in shard)
+        assert person_1_dup in shard_with_person_1
+
     # TODO: test entity matching end to end
 
     def test_readSinglePersonByName(self):
@@ -758,5 +805,168 @@ class TestPersistence(TestCase):
                              SessionFactory.for_schema_base(JailsBase)))
 
 
+@patch('os.getenv', Mock(return_value='production'))
+@patch.dict('os.environ', {'PERSIST_LOCALLY': 'false'})
+class TestPersistenceSharded(TestCase):
+    """Test that sharded writes, which match and write each shard in a forked
+    process, are committed only if the file as a whole is not aborted."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        fakes.start_on_disk_postgresql_database()
+
+    def setUp(self) -> None:
+        fakes.use_on_disk_postgresql_database(JailsBase)
+
+    def tearDown(self) -> None:
+        fakes.teardown_on_disk_postgresql_database(JailsBase)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        fakes.stop_and_clear_on_disk_postgresql_database()
+
+    def test_twoDifferentPeople_sharded_persistsBoth(self):
+        # Arrange
+        ingest_info = IngestInfo()
+        ingest_info.people.add(person_id='1_GENERATE', full_name=FULL_NAME_1)
+        ingest_info.people.add(person_id='2_GENERATE', full_name=FULL_NAME_2)
+
+        # Act
+        self.assertTrue(
+            persistence.write(ingest_info, DEFAULT_METADATA, num_shards=2))
+        result = county_dao.read_people(
+            SessionFactory.for_schema_base(JailsBase))
+
+        # Assert
+        assert sorted(person.full_name for person in result) == \
+            sorted([_format_full_name(FULL_NAME_1),
+                    _format_full_name(FULL_NAME_2)])
+
+    def test_sharded_abortedAfterMatching_persistsNothing(self):
+        # Arrange
+        ingest_info = IngestInfo()
+        ingest_info.people.add(person_id='1_GENERATE', full_name=FULL_NAME_1)
+        ingest_info.people.add(person_id='2_GENERATE', full_name=FULL_NAME_2)
+
+        # Act
+        with patch.object(persistence, '_should_abort',
+                          side_effect=[False, True]):
+            self.assertFalse(
+                persistence.write(ingest_info, DEFAULT_METADATA, num_shards=2))
+        result = county_dao.read_people(
+            SessionFactory.for_schema_base(JailsBase))
+
+        # Assert
+        assert not result
+
+    def test_sharded_parentConnectionUsableAfterWrite(self):
+        # Arrange
+        session = SessionFactory.for_schema_base(JailsBase)
+        session.execute('SELECT 1')
+        session.close()
+        ingest_info = IngestInfo()
+        ingest_info.people.add(person_id='1_GENERATE', full_name=FULL_NAME_1)
+        ingest_info.people.add(person_id='2_GENERATE', full_name=FULL_NAME_2)
+
+        # Act
+        persistence.write(ingest_info, DEFAULT_METADATA, num_shards=2)
+
+        # Assert
+        session = SessionFactory.for_schema_base(JailsBase)
+        assert session.execute('SELECT 1').scalar() == 1
+        session.close()
+
+
+@patch('os.getenv', Mock(return_value='production'))
+@patch.dict('os.environ', {'PERSIST_LOCALLY': 'false'})
+class TestPersistenceShardedState(TestCase):
+    """Test sharded writes of state people, including shards that entity match
+    the same database person."""
+
+    # External ids of two people that are written to different shards
+    SHARD_0_ELITE_ID = '23456'
+    SHARD_1_SID = '12345'
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        fakes.start_on_disk_postgresql_database()
+
+    def setUp(self) -> None:
+        fakes.use_on_disk_postgresql_database(StateBase)
+
+    def tearDown(self) -> None:
+        fakes.teardown_on_disk_postgresql_database(StateBase)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        fakes.stop_and_clear_on_disk_postgresql_database()
+
+    def _ingest_info(self) -> ingest_info_py.IngestInfo:
+        ingest_info = ingest_info_py.IngestInfo()
+        person_1 = ingest_info.create_state_person(
+            state_person_id='1', full_name=FULL_NAME_1)
+        person_1.create_state_person_external_id(
+            state_person_external_id_id=self.SHARD_1_SID, id_type=US_ND_SID)
+        person_2 = ingest_info.create_state_person(
+            state_person_id='2', full_name=FULL_NAME_2)
+        person_2.create_state_person_external_id(
+            state_person_external_id_id=self.SHARD_0_ELITE_ID,
+            id_type=US_ND_ELITE)
+        return ingest_info
+
+    def _read_people(self):
+        session = SessionFactory.for_schema_base(StateBase)
+        people = state_dao.read_people(session)
+        session.close()
+        return people
+
+    def test_twoDifferentPeople_sharded_persistsBoth(self):
+        # Arrange
+        ingest_info = self._ingest_info()
+
+        # Act
+        self.assertTrue(persistence.write_ingest_info_py(
+            ingest_info, STATE_METADATA, num_shards=2))
+        result = self._read_people()
+
+        # Assert
+        assert sorted(person.full_name for person in result) == \
+            sorted([_format_full_name(FULL_NAME_1),
+                    _format_full_name(FULL_NAME_2)])
+
+    def test_shardsMatchSameDbPerson_fallsBackToSingleTransaction(self):
+        # Arrange
+        db_person = generate_person(state_code='US_ND',
+                                    full_name=_format_full_name(FULL_NAME_3))
+        db_person.external_ids = [
+            generate_external_id(person=db_person, state_code='US_ND',
+                                 external_id=self.SHARD_1_SID,
+                                 id_type=US_ND_SID),
+            generate_external_id(person=db_person, state_code='US_ND',
+                                 external_id=self.SHARD_0_ELITE_ID,
+                                 id_type=US_ND_ELITE)]
+        session = SessionFactory.for_schema_base(StateBase)
+        session.add(db_person)
+        session.commit()
+        session.close()
+        ingest_info = self._ingest_info()
+
+        # Act
+        with patch.object(persistence, '_SHARD_LOCK_TIMEOUT_MS', 1000), \
+                patch.object(persistence, 'retry_transaction',
+                             wraps=persistence.retry_transaction) \
+                as mock_retry_transaction:
+            persistence.write_ingest_info_py(
+                ingest_info, STATE_METADATA, num_shards=2)
+        result = self._read_people()
+
+        # Assert
+        mock_retry_transaction.assert_called_once()
+        assert len(result) == 1
+        assert sorted(external_id.external_id
+                      for external_id in result[0].external_ids) == \
+            sorted([self.SHARD_0_ELITE_ID, self.SHARD_1_SID])
+
+
 def _format_full_name(full_name: str) -> str:
     return '{{"full_name": "{}"}}'.format(full_name)
@@ -73,3 +73,28 @@ class TestExistenceValidationChecker(TestCase):
                          DataValidationJobResult(validation_job=job,
                                                  was_successful=False,
                                                  failure_description='Found 2 invalid rows, though 0 were expected'))
+
+    @patch('recidiviz.validation.checks.validation_checker.BigQueryClientImpl')
+    def test_existence_check_for_region_codes(self, mock_batch_client_cls):
+        mock_batch_client = mock_batch_client_cls.return_value
+        mock_batch_client.run_query_async.return_value = [{'region_code': 'US_VA', 'value': 1},
+                                                          {'region_code': 'US_VA', 'value': 2}]
+
+        validation = ExistenceDataValidationCheck(
+            validation_type=ValidationCheckType.EXISTENCE,
+            view=BigQueryView(dataset_id='my_dataset',
+                              view_id='test_view',
+                              view_query_template='select * from literally_anything'))
+        results = ExistenceValidationChecker().run_check_for_region_codes(validation, ['US_UT', 'US_VA'])
+
+        mock_batch_client.run_query_async.assert_called_once_with(
+            validation.query_str_for_region_codes(['US_UT', 'US_VA']))
+        self.mock_client.run_query_async.assert_not_called()
+        self.assertEqual(results, [
+            DataValidationJobResult(validation_job=DataValidationJob(region_code='US_UT', validation=validation),
+                                    was_successful=True,
+                                    failure_description=None),
+            DataValidationJobResult(validation_job=DataValidationJob(region_code='US_VA', validation=validation),
+                                    was_successful=False,
+                                    failure_description='Found 2 invalid rows, though 0 were expected'),
+        ])
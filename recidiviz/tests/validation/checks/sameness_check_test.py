@@ -310,3 +310,115 @@ class TestSamenessValidationChecker(TestCase):
                                                  f'The acceptable margin of error is only {max_allowed_error}, but the '
                                                  f'validation returned an error rate of {actual_expected_error}.',
                          ))
+
+    def test_sameness_check_numbers_summary_query_above_margin(self):
+        self.mock_client.run_query_async.return_value = [
+            {'num_rows': 100, 'num_error_rows': 2, 'highest_error': 0.0612,
+             'failing_rows_sample': ['{"a":94,"b":100}', '{"a":95,"b":100}']}]
+
+        job = DataValidationJob(region_code='US_VA',
+                                validation=SamenessDataValidationCheck(
+                                    validation_type=ValidationCheckType.SAMENESS,
+                                    comparison_columns=['a', 'b'],
+                                    sameness_check_type=SamenessDataValidationCheckType.NUMBERS,
+                                    max_allowed_error=0.02,
+                                    compute_errors_in_query=True,
+                                    view=BigQueryView(dataset_id='my_dataset',
+                                                      view_id='test_view',
+                                                      view_query_template='select * from literally_anything')
+                                ))
+        result = SamenessValidationChecker.run_check(job)
+
+        query = self.mock_client.run_query_async.call_args[0][0]
+        self.assertIn(job.validation.query_str_for_region_codes(['US_VA']), query)
+        self.assertIn('GREATEST(a, b)', query)
+        self.assertIn('COUNTIF(error > 0.02)', query)
+        self.assertEqual(result,
+                         DataValidationJobResult(
+                             validation_job=job,
+                             was_successful=False,
+                             failure_description='2 row(s) had unacceptable margins of error. The acceptable margin '
+                                                 'of error is only 0.02, but the validation returned rows with errors '
+                                                 'as high as 0.06. Sample of failing rows: '
+                                                 '[\'{"a":94,"b":100}\', \'{"a":95,"b":100}\']',
+                         ))
+
+    def test_sameness_check_numbers_summary_query_no_errors(self):
+        self.mock_client.run_query_async.return_value = [
+            {'num_rows': 100, 'num_error_rows': 0, 'highest_error': 0.0, 'failing_rows_sample': []}]
+
+        job = DataValidationJob(region_code='US_VA',
+                                validation=SamenessDataValidationCheck(
+                                    validation_type=ValidationCheckType.SAMENESS,
+                                    comparison_columns=['a', 'b', 'c'],
+                                    sameness_check_type=SamenessDataValidationCheckType.NUMBERS,
+                                    compute_errors_in_query=True,
+                                    view=BigQueryView(dataset_id='my_dataset',
+                                                      view_id='test_view',
+                                                      view_query_template='select * from literally_anything')
+                                ))
+        result = SamenessValidationChecker.run_check(job)
+
+        self.assertEqual(result,
+                         DataValidationJobResult(validation_job=job, was_successful=True, failure_description=None))
+
+    def test_string_sameness_check_summary_query_above_margin(self):
+        self.mock_client.run_query_async.return_value = [
+            {'num_rows': 100, 'num_error_rows': 5, 'failing_rows_sample': ['{"a":"a_value","b":"b_value"}']}]
+
+        job = DataValidationJob(region_code='US_VA',
+                                validation=SamenessDataValidationCheck(
+                                    validation_type=ValidationCheckType.SAMENESS,
+                                    comparison_columns=['a', 'b'],
+                                    sameness_check_type=SamenessDataValidationCheckType.STRINGS,
+                                    max_allowed_error=0.04,
+                                    compute_errors_in_query=True,
+                                    view=BigQueryView(dataset_id='my_dataset',
+                                                      view_id='test_view',
+                                                      view_query_template='select * from literally_anything')
+                                ))
+        result = SamenessValidationChecker.run_check(job)
+
+        query = self.mock_client.run_query_async.call_args[0][0]
+        self.assertIn(job.validation.query_str_for_region_codes(['US_VA']), query)
+        self.assertIn("UNNEST([IFNULL(a, 'EMPTY_STRING_VALUE'), IFNULL(b, 'EMPTY_STRING_VALUE')])", query)
+        self.assertEqual(result,
+                         DataValidationJobResult(
+                             validation_job=job,
+                             was_successful=False,
+                             failure_description='5 out of 100 row(s) did not contain matching strings. The '
+                                                 'acceptable margin of error is only 0.04, but the validation '
+                                                 'returned an error rate of 0.05. Sample of failing rows: '
+                                                 '[\'{"a":"a_value","b":"b_value"}\']',
+                         ))
+
+    def test_string_sameness_check_summary_query_for_region_codes(self):
+        self.mock_client.run_query_async.return_value = [
+            {'region_code': 'US_VA', 'num_rows': 100, 'num_error_rows': 5,
+             'failing_rows_sample': ['{"a":"a_value","b":"b_value"}']}]
+
+        validation = SamenessDataValidationCheck(
+            validation_type=ValidationCheckType.SAMENESS,
+            comparison_columns=['a', 'b'],
+            sameness_check_type=SamenessDataValidationCheckType.STRINGS,
+            max_allowed_error=0.04,
+            compute_errors_in_query=True,
+            view=BigQueryView(dataset_id='my_dataset',
+                              view_id='test_view',
+                              view_query_template='select * from literally_anything'))
+        results = SamenessValidationChecker().run_check_for_region_codes(validation, ['US_UT', 'US_VA'])
+
+        self.mock_client.run_query_async.assert_called_once_with(
+            validation.summary_query_str_for_region_codes(['US_UT', 'US_VA']))
+        self.assertIn('GROUP BY region_code', self.mock_client.run_query_async.call_args[0][0])
+        self.assertEqual(results, [
+            DataValidationJobResult(validation_job=DataValidationJob(region_code='US_UT', validation=validation),
+                                    was_successful=True,
+                                    failure_description=None),
+            DataValidationJobResult(
+                validation_job=DataValidationJob(region_code='US_VA', validation=validation),
+                was_successful=False,
+                failure_description='5 out of 100 row(s) did not contain matching strings. The acceptable margin of '
+                                    'error is only 0.04, but the validation returned an error rate of 0.05. Sample '
+                                    'of failing rows: [\'{"a":"a_value","b":"b_value"}\']'),
+        ])
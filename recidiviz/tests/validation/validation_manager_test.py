@@ -27,7 +27,8 @@ from recidiviz.big_query.big_query_view import BigQueryView
 from recidiviz.tests.utils.matchers import UnorderedCollection
 from recidiviz.validation.checks.existence_check import ExistenceDataValidationCheck
 from recidiviz.validation.configured_validations import get_all_validations, STATES_TO_VALIDATE
-from recidiviz.validation.validation_manager import validation_manager_blueprint, _fetch_validation_jobs_to_perform
+from recidiviz.validation.validation_manager import validation_manager_blueprint, _fetch_validation_jobs_to_perform, \
+    _fetch_validation_batches_to_perform
 from recidiviz.validation.validation_models import DataValidationJob, DataValidationJobResult
 from recidiviz.validation.views import view_config
 
@@ -161,6 +162,41 @@ class TestHandleRequest(TestCase):
         mock_emit_failures.assert_called_with([])
         mock_update_views.assert_called_with(view_config.VIEW_BUILDERS_FOR_VIEWS_TO_UPDATE)
 
+    @patch("recidiviz.validation.validation_manager._emit_failures")
+    @patch("recidiviz.validation.validation_manager._run_batch")
+    @patch("recidiviz.validation.validation_manager._run_job")
+    @patch("recidiviz.validation.validation_manager._fetch_validation_batches_to_perform")
+    @patch("recidiviz.validation.validation_manager._fetch_validation_jobs_to_perform")
+    def test_handle_request_should_batch_queries(self,
+                                                 mock_fetch_validations,
+                                                 mock_fetch_batches,
+                                                 mock_run_job,
+                                                 mock_run_batch,
+                                                 mock_emit_failures):
+        mock_fetch_validations.return_value = _TEST_VALIDATIONS
+        mock_fetch_batches.return_value = [(_TEST_VALIDATIONS[0].validation, ['US_UT', 'US_VA']),
+                                           (_TEST_VALIDATIONS[1].validation, ['US_UT', 'US_VA'])]
+
+        failure = DataValidationJobResult(
+            validation_job=_TEST_VALIDATIONS[3], was_successful=False, failure_description='Oh no')
+        mock_run_batch.side_effect = lambda validation, region_codes: [
+            failure if job == _TEST_VALIDATIONS[3]
+            else DataValidationJobResult(validation_job=job, was_successful=True, failure_description=None)
+            for job in (DataValidationJob(validation=validation, region_code=region_code)
+                        for region_code in region_codes)]
+
+        headers = {'X-Appengine-Cron': 'test-cron'}
+        response = self.client.get('/validate?should_batch_queries=true', headers=headers)
+
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(_API_RESPONSE_IF_NO_FAILURES, response.get_data().decode())
+
+        mock_run_job.assert_not_called()
+        self.assertEqual(2, mock_run_batch.call_count)
+        mock_run_batch.assert_any_call(_TEST_VALIDATIONS[0].validation, ['US_UT', 'US_VA'])
+        mock_run_batch.assert_any_call(_TEST_VALIDATIONS[1].validation, ['US_UT', 'US_VA'])
+        mock_emit_failures.assert_called_with([failure])
+
 
 class TestFetchValidations(TestCase):
     """Tests the _fetch_validation_jobs_to_perform function."""
@@ -172,3 +208,10 @@ class TestFetchValidations(TestCase):
 
         result = _fetch_validation_jobs_to_perform()
         self.assertEqual(expected_length, len(result))
+
+    def test_one_batch_per_check(self):
+        result = _fetch_validation_batches_to_perform()
+
+        self.assertEqual(len(get_all_validations()), len(result))
+        for _, region_codes in result:
+            self.assertEqual(STATES_TO_VALIDATE, region_codes)
@@ -0,0 +1,110 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""
+Micro-benchmark for batch_persistence._dedup_people on a synthetic batch of scraped people.
+
+Builds a batch of IngestInfo objects, one per synthetic scrape task, where a fraction of the people are re-scraped
+duplicates with their bookings and charges in a different order, and times de-duplicating the batch.
+
+Example usage (run from `pipenv shell`):
+
+python -m recidiviz.tools.benchmark_dedup_people --people 50000 --duplicate-fraction 0.1
+"""
+import argparse
+import copy
+import logging
+import random
+import timeit
+from typing import List
+
+from recidiviz.ingest.models.ingest_info import IngestInfo, Person
+from recidiviz.persistence.batch_persistence import _dedup_people
+
+
+def _synthetic_person(rng: random.Random, person_index: int) -> Person:
+    person = Person(person_id=f'PERSON_{person_index}',
+                    full_name=f'SURNAME_{person_index}, GIVEN_{person_index}',
+                    birthdate=f'{rng.randint(1950, 2000)}-01-01',
+                    gender=rng.choice(['M', 'F']),
+                    race=rng.choice(['WHITE', 'BLACK', 'ASIAN']))
+    for booking_index in range(rng.randint(1, 3)):
+        booking = person.create_booking(booking_id=f'BOOKING_{person_index}_{booking_index}',
+                                        admission_date=f'2019-{rng.randint(1, 12)}-01',
+                                        facility='COUNTY JAIL')
+        for charge_index in range(rng.randint(1, 4)):
+            booking.create_charge(charge_id=f'CHARGE_{person_index}_{booking_index}_{charge_index}',
+                                  statute=str(rng.randint(100, 999)),
+                                  name=rng.choice(['THEFT', 'ASSAULT', 'DUI'])).create_bond(amount='1000')
+    return person
+
+
+def _synthetic_batch(people: int, duplicate_fraction: float, people_per_task: int) -> List[IngestInfo]:
+    """Returns IngestInfos containing |people| people in total, of which |duplicate_fraction| are duplicates of other
+    people in the batch with their repeated children shuffled."""
+    rng = random.Random(0)
+    num_duplicates = int(people * duplicate_fraction)
+    all_people = [_synthetic_person(rng, i) for i in range(people - num_duplicates)]
+    for _ in range(num_duplicates):
+        duplicate = copy.deepcopy(rng.choice(all_people))
+        rng.shuffle(duplicate.bookings)
+        for booking in duplicate.bookings:
+            rng.shuffle(booking.charges)
+        all_people.append(duplicate)
+    rng.shuffle(all_people)
+
+    return [IngestInfo(people=all_people[i:i + people_per_task]) for i in range(0, len(all_people), people_per_task)]
+
+
+def main(*, people: int, duplicate_fraction: float, people_per_task: int, repetitions: int):
+    """Times _dedup_people on a synthetic batch."""
+    batch = _synthetic_batch(people, duplicate_fraction, people_per_task)
+
+    # _dedup_people sorts people in place, so each run gets a fresh copy of the batch
+    run_seconds = []
+    num_unique_people = 0
+    for _ in range(repetitions):
+        run_batch = copy.deepcopy(batch)
+        # _dedup_people logs every duplicate person, which would otherwise dominate the output
+        logging.disable(logging.INFO)
+        start = timeit.default_timer()
+        num_unique_people = len(_dedup_people(run_batch).people)
+        run_seconds.append(timeit.default_timer() - start)
+        logging.disable(logging.NOTSET)
+
+    logging.info('De-duplicated %d people into %d unique people in %.2fs (%.0f people/s)',
+                 people, num_unique_people, min(run_seconds), people / min(run_seconds))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('--people', type=int, default=50000,
+                        help='The total number of people in the synthetic batch, including duplicates.')
+
+    parser.add_argument('--duplicate-fraction', type=float, default=0.1,
+                        help='The fraction of people in the batch that are duplicates of another person.')
+
+    parser.add_argument('--people-per-task', type=int, default=10,
+                        help='The number of people in each synthetic IngestInfo.')
+
+    parser.add_argument('--repetitions', type=int, default=3,
+                        help='The number of times to run the benchmark. The fastest run is reported.')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    main(people=args.people, duplicate_fraction=args.duplicate_fraction, people_per_task=args.people_per_task,
+         repetitions=args.repetitions)
@@ -0,0 +1,93 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""
+Micro-benchmark for str_field_utils.parse_date on synthetic date columns.
+
+Builds columns of date strings in the formats commonly found in raw direct ingest files and times parse_date on each
+column, reporting the throughput in rows per second. For comparison, also times parsing the same column directly with
+dateparser, which is what parse_date falls back to for free-text and relative values.
+
+Example usage (run from `pipenv shell`):
+
+python -m recidiviz.tools.benchmark_parse_date --rows 10000 --distinct-values 500
+"""
+import argparse
+import logging
+import random
+import timeit
+from datetime import date, timedelta
+from typing import Callable, Dict, List
+
+import dateparser
+
+from recidiviz.common.str_field_utils import parse_date
+
+# Functions that format a date the way it appears in a given kind of raw file column
+_COLUMN_FORMATTERS: Dict[str, Callable[[date], str]] = {
+    'iso_date': lambda d: d.isoformat(),
+    'us_date': lambda d: f'{d.month}/{d.day}/{d.year}',
+    'us_date_padded': lambda d: d.strftime('%m/%d/%Y'),
+    'iso_datetime': lambda d: f'{d.isoformat()} 00:00:00',
+    'us_datetime': lambda d: d.strftime('%m/%d/%Y %H:%M:%S'),
+    'free_text': lambda d: d.strftime('%b %d, %Y'),
+}
+
+
+def _synthetic_column(formatter: Callable[[date], str], rows: int, distinct_values: int) -> List[str]:
+    """Returns |rows| date strings drawn from |distinct_values| distinct dates, formatted with |formatter|."""
+    rng = random.Random(0)
+    start = date(1950, 1, 1)
+    values = [formatter(start + timedelta(days=rng.randrange(365 * 70))) for _ in range(distinct_values)]
+    return [rng.choice(values) for _ in range(rows)]
+
+
+def main(*, rows: int, distinct_values: int, repetitions: int):
+    """Times parse_date and raw dateparser on each synthetic column."""
+    for column_name, formatter in _COLUMN_FORMATTERS.items():
+        column = _synthetic_column(formatter, rows, distinct_values)
+
+        def _parse_column():
+            for value in column:
+                parse_date(value)
+
+        def _dateparser_column():
+            for value in column:
+                dateparser.parse(value, languages=['en'], settings={'PREFER_DAY_OF_MONTH': 'first'})
+
+        parse_date_seconds = min(timeit.repeat(_parse_column, number=1, repeat=repetitions))
+        dateparser_seconds = min(timeit.repeat(_dateparser_column, number=1, repeat=repetitions))
+
+        logging.info('%-15s parse_date: %9.0f rows/s, dateparser: %9.0f rows/s (%.1fx)',
+                     column_name, rows / parse_date_seconds, rows / dateparser_seconds,
+                     dateparser_seconds / parse_date_seconds)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('--rows', type=int, default=10000,
+                        help='The number of rows in each synthetic date column.')
+
+    parser.add_argument('--distinct-values', type=int, default=500,
+                        help='The number of distinct dates in each synthetic date column.')
+
+    parser.add_argument('--repetitions', type=int, default=3,
+                        help='The number of times to run each benchmark. The fastest run is reported.')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    main(rows=args.rows, distinct_values=args.distinct_values, repetitions=args.repetitions)
@@ -0,0 +1,125 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2020 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""
+Micro-benchmark for the supervision calculator on a synthetic person with a long supervision history.
+
+Builds one daily SupervisionTimeBucket for every day a synthetic person has been on supervision, with periodic
+revocations and terminations, and times map_supervision_combinations for increasingly long histories. If the time
+spent per bucket stays flat as the history grows, the calculator scales linearly with the number of buckets.
+
+Example usage (run from `pipenv shell`):
+
+python -m recidiviz.tools.benchmark_supervision_calculator --years 1 3 6 --repetitions 3
+"""
+import argparse
+import logging
+import timeit
+from datetime import date, timedelta
+from typing import List
+
+from recidiviz.calculator.pipeline.supervision import calculator
+from recidiviz.calculator.pipeline.supervision.metrics import SupervisionMetricType
+from recidiviz.calculator.pipeline.supervision.supervision_time_bucket import SupervisionTimeBucket, \
+    NonRevocationReturnSupervisionTimeBucket, RevocationReturnSupervisionTimeBucket, SupervisionTerminationBucket
+from recidiviz.calculator.pipeline.utils.calculator_utils import last_day_of_month
+from recidiviz.common.constants.person_characteristics import Gender, Race
+from recidiviz.common.constants.state.state_case_type import StateSupervisionCaseType
+from recidiviz.common.constants.state.state_supervision_period import StateSupervisionPeriodSupervisionType
+from recidiviz.persistence.entity.state.entities import StatePerson, StatePersonRace
+
+_STATE_CODE = 'US_ND'
+
+# Every this many days, the person has a revocation admission
+_REVOCATION_INTERVAL_DAYS = 180
+
+# Every this many days, a period of supervision terminates
+_TERMINATION_INTERVAL_DAYS = 365
+
+
+def _synthetic_person() -> StatePerson:
+    person = StatePerson.new_with_defaults(person_id=12345, birthdate=date(1984, 8, 31), gender=Gender.FEMALE)
+    person.races = [StatePersonRace.new_with_defaults(state_code=_STATE_CODE, race=Race.WHITE)]
+    return person
+
+
+def _synthetic_supervision_time_buckets(years: int) -> List[SupervisionTimeBucket]:
+    """Returns daily supervision buckets for a person on supervision for the |years| years ending today."""
+    end_date = date.today()
+    start_date = end_date - timedelta(days=365 * years)
+
+    buckets: List[SupervisionTimeBucket] = []
+
+    day = start_date
+    day_index = 0
+    while day <= end_date:
+        bucket_args = {
+            'state_code': _STATE_CODE,
+            'year': day.year,
+            'month': day.month,
+            'bucket_date': day,
+            'supervision_type': StateSupervisionPeriodSupervisionType.PROBATION,
+            'case_type': StateSupervisionCaseType.GENERAL,
+        }
+
+        if day_index and day_index % _REVOCATION_INTERVAL_DAYS == 0:
+            buckets.append(RevocationReturnSupervisionTimeBucket(
+                **bucket_args, is_on_supervision_last_day_of_month=False))
+        else:
+            buckets.append(NonRevocationReturnSupervisionTimeBucket(
+                **bucket_args, is_on_supervision_last_day_of_month=(day == last_day_of_month(day))))
+
+        if day_index and day_index % _TERMINATION_INTERVAL_DAYS == 0:
+            buckets.append(SupervisionTerminationBucket(**bucket_args))
+
+        day += timedelta(days=1)
+        day_index += 1
+
+    return buckets
+
+
+def main(*, years: List[int], repetitions: int):
+    """Times map_supervision_combinations for synthetic people with each of the given number of years of
+    supervision history."""
+    person = _synthetic_person()
+    metric_inclusions = {metric_type: True for metric_type in SupervisionMetricType}
+
+    for num_years in years:
+        buckets = _synthetic_supervision_time_buckets(num_years)
+
+        def _run_calculator():
+            # Copy the bucket list, since the calculator sorts it in place
+            calculator.map_supervision_combinations(
+                person, list(buckets), metric_inclusions, calculation_end_month=None, calculation_month_count=-1)
+
+        seconds = min(timeit.repeat(_run_calculator, number=1, repeat=repetitions))
+
+        logging.info('%d year(s), %d buckets: %.3fs total, %.1fus per bucket',
+                     num_years, len(buckets), seconds, seconds / len(buckets) * 1e6)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('--years', type=int, nargs='+', default=[1, 3, 6],
+                        help='The lengths of the synthetic supervision histories to benchmark, in years.')
+
+    parser.add_argument('--repetitions', type=int, default=3,
+                        help='The number of times to run each benchmark. The fastest run is reported.')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    main(years=args.years, repetitions=args.repetitions)
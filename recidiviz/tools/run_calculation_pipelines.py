@@ -52,6 +52,18 @@ Examples:
     python -m recidiviz.tools.run_calculation_pipelines.py --pipeline incarceration --job_name incarceration-example \
     --region us-central1 --include_race False --save_as_template --calculation_month_count 36
 
+    python -m recidiviz.tools.run_calculation_pipelines.py --pipeline person_snapshot --job_name snapshot-example \
+    --snapshot_output gs://my-bucket/snapshots/2020-07-01
+
+    python -m recidiviz.tools.run_calculation_pipelines.py --pipeline incarceration --job_name incarceration-example \
+    --person_snapshot_input gs://my-bucket/snapshots/2020-07-01
+
+    python -m recidiviz.tools.run_calculation_pipelines.py --pipeline fused --job_name fused-example \
+    --pipelines supervision incarceration --calculation_month_count 36
+
+    python -m recidiviz.tools.run_calculation_pipelines.py --pipeline supervision --job_name supervision-example \
+    --aggregate_event_based_metrics
+
 You must also include any arguments required by the given pipeline.
 """
 from __future__ import absolute_import
@@ -60,8 +72,12 @@ import logging
 import sys
 import argparse
 
+from recidiviz.calculator.pipeline.fused import \
+    pipeline as fused_pipeline
 from recidiviz.calculator.pipeline.incarceration import \
     pipeline as incarceration_pipeline
+from recidiviz.calculator.pipeline.person_snapshot import \
+    pipeline as person_snapshot_pipeline
 from recidiviz.calculator.pipeline.program import \
     pipeline as program_pipeline
 from recidiviz.calculator.pipeline.recidivism import \
@@ -74,7 +90,9 @@ PIPELINE_MODULES = {
     'incarceration': incarceration_pipeline,
     'recidivism': recidivism_pipeline,
     'supervision': supervision_pipeline,
-    'program': program_pipeline
+    'program': program_pipeline,
+    'person_snapshot': person_snapshot_pipeline,
+    'fused': fused_pipeline
 }
 
 
@@ -76,6 +76,8 @@ class Region:
             creating one for this region.
         queue: (dict) Any parameters to override when creating the queue for
             this region.
+        http_pool: (dict) Any parameters to override when creating the pooled
+            HTTP sessions this region's scraper fetches pages with.
         removed_from_website: (string) Value to use when a person is removed
             from a website (converted to `RemovedFromWebsite`).
         names_file: (string) Optional filename of names file for this region
@@ -92,6 +94,7 @@ class Region:
     base_url: Optional[str] = attr.ib(default=None)
     shared_queue: Optional[str] = attr.ib(default=None)
     queue: Optional[Dict[str, Any]] = attr.ib(default=None)
+    http_pool: Optional[Dict[str, Any]] = attr.ib(default=None)
     removed_from_website: RemovedFromWebsite = \
         attr.ib(default=RemovedFromWebsite.RELEASED,
                 converter=RemovedFromWebsite)
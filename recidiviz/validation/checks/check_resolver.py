@@ -21,7 +21,7 @@ from typing import Dict
 from recidiviz.validation.checks.existence_check import ExistenceValidationChecker
 from recidiviz.validation.checks.sameness_check import SamenessValidationChecker
 from recidiviz.validation.checks.validation_checker import ValidationChecker
-from recidiviz.validation.validation_models import ValidationCheckType, DataValidationJob
+from recidiviz.validation.validation_models import ValidationCheckType, DataValidationJob, DataValidationCheck
 
 
 _CHECKER_FOR_TYPE: Dict[ValidationCheckType, ValidationChecker] = {
@@ -44,5 +44,12 @@ def checker_for_validation(validation_job: DataValidationJob) -> ValidationCheck
     Raises a ValueError if the check type on the validation job is not associated with any
     validation checker implementation.
     """
-    check_type = validation_job.validation.validation_type
-    return _checker_for_type(check_type)
+    return checker_for_validation_check(validation_job.validation)
+
+
+def checker_for_validation_check(validation: DataValidationCheck) -> ValidationChecker:
+    """Retrieves the checker type associated with the given validation check.
+
+    Raises a ValueError if the check type is not associated with any validation checker implementation.
+    """
+    return _checker_for_type(validation.validation_type)
@@ -18,6 +18,8 @@
 """Models an existence check, which identifies a validation issue by observing that there is any row returned
 in a given validation result set."""
 
+from typing import Any, Iterable
+
 import attr
 
 from recidiviz.big_query.big_query_client import BigQueryClientImpl
@@ -39,12 +41,18 @@ class ExistenceValidationChecker(ValidationChecker[ExistenceDataValidationCheck]
 
     @classmethod
     def run_check(cls, validation_job: DataValidationJob[ExistenceDataValidationCheck]) -> DataValidationJobResult:
+        query_job = BigQueryClientImpl().run_query_async(validation_job.query_str())
+        return cls.run_check_for_rows(validation_job, query_job)
+
+    @classmethod
+    def run_check_for_rows(cls,
+                           validation_job: DataValidationJob[ExistenceDataValidationCheck],
+                           rows: Iterable[Any]) -> DataValidationJobResult:
         was_successful = True
         invalid_rows = 0
-        query_job = BigQueryClientImpl().run_query_async(validation_job.query_str())
 
         # We need to iterate over the collection to initialize the query result set
-        for _ in query_job:
+        for _ in rows:
             was_successful = False
             invalid_rows += 1
 
@@ -18,7 +18,7 @@
 """Models a sameness check, which identifies a validation issue by observing that values in a configured set of
 columns are not the same."""
 from enum import Enum
-from typing import List, Set
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 import attr
 
@@ -29,6 +29,63 @@ from recidiviz.validation.validation_models import ValidationCheckType, \
 
 EMPTY_STRING_VALUE = 'EMPTY_STRING_VALUE'
 
+# The number of failing rows included in the failure description of checks that compute errors in the query
+FAILING_ROWS_SAMPLE_SIZE = 5
+
+NUMBERS_SUMMARY_QUERY_TEMPLATE = \
+    """
+    WITH validation_rows AS (
+      {validation_query}
+    ),
+    bounded_rows AS (
+      SELECT *, GREATEST({comparison_columns}) AS sameness_max_value, LEAST({comparison_columns}) AS sameness_min_value
+      FROM validation_rows
+    ),
+    errors AS (
+      SELECT
+        region_code,
+        bounded_rows,
+        CASE
+          WHEN sameness_max_value = 0 AND sameness_min_value = 0 THEN 0.0
+          -- When comparing negative values to 0, the 0 is treated as the min value
+          WHEN sameness_max_value = 0 THEN 1.0
+          ELSE (sameness_max_value - sameness_min_value) / sameness_max_value
+        END AS error
+      FROM bounded_rows
+    )
+    SELECT
+      region_code,
+      COUNT(*) AS num_rows,
+      COUNTIF(error > {max_allowed_error}) AS num_error_rows,
+      MAX(error) AS highest_error,
+      ARRAY_AGG(IF(error > {max_allowed_error}, TO_JSON_STRING(bounded_rows), NULL) IGNORE NULLS
+                LIMIT {sample_size}) AS failing_rows_sample
+    FROM errors
+    GROUP BY region_code
+    """
+
+STRINGS_SUMMARY_QUERY_TEMPLATE = \
+    """
+    WITH validation_rows AS (
+      {validation_query}
+    ),
+    errors AS (
+      SELECT
+        region_code,
+        validation_rows,
+        (SELECT COUNT(DISTINCT value) FROM UNNEST([{comparison_values}]) AS value) > 1 AS is_error
+      FROM validation_rows
+    )
+    SELECT
+      region_code,
+      COUNT(*) AS num_rows,
+      COUNTIF(is_error) AS num_error_rows,
+      ARRAY_AGG(IF(is_error, TO_JSON_STRING(validation_rows), NULL) IGNORE NULLS
+                LIMIT {sample_size}) AS failing_rows_sample
+    FROM errors
+    GROUP BY region_code
+    """
+
 
 class SamenessDataValidationCheckType(Enum):
     # For comparing integers and/or floats
@@ -54,26 +111,123 @@ class SamenessDataValidationCheck(DataValidationCheck):
 
     validation_type: ValidationCheckType = attr.ib(default=ValidationCheckType.SAMENESS)
 
+    # If True, the errors are computed in BigQuery and only a single summary row per region is returned for the check,
+    # instead of streaming every row of the view to compute the errors here. STRINGS checks in this mode require all
+    # comparison columns to be of type STRING.
+    compute_errors_in_query: bool = attr.ib(default=False)
+
+    def summary_query_str_for_region_code(self, region_code: str) -> str:
+        return self.summary_query_str_for_region_codes([region_code])
+
+    def summary_query_str_for_region_codes(self, region_codes: List[str]) -> str:
+        """Returns a query which computes the errors of the rows returned by query_str_for_region_codes and returns a
+        single row per region with the total number of rows, the number of rows with an unacceptable error, the highest
+        error (for NUMBERS checks) and a sample of the failing rows as JSON strings. Regions without any rows are not
+        returned."""
+        validation_query = self.query_str_for_region_codes(region_codes)
+
+        if self.sameness_check_type == SamenessDataValidationCheckType.NUMBERS:
+            return NUMBERS_SUMMARY_QUERY_TEMPLATE.format(validation_query=validation_query,
+                                                         comparison_columns=', '.join(self.comparison_columns),
+                                                         max_allowed_error=self.max_allowed_error,
+                                                         sample_size=FAILING_ROWS_SAMPLE_SIZE)
+        if self.sameness_check_type == SamenessDataValidationCheckType.STRINGS:
+            comparison_values = ', '.join(f"IFNULL({column}, '{EMPTY_STRING_VALUE}')"
+                                          for column in self.comparison_columns)
+            return STRINGS_SUMMARY_QUERY_TEMPLATE.format(validation_query=validation_query,
+                                                         comparison_values=comparison_values,
+                                                         sample_size=FAILING_ROWS_SAMPLE_SIZE)
+
+        raise ValueError(f"Unexpected sameness_check_type of {self.sameness_check_type}.")
+
 
 class SamenessValidationChecker(ValidationChecker[SamenessDataValidationCheck]):
     """Performs the validation check for sameness check types."""
 
     @classmethod
     def run_check(cls, validation_job: DataValidationJob[SamenessDataValidationCheck]) -> DataValidationJobResult:
-        comparison_columns = validation_job.validation.comparison_columns
-        max_allowed_error = validation_job.validation.max_allowed_error
+        if validation_job.validation.compute_errors_in_query:
+            return SamenessValidationChecker.run_check_with_summary_query(validation_job)
 
         query_job = BigQueryClientImpl().run_query_async(validation_job.query_str())
+        return cls.run_check_for_rows(validation_job, query_job)
+
+    @classmethod
+    def run_check_for_rows(cls,
+                           validation_job: DataValidationJob[SamenessDataValidationCheck],
+                           rows: Iterable[Any]) -> DataValidationJobResult:
+        comparison_columns = validation_job.validation.comparison_columns
+        max_allowed_error = validation_job.validation.max_allowed_error
 
         if validation_job.validation.sameness_check_type == SamenessDataValidationCheckType.NUMBERS:
             return SamenessValidationChecker.run_check_for_numbers(
-                validation_job, comparison_columns, max_allowed_error, query_job)
+                validation_job, comparison_columns, max_allowed_error, rows)
         if validation_job.validation.sameness_check_type == SamenessDataValidationCheckType.STRINGS:
             return SamenessValidationChecker.run_check_for_strings(
-                validation_job, comparison_columns, max_allowed_error, query_job)
+                validation_job, comparison_columns, max_allowed_error, rows)
 
         raise ValueError(f"Unexpected sameness_check_type of {validation_job.validation.sameness_check_type}.")
 
+    def run_check_for_region_codes(self,
+                                   validation: SamenessDataValidationCheck,
+                                   region_codes: List[str]) -> List[DataValidationJobResult]:
+        if not validation.compute_errors_in_query:
+            return super().run_check_for_region_codes(validation, region_codes)
+
+        query_job = BigQueryClientImpl().run_query_async(validation.summary_query_str_for_region_codes(region_codes))
+        summary_row_by_region_code: Dict[str, Any] = {row['region_code']: row for row in query_job}
+
+        return [SamenessValidationChecker.result_from_summary_row(
+            DataValidationJob(validation=validation, region_code=region_code),
+            summary_row_by_region_code.get(region_code))
+                for region_code in region_codes]
+
+    @staticmethod
+    def run_check_with_summary_query(validation_job: DataValidationJob[SamenessDataValidationCheck]) -> \
+            DataValidationJobResult:
+        """Performs the validation check using a query which computes the errors in BigQuery, so that only a single
+        summary row is read from the query results."""
+        query_job = BigQueryClientImpl().run_query_async(
+            validation_job.validation.summary_query_str_for_region_code(validation_job.region_code))
+        return SamenessValidationChecker.result_from_summary_row(validation_job, next(iter(query_job), None))
+
+    @staticmethod
+    def result_from_summary_row(validation_job: DataValidationJob[SamenessDataValidationCheck],
+                                summary_row: Optional[Any]) -> DataValidationJobResult:
+        """Builds the result for a job from its summary query row, which is None if the region had no rows."""
+        if summary_row is None:
+            return DataValidationJobResult(validation_job=validation_job,
+                                           was_successful=True,
+                                           failure_description=None)
+
+        validation = validation_job.validation
+        max_allowed_error = validation.max_allowed_error
+        num_rows = summary_row['num_rows']
+        num_errors = summary_row['num_error_rows']
+
+        description: Optional[str] = None
+        if validation.sameness_check_type == SamenessDataValidationCheckType.NUMBERS:
+            was_successful = num_errors == 0
+            if not was_successful:
+                highest_error = round(summary_row['highest_error'], 2)
+                description = f'{num_errors} row(s) had unacceptable margins of error. The acceptable ' \
+                              f'margin of error is only {max_allowed_error}, but the validation returned rows with ' \
+                              f'errors as high as {highest_error}.'
+        else:
+            error_rate = (num_errors / num_rows) if num_rows > 0 else 0.0
+            was_successful = error_rate <= max_allowed_error
+            if not was_successful:
+                description = f'{num_errors} out of {num_rows} row(s) did not contain matching strings. The ' \
+                              f'acceptable margin of error is only {max_allowed_error}, but the validation returned ' \
+                              f'an error rate of {error_rate}.'
+
+        if description:
+            failing_rows_sample = summary_row['failing_rows_sample']
+            description += f' Sample of failing rows: {failing_rows_sample}'
+        return DataValidationJobResult(validation_job=validation_job,
+                                       was_successful=was_successful,
+                                       failure_description=description)
+
     @staticmethod
     def run_check_for_numbers(validation_job, comparison_columns, max_allowed_error, query_job) -> \
             DataValidationJobResult:
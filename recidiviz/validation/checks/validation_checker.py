@@ -18,8 +18,10 @@
 """An interface for validation checkers."""
 
 import abc
-from typing import Generic
+from collections import defaultdict
+from typing import Any, Dict, Generic, Iterable, List
 
+from recidiviz.big_query.big_query_client import BigQueryClientImpl
 from recidiviz.validation.validation_models import DataValidationType, DataValidationJob, DataValidationJobResult
 
 
@@ -29,3 +31,24 @@ class ValidationChecker(Generic[DataValidationType]):
     @abc.abstractmethod
     def run_check(self, validation_job: DataValidationJob[DataValidationType]) -> DataValidationJobResult:
         pass
+
+    @abc.abstractmethod
+    def run_check_for_rows(self,
+                           validation_job: DataValidationJob[DataValidationType],
+                           rows: Iterable[Any]) -> DataValidationJobResult:
+        """Performs the check for the given job over |rows|, the rows of the validation view for the job's region."""
+
+    def run_check_for_region_codes(self,
+                                   validation: DataValidationType,
+                                   region_codes: List[str]) -> List[DataValidationJobResult]:
+        """Performs the check for each of the given regions with a single query over the validation view, returning
+        one result per region."""
+        query_job = BigQueryClientImpl().run_query_async(validation.query_str_for_region_codes(region_codes))
+
+        rows_by_region_code: Dict[str, List[Any]] = defaultdict(list)
+        for row in query_job:
+            rows_by_region_code[row['region_code']].append(row)
+
+        return [self.run_check_for_rows(DataValidationJob(validation=validation, region_code=region_code),
+                                        rows_by_region_code[region_code])
+                for region_code in region_codes]
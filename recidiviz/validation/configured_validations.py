@@ -135,7 +135,8 @@ def get_all_validations() -> List[DataValidationCheck]:
             view=SUPERVISION_EOM_POPULATION_PERSON_LEVEL_DISTRICT_EXTERNAL_COMPARISON_VIEW_BUILDER.build(),
             sameness_check_type=SamenessDataValidationCheckType.STRINGS,
             comparison_columns=['external_district', 'internal_district'],
-            max_allowed_error=0.01),
+            max_allowed_error=0.01,
+            compute_errors_in_query=True),
         SamenessDataValidationCheck(
             view=REVOCATIONS_BY_PERIOD_DASHBOARD_COMPARISON_VIEW_BUILDER.build(),
             sameness_check_type=SamenessDataValidationCheckType.NUMBERS,
@@ -19,7 +19,8 @@
 from concurrent import futures
 from http import HTTPStatus
 import logging
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Tuple
 
 from opencensus.stats import aggregation, measure, view
 
@@ -31,10 +32,10 @@ from recidiviz.utils.auth import authenticate_request
 from recidiviz.utils.environment import GCP_PROJECT_STAGING
 from recidiviz.utils.metadata import local_project_id_override
 from recidiviz.utils.params import get_bool_param_value
-from recidiviz.validation.checks.check_resolver import checker_for_validation
+from recidiviz.validation.checks.check_resolver import checker_for_validation, checker_for_validation_check
 
 from recidiviz.validation.configured_validations import get_all_validations, STATES_TO_VALIDATE
-from recidiviz.validation.validation_models import DataValidationJob, DataValidationJobResult
+from recidiviz.validation.validation_models import DataValidationJob, DataValidationJobResult, DataValidationCheck
 from recidiviz.validation.views import view_config
 
 m_failed_validations = measure.MeasureInt("validation/num_failures", "The number of failed validations", "1")
@@ -52,19 +53,28 @@ monitoring.register_views([failed_validations_view])
 
 validation_manager_blueprint = Blueprint('validation_manager', __name__)
 
+# The maximum number of validation queries to run concurrently
+MAX_CONCURRENT_VALIDATION_QUERIES = 32
+
 
 @validation_manager_blueprint.route('/validate')
 @authenticate_request
 def handle_validation_request():
     """API endpoint to service data validation requests."""
     should_update_views = get_bool_param_value('should_update_views', request.args, default=False)
-    failed_validations = execute_validation(should_update_views=should_update_views)
+    should_batch_queries = get_bool_param_value('should_batch_queries', request.args, default=False)
+    failed_validations = execute_validation(should_update_views=should_update_views,
+                                            should_batch_queries=should_batch_queries)
 
     return _readable_response(failed_validations), HTTPStatus.OK
 
 
-def execute_validation(should_update_views: bool) -> List[DataValidationJobResult]:
-    """Executes all validation checks."""
+def execute_validation(should_update_views: bool, should_batch_queries: bool = False) -> List[DataValidationJobResult]:
+    """Executes all validation checks.
+
+    If |should_batch_queries| is True, each check is queried once for all states and the results are split up by
+    region, instead of running one query per check and state.
+    """
     if should_update_views:
         logging.info('Received query param "should_update_views" = true, updating validation dataset and views... ')
         view_update_manager.create_dataset_and_update_views_for_view_builders(
@@ -75,6 +85,25 @@ def execute_validation(should_update_views: bool) -> List[DataValidationJobResul
     logging.info('Performing a total of %s validation jobs...', len(validation_jobs))
 
     # Perform all validations and track failures
+    if should_batch_queries:
+        failed_validations = _run_validation_batches(_fetch_validation_batches_to_perform())
+    else:
+        failed_validations = _run_validation_jobs(validation_jobs)
+
+    if failed_validations:
+        logging.error('Found a total of %s failures. Emitting results...', len(failed_validations))
+    else:
+        logging.info('Found no failed validations...')
+
+    # Emit metrics for all failures
+    _emit_failures(failed_validations)
+
+    logging.info('Validation run complete. Analyzed a total of %s jobs.', len(validation_jobs))
+    return failed_validations
+
+
+def _run_validation_jobs(validation_jobs: List[DataValidationJob]) -> List[DataValidationJobResult]:
+    """Runs each validation job with its own query and returns the failed results."""
     failed_validations: List[DataValidationJobResult] = []
     with futures.ThreadPoolExecutor() as executor:
         future_to_jobs = {executor.submit(_run_job, job): job for job in validation_jobs}
@@ -87,19 +116,42 @@ def execute_validation(should_update_views: bool) -> List[DataValidationJobResul
                     failed_validations.append(result)
             except Exception as e:
                 logging.error('Failed to execute asynchronous query for validation job [%s] due to error: %s', job, e)
+    return failed_validations
 
-    if failed_validations:
-        logging.error('Found a total of %s failures. Emitting results...', len(failed_validations))
-    else:
-        logging.info('Found no failed validations...')
 
-    # Emit metrics for all failures
-    _emit_failures(failed_validations)
+def _run_validation_batches(
+        validation_batches: List[Tuple[DataValidationCheck, List[str]]]) -> List[DataValidationJobResult]:
+    """Runs a single query per validation check for all of its states and returns the failed results."""
+    failed_validations: List[DataValidationJobResult] = []
+    if not validation_batches:
+        return failed_validations
 
-    logging.info('Validation run complete. Analyzed a total of %s jobs.', len(validation_jobs))
+    max_workers = min(len(validation_batches), MAX_CONCURRENT_VALIDATION_QUERIES)
+    logging.info('Running [%s] batched validation queries with [%s] workers', len(validation_batches), max_workers)
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_batches = {executor.submit(_run_batch, validation, region_codes): (validation, region_codes)
+                             for validation, region_codes in validation_batches}
+
+        for future in futures.as_completed(future_to_batches):
+            validation, region_codes = future_to_batches[future]
+            try:
+                failed_validations.extend(result for result in future.result() if not result.was_successful)
+            except Exception as e:
+                logging.error('Failed to execute asynchronous query for validation view [%s] and regions %s due to '
+                              'error: %s', validation.view.view_id, region_codes, e)
     return failed_validations
 
 
+def _run_batch(validation: DataValidationCheck, region_codes: List[str]) -> List[DataValidationJobResult]:
+    start = time.perf_counter()
+    validation_checker = checker_for_validation_check(validation)
+    results = validation_checker.run_check_for_region_codes(validation, region_codes)
+    logging.info('Ran [%s] validation on view [%s] for %s regions in [%.2f] seconds with [%s] failures',
+                 validation.validation_type.value, validation.view.view_id, len(region_codes),
+                 time.perf_counter() - start, sum(1 for result in results if not result.was_successful))
+    return results
+
+
 def _run_job(job: DataValidationJob) -> DataValidationJobResult:
     validation_checker = checker_for_validation(job)
     return validation_checker.run_check(job)
@@ -116,6 +168,10 @@ def _fetch_validation_jobs_to_perform() -> List[DataValidationJob]:
     return validation_jobs
 
 
+def _fetch_validation_batches_to_perform() -> List[Tuple[DataValidationCheck, List[str]]]:
+    return [(check, list(STATES_TO_VALIDATE)) for check in get_all_validations()]
+
+
 def _emit_failures(failed_validations: List[DataValidationJobResult]):
     for result in failed_validations:
         logging.error("Failed data validation: %s", result)
@@ -18,7 +18,7 @@
 """Models representing data validation."""
 
 from enum import Enum
-from typing import Optional, TypeVar, Generic
+from typing import List, Optional, TypeVar, Generic
 
 import attr
 
@@ -51,6 +51,15 @@ class DataValidationCheck(BuildableAttr):
                     table=self.view.view_id,
                     region_code=region_code)
 
+    def query_str_for_region_codes(self, region_codes: List[str]) -> str:
+        """Returns a query for the rows of all of the given regions, to be split up by their region_code column."""
+        return "SELECT * FROM `{project_id}.{dataset}.{table}` " \
+               " WHERE region_code IN ({region_codes})" \
+            .format(project_id=metadata.project_id(),
+                    dataset=dataset_config.VIEWS_DATASET,
+                    table=self.view.view_id,
+                    region_codes=', '.join(f"'{region_code}'" for region_code in region_codes))
+
 
 DataValidationType = TypeVar('DataValidationType', bound=DataValidationCheck)
 